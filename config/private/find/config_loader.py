@@ -8,6 +8,8 @@ import toml
 class FindConfigModel(BaseModel):
     """顶层配置模型"""
     port: int = Field(default=13107, description="MCP服务端口")
+    index_dir: str = Field(default="~/.cache/mcp_find", description="元数据索引目录（位于被查找的主机上）")
+    index_max_age: int = Field(default=300, description="索引在多少秒内视为新鲜，超过后查询前先增量刷新")
 
 
 class FindConfig(BaseConfig):
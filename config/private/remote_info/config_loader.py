@@ -8,6 +8,11 @@ import toml
 class RemoteInfoConfigModel(BaseModel):
     """顶层配置模型"""
     port: int = Field(default=12100, description="MCP服务端口")
+    report_dir: str = Field(default="reports", description="报告存储目录")
+    report_compression: str = Field(default="gzip", description="报告压缩方式：zstd、gzip或none")
+    report_retention_count: int = Field(default=0, description="最多保留的报告数量，0表示不限制")
+    report_retention_bytes: int = Field(default=0, description="报告占用的最大磁盘空间（字节），0表示不限制")
+    report_retention_days: float = Field(default=0, description="报告最长保留天数，0表示不限制")
 
 
 class RemoteInfoConfig(BaseConfig):
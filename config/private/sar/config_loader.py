@@ -1,6 +1,7 @@
 # Copyright (c) Huawei Technologies Co., Ltd. 2023-2025. All rights reserved.
 from config.public.base_config_loader import BaseConfig
 import os
+from typing import List
 from pydantic import BaseModel, Field
 import toml
 
@@ -8,6 +9,7 @@ import toml
 class SarConfigModel(BaseModel):
     """顶层配置模型"""
     port: int = Field(default=13102, description="MCP服务端口")
+    sa_dirs: List[str] = Field(default=["/var/log/sa", "/var/log/sysstat"], description="sa日志目录，按顺序查找")
 
 
 class SarConfig(BaseConfig):
@@ -0,0 +1,38 @@
+"""公共基础层：远程主机查找与SSH连接"""
+from typing import List
+
+import paramiko
+
+from config.public.base_config_loader import RemoteConfigModel
+
+
+def find_remote_host(host_name: str, remote_hosts: List[RemoteConfigModel], is_zh: bool) -> RemoteConfigModel:
+    """查找远程主机配置"""
+    for host in remote_hosts:
+        if host.name == host_name or host.host == host_name:
+            return host
+    raise ValueError(f"未找到远程主机: {host_name}" if is_zh else f"Remote host not found: {host_name}")
+
+
+def open_ssh_client(host_config: RemoteConfigModel, is_zh: bool) -> paramiko.SSHClient:
+    """建立到远程主机的SSH连接"""
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            hostname=host_config.host,
+            port=host_config.port,
+            username=host_config.username,
+            password=host_config.password,
+            timeout=10,
+            banner_timeout=10
+        )
+    except paramiko.AuthenticationException as e:
+        client.close()
+        raise ValueError("SSH认证失败，请检查用户名和密码" if is_zh
+                         else "SSH authentication failed, check username and password") from e
+    except Exception as e:
+        client.close()
+        raise ValueError(f"SSH连接错误: {str(e)}" if is_zh else f"SSH connection error: {str(e)}") from e
+    return client
+
@@ -0,0 +1,237 @@
+"""
+文件 I/O 微基准：在指定目录下创建临时文件，执行顺序/随机读写测试，统计吞吐、IOPS 与时延分位数；
+只依赖标准库，远程执行时整个文件通过 SSH 标准输入交给目标机的 python3 运行，参数为命令行中的 JSON
+"""
+import json
+import mmap
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+TESTS = ("seq_read", "seq_write", "rand_read", "rand_write")
+# 每个 2 的幂区间划分的子桶位数：2^7 个子桶，相对误差小于 1%
+SUB_BUCKET_BITS = 7
+PREFILL_CHUNK = 1 << 20
+
+
+class LatencyHistogram:
+    """HDR 风格的对数-线性直方图：桶数量只与数值范围的数量级相关，记录与合并都是 O(1)"""
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        shift = max(value.bit_length() - SUB_BUCKET_BITS, 0)
+        return (shift << SUB_BUCKET_BITS) | (value >> shift)
+
+    @staticmethod
+    def _value(index: int) -> int:
+        """桶的中点"""
+        shift, sub = index >> SUB_BUCKET_BITS, index & ((1 << SUB_BUCKET_BITS) - 1)
+        return (sub << shift) + ((1 << shift) >> 1)
+
+    def record(self, value: int) -> None:
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def percentiles(self, quantiles: Tuple[float, ...]) -> Dict[float, int]:
+        result = {}
+        targets = sorted((max(int(q * self.total + 0.5), 1), q) for q in quantiles)
+        seen = 0
+        pending = iter(targets)
+        target = next(pending, None)
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            while target is not None and seen >= target[0]:
+                result[target[1]] = min(self._value(index), self.max)
+                target = next(pending, None)
+        return result
+
+
+def _open(path: str, write: bool, direct: bool) -> int:
+    flags = (os.O_RDWR if write else os.O_RDONLY) | getattr(os, "O_CLOEXEC", 0)
+    if direct:
+        flags |= os.O_DIRECT
+    return os.open(path, flags)
+
+
+def probe_direct(path: str) -> bool:
+    """tmpfs 等文件系统不支持 O_DIRECT，打开时返回 EINVAL"""
+    if not hasattr(os, "O_DIRECT"):
+        return False
+    try:
+        os.close(_open(path, False, True))
+        return True
+    except OSError:
+        return False
+
+
+def prefill(path: str, size: int) -> None:
+    """写入随机数据（避免稀疏文件或可压缩数据让读测试失真），落盘后丢弃页缓存"""
+    chunk = os.urandom(PREFILL_CHUNK)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        written = 0
+        while written < size:
+            written += os.write(fd, chunk[:min(PREFILL_CHUNK, size - written)])
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _worker(fd: int, test: str, block_size: int, region: Tuple[int, int], deadline: float, seed: int,
+            histogram: LatencyHistogram, totals: List[int], errors: List[str]) -> None:
+    # 匿名 mmap 按页对齐，满足 O_DIRECT 对缓冲区地址的要求
+    buf = mmap.mmap(-1, block_size)
+    if test.endswith("write"):
+        buf.write(os.urandom(block_size))
+    start, blocks = region
+    rng = random.Random(seed)
+    sequential = test.startswith("seq")
+    io = os.pwritev if test.endswith("write") else os.preadv
+    clock = time.perf_counter_ns
+    ops = 0
+    position = 0
+    try:
+        while time.monotonic() < deadline:
+            if sequential:
+                offset = start + position * block_size
+                position = (position + 1) % blocks
+            else:
+                offset = start + rng.randrange(blocks) * block_size
+            begin = clock()
+            io(fd, [buf], offset)
+            histogram.record(clock() - begin)
+            ops += 1
+    except OSError as e:
+        errors.append(str(e))
+    finally:
+        buf.close()
+    totals.append(ops)
+
+
+def run_test(path: str, test: str, block_size: int, file_size: int, queue_depth: int, direct: bool,
+             runtime: float) -> Dict[str, Any]:
+    """
+    queue_depth 个线程共用一个文件描述符做定位读写（pread/pwrite 期间释放 GIL）；
+    顺序测试把文件均分给各线程，各自在自己的区间内循环；缓冲写结束时的 fsync 计入耗时
+    """
+    blocks = file_size // block_size
+    share = max(blocks // queue_depth, 1)
+    fd = _open(path, test.endswith("write"), direct)
+    histograms = [LatencyHistogram() for _ in range(queue_depth)]
+    totals: List[int] = []
+    errors: List[str] = []
+    try:
+        begin = time.monotonic()
+        deadline = begin + runtime
+        threads = []
+        for i in range(queue_depth):
+            region = (i * share * block_size, share) if test.startswith("seq") else (0, blocks)
+            threads.append(threading.Thread(target=_worker, args=(fd, test, block_size, region, deadline, i,
+                                                                  histograms[i], totals, errors)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if test.endswith("write") and not direct:
+            os.fsync(fd)
+        elapsed = time.monotonic() - begin
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+    merged = LatencyHistogram()
+    for histogram in histograms:
+        merged.merge(histogram)
+    ops = sum(totals)
+    quantiles = (0.5, 0.9, 0.99, 0.999)
+    points = merged.percentiles(quantiles)
+    to_us = lambda ns: round(ns / 1000, 2)
+    result = {
+        "test": test,
+        "block_size": block_size,
+        "queue_depth": queue_depth,
+        "direct": direct,
+        "ops": ops,
+        "bytes": ops * block_size,
+        "seconds": round(elapsed, 3),
+        "iops": round(ops / elapsed, 1) if elapsed > 0 else None,
+        "throughput_mib_s": round(ops * block_size / elapsed / (1 << 20), 2) if elapsed > 0 else None,
+        "latency_us": {
+            "min": to_us(merged.min or 0),
+            "mean": to_us(merged.sum / merged.total) if merged.total else None,
+            "p50": to_us(points.get(0.5, 0)),
+            "p90": to_us(points.get(0.9, 0)),
+            "p99": to_us(points.get(0.99, 0)),
+            "p99.9": to_us(points.get(0.999, 0)),
+            "max": to_us(merged.max),
+        },
+    }
+    if errors:
+        result["error"] = errors[0]
+    return result
+
+
+def run_benchmark(params: Dict[str, Any]) -> Dict[str, Any]:
+    """执行全部测试，无论成功与否都删除临时文件"""
+    directory = params["path"]
+    file_size = params["file_size"]
+    if not os.path.isdir(directory):
+        return {"error": f"not a directory: {directory}"}
+    stat = os.statvfs(directory)
+    available = stat.f_bavail * stat.f_frsize
+    if file_size > available * 0.9:
+        return {"error": f"not enough free space: need {file_size} bytes, {available} available"}
+    path = os.path.join(directory, f".disk_bench_{uuid.uuid4().hex}")
+    try:
+        started = time.monotonic()
+        prefill(path, file_size)
+        prefill_seconds = time.monotonic() - started
+        direct = bool(params.get("direct")) and probe_direct(path)
+        results = [run_test(path, test, params["block_size"], file_size, params["queue_depth"], direct,
+                            params["runtime"]) for test in params["tests"]]
+    except OSError as e:
+        return {"error": str(e)}
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return {
+        "path": directory,
+        "file_size": file_size,
+        "direct_requested": bool(params.get("direct")),
+        "direct": direct,
+        "prefill_seconds": round(prefill_seconds, 3),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_benchmark(json.loads(sys.argv[1]))))
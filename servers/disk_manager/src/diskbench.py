@@ -0,0 +1,75 @@
+"""磁盘基准测试调度：参数校验，本地直接调用 benchcore，远程把 benchcore 源码通过 SSH 交给目标机的 python3 执行"""
+import json
+import re
+import shlex
+from typing import Any, Dict, List, Optional
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.disk_manager.src import benchcore
+from servers.disk_manager.src.base import open_ssh_client
+
+SIZE_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+SIZE_PATTERN = re.compile(r"^(\d+)\s*([kmg]?)i?b?$", re.IGNORECASE)
+MAX_QUEUE_DEPTH = 64
+MAX_RUNTIME = 300
+
+
+def parse_size(value: Any, name: str, is_zh: bool) -> int:
+    """字节数：整数，或带单位的字符串，如 4k、1m、2g"""
+    match = SIZE_PATTERN.match(str(value).strip())
+    size = int(match.group(1)) * SIZE_UNITS[match.group(2).lower()] if match else 0
+    if size <= 0:
+        raise ValueError(f"{name} 格式错误: {value}，示例: 4k、1m、1g" if is_zh
+                         else f"Invalid {name}: {value}, e.g. 4k, 1m, 1g")
+    return size
+
+
+def build_params(path: str, tests: Optional[List[str]], block_size: Any, file_size: Any, queue_depth: int,
+                 direct: bool, runtime: float, is_zh: bool) -> Dict[str, Any]:
+    tests = list(dict.fromkeys(tests)) if tests else list(benchcore.TESTS)
+    unknown = [test for test in tests if test not in benchcore.TESTS]
+    if unknown:
+        raise ValueError(f"不支持的测试: {', '.join(unknown)}，可选: {', '.join(benchcore.TESTS)}" if is_zh
+                         else f"Unsupported test: {', '.join(unknown)}, supported: {', '.join(benchcore.TESTS)}")
+    block = parse_size(block_size, "block_size", is_zh)
+    size = parse_size(file_size, "file_size", is_zh)
+    # O_DIRECT 要求偏移与长度按逻辑块对齐，统一要求 4KiB 的整数倍
+    if block % 4096:
+        raise ValueError("block_size 必须是 4k 的整数倍" if is_zh else "block_size must be a multiple of 4k")
+    if not 1 <= queue_depth <= MAX_QUEUE_DEPTH or not 0 < runtime <= MAX_RUNTIME:
+        raise ValueError(f"queue_depth 范围为 1~{MAX_QUEUE_DEPTH}，runtime 范围为 0~{MAX_RUNTIME} 秒" if is_zh
+                         else f"queue_depth must be 1-{MAX_QUEUE_DEPTH} and runtime 0-{MAX_RUNTIME} seconds")
+    if size < block * queue_depth:
+        raise ValueError("file_size 不能小于 block_size × queue_depth" if is_zh
+                         else "file_size must be at least block_size * queue_depth")
+    return {"path": path, "tests": tests, "block_size": block, "file_size": size - size % block,
+            "queue_depth": queue_depth, "direct": direct, "runtime": runtime}
+
+
+def _run_remote(host_config: RemoteConfigModel, params: Dict[str, Any], is_zh: bool) -> Dict[str, Any]:
+    with open(benchcore.__file__, encoding="utf-8") as f:
+        source = f.read()
+    # 预写文件按 100MiB/s 的保守速度估计
+    timeout = params["runtime"] * len(params["tests"]) + params["file_size"] / (100 << 20) + 120
+    client = open_ssh_client(host_config, is_zh)
+    try:
+        stdin, stdout, stderr = client.exec_command(f"python3 - {shlex.quote(json.dumps(params))}", timeout=timeout)
+        stdin.write(source)
+        stdin.channel.shutdown_write()
+        output = stdout.read().decode("utf-8", errors="replace").strip()
+        error = stderr.read().decode("utf-8", errors="replace").strip()
+    finally:
+        client.close()
+    try:
+        return json.loads(output.splitlines()[-1])
+    except (IndexError, ValueError):
+        detail = error.splitlines()[-1] if error else output
+        raise RuntimeError(f"远程主机 {host_config.name} 执行基准测试失败（需要 python3）: {detail}" if is_zh
+                           else f"Benchmark on {host_config.name} failed (python3 is required): {detail}")
+
+
+def run_disk_bench(host_config: Optional[RemoteConfigModel], params: Dict[str, Any], is_zh: bool) -> Dict[str, Any]:
+    result = benchcore.run_benchmark(params) if host_config is None else _run_remote(host_config, params, is_zh)
+    if "error" in result:
+        raise RuntimeError(f"基准测试失败: {result['error']}" if is_zh else f"Benchmark failed: {result['error']}")
+    return result
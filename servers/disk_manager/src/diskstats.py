@@ -0,0 +1,236 @@
+"""块设备 I/O 采样：直接读取 /proc/diskstats（不可读时读取 /sys/block/*/stat），计算 IOPS、吞吐、时延、队列深度与利用率"""
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.disk_manager.src.channel import get_channel
+
+SECTOR_BYTES = 512
+# /proc/diskstats 设备名之后的字段；旧内核只有前 11 个，4.18 起增加 discard，5.5 起增加 flush
+FIELDS = ("reads", "reads_merged", "sectors_read", "read_ms", "writes", "writes_merged", "sectors_written",
+          "write_ms", "in_flight", "io_ms", "queue_ms", "discards", "discards_merged", "sectors_discarded",
+          "discard_ms", "flushes", "flush_ms")
+METRICS = ("r/s", "w/s", "d/s", "iops", "rkB/s", "wkB/s", "dkB/s", "rrqm/s", "wrqm/s", "r_await", "w_await",
+           "d_await", "rareq-sz", "wareq-sz", "aqu-sz", "%util", "in_flight")
+
+# 设备类型只在开始时采集一次：分区、device-mapper 名称、md 设备
+# 单个 awk 进程完成全部采样，每次采样只产生一次 sleep
+SAMPLE_SCRIPT = """
+echo "@START $(date +%s.%N) $(cut -d' ' -f1 /proc/uptime)"
+for p in /sys/class/block/*/partition; do
+    [ -e "$p" ] || continue
+    d=${{p%/partition}}
+    echo "@PART ${{d##*/}}"
+done
+for f in /sys/block/dm-*/dm/name; do
+    [ -e "$f" ] || continue
+    d=${{f%/dm/name}}
+    echo "@DM ${{d##*/}} $(cat "$f")"
+done
+if [ -r /proc/diskstats ]; then src=/proc/diskstats; else src=; fi
+awk -v n={snapshots} -v iv={interval} -v src="$src" 'BEGIN {{
+    for (i = 0; i < n; i++) {{
+        if (i > 0) system("sleep " iv)
+        getline up < "/proc/uptime"; close("/proc/uptime"); split(up, u, " ")
+        printf "@SAMPLE %s\\n", u[1]
+        if (src != "") {{
+            while ((getline line < src) > 0) print line
+            close(src)
+        }} else {{
+            cmd = "grep -H \\"\\" /sys/block/*/stat /sys/block/*/*/stat 2>/dev/null"
+            while ((cmd | getline line) > 0) print line
+            close(cmd)
+        }}
+        fflush()
+    }}
+}}'
+"""
+
+Counters = Dict[str, Tuple[int, ...]]
+
+
+def _parse_stat_line(line: str) -> Optional[Tuple[str, Tuple[int, ...]]]:
+    """解析一行 /proc/diskstats，或 grep 输出的 /sys/block/<dev>[/<part>]/stat:<字段>"""
+    if line.startswith("/sys/block/"):
+        path, _, values = line.partition(":")
+        name = path.rsplit("/", 2)[-2]
+        parts = values.split()
+    else:
+        parts = line.split()
+        if len(parts) < 14 or not parts[0].isdigit():
+            return None
+        name = parts[2]
+        parts = parts[3:]
+    if len(parts) < 11 or not all(part.isdigit() for part in parts):
+        return None
+    values = tuple(int(part) for part in parts[:len(FIELDS)])
+    return name, values + (0,) * (len(FIELDS) - len(values))
+
+
+def parse_samples(lines: List[str]) -> Tuple[Optional[float], Dict[str, Dict[str, Any]], List[Tuple[float, Counters]]]:
+    """返回 (墙钟时间与 uptime 的差值, 设备信息, [(uptime, {设备: 计数器})])"""
+    offset = None
+    devices: Dict[str, Dict[str, Any]] = {}
+    samples: List[Tuple[float, Counters]] = []
+    for line in lines:
+        if line.startswith("@START "):
+            parts = line.split()
+            try:
+                offset = float(parts[1]) - float(parts[2])
+            except (IndexError, ValueError):
+                offset = None
+        elif line.startswith("@PART "):
+            devices.setdefault(line.split()[1], {})["partition"] = True
+        elif line.startswith("@DM "):
+            parts = line.split(" ", 2)
+            if len(parts) == 3:
+                devices.setdefault(parts[1], {})["dm_name"] = parts[2].strip()
+        elif line.startswith("@SAMPLE "):
+            samples.append((float(line.split()[1]), {}))
+        elif samples:
+            parsed = _parse_stat_line(line)
+            if parsed is not None:
+                samples[-1][1][parsed[0]] = parsed[1]
+    return offset, devices, samples
+
+
+def device_type(name: str, info: Dict[str, Any]) -> str:
+    if info.get("partition"):
+        return "partition"
+    if name.startswith("dm-"):
+        return "dm"
+    if name.startswith("md"):
+        return "md"
+    return "disk"
+
+
+def compute_metrics(before: Tuple[int, ...], after: Tuple[int, ...], elapsed: float) -> Dict[str, float]:
+    """按 iostat -x 的口径计算一段区间内的指标；时延为该区间内完成的请求的平均耗时"""
+    d = [max(a - b, 0) for a, b in zip(after, before)]
+    (reads, reads_merged, sectors_read, read_ms, writes, writes_merged, sectors_written, write_ms, _, io_ms,
+     queue_ms, discards, _, sectors_discarded, discard_ms, _, _) = d
+    elapsed_ms = elapsed * 1000
+    return {
+        "r/s": round(reads / elapsed, 2),
+        "w/s": round(writes / elapsed, 2),
+        "d/s": round(discards / elapsed, 2),
+        "iops": round((reads + writes + discards) / elapsed, 2),
+        "rkB/s": round(sectors_read * SECTOR_BYTES / 1024 / elapsed, 2),
+        "wkB/s": round(sectors_written * SECTOR_BYTES / 1024 / elapsed, 2),
+        "dkB/s": round(sectors_discarded * SECTOR_BYTES / 1024 / elapsed, 2),
+        "rrqm/s": round(reads_merged / elapsed, 2),
+        "wrqm/s": round(writes_merged / elapsed, 2),
+        "r_await": round(read_ms / reads, 3) if reads else 0.0,
+        "w_await": round(write_ms / writes, 3) if writes else 0.0,
+        "d_await": round(discard_ms / discards, 3) if discards else 0.0,
+        "rareq-sz": round(sectors_read * SECTOR_BYTES / 1024 / reads, 2) if reads else 0.0,
+        "wareq-sz": round(sectors_written * SECTOR_BYTES / 1024 / writes, 2) if writes else 0.0,
+        "aqu-sz": round(queue_ms / elapsed_ms, 2),
+        "%util": round(min(io_ms / elapsed_ms * 100, 100.0), 2),
+        "in_flight": after[FIELDS.index("in_flight")],
+    }
+
+
+def compute_diskstats(offset: Optional[float], devices: Dict[str, Dict[str, Any]],
+                      samples: List[Tuple[float, Counters]], interval: float,
+                      device_filter: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    series 为相邻两次采样之间的逐点指标，summary 用首尾两次采样计算整个窗口的指标；
+    从未有过 I/O 的设备（如未使用的 loop、ram）与 iostat 一样不输出
+    """
+    timestamps: List[str] = []
+    points: List[Tuple[float, float]] = []
+    for index in range(1, len(samples)):
+        elapsed = samples[index][0] - samples[index - 1][0]
+        if elapsed > 0:
+            points.append((index, elapsed))
+            wall = (offset + samples[index][0]) if offset is not None else time.time()
+            timestamps.append(datetime.fromtimestamp(wall).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3])
+
+    first, last = samples[0][1], samples[-1][1]
+    wanted = set(device_filter) if device_filter else None
+    series: List[Dict[str, Any]] = []
+    summary: List[Dict[str, Any]] = []
+    for name in sorted(last):
+        info = devices.get(name, {})
+        if wanted is not None and name not in wanted and info.get("dm_name") not in wanted:
+            continue
+        if wanted is None and not any(last[name][:11]):
+            continue
+        columns: Dict[str, List[Any]] = {key: [] for key in METRICS}
+        for index, elapsed in points:
+            before = samples[index - 1][1].get(name)
+            after = samples[index][1].get(name)
+            # 采样期间新出现或被移除的设备，缺失的点记为 None
+            metrics = compute_metrics(before, after, elapsed) if before and after else {}
+            for key in METRICS:
+                columns[key].append(metrics.get(key))
+        meta = {"device": name, "type": device_type(name, info)}
+        if "dm_name" in info:
+            meta["dm_name"] = info["dm_name"]
+        series.append(dict(meta, columns=columns))
+        if name in first and samples[-1][0] > samples[0][0]:
+            summary.append(dict(meta, **compute_metrics(first[name], last[name], samples[-1][0] - samples[0][0])))
+    return {
+        "samples": len(timestamps),
+        "interval": interval,
+        "timestamps": timestamps,
+        "series": series,
+        "summary": summary,
+    }
+
+
+def _read_local_stats() -> List[str]:
+    try:
+        with open("/proc/diskstats") as f:
+            return f.read().splitlines()
+    except OSError:
+        lines = []
+        for name in os.listdir("/sys/block"):
+            base = os.path.join("/sys/block", name)
+            paths = [os.path.join(base, "stat")]
+            paths += [os.path.join(base, part, "stat") for part in os.listdir(base) if part.startswith(name)]
+            for path in paths:
+                try:
+                    with open(path) as f:
+                        lines.append(f"{path}:{f.read().strip()}")
+                except OSError:
+                    continue
+        return lines
+
+
+def sample_local(interval: float, count: int) -> List[str]:
+    """本地按固定节拍读取，时间取单调时钟"""
+    lines = [f"@START {time.time() - time.monotonic()} 0"]
+    with os.scandir("/sys/class/block") as entries:
+        for entry in entries:
+            if os.path.exists(os.path.join(entry.path, "partition")):
+                lines.append(f"@PART {entry.name}")
+            try:
+                with open(os.path.join(entry.path, "dm", "name")) as f:
+                    lines.append(f"@DM {entry.name} {f.read().strip()}")
+            except OSError:
+                pass
+    start = time.monotonic()
+    for i in range(count + 1):
+        if i > 0:
+            time.sleep(max(start + i * interval - time.monotonic(), 0))
+        lines.append(f"@SAMPLE {time.monotonic()}")
+        lines += _read_local_stats()
+    return lines
+
+
+def collect_diskstats(host_config: Optional[RemoteConfigModel], interval: float, count: int,
+                      devices: Optional[List[str]], is_zh: bool) -> Dict[str, Any]:
+    """本地直接读取 procfs；远程在该主机的常驻通道中运行一次采样脚本"""
+    if host_config is None:
+        lines = sample_local(interval, count)
+    else:
+        script = SAMPLE_SCRIPT.format(snapshots=count + 1, interval=interval)
+        lines = get_channel(host_config, is_zh).run(script, timeout=interval * (count + 1) + 30)
+    offset, info, samples = parse_samples(lines)
+    if len(samples) < 2 or not samples[-1][1]:
+        raise RuntimeError("未能读取 /proc/diskstats 采样数据" if is_zh else "Failed to sample /proc/diskstats")
+    return compute_diskstats(offset, info, samples, interval, devices)
@@ -0,0 +1,220 @@
+"""进程级 I/O 归因：两次读取所有进程的 /proc/[pid]/io 计算速率，并按 cgroup v2 的 io.stat 汇总，不依赖 iotop"""
+import heapq
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.disk_manager.src.channel import get_channel
+
+# /proc/[pid]/io 中的计数器，顺序即脚本输出的列顺序
+IO_FIELDS = ("rchar", "wchar", "syscr", "syscw", "read_bytes", "write_bytes", "cancelled_write_bytes")
+# io.stat 中按设备累计的计数器，汇总为整个 cgroup 的值
+CGROUP_FIELDS = ("rbytes", "wbytes", "rios", "wios", "dbytes", "dios")
+# 排行榜名称 -> 排序字段（每秒速率）
+RANKINGS = {
+    "read_bytes": ("read_bytes",),
+    "write_bytes": ("write_bytes",),
+    "syscalls": ("syscr", "syscw"),
+    "cancelled_write_bytes": ("cancelled_write_bytes",),
+}
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# 两次扫描都由 grep 批量读取（无权限读取的进程被跳过，进程列表经 xargs 分批，不受参数长度限制），
+# 单个 awk 进程在目标机上求差值，只输出有 I/O 的进程与 cgroup，网络传输量只与活跃进程数相关；
+# 进程名与所属 cgroup 只对活跃进程读取
+SCAN_SCRIPT = """
+export LC_ALL=C
+cgroups=$(find {cgroup_root} -name io.stat 2>/dev/null)
+scan() {{
+    echo "@T $(cut -d' ' -f1 /proc/uptime) $(ls -f /proc | grep -c '^[0-9][0-9]*$')"
+    ls -f /proc | grep '^[0-9][0-9]*$' | sed 's|^|/proc/|; s|$|/io|' | xargs grep -H '' 2>/dev/null
+    [ -n "$cgroups" ] && echo "$cgroups" | xargs grep -H '' 2>/dev/null
+}}
+{{ scan; sleep {interval}; scan; }} | awk -v fields="{io_fields}" -v cgfields="{cgroup_fields}" '
+$1 == "@T" {{ n++; t[n] = $2; total = $3; next }}
+index($1, "/proc/") == 1 {{
+    split($1, p, "/"); key = substr(p[4], 4); sub(/:$/, "", key)
+    io[n, p[3], key] = $2
+    if (n == 2 && !((p[3]) in pids)) {{ pids[p[3]] = 1; readable++ }}
+    next
+}}
+{{
+    i = index($0, "io.stat:"); if (!i) next
+    path = substr($0, 1, i + 6); paths[path] = 1
+    for (j = 2; j <= NF; j++) {{ split($j, kv, "="); cg[n, path, kv[1]] += kv[2] }}
+}}
+END {{
+    nf = split(fields, f, " "); ncf = split(cgfields, cf, " ")
+    printf "@ELAPSED %s %s %d %d\\n", t[1], t[2], readable, total - readable
+    for (pid in pids) {{
+        line = ""; active = 0
+        for (j = 1; j <= nf; j++) {{
+            d = io[2, pid, f[j]] - io[1, pid, f[j]]; if (d < 0) d = 0; if (d > 0) active = 1
+            line = line " " sprintf("%.0f", d)
+        }}
+        if (active) print "@P " pid line
+    }}
+    for (path in paths) {{
+        line = ""; active = 0
+        for (j = 1; j <= ncf; j++) {{
+            d = cg[2, path, cf[j]] - cg[1, path, cf[j]]; if (d < 0) d = 0; if (d > 0) active = 1
+            line = line " " sprintf("%.0f", d)
+        }}
+        if (active) print "@C" line " " path
+    }}
+}}' | while read -r tag pid rest; do
+    if [ "$tag" = "@P" ]; then
+        comm= cgroup=
+        {{ read -r comm < "/proc/$pid/comm"; }} 2>/dev/null
+        if [ -r "/proc/$pid/cgroup" ]; then
+            while IFS= read -r l; do case "$l" in 0::*) cgroup=${{l#0::}};; esac; done < "/proc/$pid/cgroup"
+        fi
+        echo "@P $pid $rest ${{cgroup:--}} $comm"
+    else
+        echo "$tag $pid $rest"
+    fi
+done
+"""
+
+Record = Dict[str, Any]
+
+
+def _cgroup_name(path: str, root: str = CGROUP_ROOT) -> str:
+    """/sys/fs/cgroup/system.slice/x.service/io.stat -> /system.slice/x.service（混合模式下去掉 unified 前缀）"""
+    name = os.path.dirname(path)[len(root):]
+    if name.startswith("/unified"):
+        name = name[len("/unified"):]
+    return name or "/"
+
+
+def parse_scan(lines: List[str]) -> Tuple[float, int, int, List[Record], List[Record]]:
+    """返回 (间隔秒数, 扫描到的进程数, 无权限读取的进程数, 进程差值, cgroup 差值)"""
+    elapsed, scanned, unreadable = 0.0, 0, 0
+    processes: List[Record] = []
+    cgroups: List[Record] = []
+    for line in lines:
+        if line.startswith("@ELAPSED "):
+            parts = line.split()
+            elapsed = float(parts[2]) - float(parts[1])
+            scanned, unreadable = int(parts[3]), int(parts[4])
+        elif line.startswith("@P "):
+            parts = line.split(" ", 10)
+            if len(parts) < 10:
+                continue
+            record = dict(zip(IO_FIELDS, (int(value) for value in parts[2:9])))
+            record.update(pid=int(parts[1]), cgroup=None if parts[9] == "-" else parts[9],
+                          command=parts[10] if len(parts) > 10 else "")
+            processes.append(record)
+        elif line.startswith("@C "):
+            parts = line.split(" ", 7)
+            if len(parts) == 8:
+                record = dict(zip(CGROUP_FIELDS, (int(value) for value in parts[1:7])))
+                record["cgroup"] = _cgroup_name(parts[7])
+                cgroups.append(record)
+    return elapsed, scanned, unreadable, processes, cgroups
+
+
+def _read_process(pid: str) -> Optional[Tuple[int, ...]]:
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            values = dict(line.split(": ", 1) for line in f.read().splitlines())
+        return tuple(int(values.get(name, 0)) for name in IO_FIELDS)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_cgroup(path: str) -> Tuple[int, ...]:
+    totals = dict.fromkeys(CGROUP_FIELDS, 0)
+    try:
+        with open(path) as f:
+            for line in f:
+                for pair in line.split()[1:]:
+                    key, _, value = pair.partition("=")
+                    if key in totals and value.isdigit():
+                        totals[key] += int(value)
+    except OSError:
+        pass
+    return tuple(totals.values())
+
+
+def _local_snapshot(cgroup_files: List[str]) -> Tuple[float, Dict[str, Tuple[int, ...]], int,
+                                                        Dict[str, Tuple[int, ...]]]:
+    processes = {}
+    unreadable = 0
+    for pid in os.listdir("/proc"):
+        if pid.isdigit():
+            values = _read_process(pid)
+            if values is None:
+                unreadable += 1
+            else:
+                processes[pid] = values
+    return time.monotonic(), processes, unreadable, {path: _read_cgroup(path) for path in cgroup_files}
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def scan_local(interval: float) -> List[str]:
+    """本地执行与 SCAN_SCRIPT 相同的两次扫描，输出同样格式的行"""
+    cgroup_files = [os.path.join(root, "io.stat") for root, _, files in os.walk(CGROUP_ROOT) if "io.stat" in files]
+    first_time, first, _, first_cgroups = _local_snapshot(cgroup_files)
+    time.sleep(interval)
+    second_time, second, unreadable, second_cgroups = _local_snapshot(cgroup_files)
+    lines = [f"@ELAPSED {first_time} {second_time} {len(second)} {unreadable}"]
+    zero = (0,) * len(IO_FIELDS)
+    for pid, values in second.items():
+        deltas = [max(b - a, 0) for a, b in zip(first.get(pid, zero), values)]
+        if not any(deltas):
+            continue
+        cgroup = next((line[3:] for line in _read_text(f"/proc/{pid}/cgroup").splitlines()
+                       if line.startswith("0::")), "") or "-"
+        comm = _read_text(f"/proc/{pid}/comm").strip()
+        lines.append(f"@P {pid} {' '.join(map(str, deltas))} {cgroup} {comm}")
+    for path in cgroup_files:
+        deltas = [max(b - a, 0) for a, b in zip(first_cgroups[path], second_cgroups[path])]
+        if any(deltas):
+            lines.append(f"@C {' '.join(map(str, deltas))} {path}")
+    return lines
+
+
+def _rates(record: Record, fields: Tuple[str, ...], elapsed: float) -> Record:
+    rates = {f"{name}/s": round(record[name] / elapsed, 1) for name in fields}
+    return dict({key: value for key, value in record.items() if key not in fields}, **rates)
+
+
+def collect_process_io(host_config: Optional[RemoteConfigModel], interval: float, top_n: int,
+                       is_zh: bool) -> Dict[str, Any]:
+    """
+    每个排行榜用 heapq.nlargest 从活跃进程中选出 top_n；
+    在两次扫描之间退出的进程无法统计，新启动的进程按从 0 开始计算
+    """
+    if host_config is None:
+        lines = scan_local(interval)
+    else:
+        script = SCAN_SCRIPT.format(interval=interval, cgroup_root=CGROUP_ROOT, io_fields=" ".join(IO_FIELDS),
+                                    cgroup_fields=" ".join(CGROUP_FIELDS))
+        lines = get_channel(host_config, is_zh).run(script, timeout=interval + 120)
+    elapsed, scanned, unreadable, processes, cgroups = parse_scan(lines)
+    if elapsed <= 0:
+        raise RuntimeError("未能读取 /proc/[pid]/io 采样数据" if is_zh else "Failed to sample /proc/[pid]/io")
+
+    top: Dict[str, List[Record]] = {}
+    for ranking, fields in RANKINGS.items():
+        picked = heapq.nlargest(top_n, (p for p in processes if any(p[name] for name in fields)),
+                                key=lambda p: sum(p[name] for name in fields))
+        top[ranking] = [_rates(p, IO_FIELDS, elapsed) for p in picked]
+    cgroups = heapq.nlargest(top_n, cgroups, key=lambda c: c["rbytes"] + c["wbytes"])
+    return {
+        "interval": round(elapsed, 3),
+        "processes_scanned": scanned,
+        "processes_unreadable": unreadable,
+        "processes_active": len(processes),
+        "top": top,
+        "cgroups": [_rates(c, CGROUP_FIELDS, elapsed) for c in cgroups],
+    }
@@ -1,296 +1,217 @@
 from typing import Union, List, Dict
 import platform
 import os
-import paramiko
 import yaml
 import datetime
-import subprocess
 from typing import Any, Dict
 import psutil
 import socket
-import re
 from datetime import datetime
 from mcp.server import FastMCP
 import telnetlib
 from config.public.base_config_loader import LanguageEnum
 from config.private.disk_manager.config_loader import DiskManagerConfig
+from servers.disk_manager.src.base import find_remote_host
+from servers.disk_manager.src.diskbench import build_params, run_disk_bench
+from servers.disk_manager.src.diskstats import collect_diskstats
+from servers.disk_manager.src.procio import collect_process_io
 mcp = FastMCP("Remote info MCP Server", host="0.0.0.0", port=DiskManagerConfig().get_config().private_config.port)
 
 
 @mcp.tool(
     name="get_disk_status_tool"
-    if DiskManagerConfig().get_config().public_config.language == LanguageEnum.EN
+    if DiskManagerConfig().get_config().public_config.language == LanguageEnum.ZH
     else "get_disk_status_tool",
     description='''
-    使用iostat命令获取磁盘使用情况
+    直接读取 /proc/diskstats（不可读时读取 /sys/block/*/stat）采样块设备 I/O，覆盖磁盘、分区、device-mapper 与 md 设备；
+    远程主机复用同一个常驻SSH通道，不依赖 iostat
     输入值如下:
         - host: 远程主机名或IP地址, 不传表示获取本机磁盘使用情况
-        - time_gap: 采样间隔, 默认为0.1秒
-        - count: 采样次数, 默认为1次
-    输出值如下:
-        - device: 设备名
-        - tps: 每秒传输次数
-        - kB_read/s: 每秒读取的千字节数
-        - kB_wrtn/s: 每秒写入的千字节数
-        - KB_dscd/s: 每秒丢弃的千字节数
-        - kB_read: 读取的千字节总数
-        - kB_wrtn: 写入的千字节总数
-        - KB_dscd: 丢弃的千字节总数
-    ''' if DiskManagerConfig().get_config().public_config.language == LanguageEnum.EN
+        - time_gap: 采样间隔（秒），支持小数，范围 0.1~60，默认为1秒
+        - count: 采样次数，范围 1~3600，默认为1次
+        - devices: 只返回指定设备，可选，如 ["sda", "dm-0"]，也可使用 device-mapper 名称；不传时返回所有有过I/O的设备
+    输出值为字典:
+        - samples: 采样点数
+        - interval: 采样间隔
+        - timestamps: 每个采样点的时间（精确到毫秒）
+        - series: 每个设备的逐点指标 [{device, type, dm_name, columns: {指标: [取值...]}}]，
+          type 为 disk、partition、dm 或 md，dm_name 仅 device-mapper 设备有
+        - summary: 每个设备在整个采样窗口内的指标，字段如下:
+            - r/s、w/s、d/s: 每秒完成的读、写、discard 请求数
+            - iops: 每秒完成的请求总数
+            - rkB/s、wkB/s、dkB/s: 每秒读、写、discard 的千字节数
+            - rrqm/s、wrqm/s: 每秒合并的读、写请求数
+            - r_await、w_await、d_await: 读、写、discard 请求的平均耗时（毫秒，含排队时间）
+            - rareq-sz、wareq-sz: 读、写请求的平均大小（千字节）
+            - aqu-sz: 平均队列深度
+            - %util: 设备繁忙时间占比
+            - in_flight: 采样结束时正在处理的请求数
+    ''' if DiskManagerConfig().get_config().public_config.language == LanguageEnum.ZH
     else '''
-    Use the iostat command to get disk usage
+    Sample block device I/O by reading /proc/diskstats directly (or /sys/block/*/stat when it is unreadable),
+    covering disks, partitions, device-mapper and md devices; remote hosts reuse one long-lived SSH channel and
+    iostat is not required
     Input values are as follows:
         - host: Remote hostname or IP address, not passed to get local disk usage
-        - time_gap: Sampling interval, default is 0.1 seconds
-        - count: Number of samples, default is 1 time
-    Output values are as follows:
-        - device: Device name
-        - tps: Transfers per second
-        - kB_read/s: Kilobytes read per second
-        - kB_wrtn/s: Kilobytes written per second
-        - KB_dscd/s: Kilobytes discarded per second
-        - kB_read: Total kilobytes read
-        - kB_wrtn: Total kilobytes written
-        - KB_dscd: Total kilobytes discarded
+        - time_gap: Sampling interval in seconds, fractions allowed, 0.1 to 60, default is 1 second
+        - count: Number of samples, 1 to 3600, default is 1 time
+        - devices: Only return these devices, optional, e.g. ["sda", "dm-0"], device-mapper names are accepted;
+          all devices that have done I/O are returned if not passed
+    Output value is a dictionary:
+        - samples: Number of samples
+        - interval: Sampling interval
+        - timestamps: Time of each sample (millisecond precision)
+        - series: Per-sample metrics of each device [{device, type, dm_name, columns: {metric: [values...]}}],
+          type is disk, partition, dm or md, dm_name only exists for device-mapper devices
+        - summary: Metrics of each device over the whole sampling window:
+            - r/s, w/s, d/s: Read, write and discard requests completed per second
+            - iops: Total requests completed per second
+            - rkB/s, wkB/s, dkB/s: Kilobytes read, written and discarded per second
+            - rrqm/s, wrqm/s: Read and write requests merged per second
+            - r_await, w_await, d_await: Average time of read, write and discard requests (ms, including queueing)
+            - rareq-sz, wareq-sz: Average size of read and write requests (kB)
+            - aqu-sz: Average queue depth
+            - %util: Percentage of time the device was busy
+            - in_flight: Requests in flight at the end of sampling
     ''',
 
 )
-async def get_disk_status(host: Union[str, None] = None,
-                          time_gap: int = 1,
-                          count: int = 1) -> List[Dict[str, Any]]:
-    """使用iostat命令获取磁盘使用情况"""
-    if time_gap <= 0 or count <= 0:
-        raise ValueError("time_gap和count必须为正数")
-    if host is None:
-        # 获取本机磁盘使用情况
-        try:
-            result = subprocess.run(['iostat', '-d', str(time_gap), str(count)],
-                                    capture_output=True, text=True, check=True)
-            output = result.stdout
-            lines = output.strip().split('\n')
-            disk_info_dict = {}
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 8:
-                    try:
-                        disk_info = {
-                            'device': parts[0],
-                            'tps': float(parts[1]),
-                            'kB_read/s': float(parts[2]),
-                            'kB_wrtn/s': float(parts[3]),
-                            'KB_dscd/s': float(parts[4]),
-                            'kB_read': int(parts[5]),
-                            'kB_wrtn': int(parts[6]),
-                            'KB_dscd': int(parts[7])
-                        }
-                        if parts[0] not in disk_info_dict:
-                            disk_info_dict[parts[0]] = []
-                        disk_info_dict[parts[0]].append(disk_info)
-                    except ValueError:
-                        continue
-            # 计算平均值
-            disk_info = []
-            for device, infos in disk_info_dict.items():
-                avg_info = {
-                    'device': device,
-                    'tps': sum(info['tps'] for info in infos) / len(infos),
-                    'kB_read/s': sum(info['kB_read/s'] for info in infos) / len(infos),
-                    'kB_wrtn/s': sum(info['kB_wrtn/s'] for info in infos) / len(infos),
-                    'KB_dscd/s': sum(info['KB_dscd/s'] for info in infos) / len(infos),
-                    'kB_read': sum(info['kB_read'] for info in infos),
-                    'kB_wrtn': sum(info['kB_wrtn'] for info in infos),
-                    'KB_dscd': sum(info['KB_dscd'] for info in infos)
-                }
-                disk_info.append(avg_info)
-            return disk_info
-        except Exception as e:
-            return [{"error": str(e)}]
-    else:
-        # 获取远程主机磁盘使用情况
-        try:
-            for host_config in DiskManagerConfig().get_config().public_config.remote_hosts:
-                if host == host_config.name or host == host_config.host:
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(
-                        hostname=host_config.host,
-                        port=host_config.port,
-                        username=host_config.username,
-                        password=host_config.password
-                    )
-                    stdin, stdout, stderr = ssh.exec_command('iostat -d {} {}'.format(time_gap, count))
-                    output = stdout.read().decode()
-                    error = stderr.read().decode()
-                    if error:
-                        raise ValueError(f"远程命令执行错误: {error}")
-                    lines = output.strip().split('\n')
-                    disk_info_dict = {}
-                    for line in lines:
-                        parts = line.split()
-                        if len(parts) >= 8:
-                            try:
-                                disk_info = {
-                                    'device': parts[0],
-                                    'tps': float(parts[1]),
-                                    'kB_read/s': float(parts[2]),
-                                    'kB_wrtn/s': float(parts[3]),
-                                    'KB_dscd/s': float(parts[4]),
-                                    'kB_read': int(parts[5]),
-                                    'kB_wrtn': int(parts[6]),
-                                    'KB_dscd': int(parts[7])
-                                }
-                                if parts[0] not in disk_info_dict:
-                                    disk_info_dict[parts[0]] = []
-                                disk_info_dict[parts[0]].append(disk_info)
-                            except ValueError:
-                                continue
-                    # 计算平均值
-                    disk_info = []
-                    for device, infos in disk_info_dict.items():
-                        avg_info = {
-                            'device': device,
-                            'tps': sum(info['tps'] for info in infos) / len(infos),
-                            'kB_read/s': sum(info['kB_read/s'] for info in infos) / len(infos),
-                            'kB_wrtn/s': sum(info['kB_wrtn/s'] for info in infos) / len(infos),
-                            'KB_dscd/s': sum(info['KB_dscd/s'] for info in infos) / len(infos),
-                            'kB_read': sum(info['kB_read'] for info in infos),
-                            'kB_wrtn': sum(info['kB_wrtn'] for info in infos),
-                            'KB_dscd': sum(info['KB_dscd'] for info in infos)
-                        }
-                        disk_info.append(avg_info)
-                    return disk_info
-            if DiskManagerConfig().get_config().public_config.language == LanguageEnum.ZH:
-                raise ValueError(f"未找到远程主机: {host}")
-            else:
-                raise ValueError(f"Remote host not found: {host}")
-        except paramiko.AuthenticationException:
-            raise ValueError("SSH认证失败，请检查用户名和密码")
-        except paramiko.SSHException as e:
-            raise ValueError(f"SSH连接错误: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"获取远程CPU信息失败: {str(e)}")
-        finally:
-            # 确保SSH连接关闭
-            if ssh is not None:
-                try:
-                    ssh.close()
-                except Exception:
-                    pass
+def get_disk_status(host: Union[str, None] = None,
+                    time_gap: float = 1,
+                    count: int = 1,
+                    devices: Union[List[str], None] = None) -> Dict[str, Any]:
+    """读取 /proc/diskstats 采样块设备 I/O"""
+    cfg = DiskManagerConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if not 0.1 <= time_gap <= 60 or not 1 <= count <= 3600:
+        raise ValueError("time_gap 范围为 0.1~60 秒，count 范围为 1~3600" if is_zh
+                         else "time_gap must be 0.1-60 seconds and count 1-3600")
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return collect_diskstats(host_config, time_gap, count, devices, is_zh)
 
 
 @mcp.tool(
     name="disk_io_insight_tool"
-    if DiskManagerConfig().get_config().public_config.language == LanguageEnum.EN
+    if DiskManagerConfig().get_config().public_config.language == LanguageEnum.ZH
     else "disk_io_insight_tool",
     description='''
-    使用iotop命令获取磁盘IO使用情况
+    进程级磁盘I/O归因：两次读取所有进程的 /proc/[pid]/io，计算每个进程的I/O速率并返回排行，
+    同时按 cgroup v2 的 io.stat 汇总；不依赖 iotop，远程主机只需一次流式扫描，在目标机上求差值
     输入值如下:
         - host: 远程主机名或IP地址, 不传表示获取本机磁盘IO使用情况
-        - time_gap: 采样间隔, 默认为1秒
-        - count: 采样次数, 默认为1次
-    输出值如下:
-        - pid: 进程ID
-        - user: 进程所属用户
-        - disk_read: 磁盘读取速率
-        - disk_write: 磁盘写入速率
-        - swapin: 交换区使用率
-        - io: IO使用率
-        - command: 进程命令
-    ''' if DiskManagerConfig().get_config().public_config.language == LanguageEnum.EN
+        - time_gap: 两次扫描的间隔（秒），支持小数，范围 0.1~60，默认为1秒
+        - top_n: 每个排行返回的进程或 cgroup 数量，范围 1~1000，默认为10
+    输出值为字典:
+        - interval: 两次扫描的实际间隔（秒）
+        - processes_scanned: 可读取 I/O 统计的进程数
+        - processes_unreadable: 无权限读取的进程数（非root用户只能读取自己的进程）
+        - processes_active: 间隔内有I/O的进程数
+        - top: 四个排行 read_bytes、write_bytes、syscalls（读写系统调用次数）、cancelled_write_bytes，
+          每项包含 pid、command（进程名）、cgroup（所属 cgroup v2 路径）及以下每秒速率:
+            - read_bytes/s、write_bytes/s: 实际读取、写入存储层的字节数
+            - rchar/s、wchar/s: read/write 类系统调用的字节数（含页缓存命中）
+            - syscr/s、syscw/s: 读、写系统调用次数
+            - cancelled_write_bytes/s: 写入页缓存后被截断等原因取消的字节数
+        - cgroups: 按读写字节数排序的 cgroup（io.stat 包含子 cgroup），每项包含 cgroup 路径及
+          rbytes/s、wbytes/s、rios/s、wios/s、dbytes/s、dios/s；cgroup v1 的主机为空
+    ''' if DiskManagerConfig().get_config().public_config.language == LanguageEnum.ZH
     else '''
-    Use the iotop command to get disk IO usage
+    Per-process disk I/O attribution: read /proc/[pid]/io of all processes twice, compute per-process I/O
+    rates and return rankings, rolled up by cgroup v2 io.stat as well; iotop is not required and remote hosts
+    need a single streamed scan with the difference computed on the target
     Input values are as follows:
         - host: Remote hostname or IP address, not passed to get local disk IO usage
-        - time_gap: Sampling interval, default is 1 second
-        - count: Number of samples, default is 1 time
-    Output values are as follows:
-        - pid: Process ID
-        - user: Process owner
-        - disk_read: Disk read rate
-        - disk_write: Disk write rate
-        - swapin: Swap usage
-        - io: IO usage
-        - command: Process command
+        - time_gap: Seconds between the two scans, fractions allowed, 0.1 to 60, default is 1 second
+        - top_n: Number of processes or cgroups in each ranking, 1 to 1000, default is 10
+    Output value is a dictionary:
+        - interval: Actual seconds between the two scans
+        - processes_scanned: Processes whose I/O statistics could be read
+        - processes_unreadable: Processes that could not be read (non-root users can only read their own)
+        - processes_active: Processes that did I/O during the interval
+        - top: Four rankings read_bytes, write_bytes, syscalls (read and write system calls) and
+          cancelled_write_bytes, each entry has pid, command, cgroup (cgroup v2 path) and per-second rates:
+            - read_bytes/s, write_bytes/s: Bytes actually read from or written to the storage layer
+            - rchar/s, wchar/s: Bytes passed to read/write system calls (including page cache hits)
+            - syscr/s, syscw/s: Read and write system calls
+            - cancelled_write_bytes/s: Bytes written to the page cache and then cancelled, e.g. by truncation
+        - cgroups: cgroups sorted by bytes read and written (io.stat includes child cgroups), each with the cgroup
+          path and rbytes/s, wbytes/s, rios/s, wios/s, dbytes/s, dios/s; empty on cgroup v1 hosts
     '''
 )
 def disk_io_insight(host: Union[str, None] = None,
-                    time_gap: int = 1,
-                    count: int = 1) -> List[Dict[str, Any]]:
-    """使用iotop命令获取磁盘IO使用情况"""
-    if time_gap <= 0 or count <= 0:
-        raise ValueError("time_gap和count必须为正数")
-    if host is None:
-        # 获取本机磁盘IO使用情况
-        try:
-            result = subprocess.run(
-                ['iotop', '-b', '-n', str(count), '-d', str(time_gap)],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            output = result.stdout
-            lines = output.strip().split('\n')
-        except Exception as e:
-            return [{"error": str(e)}]
-    else:
-        # 获取远程主机磁盘IO使用情况
-        try:
-            lines = None
-            for host_config in DiskManagerConfig().get_config().public_config.remote_hosts:
-                if host == host_config.name or host == host_config.host:
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(
-                        hostname=host_config.host,
-                        port=host_config.port,
-                        username=host_config.username,
-                        password=host_config.password
-                    )
-                    stdin, stdout, stderr = ssh.exec_command('iotop -b -n {} -d {}'.format(count, time_gap))
-                    output = stdout.read().decode()
-                    error = stderr.read().decode()
-                    if error:
-                        raise ValueError(f"远程命令执行错误: {error}")
-                    lines = output.strip().split('\n')
-            if lines is None:
-                if DiskManagerConfig().get_config().public_config.language == LanguageEnum.ZH:
-                    raise ValueError(f"未找到远程主机: {host}")
-                else:
-                    raise ValueError(f"Remote host not found: {host}")
-        except paramiko.AuthenticationException:
-            raise ValueError("SSH认证失败，请检查用户名和密码")
-        except paramiko.SSHException as e:
-            raise ValueError(f"SSH连接错误: {str(e)}")
-    try:
-        io_info = []
-        # 处理PID、优先级、用户、磁盘读写速率（含单位）、swapin、IO、命令
-        pattern = r'^\s*(\d+)\s+(\S+)\s+(\S+)\s+(\d+\.\d+)\s+(\S+)\s+(\d+\.\d+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(.*?)\s*$'
+                    time_gap: float = 1,
+                    top_n: int = 10) -> Dict[str, Any]:
+    """读取 /proc/[pid]/io 获取进程级磁盘IO使用情况"""
+    cfg = DiskManagerConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if not 0.1 <= time_gap <= 60 or not 1 <= top_n <= 1000:
+        raise ValueError("time_gap 范围为 0.1~60 秒，top_n 范围为 1~1000" if is_zh
+                         else "time_gap must be 0.1-60 seconds and top_n 1-1000")
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return collect_process_io(host_config, time_gap, top_n, is_zh)
 
-        # 跳过标题行（通常是前3行）
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
 
-            match = re.match(pattern, line)
-            if match:
-                try:
-                    io_data = {
-                        'pid': int(match.group(1)),
-                        'priority': match.group(2),  # 如be/4
-                        'user': match.group(3),
-                        'disk_read': f"{match.group(4)} {match.group(5)}",  # 组合数值和单位
-                        'disk_write': f"{match.group(6)} {match.group(7)}",  # 组合数值和单位
-                        'swapin': match.group(8),
-                        'io': match.group(9),
-                        'command': match.group(10)
-                    }
-                    io_info.append(io_data)
-                except ValueError:
-                    continue
-        return io_info
-    except Exception as e:
-        return [{"error": str(e)}]
+@mcp.tool(
+    name="disk_bench_tool"
+    if DiskManagerConfig().get_config().public_config.language == LanguageEnum.ZH
+    else "disk_bench_tool",
+    description='''
+    文件I/O微基准测试，用于磁盘验收与慢盘排查：在指定目录下创建临时文件并写入随机数据，依次执行顺序/随机读写测试，
+    结束后删除临时文件；远程主机通过SSH把测试程序交给目标机的 python3 执行（需要目标机安装 python3）
+    输入值如下:
+        - host: 远程主机名或IP地址, 不传表示测试本机
+        - path: 临时文件所在的目录，必须已存在，测试的是该目录所在的文件系统与磁盘
+        - tests: 测试项列表，可选 seq_read、seq_write、rand_read、rand_write，默认全部
+        - block_size: 每次读写的大小，4k 的整数倍，如 4k、128k、1m，默认4k
+        - file_size: 临时文件大小，如 256m、1g，默认256m；应明显大于内存才能避免缓存影响（或使用 direct）
+        - queue_depth: 并发读写的线程数，范围 1~64，默认1
+        - direct: 是否使用 O_DIRECT 绕过页缓存，默认 true；文件系统不支持时（如 tmpfs）自动退回缓冲读写
+        - runtime: 每个测试项的最长运行时间（秒），范围 0~300，默认10
+    输出值为字典:
+        - path、file_size: 测试目录与临时文件大小
+        - direct_requested、direct: 是否请求 O_DIRECT、实际是否使用
+        - prefill_seconds: 写入临时文件的耗时
+        - results: 每个测试项的结果，包含 test、block_size、queue_depth、ops（完成的读写次数）、bytes、seconds、
+          iops、throughput_mib_s（MiB/s）、latency_us（单次读写时延，微秒：min、mean、p50、p90、p99、p99.9、max）
+    ''' if DiskManagerConfig().get_config().public_config.language == LanguageEnum.ZH
+    else '''
+    File I/O micro-benchmark for disk qualification and slow-volume checks: create a scratch file filled with random
+    data in the given directory, run sequential/random read/write tests and delete the file afterwards; remote hosts
+    run the benchmark by handing it to python3 on the target over SSH (python3 is required on the target)
+    Input values are as follows:
+        - host: Remote hostname or IP address, not passed to test the local machine
+        - path: Existing directory for the scratch file; the filesystem and disk behind it are tested
+        - tests: Tests to run, any of seq_read, seq_write, rand_read, rand_write, default all
+        - block_size: Size of each read/write, a multiple of 4k, e.g. 4k, 128k, 1m, default 4k
+        - file_size: Scratch file size, e.g. 256m, 1g, default 256m; should be well above RAM to avoid caching
+          (or use direct)
+        - queue_depth: Number of threads issuing I/O concurrently, 1 to 64, default 1
+        - direct: Use O_DIRECT to bypass the page cache, default true; falls back to buffered I/O on filesystems
+          without support (e.g. tmpfs)
+        - runtime: Maximum seconds per test, 0 to 300, default 10
+    Output value is a dictionary:
+        - path, file_size: Test directory and scratch file size
+        - direct_requested, direct: Whether O_DIRECT was requested and actually used
+        - prefill_seconds: Time spent writing the scratch file
+        - results: One entry per test with test, block_size, queue_depth, ops (completed I/Os), bytes, seconds,
+          iops, throughput_mib_s (MiB/s) and latency_us (per-I/O latency in microseconds: min, mean, p50, p90,
+          p99, p99.9, max)
+    '''
+)
+def disk_bench_tool(path: str,
+                    host: Union[str, None] = None,
+                    tests: Union[List[str], None] = None,
+                    block_size: Union[str, int] = "4k",
+                    file_size: Union[str, int] = "256m",
+                    queue_depth: int = 1,
+                    direct: bool = True,
+                    runtime: float = 10) -> Dict[str, Any]:
+    """在指定目录下执行文件I/O微基准测试"""
+    cfg = DiskManagerConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    params = build_params(path, tests, block_size, file_size, queue_depth, direct, runtime, is_zh)
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_disk_bench(host_config, params, is_zh)
 
 
 if __name__ == "__main__":
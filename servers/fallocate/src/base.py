@@ -0,0 +1,63 @@
+"""公共基础层：远程主机查找、SSH连接与远程 python3 执行"""
+import json
+from typing import Any, Dict, List
+
+import paramiko
+
+from config.public.base_config_loader import RemoteConfigModel
+
+
+def find_remote_host(host_name: str, remote_hosts: List[RemoteConfigModel], is_zh: bool) -> RemoteConfigModel:
+    """查找远程主机配置"""
+    for host in remote_hosts:
+        if host.name == host_name or host.host == host_name:
+            return host
+    raise ValueError(f"未找到远程主机: {host_name}" if is_zh else f"Remote host not found: {host_name}")
+
+
+def open_ssh_client(host_config: RemoteConfigModel, is_zh: bool) -> paramiko.SSHClient:
+    """建立到远程主机的SSH连接"""
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            hostname=host_config.host,
+            port=host_config.port,
+            username=host_config.username,
+            password=host_config.password,
+            timeout=10,
+            banner_timeout=10
+        )
+    except paramiko.AuthenticationException as e:
+        client.close()
+        raise ValueError("SSH认证失败，请检查用户名和密码" if is_zh
+                         else "SSH authentication failed, check username and password") from e
+    except Exception as e:
+        client.close()
+        raise ValueError(f"SSH连接错误: {str(e)}" if is_zh else f"SSH connection error: {str(e)}") from e
+    return client
+
+
+def run_python(host_config: RemoteConfigModel, module_file: str, args: Dict[str, Any], is_zh: bool,
+               timeout: float) -> Dict[str, Any]:
+    """
+    把只依赖标准库的模块源码通过标准输入交给远程主机的 python3 执行，返回最后一行 @RESULT 的 JSON；
+    批量操作列表可能超过单个命令行参数的长度上限，因此参数写在源码开头，而不是放在命令行中
+    """
+    with open(module_file, encoding="utf-8") as f:
+        source = f.read()
+    source = f"import sys\nsys.argv[1:] = [{json.dumps(args)!r}]\n" + source
+    client = open_ssh_client(host_config, is_zh)
+    try:
+        stdin, stdout, stderr = client.exec_command("python3 -", timeout=timeout)
+        stdin.write(source)
+        stdin.channel.shutdown_write()
+        output = stdout.read().decode("utf-8", errors="replace")
+        error = stderr.read().decode("utf-8", errors="replace").strip()
+    finally:
+        client.close()
+    for line in output.splitlines():
+        if line.startswith("@RESULT "):
+            return json.loads(line[len("@RESULT "):])
+    raise RuntimeError(f"远程主机 {host_config.name} 执行失败（需要 python3）: {error}" if is_zh
+                       else f"Execution on {host_config.name} failed (python3 is required): {error}")
@@ -0,0 +1,56 @@
+"""
+批量预分配文件：每项为 {path, size, mode}，与 fallocate -l 相同按指定字节数为文件分配磁盘空间，
+文件不存在时创建；mode 为空时使用默认权限（受 umask 影响）。
+各项在有界线程池中并发分配；posix_fallocate 只会扩展不会截断，同一路径出现多次时以最大的 size 为准。
+只依赖标准库，远程执行时整个文件通过 SSH 标准输入交给目标机的 python3 运行，结果为最后一行 @RESULT JSON
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 32
+MAX_ITEMS = 10000
+
+
+def allocate(item: Dict[str, Any]) -> None:
+    fd = os.open(item["path"], os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if item["size"]:
+            # 文件系统不支持时 glibc 会退化为逐块写零，仍能保证空间已分配
+            os.posix_fallocate(fd, 0, item["size"])
+        if item.get("mode") is not None:
+            os.fchmod(fd, item["mode"])
+    finally:
+        os.close(fd)
+
+
+def run_batch(items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """返回 {"results": [...], "succeeded", "failed", "seconds"}，results 与 items 一一对应"""
+    started = time.monotonic()
+
+    def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return dict(item, ok=True, **(allocate(item) or {}))
+        except (OSError, ValueError) as e:
+            detail = e.strerror if isinstance(e, OSError) and e.strerror else str(e)
+            return dict(item, ok=False, error=detail)
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(items)), 1)) as pool:
+        results = list(pool.map(run, items))
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded,
+            "seconds": round(time.monotonic() - started, 3)}
+
+
+def main() -> None:
+    args = json.loads(sys.argv[1])
+    result = run_batch(args["items"], args["workers"])
+    sys.stdout.write("@RESULT " + json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from typing import Union, List, Dict
 import platform
 import os
+import re
 import paramiko
 import yaml
 import datetime
@@ -12,6 +13,8 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.fallocate.config_loader import FallocateConfig
+from servers.fallocate.src import batch
+from servers.fallocate.src.base import find_remote_host, run_python
 mcp = FastMCP("Fallocate MCP Server", host="0.0.0.0", port=FallocateConfig().get_config().private_config.port)
 
 
@@ -194,6 +197,103 @@ def fallocate_create_file_tool(host: Union[str, None] = None, name: str = None,
             raise ValueError(f"Remote host not found: {host}")
 
 
+SIZE_PATTERN = re.compile(r"^(\d+)\s*(?:([KMGTPE])(iB|B)?)?$", re.IGNORECASE)
+
+
+def _parse_length(value: Any, is_zh: bool) -> int:
+    """与 fallocate -l 相同：K、M、G 等（或 KiB、MiB）为 1024 进制，KB、MB 等为 1000 进制"""
+    if isinstance(value, int) and value >= 0:
+        return value
+    match = SIZE_PATTERN.match(str(value).strip())
+    if not match:
+        raise ValueError(f"size 格式错误: {value}，示例: 4096、10M、1GiB、1GB" if is_zh
+                         else f"Invalid size: {value}, e.g. 4096, 10M, 1GiB, 1GB")
+    if not match.group(2):
+        return int(match.group(1))
+    base = 1000 if match.group(3) and match.group(3).upper() == "B" else 1024
+    return int(match.group(1)) * base ** ("KMGTPE".index(match.group(2).upper()) + 1)
+
+
+def _parse_mode(value: Any, is_zh: bool) -> Union[int, None]:
+    if value is None or value == "":
+        return None
+    try:
+        mode = value if isinstance(value, int) else int(str(value), 8)
+    except ValueError:
+        mode = -1
+    if not 0 <= mode <= 0o7777:
+        raise ValueError(f"mode 格式错误: {value}，示例: 644" if is_zh else f"Invalid mode: {value}, e.g. 644")
+    return mode
+
+
+def _check_batch(items: List[Any], workers: int, is_zh: bool) -> None:
+    if not items or len(items) > batch.MAX_ITEMS:
+        raise ValueError(f"操作列表不能为空，且最多 {batch.MAX_ITEMS} 项" if is_zh
+                         else f"The operation list must contain 1-{batch.MAX_ITEMS} items")
+    if not 1 <= workers <= batch.MAX_WORKERS:
+        raise ValueError(f"workers 范围为 1~{batch.MAX_WORKERS}" if is_zh else f"workers must be 1-{batch.MAX_WORKERS}")
+
+
+def _execute(host: Union[str, None], items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """本地直接执行；远程把整批操作交给目标机的 python3，只建立一次SSH连接"""
+    cfg = FallocateConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if host is None:
+        return batch.run_batch(items, workers)
+    host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_python(host_config, batch.__file__, {"items": items, "workers": workers}, is_zh, timeout=600)
+
+
+@mcp.tool(
+    name="fallocate_batch_tool"
+    if FallocateConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "fallocate_batch_tool",
+    description='''
+    批量预分配文件，用于快速准备测试文件：与 fallocate -l 相同为每个文件分配指定大小的磁盘空间，文件不存在时创建；
+    整批操作在本机一次完成，或在远程主机上通过一个SSH连接交给目标机的 python3 执行，各项并发执行并分别返回结果
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则对本机进行操作
+        - files: 操作列表，每项为 {"path": 文件路径, "size": 大小（如 4096、10M、1GiB，KB/MB 为1000进制）,
+          "mode": 可选权限（如 600）}，最多 10000 项
+        - workers: 并发数，范围 1~32，默认8
+    2. 返回值为字典：
+        - results: 与输入顺序一致的结果列表，每项包含输入的字段、ok（是否成功），失败时包含 error
+        - succeeded/failed: 成功与失败的项数
+        - seconds: 执行耗时
+    '''
+    if FallocateConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Preallocate files in bulk to prepare test files quickly: like fallocate -l, disk space of the given size is
+    allocated for each file, creating it when missing; the whole batch runs in one local pass, or on a remote host
+    as one python3 script over a single SSH connection, items run concurrently and each gets its own result
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the operation is performed on the local machine
+        - files: Operations, each {"path": file path, "size": size (e.g. 4096, 10M, 1GiB; KB/MB are powers of 1000),
+          "mode": optional permissions such as 600}, at most 10000 items
+        - workers: Concurrency, 1 to 32, default 8
+    2. The return value is a dictionary:
+        - results: Results in input order, each with the input fields, ok (success), and error on failure
+        - succeeded/failed: Number of items that succeeded and failed
+        - seconds: Elapsed time
+    '''
+
+)
+def fallocate_batch_tool(host: Union[str, None] = None, files: List[Dict[str, Any]] = None, workers: int = 8) -> Dict[str, Any]:
+    """批量预分配文件"""
+    is_zh = FallocateConfig().get_config().public_config.language == LanguageEnum.ZH
+    _check_batch(files, workers, is_zh)
+    items = []
+    for item in files:
+        if (not isinstance(item, dict) or not isinstance(item.get("path"), str) or not item["path"]
+                or item.get("size") is None):
+            raise ValueError("每项须包含 path 与 size" if is_zh else "Each item requires path and size")
+        items.append({"path": item["path"], "size": _parse_length(item["size"], is_zh),
+                      "mode": _parse_mode(item.get("mode"), is_zh)})
+    return _execute(host, items, workers)
+
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='sse')
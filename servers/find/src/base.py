@@ -0,0 +1,76 @@
+"""公共基础层：远程主机查找、SSH连接与远程 python3 执行"""
+import json
+import os
+import shlex
+from typing import Any, Dict, Iterator, List, Sequence
+
+import paramiko
+
+from config.public.base_config_loader import RemoteConfigModel
+
+
+def find_remote_host(host_name: str, remote_hosts: List[RemoteConfigModel], is_zh: bool) -> RemoteConfigModel:
+    """查找远程主机配置"""
+    for host in remote_hosts:
+        if host.name == host_name or host.host == host_name:
+            return host
+    raise ValueError(f"未找到远程主机: {host_name}" if is_zh else f"Remote host not found: {host_name}")
+
+
+def open_ssh_client(host_config: RemoteConfigModel, is_zh: bool) -> paramiko.SSHClient:
+    """建立到远程主机的SSH连接"""
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            hostname=host_config.host,
+            port=host_config.port,
+            username=host_config.username,
+            password=host_config.password,
+            timeout=10,
+            banner_timeout=10
+        )
+    except paramiko.AuthenticationException as e:
+        client.close()
+        raise ValueError("SSH认证失败，请检查用户名和密码" if is_zh
+                         else "SSH authentication failed, check username and password") from e
+    except Exception as e:
+        client.close()
+        raise ValueError(f"SSH连接错误: {str(e)}" if is_zh else f"SSH connection error: {str(e)}") from e
+    return client
+
+
+
+def stream_python(host_config: RemoteConfigModel, module_file: str, args: Dict[str, Any], is_zh: bool,
+                  timeout: float, dependencies: Sequence[str] = ()) -> Iterator[str]:
+    """
+    把只依赖标准库的模块源码通过标准输入交给远程主机的 python3 执行，参数为 JSON，逐行产出输出；
+    dependencies 中的模块先以文件名为模块名载入（如 walker），供主模块 import；
+    调用方提前结束迭代时关闭连接，远程进程随之退出
+    """
+    prelude = []
+    for dependency in dependencies:
+        with open(dependency, encoding="utf-8") as f:
+            name = os.path.splitext(os.path.basename(dependency))[0]
+            prelude.append(f"_module = types.ModuleType({name!r})\n"
+                           f"sys.modules[{name!r}] = _module\n"
+                           f"exec(compile({f.read()!r}, {name + '.py'!r}, 'exec'), _module.__dict__)\n")
+    with open(module_file, encoding="utf-8") as f:
+        source = f.read()
+    if prelude:
+        source = "import sys\nimport types\n" + "".join(prelude) + source
+    client = open_ssh_client(host_config, is_zh)
+    try:
+        stdin, stdout, stderr = client.exec_command(f"python3 - {shlex.quote(json.dumps(args))}", timeout=timeout)
+        stdin.write(source)
+        stdin.channel.shutdown_write()
+        produced = False
+        for line in stdout:
+            produced = True
+            yield line.rstrip("\n")
+        if not produced:
+            error = stderr.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"远程主机 {host_config.name} 执行失败（需要 python3）: {error}" if is_zh
+                               else f"Execution on {host_config.name} failed (python3 is required): {error}")
+    finally:
+        client.close()
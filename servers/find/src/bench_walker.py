@@ -0,0 +1,97 @@
+"""
+并行遍历与 GNU find 的对比基准测试
+用法：
+    python -m servers.find.src.bench_walker                  # 在临时目录生成 100 万个文件的目录树
+    python -m servers.find.src.bench_walker /data 0           # 使用已有目录，不生成文件
+    python -m servers.find.src.bench_walker /tmp/tree 200000  # 在指定目录生成指定数量的文件
+每个场景先预热一次（目录元数据进入缓存），再分别计时 GNU find 与不同线程数的 walker，结果数量不一致时报错退出；
+带 limit 的场景与 find ... | head -n N 比较
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from servers.find.src.walker import Walker
+
+FILES_PER_DIR = 100
+DIRS_PER_DIR = 10
+
+# (名称, GNU find 参数, walker 条件)
+SCENARIOS = [
+    ("name", ["-name", "*7.log"], {"name": "*7.log"}),
+    ("size+type", ["-type", "f", "-size", "+1k"], {"type": ["f"], "size": "+1k"}),
+    ("name+mtime", ["-name", "*.log", "-mtime", "-1"], {"name": "*.log", "mtime": "-1"}),
+    ("limit 100", ["-name", "*.log"], {"name": "*.log", "limit": 100}),
+]
+
+
+def build_tree(root: str, count: int) -> None:
+    """每个目录 100 个文件、10 个子目录，广度优先生成；每 50 个文件有一个 2KiB 的文件"""
+    payload = b"x" * 2048
+    created = 0
+    pending = [root]
+    while created < count:
+        directory = pending.pop(0)
+        os.makedirs(directory, exist_ok=True)
+        for i in range(min(FILES_PER_DIR, count - created)):
+            with open(os.path.join(directory, f"file{created}.{'log' if i % 2 else 'dat'}"), "wb") as f:
+                if created % 50 == 0:
+                    f.write(payload)
+            created += 1
+        pending += [os.path.join(directory, f"d{i}") for i in range(DIRS_PER_DIR)]
+
+
+def run_find(root: str, args: List[str], limit: Optional[int] = None) -> Tuple[int, float]:
+    """limit 与 head -n 相同：读到第 limit 行即结束 find"""
+    start = time.perf_counter()
+    count = 0
+    with subprocess.Popen(["find", root] + args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        for _ in proc.stdout:
+            count += 1
+            if limit and count >= limit:
+                proc.kill()
+                break
+    return count, time.perf_counter() - start
+
+
+def run_walker(root: str, conditions: dict, workers: int) -> Tuple[int, float]:
+    start = time.perf_counter()
+    count = sum(1 for _ in Walker(dict(conditions, roots=[root], workers=workers)).walk())
+    return count, time.perf_counter() - start
+
+
+def main() -> None:
+    root = sys.argv[1] if len(sys.argv) > 1 else None
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+    cleanup = root is None
+    if root is None:
+        root = tempfile.mkdtemp(prefix="bench_walker_")
+    try:
+        if count:
+            start = time.perf_counter()
+            build_tree(root, count)
+            print(f"built {count} files in {time.perf_counter() - start:.1f}s under {root}")
+        run_find(root, [])
+        print(f"cpus={os.cpu_count()}")
+        mismatches = []
+        for name, find_args, conditions in SCENARIOS:
+            found, elapsed = run_find(root, find_args, conditions.get("limit"))
+            print(f"{name:<11} gnu find      matches={found:<8} elapsed={elapsed:.2f}s")
+            for workers in (1, 4, 16):
+                matched, elapsed = run_walker(root, conditions, workers)
+                print(f"{name:<11} walker x{workers:<5} matches={matched:<8} elapsed={elapsed:.2f}s")
+                if matched != found:
+                    mismatches.append(f"{name} x{workers}: walker {matched} != find {found}")
+        if mismatches:
+            sys.exit("match counts differ: " + "; ".join(mismatches))
+    finally:
+        if cleanup:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
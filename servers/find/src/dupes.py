@@ -0,0 +1,168 @@
+"""
+重复文件检测：用 walker 遍历收集文件，先按大小分组，再对同组文件哈希首尾各 PARTIAL_BYTES，
+只有首尾仍相同的文件才读取全文哈希；哈希在线程池中以大块缓冲区读取（hashlib 计算时释放 GIL）；
+同一 inode 的硬链接不算重复。只依赖标准库，远程执行时 walker 由 stream_python 预先载入
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from servers.find.src import walker
+except ImportError:
+    import walker
+
+PARTIAL_BYTES = 4096
+READ_BUFFER = 1 << 20
+DEFAULT_WORKERS = 4
+
+
+class _StatWalker(walker.Walker):
+    """沿用 walker 的遍历与条件，结果直接给出 stat，不再转换成记录"""
+
+    def _emit(self, path: str, kind: str, st: os.stat_result) -> Tuple[str, os.stat_result]:
+        self.stats["matched"] += 1
+        return path, st
+
+
+def _partial_hash(path: str, size: int) -> bytes:
+    """文件不超过两段长度时直接读全文，此时的结果也就是全文哈希"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb", buffering=0) as f:
+        if size <= 2 * PARTIAL_BYTES:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(PARTIAL_BYTES))
+            digest.update(os.pread(f.fileno(), PARTIAL_BYTES, size - PARTIAL_BYTES))
+    return digest.digest()
+
+
+def _full_hash(path: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(READ_BUFFER)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        # 文件会整段顺序读取一次，提示内核加大预读
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.digest()
+
+
+class DuplicateFinder:
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.spec = spec
+        self.min_size = int(spec.get("min_size") or 1)
+        self.top_n = int(spec.get("top_n") or 100)
+        self.budget = float(spec.get("time_budget") or 600)
+        self.workers = max(int(spec.get("hash_workers") or DEFAULT_WORKERS), 1)
+        self.stats: Dict[str, Any] = {"files_scanned": 0, "hardlinks_skipped": 0, "size_candidates": 0,
+                                      "partial_hashed": 0, "full_hashed": 0, "bytes_read": 0, "errors": 0,
+                                      "complete": True}
+        self.error_samples: List[str] = []
+        self.deadline = 0.0
+
+    def _error(self, path: str, error: OSError) -> None:
+        self.stats["errors"] += 1
+        if len(self.error_samples) < 10:
+            self.error_samples.append(f"{path}: {error.strerror or error}")
+
+    def _collect(self) -> Dict[int, List[str]]:
+        """按大小分组；同一 (dev, inode) 只保留第一个路径"""
+        spec = dict(self.spec, type=["f"], size=f"+{self.min_size - 1}c", limit=None)
+        engine = _StatWalker(spec)
+        by_size: Dict[int, List[str]] = {}
+        inodes = set()
+        records = engine.walk()
+        for path, st in records:
+            self.stats["files_scanned"] += 1
+            if st.st_nlink > 1:
+                key = (st.st_dev, st.st_ino)
+                if key in inodes:
+                    self.stats["hardlinks_skipped"] += 1
+                    continue
+                inodes.add(key)
+            by_size.setdefault(st.st_size, []).append(path)
+            if time.monotonic() > self.deadline:
+                self.stats["complete"] = False
+                break
+        # 提前结束时关闭生成器，walker 随即停止排队中的目录任务
+        records.close()
+        self.stats["walk"] = {key: engine.stats[key] for key in ("dirs", "entries", "errors", "seconds")}
+        self.error_samples.extend(engine.error_samples[:max(10 - len(self.error_samples), 0)])
+        return {size: paths for size, paths in by_size.items() if len(paths) > 1}
+
+    def _hash_groups(self, pool: ThreadPoolExecutor, groups: List[Tuple[Any, int, List[str]]],
+                     full: bool) -> List[Tuple[Any, int, List[str]]]:
+        """对每组文件求哈希并按 (原分组键, 哈希) 细分，只保留仍有两个以上文件的分组"""
+        jobs = [(key, size, path) for key, size, paths in groups for path in paths]
+
+        def run(job: Tuple[Any, int, str]) -> Tuple[Any, int, str, Optional[bytes], Optional[OSError]]:
+            key, size, path = job
+            if time.monotonic() > self.deadline:
+                return key, size, path, None, None
+            try:
+                return key, size, path, _full_hash(path) if full else _partial_hash(path, size), None
+            except OSError as e:
+                return key, size, path, None, e
+
+        # 统计只在主线程中累加
+        refined: Dict[Tuple[Any, bytes], Tuple[int, List[str]]] = {}
+        for key, size, path, digest, error in pool.map(run, jobs):
+            if error is not None:
+                self._error(path, error)
+            if digest is None:
+                continue
+            self.stats["full_hashed" if full else "partial_hashed"] += 1
+            self.stats["bytes_read"] += size if full else min(size, 2 * PARTIAL_BYTES)
+            refined.setdefault((key, digest), (size, []))[1].append(path)
+        if time.monotonic() > self.deadline:
+            self.stats["complete"] = False
+        return [((key, digest), size, paths) for (key, digest), (size, paths) in refined.items() if len(paths) > 1]
+
+    def run(self) -> Dict[str, Any]:
+        started = time.monotonic()
+        self.deadline = started + self.budget
+        by_size = self._collect()
+        self.stats["size_candidates"] = sum(len(paths) for paths in by_size.values())
+        groups = [(size, size, paths) for size, paths in by_size.items()]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            groups = self._hash_groups(pool, groups, full=False)
+            # 不超过两段长度的文件首尾哈希已覆盖全文，无需再读
+            small = [group for group in groups if group[1] <= 2 * PARTIAL_BYTES]
+            large = [group for group in groups if group[1] > 2 * PARTIAL_BYTES]
+            # 大文件优先：时间预算用完时，已确认的重复组可回收的空间最多
+            large.sort(key=lambda group: group[1] * (len(group[2]) - 1), reverse=True)
+            groups = small + self._hash_groups(pool, large, full=True)
+        report = [{"size": size, "count": len(paths), "reclaimable_bytes": size * (len(paths) - 1),
+                   "files": sorted(paths)} for _, size, paths in groups]
+        report.sort(key=lambda group: group["reclaimable_bytes"], reverse=True)
+        self.stats["groups"] = len(report)
+        self.stats["duplicate_files"] = sum(group["count"] - 1 for group in report)
+        self.stats["reclaimable_bytes"] = sum(group["reclaimable_bytes"] for group in report)
+        self.stats["seconds"] = round(time.monotonic() - started, 3)
+        self.stats["error_samples"] = self.error_samples
+        return {"groups": report[:self.top_n], "stats": self.stats}
+
+
+def main() -> None:
+    spec = json.loads(sys.argv[1])
+    try:
+        finder = DuplicateFinder(spec)
+        result = finder.run()
+    except ValueError as e:
+        print("@ERROR " + str(e))
+        return
+    sys.stdout.write("@RESULT " + json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
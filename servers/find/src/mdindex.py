@@ -0,0 +1,226 @@
+"""
+文件元数据索引：每个查找根目录一个 SQLite 文件，记录目录 mtime 与条目的名称、类型、大小、mtime、inode；
+刷新时只重新列出 mtime 变化过的目录，未变化的目录直接沿用索引中的子目录继续向下检查；
+只依赖标准库，远程执行时通过 SSH 交给目标机的 python3 运行（条件解析复用的 walker 由 stream_python 预先载入），
+索引保存在目标机上
+"""
+import hashlib
+import json
+import os
+import stat
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from servers.find.src import walker
+except ImportError:
+    import walker
+
+BATCH_ROWS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, parent INTEGER,
+                                 mtime_ns INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS files (dir INTEGER NOT NULL, name TEXT NOT NULL, type TEXT NOT NULL,
+                                  size INTEGER NOT NULL, mtime REAL NOT NULL, inode INTEGER NOT NULL,
+                                  PRIMARY KEY (dir, name)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS files_size ON files (size);
+CREATE INDEX IF NOT EXISTS files_mtime ON files (mtime);
+"""
+
+
+def index_path(index_dir: str, root: str) -> str:
+    digest = hashlib.sha1(root.encode("utf-8", errors="surrogateescape")).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(index_dir), f"{digest}.db")
+
+
+def connect(index_dir: str, root: str):
+    import sqlite3
+    os.makedirs(os.path.expanduser(index_dir), mode=0o700, exist_ok=True)
+    conn = sqlite3.connect(index_path(index_dir, root), timeout=60, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _kind(mode: int) -> str:
+    if stat.S_ISDIR(mode):
+        return "d"
+    if stat.S_ISLNK(mode):
+        return "l"
+    if stat.S_ISREG(mode):
+        return "f"
+    return "o"
+
+
+def refresh(conn, root: str) -> Dict[str, int]:
+    """
+    目录中新增、删除、重命名条目都会改变目录的 mtime，因此 mtime 未变的目录无需重新列出；
+    原地修改文件内容不会改变目录 mtime，这类文件的大小与 mtime 要等所在目录变化后才会更新
+    """
+    known: Dict[str, Tuple[int, int]] = {}
+    children: Dict[int, List[str]] = {}
+    for dir_id, path, parent, mtime_ns in conn.execute("SELECT id, path, parent, mtime_ns FROM dirs"):
+        known[path] = (dir_id, mtime_ns)
+        children.setdefault(parent, []).append(path)
+    stats = {"dirs_rescanned": 0, "dirs_skipped": 0, "errors": 0}
+    root_dev = os.stat(root).st_dev
+    seen = set()
+    stack: List[Tuple[str, Optional[int]]] = [(root, None)]
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        while stack:
+            path, parent = stack.pop()
+            try:
+                st = os.stat(path) if parent is None else os.lstat(path)
+            except OSError:
+                stats["errors"] += 1
+                continue
+            record = known.get(path)
+            if record is not None and record[1] == st.st_mtime_ns:
+                seen.add(record[0])
+                stats["dirs_skipped"] += 1
+                stack.extend((child, record[0]) for child in children.get(record[0], ()))
+                continue
+            if record is None:
+                dir_id = conn.execute("INSERT INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                                      (path, parent, st.st_mtime_ns)).lastrowid
+            else:
+                dir_id = record[0]
+                conn.execute("UPDATE dirs SET parent = ?, mtime_ns = ? WHERE id = ?", (parent, st.st_mtime_ns, dir_id))
+                conn.execute("DELETE FROM files WHERE dir = ?", (dir_id,))
+            seen.add(dir_id)
+            stats["dirs_rescanned"] += 1
+            rows = []
+            try:
+                with os.scandir(path) as iterator:
+                    for entry in iterator:
+                        try:
+                            est = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            stats["errors"] += 1
+                            continue
+                        kind = _kind(est.st_mode)
+                        rows.append((dir_id, entry.name, kind, est.st_size, est.st_mtime, est.st_ino))
+                        # 与 find -xdev 相同，不进入其他文件系统
+                        if kind == "d" and est.st_dev == root_dev:
+                            stack.append((entry.path, dir_id))
+            except OSError:
+                stats["errors"] += 1
+            for start in range(0, len(rows), BATCH_ROWS):
+                conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                                 rows[start:start + BATCH_ROWS])
+        # 不再存在或已不可访问的目录连同其条目一起删除
+        stale = [(record[0],) for record in known.values() if record[0] not in seen]
+        conn.executemany("DELETE FROM files WHERE dir = ?", stale)
+        conn.executemany("DELETE FROM dirs WHERE id = ?", stale)
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('root', ?), ('refreshed_at', ?)", (root, str(time.time())))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return stats
+
+
+def build_where(spec: Dict[str, Any], now: float) -> Tuple[str, List[Any]]:
+    """把条件换算成索引列上的范围，结果与 walker（即 GNU find）的取整规则一致"""
+    clauses, params = [], []
+    if spec.get("name"):
+        # SQLite 的 GLOB 与 fnmatch 一致，只是取反字符集写作 [^...]
+        clauses.append("f.name GLOB ?")
+        params.append(spec["name"].replace("[!", "[^"))
+    if spec.get("type"):
+        clauses.append(f"f.type IN ({','.join('?' * len(spec['type']))})")
+        params += list(spec["type"])
+    if spec.get("size"):
+        test = walker.parse_numeric_test(spec["size"], walker.SIZE_UNITS, "b")
+        if test is None:
+            raise ValueError(f"invalid condition: {spec['size']}")
+        op, value, unit = test
+        # ceil(size / unit) 与 N 比较
+        if op == "+":
+            clauses.append("f.size > ?")
+            params.append(value * unit)
+        elif op == "-":
+            clauses.append("f.size <= ?")
+            params.append((value - 1) * unit)
+        else:
+            clauses.append("f.size > ? AND f.size <= ?")
+            params += [(value - 1) * unit, value * unit]
+    if spec.get("mtime"):
+        test = walker.parse_numeric_test(spec["mtime"], walker.TIME_UNITS, "d")
+        if test is None:
+            raise ValueError(f"invalid condition: {spec['mtime']}")
+        op, value, unit = test
+        # floor((now - mtime) / unit) 与 N 比较
+        if op == "+":
+            clauses.append("f.mtime <= ?")
+            params.append(now - (value + 1) * unit)
+        elif op == "-":
+            clauses.append("f.mtime > ?")
+            params.append(now - value * unit)
+        else:
+            clauses.append("f.mtime > ? AND f.mtime <= ?")
+            params += [now - (value + 1) * unit, now - value * unit]
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def search(spec: Dict[str, Any], index_dir: str, max_age: float) -> Tuple[Iterator[Dict[str, Any]], Dict[str, Any]]:
+    """
+    索引在 max_age 秒内刷新过时直接查询，否则先增量刷新；
+    支持 name、type、size、mtime 条件，单个根目录；与 walker 不同，结果不包含根目录本身
+    """
+    root = os.path.abspath(spec["roots"][0])
+    if not os.path.isdir(root):
+        raise ValueError(f"not a directory: {root}")
+    started = time.monotonic()
+    conn = connect(index_dir, root)
+    row = conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+    age = time.time() - float(row[0]) if row else None
+    stats: Dict[str, Any] = {"index": {"refreshed": False, "age": round(age, 1) if age is not None else None}}
+    if age is None or age > max_age:
+        stats["index"].update(refresh(conn, root), refreshed=True, age=0.0)
+    where, params = build_where(spec, time.time())
+    sql = ("SELECT d.path, f.name, f.type, f.size, f.mtime FROM files f JOIN dirs d ON f.dir = d.id" + where
+           + (" LIMIT ?" if spec.get("limit") else ""))
+    if spec.get("limit"):
+        params.append(spec["limit"])
+    stats["index"]["entries"] = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def rows() -> Iterator[Dict[str, Any]]:
+        matched = 0
+        try:
+            for path, name, kind, size, mtime in conn.execute(sql, params):
+                matched += 1
+                yield {"file": os.path.join(path, name), "type": kind, "size": size,
+                       "mtime": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")}
+        finally:
+            conn.close()
+            stats.update(matched=matched, truncated=bool(spec.get("limit")) and matched >= spec["limit"],
+                         seconds=round(time.monotonic() - started, 3))
+
+    return rows(), stats
+
+
+def main() -> None:
+    args = json.loads(sys.argv[1])
+    try:
+        records, stats = search(args["spec"], args["index_dir"], args["max_age"])
+    except ValueError as e:
+        print("@ERROR " + str(e))
+        return
+    except Exception as e:
+        # 目标机的 python3 未编译 sqlite3 模块、索引目录不可写或数据库损坏
+        print("@UNAVAILABLE " + str(e))
+        return
+    for record in records:
+        sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.write("@DONE " + json.dumps(stats) + "\n")
+
+
+if __name__ == "__main__":
+    main()
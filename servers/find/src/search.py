@@ -0,0 +1,187 @@
+"""
+查找调度：校验条件并组装遍历参数，本地直接运行 walker，远程把 walker 交给目标机的 python3 流式执行；
+启用索引时改为运行 mdindex，在被查找的主机上查询（必要时先增量刷新）元数据索引；
+空间占用分析运行 spacehog，重复文件检测运行 dupes（远程时连同其依赖的 walker 一起推送）
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.find.src import dupes, mdindex, spacehog, walker
+from servers.find.src.base import stream_python
+
+MAX_LIMIT = 100000
+MAX_WORKERS = 64
+# 索引只保存名称、类型、大小、mtime，其他条件仍需遍历
+INDEX_CONDITIONS = ("name", "type", "size", "mtime")
+MAX_TOP_N = 1000
+MAX_SUMMARY_DEPTH = 10
+MAX_TIME_BUDGET = 3600
+
+
+def build_spec(paths: Union[str, List[str], None], is_zh: bool, name: Optional[str] = None,
+               iname: Optional[str] = None, regex: Optional[str] = None, mtime: Optional[str] = None,
+               atime: Optional[str] = None, ctime: Optional[str] = None, size: Optional[str] = None,
+               file_type: Union[str, List[str], None] = None, user: Union[str, int, None] = None,
+               group: Union[str, int, None] = None, exclude: Optional[List[str]] = None, xdev: bool = False,
+               max_depth: Optional[int] = None, limit: Optional[int] = 1000,
+               workers: int = walker.DEFAULT_WORKERS) -> Dict[str, Any]:
+    """校验失败时抛出中英文 ValueError，远程主机上不会再出现格式错误"""
+    roots = [paths] if isinstance(paths, str) else list(paths or [])
+    if not roots or not all(roots):
+        raise ValueError("查找路径不能为空" if is_zh else "Search path cannot be empty")
+    if size and walker.parse_numeric_test(size, walker.SIZE_UNITS, "b") is None:
+        raise ValueError(f"size 格式错误: {size}，示例: +10M、-1k、100c" if is_zh
+                         else f"Invalid size: {size}, e.g. +10M, -1k, 100c")
+    for attr, value in (("mtime", mtime), ("atime", atime), ("ctime", ctime)):
+        if value and walker.parse_numeric_test(value, walker.TIME_UNITS, "d") is None:
+            raise ValueError(f"{attr} 格式错误: {value}，示例: -7、+30、-2h" if is_zh
+                             else f"Invalid {attr}: {value}, e.g. -7, +30, -2h")
+    if regex:
+        try:
+            re.compile(regex)
+        except re.error as e:
+            raise ValueError(f"正则表达式错误: {e}" if is_zh else f"Invalid regex: {e}") from e
+    types = file_type.split(",") if isinstance(file_type, str) else list(file_type or [])
+    types = [t.strip() for t in types if t.strip()]
+    if any(t not in walker.FILE_TYPES for t in types):
+        raise ValueError(f"type 只能是 {', '.join(walker.FILE_TYPES)}" if is_zh
+                         else f"type must be one of {', '.join(walker.FILE_TYPES)}")
+    if limit is not None and not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit 范围为 1~{MAX_LIMIT}" if is_zh else f"limit must be 1-{MAX_LIMIT}")
+    if max_depth is not None and max_depth < 0:
+        raise ValueError("max_depth 不能为负数" if is_zh else "max_depth cannot be negative")
+    if not 1 <= workers <= MAX_WORKERS:
+        raise ValueError(f"workers 范围为 1~{MAX_WORKERS}" if is_zh else f"workers must be 1-{MAX_WORKERS}")
+    return {"roots": roots, "name": name, "iname": iname, "regex": regex, "mtime": mtime, "atime": atime,
+            "ctime": ctime, "size": size, "type": types, "user": user, "group": group, "exclude": exclude or [],
+            "xdev": xdev, "max_depth": max_depth, "limit": limit, "workers": workers}
+
+
+def _read_stream(lines: Iterator[str], is_zh: bool) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    files, stats = [], {}
+    for line in lines:
+        if line.startswith("@DONE "):
+            stats = json.loads(line[len("@DONE "):])
+        elif line.startswith("@ERROR "):
+            detail = line[len("@ERROR "):]
+            raise ValueError(f"查找条件错误: {detail}" if is_zh else f"Invalid search condition: {detail}")
+        elif line.startswith("@UNAVAILABLE "):
+            detail = line[len("@UNAVAILABLE "):]
+            raise RuntimeError(f"元数据索引不可用: {detail}" if is_zh else f"Metadata index unavailable: {detail}")
+        elif line.startswith("{"):
+            files.append(json.loads(line))
+    return files, stats
+
+
+def run_search(host_config: Optional[RemoteConfigModel], spec: Dict[str, Any], is_zh: bool,
+               timeout: float = 600) -> Dict[str, Any]:
+    """返回 {"files": [...], "stats": {...}}，files 按路径排序"""
+    if host_config is None:
+        try:
+            engine = walker.Walker(spec)
+        except ValueError as e:
+            raise ValueError(f"查找条件错误: {e}" if is_zh else f"Invalid search condition: {e}") from e
+        files = list(engine.walk())
+        stats = engine.stats
+    else:
+        files, stats = _read_stream(stream_python(host_config, walker.__file__, spec, is_zh, timeout), is_zh)
+    files.sort(key=lambda record: record["file"])
+    return {"files": files, "stats": stats}
+
+
+def run_index_search(host_config: Optional[RemoteConfigModel], spec: Dict[str, Any], index_dir: str,
+                     max_age: float, is_zh: bool, timeout: float = 600) -> Dict[str, Any]:
+    """与 run_search 返回格式相同，stats 中的 index 记录索引年龄、是否刷新及跳过/重新列出的目录数"""
+    unsupported = [key for key, value in spec.items()
+                   if value and key not in INDEX_CONDITIONS + ("roots", "limit", "workers")]
+    if len(spec["roots"]) != 1 or unsupported:
+        raise ValueError(f"索引只支持单个目录与 {', '.join(INDEX_CONDITIONS)} 条件" if is_zh
+                         else f"The index supports a single directory and {', '.join(INDEX_CONDITIONS)} only")
+    if host_config is None:
+        try:
+            records, stats = mdindex.search(spec, index_dir, max_age)
+            files = list(records)
+        except ValueError as e:
+            raise ValueError(f"查找条件错误: {e}" if is_zh else f"Invalid search condition: {e}") from e
+        except Exception as e:
+            raise RuntimeError(f"元数据索引不可用: {e}" if is_zh else f"Metadata index unavailable: {e}") from e
+    else:
+        args = {"spec": spec, "index_dir": index_dir, "max_age": max_age}
+        files, stats = _read_stream(stream_python(host_config, mdindex.__file__, args, is_zh, timeout,
+                                                  dependencies=(walker.__file__,)), is_zh)
+    files.sort(key=lambda record: record["file"])
+    return {"files": files, "stats": stats}
+
+
+def build_space_spec(path: Optional[str], is_zh: bool, top_n: int = 50, depth: int = 2, time_budget: float = 60,
+                     xdev: bool = True, exclude: Optional[List[str]] = None,
+                     workers: int = spacehog.DEFAULT_WORKERS) -> Dict[str, Any]:
+    if not path:
+        raise ValueError("分析路径不能为空" if is_zh else "Path cannot be empty")
+    if not 1 <= top_n <= MAX_TOP_N:
+        raise ValueError(f"top_n 范围为 1~{MAX_TOP_N}" if is_zh else f"top_n must be 1-{MAX_TOP_N}")
+    if not 0 <= depth <= MAX_SUMMARY_DEPTH:
+        raise ValueError(f"depth 范围为 0~{MAX_SUMMARY_DEPTH}" if is_zh else f"depth must be 0-{MAX_SUMMARY_DEPTH}")
+    if not 0 < time_budget <= MAX_TIME_BUDGET:
+        raise ValueError(f"time_budget 范围为 0~{MAX_TIME_BUDGET} 秒" if is_zh
+                         else f"time_budget must be 0-{MAX_TIME_BUDGET} seconds")
+    if not 1 <= workers <= MAX_WORKERS:
+        raise ValueError(f"workers 范围为 1~{MAX_WORKERS}" if is_zh else f"workers must be 1-{MAX_WORKERS}")
+    return {"roots": [path], "top_n": top_n, "depth": depth, "time_budget": time_budget, "xdev": xdev,
+            "exclude": exclude or [], "workers": workers}
+
+
+def _remote_result(host_config: RemoteConfigModel, module_file: str, spec: Dict[str, Any], is_zh: bool,
+                   timeout: float, dependencies: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """运行输出单行 @RESULT 的模块"""
+    for line in stream_python(host_config, module_file, spec, is_zh, timeout, dependencies):
+        if line.startswith("@RESULT "):
+            return json.loads(line[len("@RESULT "):])
+        if line.startswith("@ERROR "):
+            detail = line[len("@ERROR "):]
+            raise ValueError(f"无法分析 {spec['roots'][0]}: {detail}" if is_zh
+                             else f"Cannot analyze {spec['roots'][0]}: {detail}")
+    raise RuntimeError(f"远程主机 {host_config.name} 未返回分析结果" if is_zh
+                       else f"No result returned from {host_config.name}")
+
+
+def run_space_hog(host_config: Optional[RemoteConfigModel], spec: Dict[str, Any], is_zh: bool) -> Dict[str, Any]:
+    """超过时间预算时返回部分结果，stats.complete 为 false"""
+    if host_config is None:
+        try:
+            return spacehog.SpaceScanner(spec).run()
+        except OSError as e:
+            raise ValueError(f"无法分析 {spec['roots'][0]}: {e}" if is_zh
+                             else f"Cannot analyze {spec['roots'][0]}: {e}") from e
+    # 预留连接与推送源码的时间
+    return _remote_result(host_config, spacehog.__file__, spec, is_zh, spec["time_budget"] + 60)
+
+
+def build_duplicate_spec(paths: Union[str, List[str], None], is_zh: bool, name: Optional[str] = None,
+                         min_size: str = "1", exclude: Optional[List[str]] = None, xdev: bool = False,
+                         top_n: int = 100, time_budget: float = 600, workers: int = walker.DEFAULT_WORKERS,
+                         hash_workers: int = dupes.DEFAULT_WORKERS) -> Dict[str, Any]:
+    spec = build_spec(paths, is_zh, name=name, exclude=exclude, xdev=xdev, limit=None, workers=workers)
+    parsed = walker.parse_numeric_test(min_size, walker.SIZE_UNITS, "c")
+    if parsed is None or parsed[0] or parsed[1] * parsed[2] < 1:
+        raise ValueError(f"min_size 格式错误: {min_size}，示例: 1、64k、1M" if is_zh
+                         else f"Invalid min_size: {min_size}, e.g. 1, 64k, 1M")
+    if not 1 <= top_n <= MAX_TOP_N:
+        raise ValueError(f"top_n 范围为 1~{MAX_TOP_N}" if is_zh else f"top_n must be 1-{MAX_TOP_N}")
+    if not 0 < time_budget <= MAX_TIME_BUDGET:
+        raise ValueError(f"time_budget 范围为 0~{MAX_TIME_BUDGET} 秒" if is_zh
+                         else f"time_budget must be 0-{MAX_TIME_BUDGET} seconds")
+    if not 1 <= hash_workers <= MAX_WORKERS:
+        raise ValueError(f"hash_workers 范围为 1~{MAX_WORKERS}" if is_zh else f"hash_workers must be 1-{MAX_WORKERS}")
+    return dict(spec, min_size=parsed[1] * parsed[2], top_n=top_n, time_budget=time_budget,
+                hash_workers=hash_workers)
+
+
+def run_duplicates(host_config: Optional[RemoteConfigModel], spec: Dict[str, Any], is_zh: bool) -> Dict[str, Any]:
+    """超过时间预算时只返回已确认的重复组，stats.complete 为 false"""
+    if host_config is None:
+        return dupes.DuplicateFinder(spec).run()
+    return _remote_result(host_config, dupes.__file__, spec, is_zh, spec["time_budget"] + 60,
+                          dependencies=(walker.__file__,))
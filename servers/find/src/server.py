@@ -1,10 +1,8 @@
 from typing import Union, List, Dict
 import platform
 import os
-import paramiko
 import yaml
 import datetime
-import subprocess
 from typing import Any, Dict
 import psutil
 import tempfile
@@ -12,123 +10,150 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.find.config_loader import FindConfig
+from servers.find.src.base import find_remote_host
+from servers.find.src.search import (build_duplicate_spec, build_space_spec, build_spec, run_duplicates,
+                                     run_index_search, run_search, run_space_hog)
 mcp = FastMCP("Find MCP Server", host="0.0.0.0", port=FindConfig().get_config().private_config.port)
 
 
+@mcp.tool(
+    name="find_files_tool"
+    if FindConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "find_files_tool",
+    description='''
+    在指定目录下查找文件：基于 os.scandir 并行遍历，一次遍历组合多个条件，达到 limit 后立即停止；
+    远程主机通过SSH把遍历程序交给目标机的 python3 执行，结果流式返回（需要目标机安装 python3）
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则对本机文件进行查找
+        - path: 指定查找的目录，可以是多个目录的列表
+        - name: 文件名通配符，如 *.log（区分大小写）
+        - iname: 不区分大小写的文件名通配符
+        - regex: 对完整路径做正则搜索，如 /app-[0-9]+/
+        - mtime/atime/ctime: 修改/访问/状态变化时间，与 find -mtime 相同：+N 表示超过N天，-N 表示不到N天，
+          N 表示恰好N天；可带单位 s、m、h、d，如 -2h
+        - size: 文件大小，与 find -size 相同，如 +10M、-1k、100c；不带单位时按512字节块计算
+        - type: 类型列表，f 普通文件、d 目录、l 符号链接
+        - user/group: 属主用户/组，名称或数字ID
+        - exclude: 排除的通配符列表，匹配的目录本身及其子树都不出现在结果中；含 / 时匹配完整路径，否则匹配目录名，
+          如 [".git", "/proc"]
+        - xdev: 是否只在起始目录所在的文件系统内查找，默认 false
+        - max_depth: 最大深度，起始目录下的条目深度为1，默认不限
+        - limit: 最多返回的结果数，范围 1~100000，默认1000
+        - workers: 并行遍历的线程数，范围 1~64，默认8
+    2. 返回值为字典：
+        - files: 结果列表（按路径排序），每项包含 file（路径）、type、size（字节）、mtime
+        - stats: 遍历统计，包含 dirs（扫描的目录数）、entries（扫描的条目数）、errors（无权限等错误数）、
+          error_samples（部分错误信息）、matched、truncated（是否因 limit 提前停止）、seconds
+    '''
+    if FindConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Search for files in a directory: a parallel os.scandir traversal that combines several conditions in one walk
+    and stops as soon as limit is reached; remote hosts run the walker by handing it to python3 on the target
+    over SSH and results are streamed back (python3 is required on the target)
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the local file will be searched.
+        - path: The directory to be searched, or a list of directories.
+        - name: Filename glob, e.g. *.log (case sensitive)
+        - iname: Case-insensitive filename glob
+        - regex: Regular expression searched in the full path, e.g. /app-[0-9]+/
+        - mtime/atime/ctime: Modification/access/status change time, same as find -mtime: +N more than N days,
+          -N less than N days, N exactly N days; units s, m, h, d are accepted, e.g. -2h
+        - size: File size, same as find -size, e.g. +10M, -1k, 100c; 512-byte blocks without a unit
+        - type: List of types, f regular file, d directory, l symbolic link
+        - user/group: Owner user/group, name or numeric ID
+        - exclude: Globs of subtrees to prune, the matching directory itself is not listed either; matched against
+          the full path when containing /, otherwise against the directory name, e.g. [".git", "/proc"]
+        - xdev: Stay on the filesystem of the starting directory, default false
+        - max_depth: Maximum depth, entries directly under the starting directory have depth 1, unlimited by default
+        - limit: Maximum number of results, 1 to 100000, default 1000
+        - workers: Traversal threads, 1 to 64, default 8
+    2. The return value is a dictionary:
+        - files: Results sorted by path, each with file (path), type, size (bytes) and mtime
+        - stats: Traversal statistics: dirs (directories scanned), entries (entries scanned), errors (permission
+          and other errors), error_samples (some error messages), matched, truncated (stopped early at limit), seconds
+    '''
+
+)
+def find_files_tool(host: Union[str, None] = None, path: Union[str, List[str]] = None, name: str = None,
+                    iname: str = None, regex: str = None, mtime: str = None, atime: str = None, ctime: str = None,
+                    size: str = None, type: Union[str, List[str], None] = None, user: Union[str, int, None] = None,
+                    group: Union[str, int, None] = None, exclude: List[str] = None, xdev: bool = False,
+                    max_depth: int = None, limit: int = 1000, workers: int = 8) -> Dict[str, Any]:
+    """组合多个条件在指定目录下查找文件"""
+    cfg = FindConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    spec = build_spec(path, is_zh, name=name, iname=iname, regex=regex, mtime=mtime, atime=atime, ctime=ctime,
+                      size=size, file_type=type, user=user, group=group, exclude=exclude, xdev=xdev,
+                      max_depth=max_depth, limit=limit, workers=workers)
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_search(host_config, spec, is_zh)
+
+
+def _find_list(host: Union[str, None], path: str, limit: int, use_index: bool,
+               **conditions: Any) -> List[Dict[str, Any]]:
+    """单条件查找工具的公共实现，返回结果列表；use_index 时从被查找主机上的元数据索引回答"""
+    cfg = FindConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if not path or not any(conditions.values()):
+        raise ValueError("查找路径与查找条件不能为空" if is_zh else "Search path and condition cannot be empty")
+    spec = build_spec(path, is_zh, limit=limit, **conditions)
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    if use_index:
+        private = cfg.private_config
+        return run_index_search(host_config, spec, private.index_dir, private.index_max_age, is_zh)["files"]
+    return run_search(host_config, spec, is_zh)["files"]
+
+
 @mcp.tool(
     name="find_with_name_tool"
     if FindConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     "find_with_name_tool",
     description='''
-    使用find命令基于名称在指定目录下查找文件
+    基于名称在指定目录下查找文件
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则对本机文件进行查找
         - path: 指定查找的目录
-        - name: 要找的文件名
+        - name: 要找的文件名，支持通配符，如 *.log
+        - limit: 最多返回的结果数，默认1000；达到上限后直接截断且不作提示，需要判断是否截断时请使用 find_files_tool
+        - use_index: 是否使用元数据索引，默认 false；首次使用时为该目录建立索引（保存在被查找的主机上），
+          之后索引在有效期内（默认300秒）直接查询，过期则只重新列出 mtime 变化过的目录；
+          原地修改的文件其大小与 mtime 要等所在目录有变化后才会更新
     2. 返回值为包含相应信息的字典列表，每个字典包含以下键
         - file: 符合查找要求的具体文件路径
+        - type: 类型，f 普通文件、d 目录、l 符号链接
+        - size: 文件大小（字节）
+        - mtime: 修改时间
     '''
     if FindConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Use the find command to search for files by name in a specified directory.
+    Search for files by name in a specified directory.
     1. Input values are as follows:
         - host: The name or IP address of the remote host; if not provided, the local file will be searched.
         - path: The directory to be searched.
-        - name: The filename to be found.
+        - name: The filename to be found, globs such as *.log are supported.
+        - limit: Maximum number of results, default 1000; the list is cut off silently at the cap,
+          use find_files_tool when you need to know whether results were truncated.
+        - use_index: Answer from the metadata index, default false; the first use builds an index of the directory
+          (stored on the searched host), later queries read it directly while it is fresh (300 seconds by default)
+          and otherwise only re-list directories whose mtime changed; size and mtime of files modified in place
+          are picked up once their directory changes.
     2. The return value is a list of dictionaries containing the relevant information, with each dictionary including the following keys:
         - file: The specific file path that meets the search criteria.
+        - type: Type, f regular file, d directory, l symbolic link.
+        - size: File size in bytes.
+        - mtime: Modification time.
     '''
 
 )
-def find_with_name_tool(host: Union[str, None] = None, path: str = None, name: str = None) -> List[Dict[str, Any]]:
-    """使用find命令基于名称在指定目录下查找文件"""
-    if host is None:
-        try:
-            command = ['find']
-            if not path or not name:
-                if FindConfig().get_config().public_config.language == LanguageEnum.ZH:
-                    raise ValueError(f"{command} 命令查找路径不能为空")
-                else:
-                    raise ValueError(f"{command} command search path cannot be empty")
-            command.append(path)
-            command.append('-name')
-            command.append(name)
-            result = subprocess.run(command, capture_output=True, text=True)
-            lines = result.stdout.split('\n')
-            files = []
-            if lines != ['']:
-                for line in lines:
-                    files.append({
-                        'file': line
-                    })
-            return files
-        except subprocess.CalledProcessError as e:
-            if FindConfig().get_config().public_config.language == LanguageEnum.ZH:
-                raise RuntimeError(f"执行 {command} 命令失败: {e.stderr}")
-            else:
-                raise RuntimeError(f"Command {command} execution failed: {e.stderr}")
-        except Exception as e:
-            if FindConfig().get_config().public_config.language == LanguageEnum.ZH:
-                raise RuntimeError(f"执行 {command} 命令发生未知错误: {str(e)}") from e
-            else:
-                raise RuntimeError(f"An unknown error occurred while obtaining memory information: {str(e)}") from e
-    else:
-        for host_config in FindConfig().get_config().public_config.remote_hosts:
-            if host == host_config.name or host == host_config.host:
-                try:
-                    # 建立SSH连接
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(
-                        hostname=host_config.host,
-                        port=host_config.port,
-                        username=host_config.username,
-                        password=host_config.password
-                    )
-                    command = 'find'
-                    if not path or not name:
-                        if FindConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError(f"{command} 命令查找路径不能为空")
-                        else:
-                            raise ValueError(f"{command} command search path cannot be empty")
-                    command += f' {path} -name {name}'
-                    stdin, stdout, stderr = ssh.exec_command(command)
-                    error = stderr.read().decode().strip()
-                    output = stdout.read().decode().strip()
+def find_with_name_tool(host: Union[str, None] = None, path: str = None, name: str = None,
+                        limit: int = 1000, use_index: bool = False) -> List[Dict[str, Any]]:
+    """基于名称在指定目录下查找文件"""
+    return _find_list(host, path, limit, use_index, name=name)
 
-                    if error:
-                        if VmstatConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError(f"命令 {command} 错误：{error}")
-                        else:
-                            raise ValueError(f"Command {command} error: {error}")
-                    
-                    lines = output.split('\n')
-                    files = []
-                    if lines != ['']:
-                        for line in lines:
-                            files.append({
-                                'file': line
-                            })
-                    return files
-                except paramiko.AuthenticationException:
-                    raise ValueError("SSH认证失败，请检查用户名和密码")
-                except paramiko.SSHException as e:
-                    raise ValueError(f"SSH连接错误: {str(e)}")
-                except Exception as e:
-                    raise ValueError(f"远程执行 {command} 失败: {str(e)}")
-                finally:
-                    # 确保SSH连接关闭
-                    if ssh is not None:
-                        try:
-                            ssh.close()
-                        except Exception:
-                            pass
-        if FindConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"未找到远程主机: {host}")
-        else:
-            raise ValueError(f"Remote host not found: {host}")
 
 @mcp.tool(
     name="find_with_date_tool"
@@ -136,102 +161,48 @@ def find_with_name_tool(host: Union[str, None] = None, path: str = None, name: s
     else
     "find_with_date_tool",
     description='''
-    使用find命令基于修改时间在指定目录下查找文件
+    基于修改时间在指定目录下查找文件
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则对本机文件进行查找
         - path: 指定查找的目录
-        - time: 要找的时间范围
+        - time: 要找的时间范围，与 find -mtime 相同，如 -7 表示7天内修改过，+30 表示30天前修改；可带单位 s、m、h、d
+        - limit: 最多返回的结果数，默认1000；达到上限后直接截断且不作提示，需要判断是否截断时请使用 find_files_tool
+        - use_index: 是否使用元数据索引，默认 false；首次使用时为该目录建立索引（保存在被查找的主机上），
+          之后索引在有效期内（默认300秒）直接查询，过期则只重新列出 mtime 变化过的目录；
+          原地修改的文件其大小与 mtime 要等所在目录有变化后才会更新
     2. 返回值为包含相应信息的字典列表，每个字典包含以下键
         - file: 符合查找要求的具体文件路径
+        - type: 类型，f 普通文件、d 目录、l 符号链接
+        - size: 文件大小（字节）
+        - mtime: 修改时间
     '''
     if FindConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Use the find command to search for files in a specified directory based on modification time.
+    Search for files in a specified directory based on modification time.
     1. Input values are as follows:
         - host: The name or IP address of the remote host; if not provided, the local file will be searched.
         - path: The directory to be searched.
-        - time: The time range to be searched.
+        - time: The time range to be searched, same as find -mtime, e.g. -7 for modified within 7 days, +30 for modified more than 30 days ago; units s, m, h, d are accepted.
+        - limit: Maximum number of results, default 1000; the list is cut off silently at the cap,
+          use find_files_tool when you need to know whether results were truncated.
+        - use_index: Answer from the metadata index, default false; the first use builds an index of the directory
+          (stored on the searched host), later queries read it directly while it is fresh (300 seconds by default)
+          and otherwise only re-list directories whose mtime changed; size and mtime of files modified in place
+          are picked up once their directory changes.
     2. The return value is a list of dictionaries containing the corresponding information, with each dictionary including the following keys:
         - file: The specific file path that meets the search criteria.
+        - type: Type, f regular file, d directory, l symbolic link.
+        - size: File size in bytes.
+        - mtime: Modification time.
     '''
 
 )
-def find_with_date_tool(host: Union[str, None] = None, path: str = None, time: str = None) -> List[Dict[str, Any]]:
-    """使用find命令基于名称在指定目录下查找文件"""
-    if host is None:
-        try:
-            command = ['find']
-            if not path or not time:
-                raise ValueError(f"{command} 命令查找路径不能为空")
-            command.append(path)
-            command.append('-mtime')
-            command.append(time)
-            result = subprocess.run(command, capture_output=True, text=True)
-            lines = result.stdout.split('\n')
-            files = []
-            if lines != ['']:
-                for line in lines:
-                    files.append({
-                        'file': line
-                    })
-            return files
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"执行 {command} 命令失败: {e.stderr}") from e
-        except Exception as e:
-            raise RuntimeError(f"执行 {command} 命令发生未知错误: {str(e)}") from e
-    else:
-        for host_config in FindConfig().get_config().public_config.remote_hosts:
-            if host == host_config.name or host == host_config.host:
-                try:
-                    # 建立SSH连接
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(
-                        hostname=host_config.host,
-                        port=host_config.port,
-                        username=host_config.username,
-                        password=host_config.password
-                    )
-                    command = 'find'
-                    if not path or not time:
-                        raise ValueError(f"{command} 命令查找路径不能为空")
-                    command += f' {path} -mtime {time}'
-                    stdin, stdout, stderr = ssh.exec_command(command)
-                    error = stderr.read().decode().strip()
-                    output = stdout.read().decode().strip()
+def find_with_date_tool(host: Union[str, None] = None, path: str = None, time: str = None,
+                        limit: int = 1000, use_index: bool = False) -> List[Dict[str, Any]]:
+    """基于修改时间在指定目录下查找文件"""
+    return _find_list(host, path, limit, use_index, mtime=time)
 
-                    if error:
-                        raise ValueError(f"Command {command} error: {error}")
-                    # 没有找到相应文件
-                    # if not output:
-                    #     raise ValueError("未能获取信息")
-                    
-                    lines = output.split('\n')
-                    files = []
-                    if lines != ['']:
-                        for line in lines:
-                            files.append({
-                                'file': line
-                            })
-                    return files
-                except paramiko.AuthenticationException:
-                    raise ValueError("SSH认证失败，请检查用户名和密码")
-                except paramiko.SSHException as e:
-                    raise ValueError(f"SSH连接错误: {str(e)}")
-                except Exception as e:
-                    raise ValueError(f"远程执行 {command} 失败: {str(e)}")
-                finally:
-                    # 确保SSH连接关闭
-                    if ssh is not None:
-                        try:
-                            ssh.close()
-                        except Exception:
-                            pass
-        if FindConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"未找到远程主机: {host}")
-        else:
-            raise ValueError(f"Remote host not found: {host}")
 
 @mcp.tool(
     name="find_with_size_tool"
@@ -239,102 +210,183 @@ def find_with_date_tool(host: Union[str, None] = None, path: str = None, time: s
     else
     "find_with_size_tool",
     description='''
-    使用find命令基于文件大小在指定目录下查找文件
+    基于文件大小在指定目录下查找文件
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则对本机文件进行查找
         - path: 指定查找的目录
-        - size: 要找的文件尺寸范围
+        - size: 要找的文件尺寸范围，与 find -size 相同，如 +100M、-1k
+        - limit: 最多返回的结果数，默认1000；达到上限后直接截断且不作提示，需要判断是否截断时请使用 find_files_tool
+        - use_index: 是否使用元数据索引，默认 false；首次使用时为该目录建立索引（保存在被查找的主机上），
+          之后索引在有效期内（默认300秒）直接查询，过期则只重新列出 mtime 变化过的目录；
+          原地修改的文件其大小与 mtime 要等所在目录有变化后才会更新
     2. 返回值为包含相应信息的字典列表，每个字典包含以下键
         - file: 符合查找要求的具体文件路径
+        - type: 类型，f 普通文件、d 目录、l 符号链接
+        - size: 文件大小（字节）
+        - mtime: 修改时间
     '''
     if FindConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Use the find command to search for files in a specified directory based on file size.
+    Search for files in a specified directory based on file size.
     1. Input values are as follows:
         - host: The name or IP address of the remote host; if not provided, the local file will be searched.
         - path: The directory to be searched.
-        - name: The filename to be found.
+        - size: The file size range to be searched, same as find -size, e.g. +100M, -1k.
+        - limit: Maximum number of results, default 1000; the list is cut off silently at the cap,
+          use find_files_tool when you need to know whether results were truncated.
+        - use_index: Answer from the metadata index, default false; the first use builds an index of the directory
+          (stored on the searched host), later queries read it directly while it is fresh (300 seconds by default)
+          and otherwise only re-list directories whose mtime changed; size and mtime of files modified in place
+          are picked up once their directory changes.
     2. The return value is a list of dictionaries containing the relevant information, with each dictionary including the following keys:
         - file: The specific file path that meets the search criteria.
+        - type: Type, f regular file, d directory, l symbolic link.
+        - size: File size in bytes.
+        - mtime: Modification time.
+    '''
+
+)
+def find_with_size_tool(host: Union[str, None] = None, path: str = None, size: str = None,
+                        limit: int = 1000, use_index: bool = False) -> List[Dict[str, Any]]:
+    """基于文件大小在指定目录下查找文件"""
+    return _find_list(host, path, limit, use_index, size=size)
+
+
+@mcp.tool(
+    name="space_hog_tool"
+    if FindConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "space_hog_tool",
+    description='''
+    分析磁盘空间占用：并行遍历目录树，找出最大的文件与目录，用于磁盘写满时定位占用来源；
+    按实际分配的块计算（稀疏文件按实际占用），硬链接的同一文件只计一次，目录大小与 du 一致；
+    超过时间预算时停止遍历并返回已统计部分的结果与覆盖率
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则分析本机
+        - path: 分析的起始目录，默认 /
+        - top_n: 返回最大的文件与目录各多少个，范围 1~1000，默认50
+        - depth: 目录汇总的深度，起始目录下的子目录深度为1，范围 0~10，默认2；更深的目录计入其深度为 depth 的祖先
+        - time_budget: 时间预算（秒），范围 0~3600，默认60
+        - xdev: 是否只统计起始目录所在的文件系统，默认 true（/ 下不会进入 /proc、/sys 等）
+        - exclude: 排除的通配符列表；含 / 时匹配完整路径，否则匹配目录名
+        - workers: 并行遍历的线程数，范围 1~64，默认8
+    2. 返回值为字典：
+        - root: 起始目录
+        - total_bytes/total_files: 已统计的总占用字节数与文件数
+        - largest_files: 最大的文件列表，每项包含 file、bytes（分配字节）、size（文件大小）、mtime
+        - largest_directories: 最大的目录列表（含子目录在内的累计值），每项包含 path、depth、bytes、files
+        - stats: 覆盖统计，包含 complete（是否遍历完成）、dirs_scanned、dirs_unscanned（超时未扫描的目录数）、
+          entries、files、hardlinks_skipped、errors、error_samples、seconds、scanned_bytes、
+          filesystem_used_bytes（文件系统已用空间）、coverage_percent（起始目录为挂载点时的覆盖百分比）
+    '''
+    if FindConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Analyze disk space usage: walk the tree in parallel and report the largest files and directories, to find
+    what filled a disk; sizes are allocated blocks (sparse files count what they occupy), a hard-linked file is
+    counted once, and directory sizes agree with du; when the time budget runs out the walk stops and the partial
+    results are returned together with coverage statistics
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the local host is analyzed.
+        - path: Starting directory, default /
+        - top_n: Number of largest files and of largest directories to return, 1 to 1000, default 50
+        - depth: Depth of the directory summary, subdirectories of the starting directory have depth 1, 0 to 10,
+          default 2; deeper directories are added to their ancestor at that depth
+        - time_budget: Time budget in seconds, 0 to 3600, default 60
+        - xdev: Stay on the filesystem of the starting directory, default true (/proc, /sys etc. are skipped under /)
+        - exclude: Globs of subtrees to prune; matched against the full path when containing /, otherwise against
+          the directory name
+        - workers: Traversal threads, 1 to 64, default 8
+    2. The return value is a dictionary:
+        - root: Starting directory
+        - total_bytes/total_files: Allocated bytes and files counted
+        - largest_files: Largest files, each with file, bytes (allocated), size (file size) and mtime
+        - largest_directories: Largest directories (cumulative, including subdirectories), each with path, depth,
+          bytes and files
+        - stats: Coverage statistics: complete (whether the walk finished), dirs_scanned, dirs_unscanned (left
+          unscanned when the budget ran out), entries, files, hardlinks_skipped, errors, error_samples, seconds,
+          scanned_bytes, filesystem_used_bytes (used space of the filesystem) and coverage_percent (when the
+          starting directory is a mount point)
     '''
 
 )
-def find_with_size_tool(host: Union[str, None] = None, path: str = None, size: str = None) -> List[Dict[str, Any]]:
-    """使用find命令基于文件大小在指定目录下查找文件"""
-    if host is None:
-        try:
-            command = ['find']
-            if not path or not size:
-                raise ValueError(f"{command} 命令查找路径不能为空")
-            command.append(path)
-            command.append('-size')
-            command.append(size)
-            result = subprocess.run(command, capture_output=True, text=True)
-            lines = result.stdout.split('\n')
-            files = []
-            if lines != ['']:
-                for line in lines:
-                    files.append({
-                        'file': line
-                    })
-            return files
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"执行 {command} 命令失败: {e.stderr}") from e
-        except Exception as e:
-            raise RuntimeError(f"执行 {command} 命令发生未知错误: {str(e)}") from e
-    else:
-        for host_config in FindConfig().get_config().public_config.remote_hosts:
-            if host == host_config.name or host == host_config.host:
-                try:
-                    # 建立SSH连接
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(
-                        hostname=host_config.host,
-                        port=host_config.port,
-                        username=host_config.username,
-                        password=host_config.password
-                    )
-                    command = 'find'
-                    if not path or not size:
-                        raise ValueError(f"{command} 命令查找路径不能为空")
-                    command += f' {path} -size {size}'
-                    stdin, stdout, stderr = ssh.exec_command(command)
-                    error = stderr.read().decode().strip()
-                    output = stdout.read().decode().strip()
+def space_hog_tool(host: Union[str, None] = None, path: str = "/", top_n: int = 50, depth: int = 2,
+                   time_budget: float = 60, xdev: bool = True, exclude: List[str] = None,
+                   workers: int = 8) -> Dict[str, Any]:
+    """分析指定目录下最大的文件与目录"""
+    cfg = FindConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    spec = build_space_spec(path, is_zh, top_n=top_n, depth=depth, time_budget=time_budget, xdev=xdev,
+                            exclude=exclude, workers=workers)
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_space_hog(host_config, spec, is_zh)
+
 
-                    if error:
-                        raise ValueError(f"Command {command} error: {error}")
-                    # 没有找到相应文件
-                    # if not output:
-                    #     raise ValueError("未能获取信息")
-                    
-                    lines = output.split('\n')
-                    files = []
-                    if lines != ['']:
-                        for line in lines:
-                            files.append({
-                                'file': line
-                            })
-                    return files
-                except paramiko.AuthenticationException:
-                    raise ValueError("SSH认证失败，请检查用户名和密码")
-                except paramiko.SSHException as e:
-                    raise ValueError(f"SSH连接错误: {str(e)}")
-                except Exception as e:
-                    raise ValueError(f"远程执行 {command} 失败: {str(e)}")
-                finally:
-                    # 确保SSH连接关闭
-                    if ssh is not None:
-                        try:
-                            ssh.close()
-                        except Exception:
-                            pass
-        if FindConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"未找到远程主机: {host}")
-        else:
-            raise ValueError(f"Remote host not found: {host}")
+@mcp.tool(
+    name="find_duplicates_tool"
+    if FindConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "find_duplicates_tool",
+    description='''
+    查找重复文件，用于清理存储空间：并行遍历后先按大小分组，再比较文件首尾各 4KiB 的哈希，
+    只有首尾相同的文件才读取全文哈希（线程池、1MiB 缓冲区顺序读取）；同一文件的硬链接不算重复
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则对本机文件进行查找
+        - path: 指定查找的目录，可以是多个目录的列表
+        - name: 文件名通配符，如 *.rpm，只比较匹配的文件
+        - min_size: 参与比较的最小文件大小，如 1、64k、1M，默认1字节（忽略空文件）；大目录树建议调大以减少读取量
+        - exclude: 排除的通配符列表；含 / 时匹配完整路径，否则匹配目录名
+        - xdev: 是否只在起始目录所在的文件系统内查找，默认 false
+        - top_n: 返回的重复组数量（按可回收空间从大到小），范围 1~1000，默认100
+        - time_budget: 时间预算（秒），范围 0~3600，默认600；超时后只返回已确认的重复组
+        - workers: 遍历线程数，范围 1~64，默认8
+        - hash_workers: 哈希线程数，范围 1~64，默认4；机械硬盘上并行读取过多反而更慢
+    2. 返回值为字典：
+        - groups: 重复组列表，每项包含 size（单个文件大小）、count（文件数）、
+          reclaimable_bytes（保留一份时可回收的字节数）、files（路径列表）
+        - stats: 统计信息，包含 files_scanned、hardlinks_skipped、size_candidates（大小相同的候选文件数）、
+          partial_hashed、full_hashed、bytes_read、groups、duplicate_files、reclaimable_bytes（全部重复组合计）、
+          complete（是否在时间预算内完成）、walk（遍历统计）、errors、error_samples、seconds
+    '''
+    if FindConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Find duplicate files for storage cleanup: after a parallel walk files are grouped by size, then compared by a
+    hash of their first and last 4KiB, and only files whose ends still match are hashed in full (thread pool,
+    sequential reads with a 1MiB buffer); hard links to the same file are not duplicates
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the local file will be searched.
+        - path: The directory to be searched, or a list of directories.
+        - name: Filename glob such as *.rpm, only matching files are compared
+        - min_size: Minimum file size to compare, e.g. 1, 64k, 1M, default 1 byte (empty files are ignored);
+          raise it on large trees to read less
+        - exclude: Globs of subtrees to prune; matched against the full path when containing /, otherwise against
+          the directory name
+        - xdev: Stay on the filesystem of the starting directory, default false
+        - top_n: Number of duplicate groups to return, largest reclaimable space first, 1 to 1000, default 100
+        - time_budget: Time budget in seconds, 0 to 3600, default 600; only groups confirmed in time are returned
+        - workers: Traversal threads, 1 to 64, default 8
+        - hash_workers: Hashing threads, 1 to 64, default 4; too many parallel reads slow down spinning disks
+    2. The return value is a dictionary:
+        - groups: Duplicate groups, each with size (of one file), count, reclaimable_bytes (freed by keeping one
+          copy) and files (paths)
+        - stats: Statistics: files_scanned, hardlinks_skipped, size_candidates (files sharing a size),
+          partial_hashed, full_hashed, bytes_read, groups, duplicate_files, reclaimable_bytes (all groups),
+          complete (finished within the budget), walk (traversal statistics), errors, error_samples, seconds
+    '''
+
+)
+def find_duplicates_tool(host: Union[str, None] = None, path: Union[str, List[str]] = None, name: str = None,
+                         min_size: str = "1", exclude: List[str] = None, xdev: bool = False, top_n: int = 100,
+                         time_budget: float = 600, workers: int = 8, hash_workers: int = 4) -> Dict[str, Any]:
+    """在指定目录下查找内容相同的文件"""
+    cfg = FindConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    spec = build_duplicate_spec(path, is_zh, name=name, min_size=min_size, exclude=exclude, xdev=xdev, top_n=top_n,
+                                time_budget=time_budget, workers=workers, hash_workers=hash_workers)
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_duplicates(host_config, spec, is_zh)
 
 
 if __name__ == "__main__":
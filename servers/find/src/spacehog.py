@@ -0,0 +1,200 @@
+"""
+磁盘空间占用分析：并行遍历目录树，用有界堆保留最大的文件，按指定深度汇总目录占用；
+按实际分配的块（st_blocks）计算，硬链接的同一 inode 只计一次；超过时间预算时停止并返回部分结果与覆盖率；
+只依赖标准库，远程执行时与 walker 相同，通过 SSH 交给目标机的 python3 运行，结果为最后一行 @RESULT JSON
+"""
+import fnmatch
+import heapq
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Set, Tuple
+
+DEFAULT_WORKERS = 8
+# 每扫描这么多条目检查一次是否已超时，避免单个超大目录拖过时间预算
+STOP_CHECK_EVERY = 1024
+
+# (分配字节, 路径, 文件大小, mtime)
+FileItem = Tuple[int, str, int, float]
+
+
+class SpaceScanner:
+    """
+    与 walker 相同的目录级并行：工作线程扫描单个目录并在本地完成累加与取前 N，
+    主线程只合并每个目录的小结果，因此内存只与 top_n 和汇总深度内的目录数有关
+    """
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.root = os.path.abspath(spec["roots"][0])
+        self.top_n = int(spec.get("top_n") or 50)
+        self.depth = int(spec.get("depth") or 0)
+        self.budget = float(spec.get("time_budget") or 60)
+        self.xdev = spec.get("xdev", True)
+        self.excludes = list(spec.get("exclude") or ())
+        self.workers = max(int(spec.get("workers") or DEFAULT_WORKERS), 1)
+        self._stop = threading.Event()
+
+    def _excluded(self, path: str, name: str) -> bool:
+        for pattern in self.excludes:
+            if fnmatch.fnmatchcase(path if "/" in pattern else name, pattern):
+                return True
+        return False
+
+    def scan(self, path: str, depth: int, bucket: str, dev: int) -> Dict[str, Any]:
+        """扫描单个目录：普通条目的分配字节直接累加，多链接 inode 交给主线程去重"""
+        result = {"bucket": bucket, "bytes": 0, "files": 0, "entries": 0, "top": [], "linked": [],
+                  "subdirs": [], "errors": []}
+        if self._stop.is_set():
+            return result
+        top: List[FileItem] = []
+        own_bucket = depth + 1 <= self.depth
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    result["entries"] += 1
+                    if result["entries"] % STOP_CHECK_EVERY == 0 and self._stop.is_set():
+                        result["errors"].append(f"{path}: interrupted by time budget")
+                        break
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.xdev and st.st_dev != dev:
+                                continue
+                            if self.excludes and self._excluded(entry.path, entry.name):
+                                continue
+                            # 目录自身占用的块与 du 相同计入该目录，由主线程加到它的汇总桶
+                            result["subdirs"].append((entry.path, depth + 1,
+                                                      entry.path if own_bucket else bucket, dev, st.st_blocks * 512))
+                            continue
+                        allocated = st.st_blocks * 512
+                        if st.st_nlink > 1:
+                            result["linked"].append((st.st_dev, st.st_ino, allocated, entry.path, st.st_size,
+                                                     st.st_mtime))
+                            continue
+                        result["bytes"] += allocated
+                        result["files"] += 1
+                        item = (allocated, entry.path, st.st_size, st.st_mtime)
+                        if len(top) < self.top_n:
+                            heapq.heappush(top, item)
+                        elif allocated > top[0][0]:
+                            heapq.heapreplace(top, item)
+                    except OSError as e:
+                        result["errors"].append(f"{entry.path}: {e.strerror or e}")
+        except OSError as e:
+            result["errors"].append(f"{path}: {e.strerror or e}")
+        result["top"] = top
+        return result
+
+    def _task(self, results: "queue.Queue", path: str, depth: int, bucket: str, dev: int) -> None:
+        try:
+            results.put(self.scan(path, depth, bucket, dev))
+        except BaseException as e:
+            results.put({"bucket": bucket, "bytes": 0, "files": 0, "entries": 0, "top": [], "linked": [],
+                         "subdirs": [], "errors": [f"{path}: {e}"]})
+
+    def run(self) -> Dict[str, Any]:
+        started = time.monotonic()
+        deadline = started + self.budget
+        root_stat = os.stat(self.root)
+        top: List[FileItem] = []
+        seen_inodes: Set[Tuple[int, int]] = set()
+        buckets: Dict[str, List[int]] = {self.root: [root_stat.st_blocks * 512, 0]}
+        stats = {"dirs_scanned": 0, "dirs_unscanned": 0, "entries": 0, "files": 0, "hardlinks_skipped": 0,
+                 "errors": 0, "complete": True}
+        error_samples: List[str] = []
+        results: "queue.Queue" = queue.Queue()
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        outstanding = 1
+        pool.submit(self._task, results, self.root, 0, self.root, root_stat.st_dev)
+        try:
+            while outstanding:
+                try:
+                    result = results.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    stats["complete"] = False
+                    break
+                outstanding -= 1
+                stats["dirs_scanned"] += 1
+                stats["entries"] += result["entries"]
+                stats["errors"] += len(result["errors"])
+                error_samples.extend(result["errors"][:max(10 - len(error_samples), 0)])
+                counted = result["bytes"]
+                files = result["files"]
+                candidates = result["top"]
+                for dev, ino, allocated, path, size, mtime in result["linked"]:
+                    if (dev, ino) in seen_inodes:
+                        stats["hardlinks_skipped"] += 1
+                        continue
+                    seen_inodes.add((dev, ino))
+                    counted += allocated
+                    files += 1
+                    candidates.append((allocated, path, size, mtime))
+                for item in candidates:
+                    if len(top) < self.top_n:
+                        heapq.heappush(top, item)
+                    elif item[0] > top[0][0]:
+                        heapq.heapreplace(top, item)
+                total = buckets.setdefault(result["bucket"], [0, 0])
+                total[0] += counted
+                total[1] += files
+                stats["files"] += files
+                for path, depth, bucket, dev, allocated in result["subdirs"]:
+                    buckets.setdefault(bucket, [0, 0])[0] += allocated
+                    pool.submit(self._task, results, path, depth, bucket, dev)
+                    outstanding += 1
+        finally:
+            self._stop.set()
+            # 排队中的目录任务直接返回，正在扫描的目录最多再读 STOP_CHECK_EVERY 个条目
+            pool.shutdown(wait=True)
+        stats["dirs_unscanned"] = outstanding
+        stats["seconds"] = round(time.monotonic() - started, 3)
+        stats["error_samples"] = error_samples
+        return self._report(top, buckets, stats)
+
+    def _report(self, top: List[FileItem], buckets: Dict[str, List[int]], stats: Dict[str, Any]) -> Dict[str, Any]:
+        # 汇总桶只记录自身（及更深层）的占用，向上累加到每一级祖先，与 du -d 的结果一致
+        totals = {path: list(value) for path, value in buckets.items()}
+        for path, (allocated, files) in buckets.items():
+            parent = path
+            while parent != self.root:
+                parent = os.path.dirname(parent)
+                if parent in totals:
+                    totals[parent][0] += allocated
+                    totals[parent][1] += files
+        root_prefix = self.root.rstrip("/")
+        directories = [
+            {"path": path, "depth": path[len(root_prefix):].count("/"), "bytes": allocated, "files": files}
+            for path, (allocated, files) in totals.items() if path != self.root
+        ]
+        directories = heapq.nlargest(self.top_n, directories, key=lambda record: record["bytes"])
+        largest = [{"file": path, "bytes": allocated, "size": size,
+                    "mtime": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")}
+                   for allocated, path, size, mtime in sorted(top, reverse=True)]
+        stats["scanned_bytes"] = totals[self.root][0]
+        # 起始目录是挂载点且不跨文件系统时，已统计的字节数与文件系统已用空间可直接比较
+        fs = os.statvfs(self.root)
+        used = (fs.f_blocks - fs.f_bfree) * fs.f_frsize
+        stats["filesystem_used_bytes"] = used
+        if self.xdev and os.path.ismount(self.root) and used:
+            stats["coverage_percent"] = round(min(stats["scanned_bytes"] / used * 100, 100.0), 1)
+        return {"root": self.root, "total_bytes": totals[self.root][0], "total_files": totals[self.root][1],
+                "largest_files": largest, "largest_directories": directories, "stats": stats}
+
+
+def main() -> None:
+    spec = json.loads(sys.argv[1])
+    try:
+        result = SpaceScanner(spec).run()
+    except OSError as e:
+        print("@ERROR " + str(e))
+        return
+    sys.stdout.write("@RESULT " + json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
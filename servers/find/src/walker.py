@@ -0,0 +1,255 @@
+"""
+基于 os.scandir 的并行目录遍历：一次遍历组合名称、正则、时间、大小、类型、属主等条件，
+跳过排除的子树与其他文件系统，达到 limit 后立即停止；只依赖标准库，
+远程执行时整个文件通过 SSH 标准输入交给目标机的 python3 运行，参数为命令行中的 JSON，结果逐行输出
+"""
+import fnmatch
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# 与 GNU find -size 一致：不带单位时按 512 字节块计算
+SIZE_UNITS = {"c": 1, "w": 2, "b": 512, "k": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+# 与 GNU find -mtime 一致：不带单位时按天计算
+TIME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+FILE_TYPES = ("f", "d", "l")
+NUMERIC_TEST = re.compile(r"^([+-]?)(\d+)([a-zA-Z]?)$")
+DEFAULT_WORKERS = 8
+
+NumericTest = Tuple[str, int, int]
+
+
+def parse_numeric_test(text: str, units: Dict[str, int], default_unit: str) -> Optional[NumericTest]:
+    """解析 +N、-N、N 及可选单位，返回 (比较符, N, 单位字节数或秒数)；格式错误返回 None"""
+    match = NUMERIC_TEST.match(str(text).strip())
+    if not match or (match.group(3) and match.group(3) not in units):
+        return None
+    return match.group(1), int(match.group(2)), units[match.group(3) or default_unit]
+
+
+def _compare(test: NumericTest, amount: float) -> bool:
+    op, value, _ = test
+    if op == "+":
+        return amount > value
+    if op == "-":
+        return amount < value
+    return amount == value
+
+
+def _resolve_id(value: Any, kind: str) -> int:
+    """用户名/组名在目标机上解析，数字直接作为 uid/gid"""
+    text = str(value)
+    if text.isdigit():
+        return int(text)
+    import grp
+    import pwd
+    try:
+        return pwd.getpwnam(text).pw_uid if kind == "user" else grp.getgrnam(text).gr_gid
+    except KeyError:
+        raise ValueError(f"unknown {kind}: {text}")
+
+
+class FileFilter:
+    """把条件编译一次；只有需要时才 stat，名称与类型等廉价条件先判断"""
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        patterns = []
+        if spec.get("name"):
+            patterns.append(re.compile(fnmatch.translate(spec["name"])).match)
+        if spec.get("iname"):
+            patterns.append(re.compile(fnmatch.translate(spec["iname"]), re.IGNORECASE).match)
+        # 名称条件在判断类型、stat 之前逐项检查，绝大多数条目在这里被排除
+        self.names = patterns
+        self.regex = re.compile(spec["regex"]).search if spec.get("regex") else None
+        self.types = set(spec.get("type") or ())
+        self.size = parse_numeric_test(spec["size"], SIZE_UNITS, "b") if spec.get("size") else None
+        self.times = [(attr, parse_numeric_test(spec[attr], TIME_UNITS, "d"))
+                      for attr in ("mtime", "atime", "ctime") if spec.get(attr)]
+        self.uid = _resolve_id(spec["user"], "user") if spec.get("user") is not None else None
+        self.gid = _resolve_id(spec["group"], "group") if spec.get("group") is not None else None
+        self.now = time.time()
+
+    def match_name(self, name: str) -> bool:
+        for pattern in self.names:
+            if pattern(name) is None:
+                return False
+        return True
+
+    def match(self, path: str, kind: str, get_stat: Callable[[], os.stat_result]) -> Optional[os.stat_result]:
+        """名称之外的条件；匹配时返回 stat 结果，不匹配返回 None"""
+        if self.types and kind not in self.types:
+            return None
+        if self.regex is not None and self.regex(path) is None:
+            return None
+        st = get_stat()
+        if self.uid is not None and st.st_uid != self.uid:
+            return None
+        if self.gid is not None and st.st_gid != self.gid:
+            return None
+        if self.size is not None:
+            unit = self.size[2]
+            # 按单位向上取整后比较，与 GNU find 相同（-size -1M 只匹配空文件）
+            if not _compare(self.size, -(-st.st_size // unit)):
+                return None
+        for attr, test in self.times:
+            age = self.now - getattr(st, "st_" + attr)
+            if not _compare(test, age // test[2]):
+                return None
+        return st
+
+
+def _kind(entry: os.DirEntry) -> str:
+    """非目录条目的类型，目录在调用前已判断"""
+    if entry.is_symlink():
+        return "l"
+    if entry.is_file(follow_symlinks=False):
+        return "f"
+    return "o"
+
+
+def make_record(path: str, kind: str, st: os.stat_result) -> Dict[str, Any]:
+    return {
+        "file": path,
+        "type": kind,
+        "size": st.st_size,
+        "mtime": datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+class Walker:
+    """
+    目录级并行：每个任务扫描一个目录，返回匹配项与子目录，主线程把子目录继续交给线程池；
+    结果经队列回到调用方，按完成顺序逐个产出（顺序不固定）。scandir/stat 期间释放 GIL，
+    网络文件系统或冷缓存上多个目录的元数据请求可以重叠
+    """
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.filter = FileFilter(spec)
+        self.roots = [os.path.abspath(root) for root in spec["roots"]]
+        self.excludes = list(spec.get("exclude") or ())
+        self.xdev = bool(spec.get("xdev"))
+        self.max_depth = spec.get("max_depth")
+        self.limit = spec.get("limit")
+        self.workers = max(int(spec.get("workers") or DEFAULT_WORKERS), 1)
+        self.stats = {"dirs": 0, "entries": 0, "errors": 0, "matched": 0, "truncated": False, "seconds": 0.0}
+        self.error_samples: List[str] = []
+        self._stop = threading.Event()
+
+    def _excluded(self, path: str, name: str) -> bool:
+        for pattern in self.excludes:
+            if fnmatch.fnmatchcase(path if "/" in pattern else name, pattern):
+                return True
+        return False
+
+    def scan(self, path: str, depth: int, dev: int) -> Tuple[List[Tuple[str, str, os.stat_result]],
+                                                             List[Tuple[str, int, int]], int, List[str]]:
+        """扫描单个目录，返回 (匹配项, 子目录, 条目数, 错误)"""
+        matches, subdirs, errors = [], [], []
+        entries = 0
+        if self._stop.is_set():
+            return matches, subdirs, entries, errors
+        # depth 为当前目录的深度，其中条目的深度为 depth + 1
+        descend = self.max_depth is None or depth + 1 < self.max_depth
+        match_name, match, excluded = self.filter.match_name, self.filter.match, bool(self.excludes)
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    entries += 1
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        # 与 find -name X -prune -o -print 相同，被排除的目录连同其自身都不出现在结果中
+                        if is_dir and excluded and self._excluded(entry.path, entry.name):
+                            continue
+                        if match_name(entry.name):
+                            kind = "d" if is_dir else _kind(entry)
+                            st = match(entry.path, kind, lambda: entry.stat(follow_symlinks=False))
+                            if st is not None:
+                                matches.append((entry.path, kind, st))
+                        if not is_dir or not descend:
+                            continue
+                        child_dev = entry.stat(follow_symlinks=False).st_dev if self.xdev else dev
+                        if child_dev == dev:
+                            subdirs.append((entry.path, depth + 1, dev))
+                    except OSError as e:
+                        errors.append(f"{entry.path}: {e.strerror or e}")
+        except OSError as e:
+            errors.append(f"{path}: {e.strerror or e}")
+        return matches, subdirs, entries, errors
+
+    def _task(self, results: "queue.Queue", path: str, depth: int, dev: int) -> None:
+        try:
+            results.put(self.scan(path, depth, dev))
+        except BaseException as e:
+            results.put(([], [], 0, [f"{path}: {e}"]))
+
+    def _emit(self, path: str, kind: str, st: os.stat_result) -> Dict[str, Any]:
+        self.stats["matched"] += 1
+        return make_record(path, kind, st)
+
+    def walk(self) -> Iterator[Dict[str, Any]]:
+        started = time.monotonic()
+        results: "queue.Queue" = queue.Queue()
+        outstanding = 0
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for root in self.roots:
+                try:
+                    st = os.stat(root)
+                except OSError as e:
+                    self.stats["errors"] += 1
+                    self.error_samples.append(f"{root}: {e.strerror or e}")
+                    continue
+                kind = "d" if os.path.isdir(root) else "f"
+                name = os.path.basename(root) or root
+                if self.filter.match_name(name) and self.filter.match(root, kind, lambda: st) is not None:
+                    yield self._emit(root, kind, st)
+                    if self.limit and self.stats["matched"] >= self.limit:
+                        self.stats["truncated"] = True
+                        return
+                if kind == "d" and self.max_depth != 0:
+                    pool.submit(self._task, results, root, 0, st.st_dev)
+                    outstanding += 1
+            while outstanding:
+                matches, subdirs, entries, errors = results.get()
+                outstanding -= 1
+                self.stats["dirs"] += 1
+                self.stats["entries"] += entries
+                self.stats["errors"] += len(errors)
+                self.error_samples.extend(errors[:max(10 - len(self.error_samples), 0)])
+                for subdir in subdirs:
+                    pool.submit(self._task, results, *subdir)
+                    outstanding += 1
+                for path, kind, st in matches:
+                    yield self._emit(path, kind, st)
+                    if self.limit and self.stats["matched"] >= self.limit:
+                        self.stats["truncated"] = True
+                        return
+        finally:
+            # 达到 limit 或调用方提前结束时，排队中的目录任务直接返回
+            self._stop.set()
+            pool.shutdown(wait=True)
+            self.stats["seconds"] = round(time.monotonic() - started, 3)
+            self.stats["error_samples"] = self.error_samples
+
+
+def main() -> None:
+    spec = json.loads(sys.argv[1])
+    try:
+        walker = Walker(spec)
+    except (ValueError, re.error) as e:
+        print("@ERROR " + str(e))
+        return
+    for record in walker.walk():
+        sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.write("@DONE " + json.dumps(walker.stats) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+基于 os.scandir 的分页目录列表：一次只 stat 当前页的条目（按大小/时间排序时需要 stat 全部条目），
+用有界堆选出一页，内存只与页大小有关；游标记录上一页的位置，百万级条目的目录也可以逐页读取。
+只依赖标准库，远程执行时整个文件通过 SSH 标准输入交给目标机的 python3 运行，
+每个条目输出一行紧凑的 JSON 数组，最后一行为 @DONE 统计
+"""
+import base64
+import fnmatch
+import heapq
+import json
+import os
+import re
+import stat
+import sys
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SORT_KEYS = ("name", "size", "mtime", "none")
+# 与 ls -S、ls -t 相同，按大小与时间排序时默认从大到小、从新到旧
+DESCENDING_SORTS = ("size", "mtime")
+# 紧凑行的字段顺序
+ROW_FIELDS = ("name", "type", "size", "mtime", "mode", "owner", "group", "target")
+TYPE_CODES = ((stat.S_ISDIR, "d"), (stat.S_ISREG, "f"), (stat.S_ISLNK, "l"), (stat.S_ISFIFO, "p"),
+              (stat.S_ISSOCK, "s"), (stat.S_ISCHR, "c"), (stat.S_ISBLK, "b"))
+
+Row = List[Any]
+
+
+def encode_cursor(value: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str], order: str) -> Optional[Dict[str, Any]]:
+    """游标中记录排序方式，换了排序再翻页会得到错乱的结果，因此直接拒绝"""
+    if not cursor:
+        return None
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValueError("invalid cursor")
+    if not isinstance(value, dict) or value.get("order") != order or ("offset" not in value and "key" not in value):
+        raise ValueError("cursor does not belong to this listing, keep sort and reverse unchanged between pages")
+    return value
+
+
+class _Names:
+    """uid/gid 到名称的缓存，目标机上不存在的 ID 原样返回数字"""
+
+    def __init__(self) -> None:
+        self.users: Dict[int, Any] = {}
+        self.groups: Dict[int, Any] = {}
+
+    def user(self, uid: int) -> Any:
+        if uid not in self.users:
+            import pwd
+            try:
+                self.users[uid] = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                self.users[uid] = uid
+        return self.users[uid]
+
+    def group(self, gid: int) -> Any:
+        if gid not in self.groups:
+            import grp
+            try:
+                self.groups[gid] = grp.getgrgid(gid).gr_name
+            except KeyError:
+                self.groups[gid] = gid
+        return self.groups[gid]
+
+
+def _type_code(mode: int) -> str:
+    for check, code in TYPE_CODES:
+        if check(mode):
+            return code
+    return "o"
+
+
+def make_row(name: str, path: str, st: os.stat_result, names: _Names) -> Row:
+    code = _type_code(st.st_mode)
+    target = None
+    if code == "l":
+        try:
+            target = os.readlink(path)
+        except OSError:
+            pass
+    return [name, code, st.st_size, datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+            stat.filemode(st.st_mode), names.user(st.st_uid), names.group(st.st_gid), target]
+
+
+class Lister:
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.path = spec["path"]
+        self.sort = spec.get("sort") or "name"
+        self.descending = (self.sort in DESCENDING_SORTS) != bool(spec.get("reverse"))
+        self.limit = int(spec.get("limit") or 1000)
+        self.show_all = bool(spec.get("all"))
+        self.match = re.compile(fnmatch.translate(spec["pattern"])).match if spec.get("pattern") else None
+        self.order = f"{self.sort}-" if self.descending else f"{self.sort}+"
+        self.cursor = decode_cursor(spec.get("cursor"), self.order)
+        self.names = _Names()
+        self.stats = {"scanned": 0, "errors": 0}
+
+    def _wanted(self, name: str) -> bool:
+        if not self.show_all and name.startswith("."):
+            return False
+        return self.match is None or self.match(name) is not None
+
+    def _stat(self, entry: os.DirEntry) -> Optional[os.stat_result]:
+        try:
+            return entry.stat(follow_symlinks=False)
+        except OSError:
+            # 列出期间被删除或无权限
+            self.stats["errors"] += 1
+            return None
+
+    def _unsorted(self) -> Tuple[List[Row], Optional[Dict[str, Any]]]:
+        """按目录读取顺序分页，游标为已读取的原始条目数；目录不变时前后页不重不漏"""
+        skip = self.cursor.get("offset", 0) if self.cursor else 0
+        rows: List[Row] = []
+        with os.scandir(self.path) as iterator:
+            for position, entry in enumerate(iterator):
+                if position < skip:
+                    continue
+                self.stats["scanned"] += 1
+                if not self._wanted(entry.name):
+                    continue
+                if len(rows) == self.limit:
+                    return rows, {"order": self.order, "offset": position}
+                st = self._stat(entry)
+                if st is not None:
+                    rows.append(make_row(entry.name, entry.path, st, self.names))
+        return rows, None
+
+    def _sorted(self) -> Tuple[List[Row], Optional[Dict[str, Any]], int]:
+        """
+        键集分页：只保留排在游标之后的条目，用大小为 limit + 1 的堆选出下一页，多出的一个用于判断是否还有下一页；
+        按名称排序时只比较名称，页内条目才 stat
+        """
+        by_name = self.sort == "name"
+        after = tuple(self.cursor["key"]) if self.cursor and "key" in self.cursor else None
+        keys: List[Tuple[Any, ...]] = []
+        entries: Dict[str, os.DirEntry] = {}
+        stats: Dict[str, os.stat_result] = {}
+        matched = 0
+
+        def key_of(entry: os.DirEntry, st: Optional[os.stat_result]) -> Tuple[Any, ...]:
+            if by_name:
+                return (entry.name,)
+            return (st.st_size if self.sort == "size" else st.st_mtime_ns, entry.name)
+
+        select: Callable[..., List[Tuple[Any, ...]]] = heapq.nlargest if self.descending else heapq.nsmallest
+        with os.scandir(self.path) as iterator:
+            for entry in iterator:
+                self.stats["scanned"] += 1
+                if not self._wanted(entry.name):
+                    continue
+                st = None if by_name else self._stat(entry)
+                if not by_name and st is None:
+                    continue
+                matched += 1
+                key = key_of(entry, st)
+                if after is not None and (key >= after if self.descending else key <= after):
+                    continue
+                entries[entry.name] = entry
+                if st is not None:
+                    stats[entry.name] = st
+                keys.append(key)
+                # 定期裁剪，内存保持在页大小的常数倍
+                if len(keys) >= 4 * (self.limit + 1):
+                    keys = select(self.limit + 1, keys)
+                    kept = {key[-1] for key in keys}
+                    entries = {name: entries[name] for name in kept}
+                    stats = {name: stats[name] for name in kept if name in stats}
+        keys = select(self.limit + 1, keys)
+        more = len(keys) > self.limit
+        keys = keys[:self.limit]
+        rows = []
+        for key in keys:
+            name = key[-1]
+            st = stats.get(name) or self._stat(entries[name])
+            if st is not None:
+                rows.append(make_row(name, entries[name].path, st, self.names))
+        cursor = {"order": self.order, "key": list(keys[-1])} if more and keys else None
+        return rows, cursor, matched
+
+    def run(self) -> Tuple[List[Row], Dict[str, Any]]:
+        st = os.lstat(self.path)
+        if not stat.S_ISDIR(os.stat(self.path).st_mode):
+            # 与 ls 相同，目标为文件时只列出它自身
+            return [make_row(os.path.basename(self.path), self.path, st, self.names)], {"next_cursor": None}
+        info: Dict[str, Any] = {}
+        if self.sort == "none":
+            rows, cursor = self._unsorted()
+        else:
+            rows, cursor, info["matched"] = self._sorted()
+        info["next_cursor"] = encode_cursor(cursor) if cursor else None
+        info.update(self.stats, returned=len(rows))
+        return rows, info
+
+
+def main() -> None:
+    spec = json.loads(sys.argv[1])
+    try:
+        rows, info = Lister(spec).run()
+    except (OSError, ValueError, re.error) as e:
+        print("@ERROR " + (e.strerror if isinstance(e, OSError) and e.strerror else str(e)))
+        return
+    write = sys.stdout.write
+    for row in rows:
+        write(json.dumps(row, separators=(",", ":")) + "\n")
+    write("@DONE " + json.dumps(info) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""列表调度：校验参数，本地直接运行 lister，远程把 lister 交给目标机的 python3 执行并把紧凑行还原为字典"""
+import json
+from typing import Any, Dict, List, Optional
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.ls.src import lister
+from servers.ls.src.base import stream_python
+
+MAX_LIMIT = 10000
+
+
+def build_spec(path: Optional[str], is_zh: bool, pattern: Optional[str] = None, sort: str = "name",
+               reverse: bool = False, limit: int = 1000, cursor: Optional[str] = None,
+               show_all: bool = False) -> Dict[str, Any]:
+    if not path:
+        raise ValueError("目标路径不能为空" if is_zh else "Target path cannot be empty")
+    if sort not in lister.SORT_KEYS:
+        raise ValueError(f"sort 只能是 {', '.join(lister.SORT_KEYS)}" if is_zh
+                         else f"sort must be one of {', '.join(lister.SORT_KEYS)}")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit 范围为 1~{MAX_LIMIT}" if is_zh else f"limit must be 1-{MAX_LIMIT}")
+    return {"path": path, "pattern": pattern, "sort": sort, "reverse": reverse, "limit": limit, "cursor": cursor,
+            "all": show_all}
+
+
+def list_directory(host_config: Optional[RemoteConfigModel], spec: Dict[str, Any], is_zh: bool,
+                   timeout: float = 120) -> Dict[str, Any]:
+    """返回 {"path", "entries", "next_cursor", "stats"}，next_cursor 为空表示已是最后一页"""
+    if host_config is None:
+        try:
+            rows, info = lister.Lister(spec).run()
+        except OSError as e:
+            detail = e.strerror or str(e)
+            raise ValueError(f"无法列出 {spec['path']}: {detail}" if is_zh
+                             else f"Cannot list {spec['path']}: {detail}") from e
+        except ValueError as e:
+            raise ValueError(f"无法列出 {spec['path']}: {e}" if is_zh else f"Cannot list {spec['path']}: {e}") from e
+    else:
+        rows: List[List[Any]] = []
+        info = {}
+        for line in stream_python(host_config, lister.__file__, spec, is_zh, timeout):
+            if line.startswith("["):
+                rows.append(json.loads(line))
+            elif line.startswith("@DONE "):
+                info = json.loads(line[len("@DONE "):])
+            elif line.startswith("@ERROR "):
+                detail = line[len("@ERROR "):]
+                raise ValueError(f"无法列出 {spec['path']}: {detail}" if is_zh
+                                 else f"Cannot list {spec['path']}: {detail}")
+    next_cursor = info.pop("next_cursor", None)
+    return {"path": spec["path"], "entries": [dict(zip(lister.ROW_FIELDS, row)) for row in rows],
+            "next_cursor": next_cursor, "stats": info}
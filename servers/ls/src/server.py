@@ -1,10 +1,8 @@
-from typing import Union, List, Dict
+from typing import Union, Dict
 import platform
 import os
-import paramiko
 import yaml
 import datetime
-import subprocess
 from typing import Any, Dict
 import psutil
 import tempfile
@@ -12,6 +10,8 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.ls.config_loader import LsConfig
+from servers.ls.src.base import find_remote_host
+from servers.ls.src.listing import build_spec, list_directory
 mcp = FastMCP("Ls MCP Server", host="0.0.0.0", port=LsConfig().get_config().private_config.port)
 
 
@@ -21,84 +21,61 @@ mcp = FastMCP("Ls MCP Server", host="0.0.0.0", port=LsConfig().get_config().priv
     else
     "ls_collect_tool",
     description='''
-    使用ls命令列出目录内容
+    列出目录内容及元数据：基于 os.scandir，分页返回，百万级条目的目录也可以通过游标逐页读取；
+    远程主机通过SSH把列表程序交给目标机的 python3 执行（需要目标机安装 python3）
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则对本机进行操作
-        - file: 目标文件/目录
-    2. 返回值为目标目录内容的列表
+        - file: 目标文件/目录，目标为文件时只返回它自身
+        - pattern: 文件名通配符，如 *.log，只返回匹配的条目
+        - sort: 排序方式，name 按名称（默认）、size 按大小从大到小、mtime 按修改时间从新到旧、
+          none 不排序（按目录读取顺序，每页只读取到该页为止，适合超大目录）
+        - reverse: 是否反转排序，默认 false
+        - limit: 每页条目数，范围 1~10000，默认1000
+        - cursor: 上一页返回的 next_cursor，用于读取下一页；翻页时 sort、reverse 须保持不变
+        - all: 是否包含以 . 开头的隐藏条目，默认 false
+    2. 返回值为字典：
+        - path: 目标路径
+        - entries: 条目列表，每项包含 name、type（f 普通文件、d 目录、l 符号链接、p 管道、s 套接字、
+          c 字符设备、b 块设备）、size（字节）、mtime、mode（如 -rw-r--r--）、owner、group、target（符号链接指向）
+        - next_cursor: 下一页游标，为空表示已是最后一页
+        - stats: 统计信息，包含 scanned（读取的条目数）、matched（排序时匹配的条目总数）、returned、errors
     '''
     if LsConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Use the `ls` command to list the contents of a directory
+    List the contents of a directory with metadata: based on os.scandir and paginated, so directories with millions
+    of entries can be read page by page with a cursor; remote hosts run the lister by handing it to python3 on the
+    target over SSH (python3 is required on the target)
     1. Input values are as follows:
         - host: The name or IP address of the remote host; if not provided, the operation is performed on the local machine.
-        - file: The target file/directory.
-    2. The return value is a list of the contents of the target directory
+        - file: The target file/directory; a file is listed as itself.
+        - pattern: Filename glob such as *.log, only matching entries are returned
+        - sort: name (default), size (largest first), mtime (newest first), or none (directory order, each page only
+          reads up to its last entry, best for huge directories)
+        - reverse: Reverse the order, default false
+        - limit: Entries per page, 1 to 10000, default 1000
+        - cursor: next_cursor of the previous page to read the next one; keep sort and reverse unchanged between pages
+        - all: Include hidden entries starting with ., default false
+    2. The return value is a dictionary:
+        - path: The target path
+        - entries: Entries, each with name, type (f regular file, d directory, l symbolic link, p fifo, s socket,
+          c character device, b block device), size (bytes), mtime, mode (e.g. -rw-r--r--), owner, group and
+          target (of a symbolic link)
+        - next_cursor: Cursor of the next page, empty on the last page
+        - stats: Statistics: scanned (entries read), matched (total matching entries when sorted), returned, errors
     '''
 
 )
-def ls_collect_tool(host: Union[str, None] = None, file: str = './') -> List[Dict[str, Any]]:
-    """使用ls命令列出目录内容"""
-    if host is None:
-        try:
-            command = ['ls']
-            command.append(file)
-
-            result = subprocess.run(command, capture_output=True, text=True)
-            lines = result.stdout.split('\n')
-            file_list = []
-            for line in lines:
-                file_list.append({
-                    "name": line
-                })
-            return file_list
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"执行 {command} 命令失败: {e.stderr}") from e
-        except Exception as e:
-            raise RuntimeError(f"执行 {command} 命令发生未知错误: {str(e)}") from e
-    else:
-        for host_config in LsConfig().get_config().public_config.remote_hosts:
-            if host == host_config.name or host == host_config.host:
-                try:
-                    # 建立SSH连接
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(
-                        hostname=host_config.host,
-                        port=host_config.port,
-                        username=host_config.username,
-                        password=host_config.password
-                    )
-                    command = 'ls'
-                    command += f' {file}'
-                    stdin, stdout, stderr = ssh.exec_command(command, timeout = 20)
-                    error = stderr.read().decode().strip()
-                    output = stdout.read().decode().strip()
-                    lines = output.split('\n')
-                    file_list = []
-                    for line in lines:
-                        file_list.append({
-                            "name": line
-                        })
-                    return file_list
-                except paramiko.AuthenticationException:
-                    raise ValueError("SSH认证失败，请检查用户名和密码")
-                except paramiko.SSHException as e:
-                    raise ValueError(f"SSH连接错误: {str(e)}")
-                except Exception as e:
-                    raise ValueError(f"远程执行 {command} 失败: {str(e)}")
-                finally:
-                    # 确保SSH连接关闭
-                    if ssh is not None:
-                        try:
-                            ssh.close()
-                        except Exception:
-                            pass
-        if LsConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"未找到远程主机: {host}")
-        else:
-            raise ValueError(f"Remote host not found: {host}")
+def ls_collect_tool(host: Union[str, None] = None, file: str = './', pattern: str = None, sort: str = "name",
+                    reverse: bool = False, limit: int = 1000, cursor: str = None,
+                    all: bool = False) -> Dict[str, Any]:
+    """列出目录内容及元数据"""
+    cfg = LsConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    spec = build_spec(file, is_zh, pattern=pattern, sort=sort, reverse=reverse, limit=limit, cursor=cursor,
+                      show_all=all)
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return list_directory(host_config, spec, is_zh)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+"""
+批量创建目录：每项为 {path, mode}，与 mkdir -p 相同逐级创建，已存在时视为成功；
+给出 mode 时与 mkdir -m 相同，最终目录的权限不受 umask 影响。
+各项在有界线程池中并发执行；makedirs 容忍上级目录被其他线程同时创建，同一批中嵌套的路径（如 a 与 a/b）
+无需排序，mode 只作用于每项的最终目录，逐级创建的上级目录使用默认权限。
+只依赖标准库，远程执行时整个文件通过 SSH 标准输入交给目标机的 python3 运行，结果为最后一行 @RESULT JSON
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 32
+MAX_ITEMS = 10000
+
+
+def make_dir(item: Dict[str, Any]) -> Dict[str, Any]:
+    path = item["path"]
+    existed = os.path.isdir(path)
+    os.makedirs(path, exist_ok=True)
+    if item.get("mode") is not None:
+        os.chmod(path, item["mode"])
+    return {"existed": existed}
+
+
+def run_batch(items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """返回 {"results": [...], "succeeded", "failed", "seconds"}，results 与 items 一一对应"""
+    started = time.monotonic()
+
+    def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return dict(item, ok=True, **(make_dir(item) or {}))
+        except (OSError, ValueError) as e:
+            detail = e.strerror if isinstance(e, OSError) and e.strerror else str(e)
+            return dict(item, ok=False, error=detail)
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(items)), 1)) as pool:
+        results = list(pool.map(run, items))
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded,
+            "seconds": round(time.monotonic() - started, 3)}
+
+
+def main() -> None:
+    args = json.loads(sys.argv[1])
+    result = run_batch(args["items"], args["workers"])
+    sys.stdout.write("@RESULT " + json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
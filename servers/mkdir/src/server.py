@@ -12,6 +12,8 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.mkdir.config_loader import MkdirConfig
+from servers.mkdir.src import batch
+from servers.mkdir.src.base import find_remote_host, run_python
 mcp = FastMCP("Mkdir MCP Server", host="0.0.0.0", port=MkdirConfig().get_config().private_config.port)
 
 
@@ -99,6 +101,85 @@ def mkdir_collect_tool(host: Union[str, None] = None, dir: str = None) -> bool:
             raise ValueError(f"Remote host not found: {host}")
 
 
+def _parse_mode(value: Any, is_zh: bool) -> Union[int, None]:
+    if value is None or value == "":
+        return None
+    try:
+        mode = value if isinstance(value, int) else int(str(value), 8)
+    except ValueError:
+        mode = -1
+    if not 0 <= mode <= 0o7777:
+        raise ValueError(f"mode 格式错误: {value}，示例: 755" if is_zh else f"Invalid mode: {value}, e.g. 755")
+    return mode
+
+
+def _check_batch(items: List[Any], workers: int, is_zh: bool) -> None:
+    if not items or len(items) > batch.MAX_ITEMS:
+        raise ValueError(f"操作列表不能为空，且最多 {batch.MAX_ITEMS} 项" if is_zh
+                         else f"The operation list must contain 1-{batch.MAX_ITEMS} items")
+    if not 1 <= workers <= batch.MAX_WORKERS:
+        raise ValueError(f"workers 范围为 1~{batch.MAX_WORKERS}" if is_zh else f"workers must be 1-{batch.MAX_WORKERS}")
+
+
+def _execute(host: Union[str, None], items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """本地直接执行；远程把整批操作交给目标机的 python3，只建立一次SSH连接"""
+    cfg = MkdirConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if host is None:
+        return batch.run_batch(items, workers)
+    host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_python(host_config, batch.__file__, {"items": items, "workers": workers}, is_zh, timeout=600)
+
+
+@mcp.tool(
+    name="mkdir_batch_tool"
+    if MkdirConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "mkdir_batch_tool",
+    description='''
+    批量创建目录：与 mkdir -p 相同逐级创建，已存在时视为成功，可为每个目录设置权限；
+    整批操作在本机一次完成，或在远程主机上通过一个SSH连接交给目标机的 python3 执行，各项并发执行并分别返回结果
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则对本机进行操作
+        - dirs: 操作列表，每项为目录路径字符串，或 {"path": 目录路径, "mode": 权限（如 755，与 mkdir -m 相同）}，
+          最多 10000 项
+        - workers: 并发数，范围 1~32，默认8
+    2. 返回值为字典：
+        - results: 与输入顺序一致的结果列表，每项包含输入的字段、ok（是否成功）、existed（是否已存在），失败时包含 error
+        - succeeded/failed: 成功与失败的项数
+        - seconds: 执行耗时
+    '''
+    if MkdirConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Create directories in bulk: like mkdir -p, parents are created as needed and existing directories count as
+    success, optionally with permissions per directory; the whole batch runs in one local pass, or on a remote host
+    as one python3 script over a single SSH connection, items run concurrently and each gets its own result
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the operation is performed on the local machine
+        - dirs: Operations, each a directory path string or {"path": directory path, "mode": permissions such as 755,
+          as in mkdir -m}, at most 10000 items
+        - workers: Concurrency, 1 to 32, default 8
+    2. The return value is a dictionary:
+        - results: Results in input order, each with the input fields, ok (success), existed (already existed), and error on failure
+        - succeeded/failed: Number of items that succeeded and failed
+        - seconds: Elapsed time
+    '''
+
+)
+def mkdir_batch_tool(host: Union[str, None] = None, dirs: List[Union[str, Dict[str, Any]]] = None, workers: int = 8) -> Dict[str, Any]:
+    """批量创建目录"""
+    is_zh = MkdirConfig().get_config().public_config.language == LanguageEnum.ZH
+    _check_batch(dirs, workers, is_zh)
+    items = []
+    for item in dirs:
+        item = {"path": item} if isinstance(item, str) else item
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str) or not item["path"]:
+            raise ValueError("每项须包含 path" if is_zh else "Each item requires path")
+        items.append({"path": item["path"], "mode": _parse_mode(item.get("mode"), is_zh)})
+    return _execute(host, items, workers)
+
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='sse')
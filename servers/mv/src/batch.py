@@ -0,0 +1,48 @@
+"""
+批量移动/重命名：每项为 {source, target}，与 mv 相同，目标为已存在的目录时移入其中，跨文件系统时复制后删除源。
+默认 workers=1，按列表顺序逐项执行，互相依赖的重命名（如 a→b、b→c）可以放在同一批中；
+workers 大于1时各项并发执行且没有先后顺序，只适用于互不相关的移动。某项失败不影响后续各项。
+只依赖标准库，远程执行时整个文件通过 SSH 标准输入交给目标机的 python3 运行，结果为最后一行 @RESULT JSON
+"""
+import json
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+DEFAULT_WORKERS = 1
+MAX_WORKERS = 32
+MAX_ITEMS = 10000
+
+
+def move(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {"destination": shutil.move(item["source"], item["target"])}
+
+
+def run_batch(items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """返回 {"results": [...], "succeeded", "failed", "seconds"}，results 与 items 一一对应"""
+    started = time.monotonic()
+
+    def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return dict(item, ok=True, **(move(item) or {}))
+        except (OSError, ValueError) as e:
+            detail = e.strerror if isinstance(e, OSError) and e.strerror else str(e)
+            return dict(item, ok=False, error=detail)
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(items)), 1)) as pool:
+        results = list(pool.map(run, items))
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded,
+            "seconds": round(time.monotonic() - started, 3)}
+
+
+def main() -> None:
+    args = json.loads(sys.argv[1])
+    result = run_batch(args["items"], args["workers"])
+    sys.stdout.write("@RESULT " + json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
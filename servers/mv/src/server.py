@@ -12,6 +12,8 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.mv.config_loader import MvConfig
+from servers.mv.src import batch
+from servers.mv.src.base import find_remote_host, run_python
 mcp = FastMCP("Mv MCP Server", host="0.0.0.0", port=MvConfig().get_config().private_config.port)
 
 
@@ -105,6 +107,74 @@ def mv_collect_tool(host: Union[str, None] = None, source: str = None, target: s
             raise ValueError(f"Remote host not found: {host}")
 
 
+def _check_batch(items: List[Any], workers: int, is_zh: bool) -> None:
+    if not items or len(items) > batch.MAX_ITEMS:
+        raise ValueError(f"操作列表不能为空，且最多 {batch.MAX_ITEMS} 项" if is_zh
+                         else f"The operation list must contain 1-{batch.MAX_ITEMS} items")
+    if not 1 <= workers <= batch.MAX_WORKERS:
+        raise ValueError(f"workers 范围为 1~{batch.MAX_WORKERS}" if is_zh else f"workers must be 1-{batch.MAX_WORKERS}")
+
+
+def _execute(host: Union[str, None], items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """本地直接执行；远程把整批操作交给目标机的 python3，只建立一次SSH连接"""
+    cfg = MvConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if host is None:
+        return batch.run_batch(items, workers)
+    host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_python(host_config, batch.__file__, {"items": items, "workers": workers}, is_zh, timeout=600)
+
+
+@mcp.tool(
+    name="mv_batch_tool"
+    if MvConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "mv_batch_tool",
+    description='''
+    批量移动或重命名文件/目录：与 mv 相同，目标为已存在的目录时移入其中，跨文件系统时复制后删除源；
+    整批操作在本机一次完成，或在远程主机上通过一个SSH连接交给目标机的 python3 执行，每项分别返回结果
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则对本机进行操作
+        - moves: 操作列表，每项为 {"source": 源文件或目录, "target": 目标文件或目录}，最多 10000 项
+        - workers: 并发数，范围 1~32，默认1（按列表顺序逐项执行）；各项互不依赖时可调大，
+          互相依赖的重命名（如 a→b、b→c）须保持为1
+    2. 返回值为字典：
+        - results: 与输入顺序一致的结果列表，每项包含输入的字段、ok（是否成功）、destination（最终路径），失败时包含 error
+        - succeeded/failed: 成功与失败的项数
+        - seconds: 执行耗时
+    '''
+    if MvConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Move or rename files/directories in bulk: like mv, a source moved onto an existing directory goes inside it and
+    moves across filesystems copy then delete the source; the whole batch runs in one local pass, or on a remote
+    host as one python3 script over a single SSH connection, and each item gets its own result
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the operation is performed on the local machine
+        - moves: Operations, each {"source": source file or directory, "target": target file or directory},
+          at most 10000 items
+        - workers: Concurrency, 1 to 32, default 1 (items run in list order); raise it only for independent items,
+          dependent renames such as a->b, b->c must keep 1
+    2. The return value is a dictionary:
+        - results: Results in input order, each with the input fields, ok (success), destination (final path), and error on failure
+        - succeeded/failed: Number of items that succeeded and failed
+        - seconds: Elapsed time
+    '''
+
+)
+def mv_batch_tool(host: Union[str, None] = None, moves: List[Dict[str, str]] = None, workers: int = 1) -> Dict[str, Any]:
+    """批量移动或重命名文件/目录"""
+    is_zh = MvConfig().get_config().public_config.language == LanguageEnum.ZH
+    _check_batch(moves, workers, is_zh)
+    items = []
+    for item in moves:
+        if not isinstance(item, dict) or not all(isinstance(item.get(key), str) and item[key]
+                                                 for key in ("source", "target")):
+            raise ValueError("每项须包含 source 与 target" if is_zh else "Each item requires source and target")
+        items.append({"source": item["source"], "target": item["target"]})
+    return _execute(host, items, workers)
+
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='sse')
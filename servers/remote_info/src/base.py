@@ -0,0 +1,116 @@
+"""公共基础层：封装远程主机查找与采集脚本执行等复用逻辑"""
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+
+import paramiko
+
+from config.public.base_config_loader import RemoteConfigModel
+
+
+def parse_proc_stat(line: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """解析一行 /proc/<pid>/stat（或 task/<tid>/stat），进程名可能包含空格与括号"""
+    lpar = line.find("(")
+    rpar = line.rfind(")")
+    if lpar <= 0 or rpar < lpar:
+        return None
+    try:
+        pid = int(line[:lpar])
+    except ValueError:
+        return None
+    fields = line[rpar + 2:].split()
+    if len(fields) < 22:
+        return None
+    return pid, {
+        "name": line[lpar + 1:rpar],
+        "state": fields[0],
+        "ppid": int(fields[1]),
+        "minflt": int(fields[7]),
+        "majflt": int(fields[9]),
+        "utime": int(fields[11]),
+        "stime": int(fields[12]),
+        "num_threads": int(fields[17]),
+        "starttime": int(fields[19]),
+        "rss_pages": int(fields[21]),
+        "processor": int(fields[36]) if len(fields) > 36 else None,
+    }
+
+
+def find_remote_host(host_name: str, remote_hosts: List[RemoteConfigModel], is_zh: bool) -> RemoteConfigModel:
+    """查找远程主机配置"""
+    for host in remote_hosts:
+        if host.name == host_name or host.host == host_name:
+            return host
+
+    available = ", ".join([h.name for h in remote_hosts])
+    msg = (
+        f"未找到远程主机: {host_name}，可用: {available}" if is_zh
+        else f"Host not found: {host_name}, available: {available}"
+    )
+    raise ValueError(msg)
+
+
+def open_ssh_client(host_config: RemoteConfigModel, is_zh: bool) -> paramiko.SSHClient:
+    """建立到远程主机的SSH连接"""
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            hostname=host_config.host,
+            port=host_config.port,
+            username=host_config.username,
+            password=host_config.password,
+            timeout=10,
+            banner_timeout=10
+        )
+    except paramiko.AuthenticationException as e:
+        client.close()
+        msg = "SSH认证失败，请检查用户名和密码" if is_zh else "SSH authentication failed, check username and password"
+        raise ConnectionError(msg) from e
+    except Exception as e:
+        client.close()
+        msg = f"SSH连接失败: {str(e)}" if is_zh else f"SSH connection failed: {str(e)}"
+        raise ConnectionError(msg) from e
+    return client
+
+
+def run_local_script(script: str, is_zh: bool, timeout: float = 60) -> str:
+    """在本机通过 sh 执行采集脚本并返回标准输出"""
+    try:
+        result = subprocess.run(
+            ["sh", "-s"],
+            input=script,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired as e:
+        msg = f"本地采集脚本执行超时（{timeout}秒）" if is_zh else f"Local collection script timed out ({timeout}s)"
+        raise RuntimeError(msg) from e
+    if result.returncode != 0 and not result.stdout:
+        msg = (
+            f"本地采集脚本执行失败: {result.stderr.strip()}" if is_zh
+            else f"Local collection script failed: {result.stderr.strip()}"
+        )
+        raise RuntimeError(msg)
+    return result.stdout
+
+
+def run_remote_script(host_config: RemoteConfigModel, script: str, is_zh: bool, timeout: float = 60) -> str:
+    """通过一次SSH会话在远程主机执行采集脚本（脚本经标准输入传入，避免转义问题）"""
+    client = open_ssh_client(host_config, is_zh)
+    try:
+        stdin, stdout, stderr = client.exec_command("sh -s", timeout=timeout)
+        stdin.write(script)
+        stdin.channel.shutdown_write()
+        output = stdout.read().decode("utf-8", errors="replace")
+        exit_code = stdout.channel.recv_exit_status()
+        error = stderr.read().decode("utf-8", errors="replace").strip()
+        if exit_code != 0 and not output:
+            msg = (
+                f"远程采集脚本执行失败: {error or exit_code}" if is_zh
+                else f"Remote collection script failed: {error or exit_code}"
+            )
+            raise RuntimeError(msg)
+        return output
+    finally:
+        client.close()
@@ -0,0 +1,243 @@
+"""主机清单实现：一次往返采集操作系统、CPU、内存、磁盘、网络与DNS信息，静态部分按 boot ID 缓存"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.remote_info.src.base import run_local_script, run_remote_script
+from servers.remote_info.src.fsusage import build_remote_script as build_disk_script, parse_remote_usage
+
+# 并发采集的主机数上限
+MAX_HOSTS_IN_FLIGHT = 16
+
+# 静态部分（系统版本、CPU型号与核数、频率范围）只在 boot ID 变化（重启）后重新采集
+INVENTORY_SCRIPT = """
+boot_id=$(cat /proc/sys/kernel/random/boot_id 2>/dev/null)
+echo "@BOOTID $boot_id"
+if [ -z "$boot_id" ] || [ "$boot_id" != "{boot_id}" ]; then
+    echo "@STATIC"
+    echo "@UNAME $(uname -s)|$(uname -r)|$(uname -v)|$(uname -m)"
+    grep -E '^(NAME|VERSION|ID|VERSION_ID|PRETTY_NAME)=' /etc/os-release 2>/dev/null | sed 's/^/@OSREL /'
+    awk -F: '
+    /^model name/ && m == "" {{ m = $2 }}
+    /^processor/ {{ n++ }}
+    /^physical id/ {{ p = $2 }}
+    /^core id/ {{ c[p ":" $2] = 1 }}
+    END {{ k = 0; for (x in c) k++; sub(/^[ \\t]+/, "", m); printf "@CPUINFO %d %d %s\\n", n, k, m }}' /proc/cpuinfo
+    for f in cpuinfo_max_freq cpuinfo_min_freq; do
+        echo "@FREQ $f $(cat /sys/devices/system/cpu/cpu0/cpufreq/$f 2>/dev/null)"
+    done
+fi
+echo "@HOSTNAME $(uname -n)"
+echo "@UPTIME $(cut -d' ' -f1 /proc/uptime)"
+echo "@LOADAVG $(cut -d' ' -f1-3 /proc/loadavg)"
+grep '^cpu[0-9]' /proc/stat | sed 's/^/@STAT1 /'
+sleep {interval}
+grep '^cpu[0-9]' /proc/stat | sed 's/^/@STAT2 /'
+echo "@CURFREQ $(cat /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq 2>/dev/null)"
+awk '/^cpu MHz/ {{ printf "@MHZ %s\\n", $4; exit }}' /proc/cpuinfo
+grep -E '^(MemTotal|MemFree|MemAvailable|Buffers|Cached|Shmem|SwapTotal|SwapFree):' /proc/meminfo | sed 's/^/@MEM /'
+ip -o addr show 2>/dev/null | sed 's/^/@ADDR /'
+grep -H '' /sys/class/net/*/address /sys/class/net/*/operstate 2>/dev/null | sed 's/^/@NET /'
+sed 's/^/@RESOLV /' /etc/resolv.conf 2>/dev/null
+"""
+
+# 每台主机的静态信息缓存：{host: {"boot_id": ..., "os": {...}, "cpu": {...}}}
+_static_cache: Dict[str, Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def build_inventory_script(boot_id: str, interval: float, disk_timeout: float) -> str:
+    script = INVENTORY_SCRIPT.format(boot_id="".join(c for c in boot_id if c.isalnum() or c == "-"),
+                                     interval=float(interval))
+    # 磁盘部分复用文件系统用量脚本，同样对每个挂载点单独超时
+    return script + build_disk_script(disk_timeout)
+
+
+def _parse_static(lines: List[str]) -> Dict[str, Any]:
+    os_info: Dict[str, Any] = {}
+    cpu: Dict[str, Any] = {}
+    for line in lines:
+        tag, _, rest = line.partition(" ")
+        if tag == "@UNAME":
+            fields = rest.split("|")
+            if len(fields) == 4:
+                os_info.update(system=fields[0], release=fields[1], kernel_version=fields[2], machine=fields[3])
+        elif tag == "@OSREL":
+            key, _, value = rest.partition("=")
+            os_info[key.lower()] = value.strip().strip('"')
+        elif tag == "@CPUINFO":
+            parts = rest.split(" ", 2)
+            total = int(parts[0]) if parts[0].isdigit() else None
+            cores = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+            cpu.update(
+                model=parts[2].strip() if len(parts) > 2 else None,
+                total_cores=total,
+                # 部分架构（如虚拟机、ARM）没有 core id，物理核数退化为逻辑核数
+                physical_cores=cores or total,
+            )
+        elif tag == "@FREQ":
+            name, _, value = rest.partition(" ")
+            key = "max_frequency" if name == "cpuinfo_max_freq" else "min_frequency"
+            cpu[key] = int(value) / 1000 if value.strip().isdigit() else None
+    return {"os": os_info, "cpu": cpu}
+
+
+def _cpu_usage(first: Dict[str, List[int]], second: Dict[str, List[int]]) -> List[float]:
+    """两次 /proc/stat 采样之间每个核心的使用率"""
+    usage = []
+    for name in sorted(second, key=lambda n: int(n[3:])):
+        if name not in first:
+            continue
+        before, after = first[name], second[name]
+        total = sum(after) - sum(before)
+        # idle + iowait
+        idle = (after[3] + after[4]) - (before[3] + before[4])
+        usage.append(round((total - idle) / total * 100, 1) if total > 0 else 0.0)
+    return usage
+
+
+def parse_inventory_output(output: str) -> Dict[str, Any]:
+    """解析 INVENTORY_SCRIPT 输出，静态部分单独返回以便缓存"""
+    static_lines: List[str] = []
+    in_static = False
+    boot_id = ""
+    stats: Dict[str, Dict[str, List[int]]] = {"@STAT1": {}, "@STAT2": {}}
+    mem: Dict[str, int] = {}
+    addrs: Dict[str, Dict[str, Any]] = {}
+    sysfs: Dict[str, Dict[str, str]] = {}
+    dns: Dict[str, List[str]] = {"nameservers": [], "search": []}
+    dynamic: Dict[str, Any] = {}
+    cur_freq = None
+    for line in output.splitlines():
+        tag, _, rest = line.partition(" ")
+        if tag == "@BOOTID":
+            boot_id = rest.strip()
+        elif tag == "@STATIC":
+            in_static = True
+        elif tag in ("@UNAME", "@OSREL", "@CPUINFO", "@FREQ"):
+            if in_static:
+                static_lines.append(line)
+        elif tag == "@HOSTNAME":
+            dynamic["hostname"] = rest.strip()
+        elif tag == "@UPTIME":
+            dynamic["uptime_seconds"] = float(rest) if rest.strip() else None
+        elif tag == "@LOADAVG":
+            dynamic["load_avg"] = [float(v) for v in rest.split()]
+        elif tag in stats:
+            fields = rest.split()
+            if len(fields) >= 5:
+                stats[tag][fields[0]] = [int(v) for v in fields[1:9]]
+        elif tag == "@CURFREQ":
+            if rest.strip().isdigit():
+                cur_freq = int(rest) / 1000
+        elif tag == "@MHZ":
+            if cur_freq is None:
+                cur_freq = float(rest)
+        elif tag == "@MEM":
+            key, _, value = rest.partition(":")
+            mem[key] = int(value.split()[0]) * 1024
+        elif tag == "@ADDR":
+            parts = rest.split()
+            if len(parts) < 4:
+                continue
+            iface = addrs.setdefault(parts[1], {"ipv4": [], "ipv6": []})
+            address, _, prefix = parts[3].partition("/")
+            iface["ipv4" if parts[2] == "inet" else "ipv6"].append({"address": address, "prefix": prefix})
+        elif tag == "@NET":
+            path, _, value = rest.partition(":")
+            segments = path.split("/")
+            if len(segments) >= 6:
+                sysfs.setdefault(segments[4], {})[segments[5]] = value.strip()
+        elif tag == "@RESOLV":
+            parts = rest.split()
+            if parts and parts[0] == "nameserver" and len(parts) > 1:
+                dns["nameservers"].append(parts[1])
+            elif parts and parts[0] == "search":
+                dns["search"].extend(parts[1:])
+
+    total = mem.get("MemTotal", 0)
+    available = mem.get("MemAvailable", mem.get("MemFree", 0))
+    dynamic["cpu"] = {"current_frequency": cur_freq, "cpu_usage": _cpu_usage(stats["@STAT1"], stats["@STAT2"])}
+    dynamic["memory"] = {
+        "total": round(total / (1024 ** 2), 1),
+        "available": round(available / (1024 ** 2), 1),
+        "used": round((total - available) / (1024 ** 2), 1),
+        "free": round(mem.get("MemFree", 0) / (1024 ** 2), 1),
+        "buff_cache": round((mem.get("Buffers", 0) + mem.get("Cached", 0)) / (1024 ** 2), 1),
+        "shared": round(mem.get("Shmem", 0) / (1024 ** 2), 1),
+        "swap_total": round(mem.get("SwapTotal", 0) / (1024 ** 2), 1),
+        "swap_free": round(mem.get("SwapFree", 0) / (1024 ** 2), 1),
+        "percent": round((total - available) / total * 100, 1) if total else None,
+    }
+    network = []
+    for name in sorted(set(addrs) | set(sysfs)):
+        ipv4 = addrs.get(name, {}).get("ipv4", [])
+        network.append({
+            "interface": name,
+            "ip_address": ipv4[0]["address"] if ipv4 else None,
+            "netmask": ipv4[0]["prefix"] if ipv4 else None,
+            "mac_address": sysfs.get(name, {}).get("address"),
+            "is_up": sysfs.get(name, {}).get("operstate") == "up",
+            "addresses": ipv4 + addrs.get(name, {}).get("ipv6", []),
+        })
+    dynamic["network"] = network
+    dynamic["dns"] = dns
+    dynamic["disk"] = parse_remote_usage(output)
+    return {
+        "boot_id": boot_id,
+        "static": _parse_static(static_lines) if in_static else None,
+        "dynamic": dynamic,
+    }
+
+
+def collect_inventory(host_config: Optional[RemoteConfigModel], interval: float, disk_timeout: float,
+                      is_zh: bool) -> Dict[str, Any]:
+    """采集单台主机清单；静态部分命中缓存时脚本不再输出这些内容"""
+    key = "localhost" if host_config is None else host_config.name
+    with _cache_lock:
+        cached = _static_cache.get(key)
+    script = build_inventory_script(cached["boot_id"] if cached else "", interval, disk_timeout)
+    timeout = interval + disk_timeout + 30
+    if host_config is None:
+        output = run_local_script(script, is_zh, timeout=timeout)
+    else:
+        output = run_remote_script(host_config, script, is_zh, timeout=timeout)
+    parsed = parse_inventory_output(output)
+
+    static_cached = parsed["static"] is None and cached is not None
+    if static_cached:
+        static = cached
+    else:
+        static = dict(parsed["static"] or {"os": {}, "cpu": {}}, boot_id=parsed["boot_id"])
+        with _cache_lock:
+            _static_cache[key] = static
+
+    dynamic = parsed["dynamic"]
+    return {
+        "host": key,
+        "boot_id": parsed["boot_id"],
+        "static_cached": static_cached,
+        "hostname": dynamic["hostname"],
+        "uptime_seconds": dynamic["uptime_seconds"],
+        "os": static["os"],
+        "cpu": dict(static["cpu"], load_avg=dynamic.get("load_avg"), **dynamic["cpu"]),
+        "memory": dynamic["memory"],
+        "disk": dynamic["disk"],
+        "network": dynamic["network"],
+        "dns": dynamic["dns"],
+    }
+
+
+def collect_inventories(host_configs: List[Optional[RemoteConfigModel]], interval: float, disk_timeout: float,
+                        is_zh: bool) -> List[Dict[str, Any]]:
+    """并发采集多台主机，单台失败只在该主机的结果中返回 error"""
+    def collect(host_config: Optional[RemoteConfigModel]) -> Dict[str, Any]:
+        try:
+            return collect_inventory(host_config, interval, disk_timeout, is_zh)
+        except Exception as e:
+            return {"host": "localhost" if host_config is None else host_config.name, "error": str(e)}
+
+    workers = max(min(MAX_HOSTS_IN_FLIGHT, len(host_configs)), 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(collect, host_configs))
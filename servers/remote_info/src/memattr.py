@@ -0,0 +1,265 @@
+"""内存归属实现：基于 /proc/<pid>/smaps_rollup 统计进程的 PSS/USS/Swap，并汇总 /proc/meminfo 中的内核内存"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.remote_info.src.base import run_remote_script
+
+ROLLUP_KEYS = ("Rss", "Pss", "Private_Clean", "Private_Dirty", "Swap", "SwapPss")
+SORT_KEYS = ("pss", "uss", "swap")
+
+# 并行读取 smaps_rollup 的线程数上限（读取 procfs 时会释放 GIL）
+MAX_WORKERS = 16
+
+# 一次 grep 流式读取所有进程的 smaps_rollup，由 awk 在目标机上按进程汇总；
+# 内核线程没有地址空间，smaps_rollup 为空，不产生任何输出；
+# timeout 限制扫描总时长，grep 使用行缓冲保证超时前已读到的数据不丢失
+ATTRIBUTION_SCRIPT = """
+echo "@MEMINFO"
+cat /proc/meminfo
+set -- /proc/[0-9]*/smaps_rollup
+echo "@TOTAL $#"
+if command -v timeout >/dev/null 2>&1; then
+    runner="timeout {budget}"
+else
+    runner=""
+fi
+rows=$({{ $runner grep --line-buffered -H -E '^(Rss|Pss|Private_Clean|Private_Dirty|Swap|SwapPss):' "$@" 2>/dev/null
+    echo "@RC $?"; }} | awk '
+$1 == "@RC" {{ rc = $2; next }}
+{{
+    split($1, path, "/"); pid = path[3]; key = substr($1, index($1, ":") + 1)
+    if (!(pid in seen)) {{ seen[pid] = 1; order[++n] = pid }}
+    v[pid, key] = $2
+}}
+END {{
+    printf "@RC %d\\n", rc
+    for (i = 1; i <= n; i++) {{
+        p = order[i]
+        printf "%s %d %d %d %d %d\\n", p, v[p, "Rss:"], v[p, "Pss:"],
+            v[p, "Private_Clean:"] + v[p, "Private_Dirty:"], v[p, "Swap:"], v[p, "SwapPss:"]
+    }}
+}}')
+printf '%s\\n' "$rows" | grep '^@RC'
+printf '%s\\n' "$rows" | awk '$1 != "@RC" {{ n++; pss += $3; uss += $4; swap += $5 }}
+    END {{ printf "@SUM %d %d %d %d\\n", n, pss, uss, swap }}'
+top=""
+for col in 3 4 5; do
+    top="$top $(printf '%s\\n' "$rows" | grep -v '^@RC' | sort -k$col -n -r | head -n {top_n} | awk '{{ printf " %s", $1 }}')"
+done
+files=""
+for p in $top; do
+    files="$files /proc/$p/comm"
+done
+echo "@ROWS"
+printf '%s\\n' "$rows" | awk -v keep="$top" '
+BEGIN {{ n = split(keep, a, " "); for (i = 1; i <= n; i++) k[a[i]] = 1 }}
+$1 in k'
+if [ -n "$files" ]; then
+    grep -H '' $files 2>/dev/null
+fi
+exit 0
+"""
+
+
+def parse_meminfo(content: str) -> Dict[str, Any]:
+    """/proc/meminfo 中与内核内存、共享内存、大页相关的汇总（单位MB）"""
+    raw: Dict[str, int] = {}
+    for line in content.splitlines():
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts and parts[0].isdigit():
+            raw[key] = int(parts[0])
+
+    def mb(key: str) -> Optional[float]:
+        return round(raw[key] / 1024, 1) if key in raw else None
+
+    hugepage_kb = raw.get("Hugepagesize", 0)
+    return {
+        "total_mb": mb("MemTotal"),
+        "available_mb": mb("MemAvailable"),
+        "free_mb": mb("MemFree"),
+        "buffers_mb": mb("Buffers"),
+        "cached_mb": mb("Cached"),
+        "anon_mb": mb("AnonPages"),
+        "shmem_mb": mb("Shmem"),
+        "slab_mb": mb("Slab"),
+        "slab_reclaimable_mb": mb("SReclaimable"),
+        "slab_unreclaimable_mb": mb("SUnreclaim"),
+        "kernel_stack_mb": mb("KernelStack"),
+        "page_tables_mb": mb("PageTables"),
+        "vmalloc_used_mb": mb("VmallocUsed"),
+        "anon_hugepages_mb": mb("AnonHugePages"),
+        "shmem_hugepages_mb": mb("ShmemHugePages"),
+        "hugepages": {
+            "total": raw.get("HugePages_Total"),
+            "free": raw.get("HugePages_Free"),
+            "reserved": raw.get("HugePages_Rsvd"),
+            "size_kb": hugepage_kb or None,
+            "hugetlb_mb": mb("Hugetlb") if "Hugetlb" in raw
+            else round(raw.get("HugePages_Total", 0) * hugepage_kb / 1024, 1),
+        },
+        "swap_total_mb": mb("SwapTotal"),
+        "swap_free_mb": mb("SwapFree"),
+    }
+
+
+def _read_rollup(pid: str) -> Optional[Tuple[int, ...]]:
+    """读取单个进程的 smaps_rollup，返回 (rss, pss, uss, swap, swap_pss)（kB）；内核线程返回 None"""
+    values = dict.fromkeys(ROLLUP_KEYS, 0)
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            content = f.read()
+    except OSError:
+        return None
+    if not content:
+        return None
+    for line in content.splitlines():
+        key, _, rest = line.partition(":")
+        if key in values:
+            values[key] = int(rest.split()[0])
+    return (values["Rss"], values["Pss"], values["Private_Clean"] + values["Private_Dirty"],
+            values["Swap"], values["SwapPss"])
+
+
+def _read_comm(pid: int) -> Optional[str]:
+    try:
+        with open(f"/proc/{pid}/comm") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _scan_chunk(pids: List[str], deadline: float) -> Tuple[Dict[int, Tuple[int, ...]], bool]:
+    """单个线程处理一段PID，超过截止时间立即返回已读到的部分"""
+    rows: Dict[int, Tuple[int, ...]] = {}
+    for pid in pids:
+        if time.monotonic() > deadline:
+            return rows, False
+        values = _read_rollup(pid)
+        if values is not None:
+            rows[int(pid)] = values
+    return rows, True
+
+
+def _summarize(rows: Dict[int, Tuple[int, ...]], names: Dict[int, Optional[str]], total: int,
+               complete: bool, elapsed: float, meminfo: Dict[str, Any], top_n: int) -> Dict[str, Any]:
+    def fmt(pid: int) -> Dict[str, Any]:
+        rss, pss, uss, swap, swap_pss = rows[pid]
+        return {
+            "pid": pid,
+            "name": names.get(pid),
+            "rss_mb": round(rss / 1024, 1),
+            "pss_mb": round(pss / 1024, 1),
+            "uss_mb": round(uss / 1024, 1),
+            "swap_mb": round(swap / 1024, 1),
+            "swap_pss_mb": round(swap_pss / 1024, 1),
+        }
+
+    result: Dict[str, Any] = {
+        "meminfo": meminfo,
+        "processes": {
+            "total": total,
+            "scanned": len(rows),
+            "complete": complete,
+            "elapsed": round(elapsed, 3),
+            "pss_total_mb": round(sum(r[1] for r in rows.values()) / 1024, 1),
+            "uss_total_mb": round(sum(r[2] for r in rows.values()) / 1024, 1),
+            "swap_total_mb": round(sum(r[3] for r in rows.values()) / 1024, 1),
+        },
+    }
+    for index, key in enumerate(SORT_KEYS, start=1):
+        pids = sorted(rows, key=lambda p: rows[p][index], reverse=True)[:top_n]
+        result[f"top_{key}"] = [fmt(pid) for pid in pids]
+    return result
+
+
+def collect_local_attribution(top_n: int, time_budget: float) -> Dict[str, Any]:
+    """本地多线程并行读取所有进程的 smaps_rollup"""
+    start = time.monotonic()
+    deadline = start + time_budget
+    with open("/proc/meminfo") as f:
+        meminfo = parse_meminfo(f.read())
+    pids = [d for d in os.listdir("/proc") if d.isdigit()]
+    workers = min(MAX_WORKERS, (os.cpu_count() or 1) * 2, max(len(pids), 1))
+    chunks = [pids[i::workers] for i in range(workers)]
+    rows: Dict[int, Tuple[int, ...]] = {}
+    complete = True
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for part, done in executor.map(lambda chunk: _scan_chunk(chunk, deadline), chunks):
+            rows.update(part)
+            complete = complete and done
+    top = {pid for index in range(1, len(SORT_KEYS) + 1)
+           for pid in sorted(rows, key=lambda p: rows[p][index], reverse=True)[:top_n]}
+    names = {pid: _read_comm(pid) for pid in top}
+    return _summarize(rows, names, len(pids), complete, time.monotonic() - start, meminfo, top_n)
+
+
+def parse_attribution_output(output: str) -> Dict[str, Any]:
+    """解析 ATTRIBUTION_SCRIPT 输出"""
+    meminfo_lines: List[str] = []
+    rows: Dict[int, Tuple[int, ...]] = {}
+    names: Dict[int, Optional[str]] = {}
+    sums = (0, 0, 0, 0)
+    total, rc = 0, 0
+    section = None
+    for line in output.splitlines():
+        if line in ("@MEMINFO", "@ROWS"):
+            section = line
+            continue
+        if line.startswith("@TOTAL "):
+            total = int(line.split()[1])
+            section = None
+        elif line.startswith("@RC "):
+            rc = int(line.split()[1] or 0)
+        elif line.startswith("@SUM "):
+            sums = tuple(int(v) for v in line.split()[1:5])
+        elif line.startswith("/proc/"):
+            path, _, name = line.partition(":")
+            try:
+                names[int(path.split("/")[2])] = name.strip()
+            except (IndexError, ValueError):
+                continue
+        elif section == "@MEMINFO":
+            meminfo_lines.append(line)
+        elif section == "@ROWS":
+            parts = line.split()
+            if len(parts) == 6 and all(p.isdigit() for p in parts):
+                rows[int(parts[0])] = tuple(int(p) for p in parts[1:])
+    return {
+        "meminfo": parse_meminfo("\n".join(meminfo_lines)),
+        "total": total,
+        # timeout 超时退出码为 124
+        "complete": rc != 124,
+        "sums": sums,
+        "rows": rows,
+        "names": names,
+    }
+
+
+def collect_remote_attribution(host_config: RemoteConfigModel, top_n: int, time_budget: float,
+                               is_zh: bool) -> Dict[str, Any]:
+    """远程一次SSH会话完成扫描，目标机上汇总后只回传 Top N 进程"""
+    start = time.monotonic()
+    script = ATTRIBUTION_SCRIPT.format(budget=max(float(time_budget), 0.1), top_n=int(top_n))
+    parsed = parse_attribution_output(run_remote_script(host_config, script, is_zh, timeout=time_budget + 30))
+    result = _summarize(parsed["rows"], parsed["names"], parsed["total"], parsed["complete"],
+                        time.monotonic() - start, parsed["meminfo"], top_n)
+    scanned, pss, uss, swap = parsed["sums"]
+    result["processes"].update(
+        scanned=scanned,
+        pss_total_mb=round(pss / 1024, 1),
+        uss_total_mb=round(uss / 1024, 1),
+        swap_total_mb=round(swap / 1024, 1),
+    )
+    return result
+
+
+def collect_memory_attribution(host_config: Optional[RemoteConfigModel], top_n: int, time_budget: float,
+                               is_zh: bool) -> Dict[str, Any]:
+    """统一入口：本地并行读取，远程单次流式扫描"""
+    if host_config is None:
+        return collect_local_attribution(top_n, time_budget)
+    return collect_remote_attribution(host_config, top_n, time_budget, is_zh)
@@ -0,0 +1,153 @@
+"""性能采样实现：对一组进程做一次同步的两点采样，计算CPU、内存、IO、上下文切换与缺页速率"""
+import shlex
+from typing import Any, Dict, List, Optional
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.remote_info.src.base import parse_proc_stat, run_local_script, run_remote_script
+
+IO_KEYS = ("rchar", "wchar", "syscr", "syscw", "read_bytes", "write_bytes", "cancelled_write_bytes")
+
+# 每次快照只调用一次 cat 与一次 grep，进程数量不影响命令次数；两次快照共用一个采样窗口
+SAMPLE_SCRIPT = """
+pids="{pids}"
+pattern={pattern}
+if [ -n "$pattern" ]; then
+    pids="$pids $(pgrep -f -- "$pattern" 2>/dev/null | tr '\\n' ' ')"
+fi
+echo "@HZ $(getconf CLK_TCK 2>/dev/null || echo 100)"
+echo "@PAGESIZE $(getconf PAGESIZE 2>/dev/null || echo 4096)"
+awk '/^MemTotal:/ {{ printf "@MEMTOTAL %.0f\\n", $2 * 1024 }}' /proc/meminfo
+echo "@PIDS $pids"
+stats=""
+others=""
+for p in $pids; do
+    stats="$stats /proc/$p/stat"
+    others="$others /proc/$p/io /proc/$p/status"
+done
+if [ -z "$stats" ]; then
+    exit 0
+fi
+snap() {{
+    echo "@SNAP $1 $(cut -d' ' -f1 /proc/uptime)"
+    cat $stats 2>/dev/null
+    grep -H -E '^(rchar|wchar|syscr|syscw|read_bytes|write_bytes|cancelled_write_bytes|voluntary_ctxt_switches|nonvoluntary_ctxt_switches):' $others 2>/dev/null
+}}
+snap 1
+sleep {interval}
+snap 2
+"""
+
+
+def build_sample_script(pids: List[int], pattern: Optional[str], interval: float) -> str:
+    """生成采样脚本，PID与匹配模式均经过转义"""
+    return SAMPLE_SCRIPT.format(
+        pids=" ".join(str(int(p)) for p in pids),
+        pattern=shlex.quote(pattern or ""),
+        interval=float(interval)
+    )
+
+
+def parse_samples(output: str) -> Dict[str, Any]:
+    """解析采样脚本输出为两次快照"""
+    result: Dict[str, Any] = {"hz": 100, "page_size": 4096, "mem_total": 0, "pids": [], "snapshots": {}}
+    current = None
+    for line in output.splitlines():
+        if not line:
+            continue
+        if line.startswith("@"):
+            tag, _, rest = line.partition(" ")
+            if tag == "@HZ":
+                result["hz"] = int(rest)
+            elif tag == "@PAGESIZE":
+                result["page_size"] = int(rest)
+            elif tag == "@MEMTOTAL":
+                result["mem_total"] = int(rest)
+            elif tag == "@PIDS":
+                result["pids"] = list(dict.fromkeys(int(p) for p in rest.split()))
+            elif tag == "@SNAP":
+                index, _, uptime = rest.partition(" ")
+                current = {"uptime": float(uptime), "procs": {}}
+                result["snapshots"][int(index)] = current
+            continue
+        if current is None:
+            continue
+        if line.startswith("/proc/"):
+            path, _, rest = line.partition(":")
+            key, _, value = rest.partition(":")
+            try:
+                pid = int(path.split("/")[2])
+                count = int(value.strip())
+            except (IndexError, ValueError):
+                continue
+            if pid in current["procs"]:
+                current["procs"][pid][key] = count
+        else:
+            parsed = parse_proc_stat(line)
+            if parsed:
+                current["procs"][parsed[0]] = parsed[1]
+    return result
+
+
+def compute_rates(samples: Dict[str, Any]) -> Dict[str, Any]:
+    """根据两次快照计算每个进程的速率"""
+    first = samples["snapshots"].get(1, {"uptime": 0.0, "procs": {}})
+    second = samples["snapshots"].get(2, {"uptime": 0.0, "procs": {}})
+    elapsed = max(second["uptime"] - first["uptime"], 1e-6)
+    hz = samples["hz"] or 100
+
+    def per_s(cur: Dict[str, Any], prev: Dict[str, Any], key: str) -> Optional[float]:
+        if key not in cur or key not in prev:
+            return None
+        return round(max(cur[key] - prev[key], 0) / elapsed, 1)
+
+    processes = []
+    for pid, cur in second["procs"].items():
+        prev = first["procs"].get(pid)
+        # PID 在窗口内被回收复用时 starttime 会变化，此时不计算速率
+        if prev is None or prev["starttime"] != cur["starttime"]:
+            continue
+        cpu = (cur["utime"] + cur["stime"] - prev["utime"] - prev["stime"]) / hz
+        rss = cur["rss_pages"] * samples["page_size"]
+        ctx_cur = cur.get("voluntary_ctxt_switches", 0) + cur.get("nonvoluntary_ctxt_switches", 0)
+        ctx_prev = prev.get("voluntary_ctxt_switches", 0) + prev.get("nonvoluntary_ctxt_switches", 0)
+        processes.append({
+            "pid": pid,
+            "name": cur["name"],
+            "state": cur["state"],
+            "num_threads": cur["num_threads"],
+            "cpu_percent": round(cpu / elapsed * 100, 1),
+            "rss_bytes": rss,
+            "memory_percent": round(rss / samples["mem_total"] * 100, 2) if samples["mem_total"] else None,
+            "read_bytes_per_s": per_s(cur, prev, "read_bytes"),
+            "write_bytes_per_s": per_s(cur, prev, "write_bytes"),
+            "rchar_per_s": per_s(cur, prev, "rchar"),
+            "wchar_per_s": per_s(cur, prev, "wchar"),
+            "ctx_switches_per_s": round(max(ctx_cur - ctx_prev, 0) / elapsed, 1),
+            "minor_faults_per_s": per_s(cur, prev, "minflt"),
+            "major_faults_per_s": per_s(cur, prev, "majflt"),
+            "io_counters": {key: cur[key] for key in IO_KEYS if key in cur},
+        })
+    processes.sort(key=lambda p: p["cpu_percent"], reverse=True)
+    sampled = {p["pid"] for p in processes}
+    return {
+        "interval": round(elapsed, 3),
+        "processes": processes,
+        "missing": [pid for pid in samples["pids"] if pid not in sampled],
+    }
+
+
+def sample_processes(
+    host_config: Optional[RemoteConfigModel],
+    pids: List[int],
+    pattern: Optional[str],
+    interval: float,
+    is_zh: bool
+) -> Dict[str, Any]:
+    """统一入口：本地与远程都只执行一次采样脚本，共享同一个采样窗口"""
+    script = build_sample_script(pids, pattern, interval)
+    timeout = interval + 30
+    if host_config is None:
+        output = run_local_script(script, is_zh, timeout=timeout)
+    else:
+        output = run_remote_script(host_config, script, is_zh, timeout=timeout)
+    return compute_rates(parse_samples(output))
@@ -0,0 +1,265 @@
+"""进程名索引实现：按主机缓存进程表，支持精确/前缀/正则查找，并按 /proc 中新增与退出的 PID 增量刷新"""
+import bisect
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.remote_info.src.base import parse_proc_stat, run_remote_script
+
+MATCH_MODES = ("exact", "prefix", "regex")
+
+# 超过该时长的索引整体重建，兜底处理进程运行中改写 argv（cmdline 变化而 comm 不变）的情况
+INDEX_MAX_AGE = 300.0
+
+# 一次往返完成增量刷新：一次 cat 读取全部 /proc/*/stat，awk 按 "pid starttime comm" 与已知条目对比，
+# 得到退出的PID，以及新增、被回收复用（starttime 变化）或 exec 后改名（comm 变化）的PID；
+# 只有这些PID与待校验的候选PID才重新读取 stat/cmdline，各用一次 cat 与一次 grep。
+# 已知进程表可达数千行，经 here-document 写入临时文件交给 awk，不放在环境变量或参数中（单个字符串上限 128KiB）；
+# 扫描成功时输出 @SCANNED，没有该标记说明 awk 未能执行或未读到任何进程
+REFRESH_SCRIPT = """
+tmp=$(mktemp 2>/dev/null) || tmp=/tmp/.pidindex.$$
+trap 'rm -f "$tmp"' EXIT
+cat > "$tmp" <<'@PIDINDEX_END'
+{table}
+E
+@PIDINDEX_END
+scan=$(cat /proc/[0-9]*/stat 2>/dev/null | awk '
+NR == FNR {{
+    if ($1 == "K") {{ k[substr($0, 3)] = 1; kp[$2] = 1 }} else if ($1 == "V") v[$2] = 1
+    next
+}}
+{{
+    l = index($0, "(")
+    r = length($0)
+    while (r > l && substr($0, r, 1) != ")") r--
+    if (l < 2 || r <= l) next
+    pid = substr($0, 1, l - 2)
+    split(substr($0, r + 2), f, " ")
+    seen[pid] = 1
+    lines++
+    if (!((pid " " f[20] " " substr($0, l + 1, r - l - 1)) in k) || (pid in v)) print "@READ", pid
+}}
+END {{
+    if (!lines) exit 1
+    for (p in kp) if (!(p in seen)) print "@EXITED", p
+    print "@SCANNED", lines
+}}' "$tmp" -)
+printf '%s\\n' "$scan" | grep -E '^@(EXITED|SCANNED)'
+stats=""
+cmds=""
+for p in $(printf '%s\\n' "$scan" | awk '$1 == "@READ" {{ print $2 }}'); do
+    stats="$stats /proc/$p/stat"
+    cmds="$cmds /proc/$p/cmdline"
+done
+echo "@STAT"
+if [ -n "$stats" ]; then
+    cat $stats 2>/dev/null
+    echo "@CMDLINE"
+    grep -a -H '' $cmds 2>/dev/null | tr '\\0' ' '
+fi
+exit 0
+"""
+
+
+class ProcessIndex:
+    """单台主机的进程表索引：pid -> (starttime, name, cmdline)，并维护 name -> pids 倒排"""
+
+    def __init__(self) -> None:
+        self.entries: Dict[int, Tuple[int, str, str]] = {}
+        self.by_name: Dict[str, Set[int]] = {}
+        self.sorted_names: List[str] = []
+        self.built_at = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, pid: int, starttime: int, name: str, cmdline: str) -> None:
+        self.remove(pid)
+        self.entries[pid] = (starttime, name, cmdline)
+        for key in _index_keys(name, cmdline):
+            if key not in self.by_name:
+                bisect.insort(self.sorted_names, key)
+            self.by_name.setdefault(key, set()).add(pid)
+
+    def remove(self, pid: int) -> None:
+        entry = self.entries.pop(pid, None)
+        if entry is None:
+            return
+        for key in _index_keys(entry[1], entry[2]):
+            pids = self.by_name.get(key)
+            if pids is None:
+                continue
+            pids.discard(pid)
+            if not pids:
+                del self.by_name[key]
+                pos = bisect.bisect_left(self.sorted_names, key)
+                if pos < len(self.sorted_names) and self.sorted_names[pos] == key:
+                    self.sorted_names.pop(pos)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.by_name.clear()
+        self.sorted_names.clear()
+
+    def lookup(self, pattern: str, mode: str, match_cmdline: bool) -> Set[int]:
+        """在索引中查找候选PID，不访问 /proc"""
+        if match_cmdline:
+            if mode == "regex":
+                regex = re.compile(pattern)
+                return {pid for pid, (_, _, cmd) in self.entries.items() if regex.search(cmd)}
+            if mode == "prefix":
+                return {pid for pid, (_, _, cmd) in self.entries.items() if cmd.startswith(pattern)}
+            return {pid for pid, (_, _, cmd) in self.entries.items() if cmd == pattern}
+        if mode == "exact":
+            return set(self.by_name.get(pattern, ()))
+        if mode == "prefix":
+            result: Set[int] = set()
+            pos = bisect.bisect_left(self.sorted_names, pattern)
+            while pos < len(self.sorted_names) and self.sorted_names[pos].startswith(pattern):
+                result |= self.by_name[self.sorted_names[pos]]
+                pos += 1
+            return result
+        regex = re.compile(pattern)
+        result = set()
+        for key in self.sorted_names:
+            if regex.search(key):
+                result |= self.by_name[key]
+        return result
+
+
+# 每台主机一个索引，本机使用键 "localhost"
+_indexes: Dict[str, ProcessIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_keys(name: str, cmdline: str) -> Set[str]:
+    """索引键：内核进程名（comm，最长15字符）以及 argv[0] 的文件名，后者可找回被截断的长进程名"""
+    keys = {name}
+    argv0 = cmdline.split(" ", 1)[0]
+    if argv0:
+        keys.add(os.path.basename(argv0))
+    return keys
+
+
+def _get_index(cache_key: str) -> ProcessIndex:
+    with _indexes_lock:
+        if cache_key not in _indexes:
+            _indexes[cache_key] = ProcessIndex()
+        return _indexes[cache_key]
+
+
+def _read_local_stat(pid: int) -> Optional[Tuple[int, str]]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            parsed = parse_proc_stat(f.read())
+    except OSError:
+        return None
+    return None if parsed is None else (parsed[1]["starttime"], parsed[1]["name"])
+
+
+def _read_local_cmdline(pid: int) -> Optional[str]:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode("utf-8", errors="replace").strip()
+    except OSError:
+        return None
+
+
+def _refresh_local(index: ProcessIndex, verify: Set[int]) -> None:
+    """读取全部PID的 stat，starttime 或 comm 与索引不一致的（回收复用、exec 后改名）与候选PID一起重新入索引"""
+    current = {int(d) for d in os.listdir("/proc") if d.isdigit()}
+    for pid in set(index.entries) - current:
+        index.remove(pid)
+    for pid in current:
+        stat = _read_local_stat(pid)
+        if stat is None:
+            index.remove(pid)
+            continue
+        entry = index.entries.get(pid)
+        if entry is not None and entry[:2] == stat and pid not in verify:
+            continue
+        cmdline = _read_local_cmdline(pid)
+        if cmdline is None:
+            index.remove(pid)
+        else:
+            index.add(pid, stat[0], stat[1], cmdline)
+
+
+def parse_refresh_output(output: str) -> Tuple[Set[int], Dict[int, Tuple[int, str]], Dict[int, str]]:
+    """解析 REFRESH_SCRIPT 输出，返回 (退出的PID, {pid: (starttime, name)}, {pid: cmdline})"""
+    exited: Set[int] = set()
+    stats: Dict[int, Tuple[int, str]] = {}
+    cmdlines: Dict[int, str] = {}
+    section = None
+    for line in output.splitlines():
+        if line.startswith("@EXITED "):
+            exited.add(int(line.split()[1]))
+        elif line in ("@STAT", "@CMDLINE"):
+            section = line
+        elif section == "@STAT":
+            parsed = parse_proc_stat(line)
+            if parsed:
+                stats[parsed[0]] = (parsed[1]["starttime"], parsed[1]["name"])
+        elif section == "@CMDLINE" and line.startswith("/proc/"):
+            path, _, cmd = line.partition(":")
+            try:
+                pid = int(path.split("/")[2])
+            except (IndexError, ValueError):
+                continue
+            cmdlines[pid] = cmd.strip()
+    return exited, stats, cmdlines
+
+
+def _refresh_remote(index: ProcessIndex, host_config: RemoteConfigModel, verify: Set[int], is_zh: bool) -> None:
+    # K 行为已知条目（comm 中的换行替换为空格，只会导致该进程被重新读取），V 行为待校验的候选PID
+    table = [f"K {pid} {start} {name}".replace("\n", " ") for pid, (start, name, _) in sorted(index.entries.items())]
+    table += [f"V {int(pid)}" for pid in sorted(verify)]
+    output = run_remote_script(host_config, REFRESH_SCRIPT.format(table="\n".join(table)), is_zh)
+    if not any(line.startswith("@SCANNED ") for line in output.splitlines()):
+        # 扫描失败时不能把候选当作已退出，否则所有查找都会返回空
+        raise RuntimeError("刷新远程进程表失败：未能读取 /proc/*/stat" if is_zh
+                           else "Failed to refresh the remote process table: could not read /proc/*/stat")
+    exited, stats, cmdlines = parse_refresh_output(output)
+    for pid in exited:
+        index.remove(pid)
+    for pid in verify - set(stats):
+        index.remove(pid)
+    for pid, (starttime, name) in stats.items():
+        index.add(pid, starttime, name, cmdlines.get(pid, ""))
+
+
+def resolve_pids(
+    host_config: Optional[RemoteConfigModel],
+    pattern: str,
+    mode: str,
+    match_cmdline: bool,
+    is_zh: bool
+) -> List[int]:
+    """
+    先在缓存索引中找出候选PID，再通过一次刷新同时完成：
+    清理已退出的PID、读取新增PID、重新读取 starttime 或 comm 变化的PID以及全部候选PID；
+    PID 被回收复用或 exec 成新程序后都会以新进程信息重新入索引再匹配，既不返回过期结果，也不会漏掉改名后匹配的进程
+    """
+    if mode not in MATCH_MODES:
+        raise ValueError(
+            f"匹配模式必须是 {', '.join(MATCH_MODES)} 之一" if is_zh
+            else f"Match mode must be one of {', '.join(MATCH_MODES)}"
+        )
+    if mode == "regex":
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"无效的正则表达式: {e}" if is_zh else f"Invalid regular expression: {e}") from e
+
+    index = _get_index("localhost" if host_config is None else host_config.name)
+    with index.lock:
+        if time.monotonic() - index.built_at > INDEX_MAX_AGE:
+            index.clear()
+            index.built_at = time.monotonic()
+        candidates = index.lookup(pattern, mode, match_cmdline)
+        if host_config is None:
+            _refresh_local(index, candidates)
+        else:
+            _refresh_remote(index, host_config, candidates, is_zh)
+        return sorted(index.lookup(pattern, mode, match_cmdline))
@@ -0,0 +1,135 @@
+"""连通性探测实现：基于 asyncio 并发执行 TCP 建连与系统 ping，输出主机×端口的延迟/可达性矩阵"""
+import asyncio
+import math
+import re
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+PING_RTT = re.compile(r"time[=<]([\d.]+)\s*ms")
+
+
+def _summary(rtts: List[float], attempts: int) -> Dict[str, Any]:
+    """K 次尝试的 min/avg/max 与丢失率"""
+    return {
+        "attempts": attempts,
+        "succeeded": len(rtts),
+        "loss_percent": round((attempts - len(rtts)) / attempts * 100, 1) if attempts else None,
+        "min_ms": round(min(rtts), 3) if rtts else None,
+        "avg_ms": round(sum(rtts) / len(rtts), 3) if rtts else None,
+        "max_ms": round(max(rtts), 3) if rtts else None,
+        "reachable": bool(rtts),
+    }
+
+
+async def _tcp_connect(address: str, port: int, timeout: float) -> Tuple[Optional[float], Optional[str]]:
+    """单次 TCP 建连，返回 (RTT毫秒, 错误信息)"""
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout)
+    except asyncio.TimeoutError:
+        return None, "timeout"
+    except OSError as e:
+        return None, e.strerror or str(e)
+    rtt = (time.perf_counter() - start) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return rtt, None
+
+
+async def probe_tcp(address: str, port: int, attempts: int, timeout: float,
+                    semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """同一目标的多次尝试依次进行，避免相互干扰；不同目标之间并发"""
+    rtts: List[float] = []
+    error = None
+    for _ in range(attempts):
+        async with semaphore:
+            rtt, error_msg = await _tcp_connect(address, port, timeout)
+        if rtt is None:
+            error = error_msg
+        else:
+            rtts.append(rtt)
+    result = _summary(rtts, attempts)
+    result["error"] = error if not rtts else None
+    return result
+
+
+async def probe_icmp(address: str, attempts: int, timeout: float,
+                     semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """调用系统 ping 发送 K 个报文，解析每个回复的 time= 字段"""
+    if shutil.which("ping") is None:
+        return dict(_summary([], attempts), error="ping not found")
+    command = ["ping", "-n", "-c", str(attempts), "-i", "0.2", "-W", str(max(math.ceil(timeout), 1)), address]
+    async with semaphore:
+        proc = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+        try:
+            output, _ = await asyncio.wait_for(proc.communicate(), attempts * 0.2 + timeout + 1)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return dict(_summary([], attempts), error="timeout")
+        except asyncio.CancelledError:
+            # 总截止时间到达时探测被取消，不能留下仍在运行的 ping 子进程
+            proc.kill()
+            await proc.wait()
+            raise
+    text = output.decode("utf-8", errors="replace")
+    rtts = [float(v) for v in PING_RTT.findall(text)][:attempts]
+    result = _summary(rtts, attempts)
+    result["error"] = None if rtts else (text.strip().splitlines() or ["no reply"])[-1]
+    return result
+
+
+async def probe_matrix(targets: List[Tuple[str, str, List[int]]], attempts: int, timeout: float,
+                       concurrency: int, deadline: float, icmp: bool) -> Dict[str, Any]:
+    """
+    targets 为 (名称, 地址, 端口列表)；所有探测并发执行，由信号量限制同时进行的探测数，
+    超过总截止时间仍未完成的探测取消并标记为 deadline_exceeded
+    """
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks: Dict[Tuple[int, str, Optional[int]], asyncio.Task] = {}
+    for index, (_, address, ports) in enumerate(targets):
+        if icmp:
+            tasks[(index, "icmp", None)] = asyncio.ensure_future(probe_icmp(address, attempts, timeout, semaphore))
+        for port in ports:
+            tasks[(index, "tcp", port)] = asyncio.ensure_future(
+                probe_tcp(address, port, attempts, timeout, semaphore)
+            )
+
+    if tasks:
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    matrix = []
+    for index, (name, address, ports) in enumerate(targets):
+        row: Dict[str, Any] = {"host": name, "address": address, "tcp": {}}
+        for (i, kind, port), task in tasks.items():
+            if i != index:
+                continue
+            if task.cancelled():
+                cell = dict(_summary([], attempts), error="deadline_exceeded")
+            elif task.exception() is not None:
+                cell = dict(_summary([], attempts), error=str(task.exception()))
+            else:
+                cell = task.result()
+            if kind == "icmp":
+                row["icmp"] = cell
+            else:
+                row["tcp"][str(port)] = cell
+        row["reachable"] = any(cell["reachable"] for cell in row["tcp"].values()) or \
+            bool(row.get("icmp", {}).get("reachable"))
+        matrix.append(row)
+    return {
+        "attempts": attempts,
+        "elapsed": round(time.perf_counter() - start, 3),
+        "matrix": matrix,
+    }
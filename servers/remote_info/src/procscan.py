@@ -0,0 +1,273 @@
+"""进程维度实现：单次扫描 /proc 获取 Top N 进程与批量进程详情"""
+import shlex
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.remote_info.src.base import parse_proc_stat, run_remote_script
+
+# 一次 cat + 一次 grep 流式读取全部 /proc/<pid>/stat 与 statm，由 awk 在目标机上保留 Top N，
+# 只有入选进程才会再读取 smaps_rollup 获取 PSS/Swap，传输量与进程总数无关
+TOP_SCRIPT = """
+ps=$(getconf PAGESIZE 2>/dev/null || echo 4096)
+awk '/^MemTotal:/ {{ printf "@MEMTOTAL %.0f\\n", $2 * 1024 }}' /proc/meminfo
+top=$({{ cat /proc/[0-9]*/stat 2>/dev/null; grep -H '' /proc/[0-9]*/statm 2>/dev/null; }} | awk -v n={k} -v ps="$ps" '
+index($0, "/proc/") == 1 {{
+    split($0, kv, ":"); split(kv[1], path, "/"); pid = path[3]
+    split(kv[2], m, " "); rss[pid] = m[2] * ps; shr[pid] = m[3] * ps
+    next
+}}
+{{
+    l = index($0, "("); r = length($0)
+    while (r > l && substr($0, r, 1) != ")") r--
+    pid = substr($0, 1, l - 2); stat[pid] = $0
+}}
+END {{
+    for (pid in rss) {{
+        if (!(pid in stat)) continue
+        total++
+        v = rss[pid]
+        if (cnt < n) {{ cnt++; k = cnt }} else if (v > tv[cnt]) {{ k = cnt }} else continue
+        while (k > 1 && tv[k - 1] < v) {{ tv[k] = tv[k - 1]; tp[k] = tp[k - 1]; k-- }}
+        tv[k] = v; tp[k] = pid
+    }}
+    printf "@TOTAL %d\\n", total
+    for (i = 1; i <= cnt; i++) {{
+        p = tp[i]
+        printf "@M %s %.0f %.0f\\n", p, rss[p], shr[p]
+        print stat[p]
+    }}
+}}')
+printf '%s\\n' "$top"
+files=$(printf '%s\\n' "$top" | awk '$1 == "@M" {{ printf " /proc/%s/smaps_rollup", $2 }}')
+if [ -n "$files" ]; then
+    grep -H -E '^(Pss|Swap):' $files 2>/dev/null
+fi
+exit 0
+"""
+
+# 按给定PID列表一次性读取详情，每个PID只增加少量文件读取，不再单独建立SSH会话
+DETAIL_SCRIPT = """
+ps=$(getconf PAGESIZE 2>/dev/null || echo 4096)
+echo "@PAGESIZE $ps"
+echo "@HZ $(getconf CLK_TCK 2>/dev/null || echo 100)"
+awk '/^btime/ {{ print "@BTIME", $2 }}' /proc/stat
+awk '/^MemTotal:/ {{ printf "@MEMTOTAL %.0f\\n", $2 * 1024 }}' /proc/meminfo
+for p in {pids}; do
+    if [ ! -r /proc/$p/stat ]; then
+        echo "@GONE $p"
+        continue
+    fi
+    echo "@PID $p"
+    cat /proc/$p/stat 2>/dev/null
+    echo "@STATM $(cat /proc/$p/statm 2>/dev/null)"
+    grep -E '^(Pss|Swap):' /proc/$p/smaps_rollup 2>/dev/null
+    grep -E '^(Uid|voluntary_ctxt_switches|nonvoluntary_ctxt_switches):' /proc/$p/status 2>/dev/null
+    echo "@FDS $(ls /proc/$p/fd 2>/dev/null | wc -l)"
+    echo "@CMD $(tr '\\0' ' ' < /proc/$p/cmdline 2>/dev/null)"
+done
+exit 0
+"""
+
+
+def _kb_line(line: str) -> Optional[int]:
+    """解析 'Pss:    1234 kB' 形式的行，返回字节数"""
+    parts = line.split()
+    if len(parts) >= 2 and parts[1].isdigit():
+        return int(parts[1]) * 1024
+    return None
+
+
+def parse_top_output(output: str) -> Dict[str, Any]:
+    """解析 TOP_SCRIPT 输出"""
+    mem_total = 0
+    total = 0
+    processes: List[Dict[str, Any]] = []
+    by_pid: Dict[int, Dict[str, Any]] = {}
+    pending: Optional[Dict[str, Any]] = None
+    for line in output.splitlines():
+        if not line:
+            continue
+        if line.startswith("@MEMTOTAL "):
+            mem_total = int(line.split()[1])
+        elif line.startswith("@TOTAL "):
+            total = int(line.split()[1])
+        elif line.startswith("@M "):
+            _, pid, rss, shared = line.split()
+            pending = {"pid": int(pid), "rss_bytes": int(rss), "shared_bytes": int(shared)}
+        elif line.startswith("/proc/"):
+            path, _, rest = line.partition(":")
+            pid = int(path.split("/")[2])
+            value = _kb_line(rest)
+            if pid in by_pid and value is not None:
+                key = "pss_bytes" if rest.startswith("Pss") else "swap_bytes"
+                by_pid[pid][key] = value
+        elif pending is not None:
+            parsed = parse_proc_stat(line)
+            if parsed:
+                _, stat = parsed
+                pending.update(name=stat["name"], state=stat["state"], num_threads=stat["num_threads"],
+                               pss_bytes=None, swap_bytes=None)
+                processes.append(pending)
+                by_pid[pending["pid"]] = pending
+            pending = None
+    return {"mem_total": mem_total, "total": total, "processes": processes}
+
+
+def _format_top(proc: Dict[str, Any], mem_total: int) -> Dict[str, Any]:
+    return {
+        "pid": proc["pid"],
+        "name": proc["name"],
+        "memory": round(proc["rss_bytes"] / (1024 * 1024), 2),
+        "memory_percent": round(proc["rss_bytes"] / mem_total * 100, 2) if mem_total else None,
+        "rss_bytes": proc["rss_bytes"],
+        "pss_bytes": proc.get("pss_bytes"),
+        "swap_bytes": proc.get("swap_bytes"),
+        "shared_bytes": proc.get("shared_bytes"),
+        "state": proc.get("state"),
+        "num_threads": proc.get("num_threads"),
+    }
+
+
+def collect_local_top(k: int) -> List[Dict[str, Any]]:
+    """本地按RSS取Top K，仅对入选进程读取PSS"""
+    processes = []
+    for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'status', 'num_threads']):
+        try:
+            mem = proc.info['memory_info']
+            if mem is None:
+                continue
+            processes.append({
+                "proc": proc,
+                "pid": proc.info['pid'],
+                "name": proc.info['name'],
+                "rss_bytes": mem.rss,
+                "shared_bytes": getattr(mem, "shared", None),
+                "state": proc.info['status'],
+                "num_threads": proc.info['num_threads'],
+            })
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+    processes.sort(key=lambda x: x['rss_bytes'], reverse=True)
+    top = processes[:k]
+    for item in top:
+        try:
+            full = item["proc"].memory_full_info()
+            item["pss_bytes"] = getattr(full, "pss", None)
+            item["swap_bytes"] = getattr(full, "swap", None)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    mem_total = psutil.virtual_memory().total
+    return [_format_top(item, mem_total) for item in top]
+
+
+def collect_remote_top(host_config: RemoteConfigModel, k: int, is_zh: bool) -> List[Dict[str, Any]]:
+    """远程单次扫描 /proc，在目标机上完成Top K筛选"""
+    output = run_remote_script(host_config, TOP_SCRIPT.format(k=int(k)), is_zh)
+    parsed = parse_top_output(output)
+    return [_format_top(proc, parsed["mem_total"]) for proc in parsed["processes"]]
+
+
+def parse_detail_output(output: str) -> List[Dict[str, Any]]:
+    """解析 DETAIL_SCRIPT 输出"""
+    page_size, hz, btime, mem_total = 4096, 100, 0, 0
+    details: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for line in output.splitlines():
+        if not line:
+            continue
+        tag, _, rest = line.partition(" ")
+        if tag == "@PAGESIZE":
+            page_size = int(rest)
+        elif tag == "@HZ":
+            hz = int(rest)
+        elif tag == "@BTIME":
+            btime = int(rest)
+        elif tag == "@MEMTOTAL":
+            mem_total = int(rest)
+        elif tag == "@GONE":
+            details.append({"pid": int(rest), "error": "process not found"})
+            current = None
+        elif tag == "@PID":
+            current = {"pid": int(rest), "memory_info": {}}
+            details.append(current)
+        elif current is None:
+            continue
+        elif tag == "@STATM":
+            fields = rest.split()
+            if len(fields) >= 3:
+                current["memory_info"].update(vms=int(fields[0]) * page_size, rss=int(fields[1]) * page_size,
+                                              shared=int(fields[2]) * page_size)
+        elif tag == "@FDS":
+            current["num_fds"] = int(rest or 0)
+        elif tag == "@CMD":
+            current["cmdline"] = rest.strip()
+        elif tag == "Pss:":
+            current["memory_info"]["pss"] = _kb_line(line)
+        elif tag == "Swap:":
+            current["memory_info"]["swap"] = _kb_line(line)
+        elif tag == "Uid:":
+            current["uid"] = int(rest.split()[0])
+        elif tag in ("voluntary_ctxt_switches:", "nonvoluntary_ctxt_switches:"):
+            current.setdefault("num_ctx_switches", {})[tag[:-len("_ctxt_switches:")]] = int(rest.strip())
+        else:
+            parsed = parse_proc_stat(line)
+            if parsed:
+                _, stat = parsed
+                current.update(
+                    name=stat["name"],
+                    status=stat["state"],
+                    ppid=stat["ppid"],
+                    num_threads=stat["num_threads"],
+                    create_time=datetime.fromtimestamp(btime + stat["starttime"] / hz).strftime("%Y-%m-%d %H:%M:%S"),
+                    cpu_times={"user": stat["utime"] / hz, "system": stat["stime"] / hz},
+                )
+    for item in details:
+        rss = item.get("memory_info", {}).get("rss")
+        if rss is not None and mem_total:
+            item["memory_percent"] = round(rss / mem_total * 100, 2)
+    return details
+
+
+def collect_local_details(pids: List[int]) -> List[Dict[str, Any]]:
+    """本地批量获取进程详情"""
+    details = []
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                cpu_times = proc.cpu_times()
+                item = {
+                    "pid": pid,
+                    "name": proc.name(),
+                    "status": proc.status(),
+                    "ppid": proc.ppid(),
+                    "num_threads": proc.num_threads(),
+                    "create_time": datetime.fromtimestamp(proc.create_time()).strftime("%Y-%m-%d %H:%M:%S"),
+                    "cpu_times": {"user": cpu_times.user, "system": cpu_times.system},
+                    "memory_info": proc.memory_info()._asdict(),
+                    "memory_percent": round(proc.memory_percent(), 2),
+                    "cmdline": " ".join(proc.cmdline()),
+                }
+            try:
+                full = proc.memory_full_info()
+                item["memory_info"].update(pss=getattr(full, "pss", None), swap=getattr(full, "swap", None))
+                item["num_fds"] = proc.num_fds()
+                item["num_ctx_switches"] = proc.num_ctx_switches()._asdict()
+            except psutil.AccessDenied:
+                pass
+            details.append(item)
+        except psutil.NoSuchProcess:
+            details.append({"pid": pid, "error": "process not found"})
+        except psutil.AccessDenied:
+            details.append({"pid": pid, "error": "access denied"})
+    return details
+
+
+def collect_remote_details(host_config: RemoteConfigModel, pids: List[int], is_zh: bool) -> List[Dict[str, Any]]:
+    """远程一次SSH会话批量获取进程详情"""
+    script = DETAIL_SCRIPT.format(pids=" ".join(shlex.quote(str(int(p))) for p in pids))
+    return parse_detail_output(run_remote_script(host_config, script, is_zh))
@@ -0,0 +1,198 @@
+"""报告存储实现：压缩写入、追加写入、索引与保留策略，读取时按字节范围流式解压"""
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Optional
+
+can_use_zstd = True
+try:
+    import zstandard
+except ImportError:
+    can_use_zstd = False
+
+COMPRESSIONS = {"zstd": ".zst", "gzip": ".gz", "none": ""}
+INDEX_FILE = "index.json"
+
+# 单次读取返回的最大字节数
+MAX_READ_LENGTH = 1024 * 1024
+# 跳过 offset 之前的内容时每次解压的块大小
+SKIP_CHUNK = 256 * 1024
+
+_lock = threading.Lock()
+
+
+class ReportStore:
+    """
+    报告目录结构：<id>.txt[.gz|.zst] 加一个 index.json；
+    追加写入时 gzip 新增一个 member、zstd 新增一个 frame，不需要解压重写已有内容
+    """
+
+    def __init__(self, directory: str, compression: str, is_zh: bool) -> None:
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"不支持的压缩方式: {compression}，可选: {', '.join(COMPRESSIONS)}" if is_zh
+                else f"Unsupported compression: {compression}, supported: {', '.join(COMPRESSIONS)}"
+            )
+        if compression == "zstd" and not can_use_zstd:
+            raise ValueError(
+                "zstd压缩需要安装zstandard，请执行 pip install zstandard 或改用gzip" if is_zh
+                else "zstd compression requires zstandard, run pip install zstandard or use gzip"
+            )
+        self.directory = os.path.realpath(directory)
+        self.compression = compression
+        self.is_zh = is_zh
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self._index_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _save_index(self, entries: List[Dict[str, Any]]) -> None:
+        tmp = self._index_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp, self._index_path())
+
+    def _find(self, entries: List[Dict[str, Any]], report_id: str) -> Dict[str, Any]:
+        for entry in entries:
+            if entry["id"] == report_id:
+                return entry
+        raise ValueError(f"报告不存在: {report_id}" if self.is_zh else f"Report not found: {report_id}")
+
+    def _append_bytes(self, path: str, compression: str, data: bytes) -> None:
+        with open(path, "ab") as raw:
+            if compression == "gzip":
+                with gzip.GzipFile(fileobj=raw, mode="ab") as f:
+                    f.write(data)
+            elif compression == "zstd":
+                raw.write(zstandard.ZstdCompressor().compress(data))
+            else:
+                raw.write(data)
+
+    def write(self, content: str, host: Optional[str], tags: List[str], report_id: Optional[str],
+              append: bool, retention: Dict[str, float]) -> Dict[str, Any]:
+        data = content.encode("utf-8", errors="ignore")
+        now = datetime.now()
+        with _lock:
+            entries = self._load_index()
+            if append:
+                entry = self._find(entries, report_id or "")
+                path = os.path.join(self.directory, entry["file"])
+                self._append_bytes(path, entry["compression"], data)
+                entry["size"] += len(data)
+                entry["updated"] = now.strftime("%Y-%m-%d %H:%M:%S")
+                entry["tags"] = sorted(set(entry["tags"]) | set(tags))
+            else:
+                report_id = report_id or f"system_report_{now.strftime('%Y%m%d_%H%M%S%f')}"
+                if any(e["id"] == report_id for e in entries) or os.sep in report_id or report_id.startswith("."):
+                    raise ValueError(
+                        f"报告ID已存在或不合法: {report_id}" if self.is_zh
+                        else f"Report ID already exists or is invalid: {report_id}"
+                    )
+                entry = {
+                    "id": report_id,
+                    "file": f"{report_id}.txt{COMPRESSIONS[self.compression]}",
+                    "host": host,
+                    "created": now.strftime("%Y-%m-%d %H:%M:%S"),
+                    "updated": now.strftime("%Y-%m-%d %H:%M:%S"),
+                    "created_ts": now.timestamp(),
+                    "size": len(data),
+                    "compression": self.compression,
+                    "tags": sorted(set(tags)),
+                }
+                path = os.path.join(self.directory, entry["file"])
+                self._append_bytes(path, self.compression, data)
+                entries.append(entry)
+            entry["stored_size"] = os.path.getsize(path)
+            removed = self._apply_retention(entries, retention, keep=entry["id"])
+            self._save_index(entries)
+        result = {k: v for k, v in entry.items() if k != "created_ts"}
+        return dict(result, path=path, removed=removed)
+
+    def _apply_retention(self, entries: List[Dict[str, Any]], retention: Dict[str, float], keep: str) -> List[str]:
+        """按数量、总占用与保留天数删除最旧的报告，刚写入的报告不会被删除"""
+        entries.sort(key=lambda e: e["created_ts"])
+        doomed = set()
+        max_age = retention.get("days", 0) * 86400
+        if max_age > 0:
+            cutoff = time.time() - max_age
+            doomed.update(e["id"] for e in entries if e["created_ts"] < cutoff)
+        count = retention.get("count", 0)
+        if count > 0:
+            alive = [e for e in entries if e["id"] not in doomed]
+            doomed.update(e["id"] for e in alive[:max(len(alive) - int(count), 0)])
+        max_bytes = retention.get("bytes", 0)
+        if max_bytes > 0:
+            total = sum(e["stored_size"] for e in entries if e["id"] not in doomed)
+            for e in entries:
+                if total <= max_bytes:
+                    break
+                if e["id"] not in doomed:
+                    doomed.add(e["id"])
+                    total -= e["stored_size"]
+        doomed.discard(keep)
+        for e in entries:
+            if e["id"] in doomed:
+                try:
+                    os.remove(os.path.join(self.directory, e["file"]))
+                except FileNotFoundError:
+                    pass
+        entries[:] = [e for e in entries if e["id"] not in doomed]
+        return sorted(doomed)
+
+    def list_reports(self, host: Optional[str], tag: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        with _lock:
+            entries = self._load_index()
+        matched = [e for e in entries if (host is None or e["host"] == host) and (tag is None or tag in e["tags"])]
+        matched.sort(key=lambda e: e["created_ts"], reverse=True)
+        return [{k: v for k, v in e.items() if k != "created_ts"} for e in matched[:limit]]
+
+    def _open(self, entry: Dict[str, Any]) -> BinaryIO:
+        path = os.path.join(self.directory, entry["file"])
+        if entry["compression"] == "gzip":
+            return gzip.open(path, "rb")
+        if entry["compression"] == "zstd":
+            if not can_use_zstd:
+                raise ValueError(
+                    "读取zstd报告需要安装zstandard" if self.is_zh else "Reading zstd reports requires zstandard"
+                )
+            return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True,
+                                                               closefd=True)
+        return open(path, "rb")
+
+    def read(self, report_id: str, offset: int, length: int) -> Dict[str, Any]:
+        """读取 [offset, offset+length) 的未压缩字节；压缩文件边解压边跳过，内存占用与报告大小无关"""
+        with _lock:
+            entry = self._find(self._load_index(), report_id)
+        length = min(length, MAX_READ_LENGTH)
+        with self._open(entry) as f:
+            if entry["compression"] == "none":
+                f.seek(offset)
+            else:
+                remaining = offset
+                while remaining > 0:
+                    chunk = f.read(min(remaining, SKIP_CHUNK))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+            data = f.read(length)
+        return {
+            "id": entry["id"],
+            "host": entry["host"],
+            "tags": entry["tags"],
+            "size": entry["size"],
+            "offset": offset,
+            "length": len(data),
+            "eof": offset + len(data) >= entry["size"],
+            # 截断位置可能落在多字节字符中间，替换而不是报错
+            "content": data.decode("utf-8", errors="replace"),
+        }
@@ -1,6 +1,5 @@
 from typing import Union, List, Dict
 import platform
-import os
 import paramiko
 import yaml
 import datetime
@@ -13,6 +12,18 @@ from mcp.server import FastMCP
 import telnetlib
 from config.public.base_config_loader import LanguageEnum
 from config.private.remote_info.config_loader import RemoteInfoConfig
+from servers.remote_info.src.base import find_remote_host
+from servers.remote_info.src.fsusage import collect_filesystem_usage
+from servers.remote_info.src.inventory import collect_inventories
+from servers.remote_info.src.memattr import collect_memory_attribution
+from servers.remote_info.src.perfsample import sample_processes
+from servers.remote_info.src.pidindex import resolve_pids
+from servers.remote_info.src.probe import probe_matrix
+from servers.remote_info.src.reports import ReportStore
+from servers.remote_info.src.procscan import (
+    collect_local_details, collect_local_top, collect_remote_details, collect_remote_top
+)
+from servers.remote_info.src.threads import SORT_KEYS as THREAD_SORT_KEYS, collect_thread_top
 mcp = FastMCP("Remote info MCP Server", host="0.0.0.0", port=RemoteInfoConfig().get_config().private_config.port)
 
 
@@ -22,19 +33,27 @@ mcp = FastMCP("Remote info MCP Server", host="0.0.0.0", port=RemoteInfoConfig().
     else
     "top_collect_tool",
     description='''
-    使用top命令获取远端机器或者本机内存占用最多的k个进程
+    获取远端机器或者本机内存（RSS）占用最多的k个进程，远程时在目标机上单次扫描/proc并只回传Top k
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则表示获取本机的top k进程
         - k: 需要获取的进程数量，默认为5，可根据实际需求调整
     2. 返回值为包含进程信息的字典列表，每个字典包含以下键
         - pid: 进程ID
         - name: 进程名称
-        - memory: 内存使用量（单位MB）
+        - memory: 内存使用量（RSS，单位MB）
+        - memory_percent: 占目标主机物理内存的百分比
+        - rss_bytes: 常驻内存（字节）
+        - pss_bytes: 按比例分摊的共享内存（字节），无权限或内核不支持时为None
+        - swap_bytes: 交换分区占用（字节），无权限或内核不支持时为None
+        - shared_bytes: 共享页（字节）
+        - state: 进程状态
+        - num_threads: 线程数
     '''
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Use the top command to get the top k memory-consuming processes on a remote machine or the local machine.
+    Get the top k processes by resident memory (RSS) on a remote machine or the local machine. Remotely,
+    /proc is scanned once on the target and only the top k rows are sent back.
     1. Input values are as follows:
         - host: Remote host name or IP address. If not provided, it means to get
             the top k processes of the local machine.
@@ -43,60 +62,27 @@ mcp = FastMCP("Remote info MCP Server", host="0.0.0.0", port=RemoteInfoConfig().
         the following keys:
         - pid: Process ID
         - name: Process name
-        - memory: Memory usage (in MB)
+        - memory: Memory usage (RSS, in MB)
+        - memory_percent: Percentage of the target host's physical memory
+        - rss_bytes: Resident memory (bytes)
+        - pss_bytes: Proportional set size (bytes), None without permission or kernel support
+        - swap_bytes: Swapped-out memory (bytes), None without permission or kernel support
+        - shared_bytes: Shared pages (bytes)
+        - state: Process state
+        - num_threads: Number of threads
     '''
 
 )
 def top_collect_tool(host: Union[str, None] = None, k: int = 5) -> List[Dict[str, Any]]:
-    """使用top命令获取内存占用最多的k个进程"""
+    """获取内存占用最多的k个进程"""
+    cfg = RemoteInfoConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if k <= 0:
+        raise ValueError("进程数量必须为正整数" if is_zh else "k must be a positive integer")
     if host is None:
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
-            try:
-                memory_usage = proc.info['memory_info'].rss / (1024 * 1024)  # 转换为MB
-                processes.append({
-                    'pid': proc.info['pid'],
-                    'name': proc.info['name'],
-                    'memory': memory_usage
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-
-        # 按内存使用量排序并取前k个
-        processes.sort(key=lambda x: x['memory'], reverse=True)
-        return processes[:k]
-    else:
-        for host_config in RemoteInfoConfig().get_config().public_config.remote_hosts:
-            if host == host_config.name or host == host_config.host:
-                ssh = paramiko.SSHClient()
-                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                ssh.connect(
-                    hostname=host_config.host,
-                    port=host_config.port,
-                    username=host_config.username,
-                    password=host_config.password
-                )
-                stdin, stdout, stderr = ssh.exec_command(f"ps aux --sort=-%mem | head -n {k + 1}")
-                output = stdout.read().decode()
-                ssh.close()
-
-                lines = output.strip().split('\n')[1:]
-                processes = []
-                for line in lines:
-                    parts = line.split()
-                    pid = int(parts[1])
-                    name = parts[10]
-                    memory = float(parts[3]) * psutil.virtual_memory().total / (1024 * 1024)  # 转换为MB
-                    processes.append({
-                        'pid': pid,
-                        'name': name,
-                        'memory': memory
-                    })
-                return processes
-        if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"未找到远程主机: {host}")
-        else:
-            raise ValueError(f"Remote host not found: {host}")
+        return collect_local_top(k)
+    host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return collect_remote_top(host_config, k, is_zh)
 
 
 @mcp.tool(
@@ -109,7 +95,8 @@ def top_collect_tool(host: Union[str, None] = None, k: int = 5) -> List[Dict[str
         - host: 远程主机名称或IP地址，若不提供则表示
             获取本机的指定PID进程信息
         - pid: 需要获取信息的进程ID
-    2. 返回值为包含进程详细信息的字典，包含以下键
+        - pids: 可选，需要批量获取信息的进程ID列表；提供时忽略pid，远程只需一次SSH会话
+    2. 返回值为包含进程详细信息的字典（提供pids时为字典列表，不存在的进程包含error键），包含以下键
         - pid: 进程ID
         - name: 进程名称
         - status: 进程状态
@@ -118,6 +105,8 @@ def top_collect_tool(host: Union[str, None] = None, k: int = 5) -> List[Dict[str
         - memory_info: 内存使用信息
         - open_files: 打开的文件列表
         - connections: 网络连接信息
+        批量模式下不返回open_files与connections，改为返回num_fds（打开的文件描述符数）、
+        ppid、num_threads、memory_percent、num_ctx_switches、cmdline，memory_info中包含pss与swap
     '''
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else
@@ -128,8 +117,10 @@ def top_collect_tool(host: Union[str, None] = None, k: int = 5) -> List[Dict[str
         - host: Remote host name or IP address. If not provided, it means to get
             the specified PID process information of the local machine.
         - pid: The process ID for which information is to be obtained.
-    2. The return value is a dictionary containing detailed information of the process,
-        containing the following keys:
+        - pids: Optional list of process IDs to look up in one batch; pid is ignored when given,
+            and a remote host is queried over a single SSH session.
+    2. The return value is a dictionary containing detailed information of the process (a list of
+        dictionaries when pids is given; missing processes carry an error key), containing the following keys:
         - pid: Process ID
         - name: Process name
         - status: Process status
@@ -138,10 +129,26 @@ def top_collect_tool(host: Union[str, None] = None, k: int = 5) -> List[Dict[str
         - memory_info: Memory usage information
         - open_files: List of opened files
         - connections: Network connection information
+        In batch mode open_files and connections are replaced by num_fds (open file descriptors),
+        and ppid, num_threads, memory_percent, num_ctx_switches and cmdline are added; memory_info
+        also contains pss and swap.
     '''
 )
-def get_process_info_tool(host: Union[str, None] = None, pid: int = 0) -> Dict[str, Any]:
+def get_process_info_tool(
+    host: Union[str, None] = None,
+    pid: int = 0,
+    pids: Union[List[int], None] = None
+) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
     """获取指定PID的进程详细信息"""
+    if pids:
+        cfg = RemoteInfoConfig().get_config()
+        is_zh = cfg.public_config.language == LanguageEnum.ZH
+        if any(int(p) <= 0 for p in pids):
+            raise ValueError("PID必须为正整数" if is_zh else "PID must be a positive integer")
+        if host is None:
+            return collect_local_details([int(p) for p in pids])
+        host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+        return collect_remote_details(host_config, [int(p) for p in pids], is_zh)
     if pid <= 0:
         if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH:
             raise ValueError("PID必须为正整数")
@@ -218,58 +225,49 @@ def get_process_info_tool(host: Union[str, None] = None, pid: int = 0) -> Dict[s
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else "change_name_to_pid_tool",
     description='''
-    根据进程名称获取对应的PID列表
+    根据进程名称获取对应的PID列表，每台主机缓存一份进程表索引，重复查询只增量读取新增/退出的进程
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则表示
             获取本机的指定名称进程的PID列表
-        - name: 需要获取PID的进程名称
+        - name: 需要获取PID的进程名称（或前缀、正则表达式）
+        - match: 匹配方式，可选 exact（精确，默认）、prefix（前缀）、regex（正则）
+        - match_cmdline: 为True时匹配完整命令行而不是进程名，默认为False
     2. 返回值为包含对应PID的字符串，每个PID之间以空格分隔
+    3. 进程名同时匹配内核进程名（comm）与argv[0]的文件名；返回前会重新校验每个PID的启动时间，
+        PID被回收复用时不会返回过期结果
     '''
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Get the list of PIDs corresponding to the process name.
+    Get the list of PIDs corresponding to the process name. A process table index is cached per host,
+    so repeated lookups only read processes that appeared or exited since the previous call.
     1. Input values are as follows:
         - host: Remote host name or IP address. If not provided, it means to get
             the PID list of the specified name process of the local machine.
-        - name: The process name for which the PID is to be obtained.
+        - name: The process name (or prefix, or regular expression) for which the PID is to be obtained.
+        - match: Match mode, one of exact (default), prefix, regex.
+        - match_cmdline: If True, match the full command line instead of the process name. Default is False.
     2. The return value is a string containing the corresponding PIDs, with each PID separated by a space.
+    3. Process names match both the kernel name (comm) and the file name of argv[0]. The start time of
+        every returned PID is re-checked, so recycled PIDs are never returned stale.
     '''
 )
-def change_name_to_pid_tool(host: Union[str, None] = None, name: str = "") -> List[int]:
+def change_name_to_pid_tool(
+    host: Union[str, None] = None,
+    name: str = "",
+    match: str = "exact",
+    match_cmdline: bool = False
+) -> str:
     """根据进程名称获取对应的PID列表"""
+    cfg = RemoteInfoConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
     if not name:
-        if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError("进程名称不能为空")
-        else:
-            raise ValueError("Process name cannot be empty")
-    pids = []
-    if host is None:
-        for proc in psutil.process_iter(['pid', 'name']):
-            if proc.info['name'] == name:
-                pids.append(str(proc.info['pid']))
-        return ' '.join(pids)
-    else:
-        for host_config in RemoteInfoConfig().get_config().public_config.remote_hosts:
-            if host == host_config.name or host == host_config.host:
-                ssh = paramiko.SSHClient()
-                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                ssh.connect(
-                    hostname=host_config.host,
-                    port=host_config.port,
-                    username=host_config.username,
-                    password=host_config.password
-                )
-                stdin, stdout, stderr = ssh.exec_command(f"pgrep {name}")
-                output = stdout.read().decode().strip()
-                ssh.close()
-                if output:
-                    pids = [str(pid) for pid in output.split('\n')]
-                return ' '.join(pids)
-        if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"未找到远程主机: {host}")
-        else:
-            raise ValueError(f"Remote host not found: {host}")
+        raise ValueError("进程名称不能为空" if is_zh else "Process name cannot be empty")
+    host_config = None
+    if host is not None:
+        host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    pids = resolve_pids(host_config, name, match, match_cmdline, is_zh)
+    return ' '.join(str(pid) for pid in pids)
 
 
 @mcp.tool(
@@ -417,6 +415,16 @@ def get_cpu_info_tool(host: Union[str, None] = None) -> Dict[str, Any]:
         - used: 已用内存（MB）
         - free: 空闲内存（MB）
         - percent: 内存使用率（百分比）
+    3. attribution为True时进入内存归属模式，读取所有进程的/proc/<pid>/smaps_rollup
+        （本地多线程并行，远程单次SSH会话流式扫描并在目标机上汇总），可选参数：
+        - top_n: 每个排行返回的进程数，默认为10
+        - time_budget: 扫描时间预算（秒），默认为5，超时返回已扫描部分
+       返回值包含以下键
+        - meminfo: /proc/meminfo汇总（MB），含slab、shmem、page cache、大页（hugepages）等内核内存
+        - processes: 扫描统计（total、scanned、complete、elapsed、pss_total_mb、uss_total_mb、swap_total_mb）
+        - top_pss / top_uss / top_swap: 按PSS、USS（私有内存）、Swap排序的进程列表，
+            每项包含pid、name、rss_mb、pss_mb、uss_mb、swap_mb、swap_pss_mb
+       内核线程没有用户态地址空间，会被直接跳过
     '''
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else
@@ -432,10 +440,37 @@ def get_cpu_info_tool(host: Union[str, None] = None) -> Dict[str, Any]:
         - used: Used memory (MB)
         - free: Free memory (MB)
         - percent: Memory usage rate (percentage)
+    3. When attribution is True, the tool reads /proc/<pid>/smaps_rollup for every process
+        (in parallel threads locally, in one streamed SSH session remotely with aggregation on the target).
+        Optional parameters:
+        - top_n: Number of processes in each ranking, default is 10
+        - time_budget: Scan time budget in seconds, default is 5; the scanned part is returned on timeout
+       The result contains the following keys:
+        - meminfo: Summary of /proc/meminfo (MB), including slab, shmem, page cache and hugepages
+        - processes: Scan statistics (total, scanned, complete, elapsed, pss_total_mb, uss_total_mb, swap_total_mb)
+        - top_pss / top_uss / top_swap: Processes sorted by PSS, USS (private memory) and swap,
+            each item contains pid, name, rss_mb, pss_mb, uss_mb, swap_mb, swap_pss_mb
+       Kernel threads have no user address space and are skipped.
     '''
 )
-def memory_anlyze_tool(host: Union[str, None] = None) -> Dict[str, Any]:
+def memory_anlyze_tool(
+    host: Union[str, None] = None,
+    attribution: bool = False,
+    top_n: int = 10,
+    time_budget: float = 5.0
+) -> Dict[str, Any]:
     """分析内存使用情况"""
+    if attribution:
+        cfg = RemoteInfoConfig().get_config()
+        is_zh = cfg.public_config.language == LanguageEnum.ZH
+        if top_n <= 0:
+            raise ValueError("top_n必须为正整数" if is_zh else "top_n must be a positive integer")
+        if time_budget <= 0:
+            raise ValueError("时间预算必须大于0" if is_zh else "Time budget must be greater than 0")
+        host_config = None
+        if host is not None:
+            host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+        return collect_memory_attribution(host_config, top_n, time_budget, is_zh)
     if host is None:
         # 获取本地内存信息
         try:
@@ -526,126 +561,63 @@ def memory_anlyze_tool(host: Union[str, None] = None) -> Dict[str, Any]:
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else "get_disk_info_tool",
     description='''
-    获取磁盘信息
+    获取磁盘信息，各挂载点的statvfs并发执行并单独超时，失联的NFS/FUSE挂载不会阻塞整个工具
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则表示获取本机的磁盘信息
-    2. 返回值为包含磁盘信息的字典，包含以下键
+        - timeout: 单个挂载点的超时时间（秒），默认为2
+        - all_mounts: 是否包含tmpfs、overlay等伪文件系统，默认为False
+    2. 返回值为包含磁盘信息的字典列表，每个字典包含以下键
         - device: 设备名称
         - mountpoint: 挂载点
         - fstype: 文件系统类型
+        - status: ok（正常）、unresponsive（超时无响应）或error（读取失败）
         - total: 总容量（GB）
         - used: 已用容量（GB）
         - free: 可用容量（GB）
         - percent: 使用率（百分比）
+        - inodes_total / inodes_used / inodes_free: inode总数、已用数、空闲数
+        - inodes_percent: inode使用率（百分比）
+       status不为ok时容量与inode字段为None
     '''
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Get disk information.
+    Get disk information. statvfs runs concurrently for all mount points, each with its own timeout,
+    so a stale NFS/FUSE mount cannot block the whole tool.
     1. Input values are as follows:
         - host: Remote host name or IP address. If not provided, it means to get
             the disk information of the local machine.
+        - timeout: Timeout for a single mount point in seconds, default is 2.
+        - all_mounts: Whether to include pseudo file systems such as tmpfs and overlay, default is False.
     2. The return value is a list of dictionaries containing disk information, each dictionary contains
         the following keys:
         - device: Device name
         - mountpoint: Mount point
         - fstype: File system type
+        - status: ok, unresponsive (timed out) or error (failed to read)
         - total: Total capacity (GB)
         - used: Used capacity (GB)
         - free: Free capacity (GB)
         - percent: Usage rate (percentage)
+        - inodes_total / inodes_used / inodes_free: Total, used and free inodes
+        - inodes_percent: Inode usage rate (percentage)
+       Capacity and inode fields are None when status is not ok.
     '''
 )
-def get_disk_info_tool(host: Union[str, None] = None) -> List[Dict[str, Any]]:
+def get_disk_info_tool(
+    host: Union[str, None] = None,
+    timeout: float = 2.0,
+    all_mounts: bool = False
+) -> List[Dict[str, Any]]:
     """获取磁盘信息"""
-    if host is None:
-        # 获取本地磁盘信息
-        try:
-            partitions = psutil.disk_partitions()
-            disk_info = []
-            for part in partitions:
-                try:
-                    usage = psutil.disk_usage(part.mountpoint)
-                    disk_info.append({
-                        'device': part.device,
-                        'mountpoint': part.mountpoint,
-                        'fstype': part.fstype,
-                        'total': usage.total / (1024 * 1024 * 1024),  # 转换为GB
-                        'used': usage.used / (1024 * 1024 * 1024),    # 转换为GB
-                        'free': usage.free / (1024 * 1024 * 1024),    # 转换为GB
-                        'percent': usage.percent
-                    })
-                except PermissionError:
-                    continue
-            return disk_info
-        except Exception as e:
-            return {"error": f"获取本地磁盘信息失败: {str(e)}"}
-    else:
-        # 查找远程主机配置
-        remote_hosts = RemoteInfoConfig().get_config().public_config.remote_hosts
-        target_host = next(
-            (h for h in remote_hosts if host == h.name or host == h.host),
-            None
-        )
-
-        if not target_host:
-            if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH:
-                raise ValueError(f"未找到远程主机: {host}")
-            else:
-                raise ValueError(f"Remote host not found: {host}")
-
-        ssh = None
-        try:
-            # 建立SSH连接
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(
-                hostname=target_host.host,
-                port=target_host.port,
-                username=target_host.username,
-                password=target_host.password,
-                timeout=10,
-                banner_timeout=10
-            )
-
-            # 使用df命令获取磁盘信息，增加兼容性和容错性
-            cmd = "df -h"
-            stdin, stdout, stderr = ssh.exec_command(cmd, timeout=5)
-            error = stderr.read().decode().strip()
-            output = stdout.read().decode().strip()
-            if error:
-                raise ValueError(f"Command {cmd} error: {error}")
-            if not output:
-                raise ValueError("未能获取磁盘信息")
-            lines = output.split('\n')[1:]
-            disk_info = []
-            for line in lines:
-                parts = line.split()
-                if len(parts) < 7:
-                    continue
-                disk_info.append({
-                    'device': parts[0],
-                    'mountpoint': parts[1],
-                    'fstype': parts[2],
-                    'total': float(parts[3][:-1]) if parts[3][-1] == 'G' else 0,  # 仅处理GB单位
-                    'used': float(parts[4][:-1]) if parts[4][-1] == 'G' else 0,   # 仅处理GB单位
-                    'free': float(parts[5][:-1]) if parts[5][-1] == 'G' else 0,   # 仅处理GB单位
-                    'percent': float(parts[6][:-1]) if parts[6][-1] == '%' else 0
-                })
-            return disk_info
-        except paramiko.AuthenticationException:
-            raise ValueError("SSH认证失败，请检查用户名和密码")
-        except paramiko.SSHException as e:
-            raise ValueError(f"SSH连接错误: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"获取远程磁盘信息失败: {str(e)}")
-        finally:
-            # 确保SSH连接关闭
-            if ssh is not None:
-                try:
-                    ssh.close()
-                except Exception:
-                    pass
+    cfg = RemoteInfoConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if timeout <= 0 or timeout > 60:
+        raise ValueError("超时时间必须在0到60秒之间" if is_zh else "Timeout must be between 0 and 60 seconds")
+    host_config = None
+    if host is not None:
+        host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return collect_filesystem_usage(host_config, timeout, is_zh, all_mounts)
 
 
 @mcp.tool(
@@ -887,6 +859,15 @@ def get_network_info_tool(host: Union[str, None] = None) -> List[Dict[str, Any]]
                     pass
 
 
+def _report_store() -> ReportStore:
+    cfg = RemoteInfoConfig().get_config()
+    return ReportStore(
+        cfg.private_config.report_dir,
+        cfg.private_config.report_compression,
+        cfg.public_config.language == LanguageEnum.ZH
+    )
+
+
 @mcp.tool(
     name="write_report_tool"
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
@@ -895,7 +876,13 @@ def get_network_info_tool(host: Union[str, None] = None) -> List[Dict[str, Any]]
     将分析结果写入报告文件
     1. 输入值如下：
         - report: 报告内容字符串
-    2. 返回值为写入报告文件的路径字符串
+        - host: 可选，报告对应的主机名称，写入索引便于检索
+        - tags: 可选，报告标签列表
+        - report_id: 可选，报告ID；不提供时自动生成 system_report_<时间戳>
+        - append: 为True时将report追加到report_id对应的已有报告末尾（分段写入大报告），默认为False
+    2. 返回值为写入报告文件的路径字符串，报告ID为文件名去掉 .txt 及压缩扩展名后的部分
+    3. 报告保存在配置的report_dir目录中，按report_compression（zstd、gzip或none）压缩，
+        目录中的index.json记录每份报告的id、host、时间、大小与标签；每次写入后按配置的数量、总大小与天数执行保留策略
     '''
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else
@@ -903,28 +890,97 @@ def get_network_info_tool(host: Union[str, None] = None) -> List[Dict[str, Any]]
     Write analysis results to a report file.
     1. Input values are as follows:
         - report: Report content string
-    2. The return value is the path string of the written report file.
+        - host: Optional host name the report belongs to, stored in the index for lookups
+        - tags: Optional list of report tags
+        - report_id: Optional report ID; system_report_<timestamp> is generated when omitted
+        - append: If True, report is appended to the existing report report_id (to write large reports in
+            chunks), default is False
+    2. The return value is the path string of the written report file. The report ID is the file name without
+        .txt and the compression extension.
+    3. Reports are stored in the configured report_dir and compressed with report_compression (zstd, gzip or
+        none). index.json in that directory records id, host, time, size and tags of every report. Retention
+        by count, total size and age from the configuration is applied after every write.
     '''
 )
-def write_report_tool(report: str) -> str:
+def write_report_tool(
+    report: str,
+    host: Union[str, None] = None,
+    tags: Union[List[str], None] = None,
+    report_id: Union[str, None] = None,
+    append: bool = False
+) -> str:
     """将分析结果写入报告文件"""
+    cfg = RemoteInfoConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
     if not report:
-        if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError("报告内容不能为空")
-        else:
-            raise ValueError("Report content cannot be empty")
+        raise ValueError("报告内容不能为空" if is_zh else "Report content cannot be empty")
+    if append and not report_id:
+        raise ValueError("追加写入需要提供report_id" if is_zh else "report_id is required in append mode")
+    retention = {
+        "count": cfg.private_config.report_retention_count,
+        "bytes": cfg.private_config.report_retention_bytes,
+        "days": cfg.private_config.report_retention_days,
+    }
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S%f")
-        report_path = f"system_report_{timestamp}.txt"
-        with open(report_path, 'w', encoding='utf-8', errors='ignore') as f:
-            f.write(report)
-        real_path = os.path.realpath(report_path)
-        return real_path
+        entry = _report_store().write(report, host, tags or [], report_id, append, retention)
+        return entry["path"]
+    except ValueError:
+        raise
     except Exception as e:
-        if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"写入报告文件失败: {str(e)}")
-        else:
-            raise ValueError(f"Failed to write report file: {str(e)}")
+        raise ValueError(f"写入报告文件失败: {str(e)}" if is_zh else f"Failed to write report file: {str(e)}")
+
+
+@mcp.tool(
+    name="read_report_tool"
+    if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    else "read_report_tool",
+    description='''
+    查询或读取write_report_tool保存的报告
+    1. 输入值如下：
+        - report_id: 报告ID；不提供时返回报告索引列表（按时间倒序）
+        - offset: 读取起始位置（未压缩内容的字节偏移），默认为0
+        - length: 读取的字节数，默认为65536，单次最多1048576
+        - host: 列出报告时按主机过滤
+        - tag: 列出报告时按标签过滤
+        - limit: 列出报告时返回的最大条数，默认为20
+    2. 提供report_id时返回字典，包含id、host、tags、size（报告总字节数）、offset、length、eof、content；
+        压缩报告边解压边跳过，不会把整份报告读入内存
+       未提供report_id时返回报告列表，每项包含id、file、host、created、updated、size、stored_size、compression、tags
+    '''
+    if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    List or read reports saved by write_report_tool.
+    1. Input values are as follows:
+        - report_id: Report ID. If not provided, the report index is returned (newest first).
+        - offset: Start position (byte offset in the uncompressed content), default is 0
+        - length: Number of bytes to read, default is 65536, at most 1048576 per call
+        - host: Filter by host when listing reports
+        - tag: Filter by tag when listing reports
+        - limit: Maximum number of reports when listing, default is 20
+    2. With report_id, a dictionary containing id, host, tags, size (total bytes), offset, length, eof and
+        content is returned. Compressed reports are decompressed as a stream while skipping, so the whole
+        report is never loaded into memory.
+       Without report_id, a list of reports is returned, each containing id, file, host, created, updated,
+        size, stored_size, compression and tags.
+    '''
+)
+def read_report_tool(
+    report_id: Union[str, None] = None,
+    offset: int = 0,
+    length: int = 65536,
+    host: Union[str, None] = None,
+    tag: Union[str, None] = None,
+    limit: int = 20
+) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """查询或读取报告"""
+    is_zh = RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    if offset < 0 or length <= 0:
+        raise ValueError("offset不能为负数且length必须大于0" if is_zh else "offset must not be negative and length must be positive")
+    store = _report_store()
+    if report_id is None:
+        return store.list_reports(host, tag, limit)
+    return store.read(report_id, offset, length)
 
 
 @mcp.tool(
@@ -1113,10 +1169,19 @@ def get_dns_info_tool(host: Union[str, None] = None) -> Dict[str, Any]:
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则表示收集本机的性能数据
         - pid : 进程ID，若不提供则表示收集所有进程的性能数据
+        - pids: 可选，需要批量采样的进程ID列表
+        - pattern: 可选，按命令行匹配进程的正则表达式（pgrep -f 语义），与pids可同时使用
+        - interval: 两点采样的间隔（秒），默认为1
     2. 返回值为包含性能数据的字典，包含以下键
         - cpu_usage: CPU使用率（百分比）
         - memory_usage: 内存使用率（百分比）
         - io_counters: I/O统计信息（字典）
+       提供pids或pattern时，所有进程共享同一个采样窗口（远程只需一次SSH会话），返回：
+        - interval: 实际采样间隔（秒）
+        - processes: 进程列表，按cpu_percent降序，每项包含pid、name、state、num_threads、cpu_percent、
+            rss_bytes、memory_percent、read_bytes_per_s、write_bytes_per_s、rchar_per_s、wchar_per_s、
+            ctx_switches_per_s、minor_faults_per_s、major_faults_per_s、io_counters
+        - missing: 采样期间不存在或已退出的PID列表
     '''
     if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
     else
@@ -1126,39 +1191,68 @@ def get_dns_info_tool(host: Union[str, None] = None) -> Dict[str, Any]:
         - host: Remote host name or IP address. If not provided, it means to collect
             the performance data of the local machine.
         - pid : Process ID. If not provided, it means to collect performance data for all processes.
+        - pids: Optional list of process IDs to sample in one batch.
+        - pattern: Optional regular expression matched against the command line (pgrep -f semantics);
+            can be combined with pids.
+        - interval: Seconds between the two sample points, default is 1.
     2. The return value is a dictionary containing performance data, containing the following
         keys:
         - cpu_usage: CPU usage (percentage)
         - memory_usage: Memory usage (percentage)
         - io_counters: I/O statistics (dictionary)
+       When pids or pattern is given, all processes share one sampling window (a single SSH session
+        remotely) and the result contains:
+        - interval: Actual sampling interval (seconds)
+        - processes: Process list sorted by cpu_percent, each item contains pid, name, state, num_threads,
+            cpu_percent, rss_bytes, memory_percent, read_bytes_per_s, write_bytes_per_s, rchar_per_s,
+            wchar_per_s, ctx_switches_per_s, minor_faults_per_s, major_faults_per_s, io_counters
+        - missing: PIDs that did not exist or exited during sampling
     '''
 )
-def perf_data_tool(host: Union[str, None] = None, pid: Union[int, None] = None) -> Dict[str, Any]:
+def perf_data_tool(
+    host: Union[str, None] = None,
+    pid: Union[int, None] = None,
+    pids: Union[List[int], None] = None,
+    pattern: Union[str, None] = None,
+    interval: float = 1.0
+) -> Dict[str, Any]:
     """收集性能数据"""
+    if pids or pattern or pid is not None:
+        cfg = RemoteInfoConfig().get_config()
+        is_zh = cfg.public_config.language == LanguageEnum.ZH
+        if interval <= 0 or interval > 60:
+            raise ValueError("采样间隔必须在0到60秒之间" if is_zh else "Interval must be between 0 and 60 seconds")
+        host_config = None
+        if host is not None:
+            host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+        targets = list(pids or []) if (pids or pattern) else [pid]
+        result = sample_processes(host_config, targets, pattern, interval, is_zh)
+        if pids or pattern:
+            return result
+        # 仅提供单个pid时保持原有返回结构
+        if not result["processes"]:
+            return {"error": f"进程ID {pid} 不存在" if is_zh else f"Process ID {pid} does not exist"}
+        proc = result["processes"][0]
+        return {
+            'cpu_usage': proc["cpu_percent"],
+            'memory_usage': proc["memory_percent"],
+            'io_counters': proc["io_counters"]
+        }
+
     if host is None:
         # 获取本地性能数据
         try:
-            if pid is not None:
-                # 获取指定进程的性能数据
-                proc = psutil.Process(pid)
-                cpu_usage = proc.cpu_percent(interval=1)
-                memory_info = proc.memory_info()
-                memory_usage = proc.memory_percent()
-                io_counters = proc.io_counters()._asdict() if hasattr(proc, 'io_counters') else {}
-            else:
-                # 获取所有进程的性能数据
-                cpu_usage = psutil.cpu_percent(interval=1)
-                memory_info = psutil.virtual_memory()
-                memory_usage = memory_info.percent
-                io_counters = {}
+            # 获取所有进程的性能数据
+            cpu_usage = psutil.cpu_percent(interval=1)
+            memory_info = psutil.virtual_memory()
+            memory_usage = memory_info.percent
+            io_counters = {}
             performance_data = {
                 'cpu_usage': cpu_usage,
                 'memory_usage': memory_usage,
                 'io_counters': io_counters
             }
             return performance_data
-        except psutil.NoSuchProcess:
-            return {"error": f"进程ID {pid} 不存在"}
         except Exception as e:
             return {"error": f"获取本地性能数据失败: {str(e)}"}
     else:
@@ -1189,87 +1283,57 @@ def perf_data_tool(host: Union[str, None] = None, pid: Union[int, None] = None)
                 banner_timeout=10
             )
 
-            if pid is not None:
-                # 获取指定进程的性能数据
-                cmd_cpu = f"ps -p {pid} -o %cpu --no-headers"
-                cmd_mem = f"ps -p {pid} -o %mem --no-headers"
-                cmd_io = f"cat /proc/{pid}/io"
-                stdin_cpu, stdout_cpu, stderr_cpu = ssh.exec_command(cmd_cpu, timeout=5)
-                stdin_mem, stdout_mem, stderr_mem = ssh.exec_command(cmd_mem, timeout=5)
-                stdin_io, stdout_io, stderr_io = ssh.exec_command(cmd_io, timeout=5)
-                error_cpu = stderr_cpu.read().decode().strip()
-                error_mem = stderr_mem.read().decode().strip()
-                error_io = stderr_io.read().decode().strip()
-                output_cpu = stdout_cpu.read().decode().strip()
-                output_mem = stdout_mem.read().decode().strip()
-                output_io = stdout_io.read().decode().strip()
-                if error_cpu:
-                    raise ValueError(f"Command {cmd_cpu} error: {error_cpu}")
-                if error_mem:
-                    raise ValueError(f"Command {cmd_mem} error: {error_mem}")
-                if error_io:
-                    raise ValueError(f"Command {cmd_io} error: {error_io}")
-                if not output_cpu or not output_mem:
-                    raise ValueError(f"未能获取进程ID {pid} 的性能数据")
-                cpu_usage = float(output_cpu)
-                memory_usage = float(output_mem)
-                io_counters = {}
-                for line in output_io.split('\n'):
-                    parts = line.split(':')
-                    if len(parts) == 2:
-                        io_counters[parts[0].strip()] = int(parts[1].strip())
-            else:
-                # 获取所有进程的性能数据
-                cmd_cpu = "top -b -n2 -d1 | grep 'Cpu(s)' | tail -n1"
-                cmd_mem = "free -m | grep Mem"
-
-                # 执行命令获取CPU和内存数据
-                stdin_cpu, stdout_cpu, stderr_cpu = ssh.exec_command(cmd_cpu, timeout=5)
-                stdin_mem, stdout_mem, stderr_mem = ssh.exec_command(cmd_mem, timeout=5)
-
-                # 读取命令执行结果和错误信息
-                error_cpu = stderr_cpu.read().decode().strip()
-                error_mem = stderr_mem.read().decode().strip()
-                output_cpu = stdout_cpu.read().decode().strip()
-                output_mem = stdout_mem.read().decode().strip()
-
-                # 检查命令执行错误
-                if error_cpu:
-                    raise ValueError(f"Command {cmd_cpu} error: {error_cpu}")
-                if error_mem:
-                    raise ValueError(f"Command {cmd_mem} error: {error_mem}")
-
-                # 检查输出是否为空
-                if not output_cpu or not output_mem:
-                    raise ValueError("未能获取系统性能数据")
-
-                # 解析CPU使用率（适配新格式）
-                cpu_parts = output_cpu.split(',')  # 按逗号分割各项指标
-                idle_value = None
-
-                for part in cpu_parts:
-                    part = part.strip()  # 去除空格
-                    if part.endswith('id'):  # 查找包含空闲时间的项
-                        # 提取数字部分（如 "95.8 id" 中的 "95.8"）
-                        idle_value = part.split()[0]
-                        break
-
-                if idle_value is None:
-                    raise ValueError(f"无法解析CPU空闲时间: {output_cpu}")
-
-                # 计算CPU使用率
-                cpu_usage = 100.0 - float(idle_value)
-
-                # 解析内存使用率
-                mem_parts = output_mem.split()
-                if len(mem_parts) < 7:
-                    raise ValueError("内存信息格式异常")
-
-                # 计算内存使用率
-                memory_usage = (float(mem_parts[2]) / float(mem_parts[1])) * 100 if float(mem_parts[1]) > 0 else 0
-
-                # IO计数器（可根据需要补充实现）
-                io_counters = {}
+            # 获取所有进程的性能数据
+            cmd_cpu = "top -b -n2 -d1 | grep 'Cpu(s)' | tail -n1"
+            cmd_mem = "free -m | grep Mem"
+
+            # 执行命令获取CPU和内存数据
+            stdin_cpu, stdout_cpu, stderr_cpu = ssh.exec_command(cmd_cpu, timeout=5)
+            stdin_mem, stdout_mem, stderr_mem = ssh.exec_command(cmd_mem, timeout=5)
+
+            # 读取命令执行结果和错误信息
+            error_cpu = stderr_cpu.read().decode().strip()
+            error_mem = stderr_mem.read().decode().strip()
+            output_cpu = stdout_cpu.read().decode().strip()
+            output_mem = stdout_mem.read().decode().strip()
+
+            # 检查命令执行错误
+            if error_cpu:
+                raise ValueError(f"Command {cmd_cpu} error: {error_cpu}")
+            if error_mem:
+                raise ValueError(f"Command {cmd_mem} error: {error_mem}")
+
+            # 检查输出是否为空
+            if not output_cpu or not output_mem:
+                raise ValueError("未能获取系统性能数据")
+
+            # 解析CPU使用率（适配新格式）
+            cpu_parts = output_cpu.split(',')  # 按逗号分割各项指标
+            idle_value = None
+
+            for part in cpu_parts:
+                part = part.strip()  # 去除空格
+                if part.endswith('id'):  # 查找包含空闲时间的项
+                    # 提取数字部分（如 "95.8 id" 中的 "95.8"）
+                    idle_value = part.split()[0]
+                    break
+
+            if idle_value is None:
+                raise ValueError(f"无法解析CPU空闲时间: {output_cpu}")
+
+            # 计算CPU使用率
+            cpu_usage = 100.0 - float(idle_value)
+
+            # 解析内存使用率
+            mem_parts = output_mem.split()
+            if len(mem_parts) < 7:
+                raise ValueError("内存信息格式异常")
+
+            # 计算内存使用率
+            memory_usage = (float(mem_parts[2]) / float(mem_parts[1])) * 100 if float(mem_parts[1]) > 0 else 0
+
+            # IO计数器（可根据需要补充实现）
+            io_counters = {}
             performance_data = {
                 'cpu_usage': cpu_usage,
                 'memory_usage': memory_usage,
@@ -1290,6 +1354,240 @@ def perf_data_tool(host: Union[str, None] = None, pid: Union[int, None] = None)
                     pass
 
 
+@mcp.tool(
+    name="thread_top_tool"
+    if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    else "thread_top_tool",
+    description='''
+    定位指定进程内CPU占用最高的线程（对/proc/<pid>/task/*/stat做两次采样）
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则表示采样本机进程
+        - pid: 需要分析的进程ID
+        - interval: 两次采样的间隔（秒），默认为1
+        - top_n: 返回的线程数量，默认为20
+        - sort_by: 排序字段，可选 cpu（CPU占用率）、ctx_switches（上下文切换速率），默认为cpu
+    2. 返回值为包含线程采样结果的字典，包含以下键
+        - pid: 进程ID
+        - name: 进程名称
+        - interval: 实际采样间隔（秒）
+        - threads_total: 线程总数
+        - exited_threads: 采样期间退出的线程数
+        - cpu_percent: 进程总CPU占用率（百分比，可超过100）
+        - threads: 线程列表，每项包含tid、tid_hex（对应jstack中的nid）、name、state、processor、
+            cpu_percent、user_percent、system_percent、ctx_switches_per_s、
+            voluntary_ctx_switches_per_s、nonvoluntary_ctx_switches_per_s、new
+        - thread_groups: 按线程名前缀（去掉编号）聚合的线程组，包含name、threads、cpu_percent、ctx_switches_per_s
+    '''
+    if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Find the busiest threads inside a process by sampling /proc/<pid>/task/*/stat twice.
+    1. Input values are as follows:
+        - host: Remote host name or IP address. If not provided, the local process is sampled.
+        - pid: The process ID to analyze.
+        - interval: Seconds between the two samples, default is 1.
+        - top_n: Number of threads to return, default is 20.
+        - sort_by: Sort key, cpu (CPU usage) or ctx_switches (context switch rate), default is cpu.
+    2. The return value is a dictionary containing the following keys:
+        - pid: Process ID
+        - name: Process name
+        - interval: Actual sampling interval (seconds)
+        - threads_total: Total number of threads
+        - exited_threads: Number of threads that exited during sampling
+        - cpu_percent: Total CPU usage of the process (percentage, may exceed 100)
+        - threads: Thread list, each item contains tid, tid_hex (matches nid in jstack), name, state,
+            processor, cpu_percent, user_percent, system_percent, ctx_switches_per_s,
+            voluntary_ctx_switches_per_s, nonvoluntary_ctx_switches_per_s, new
+        - thread_groups: Threads aggregated by name with numeric suffixes removed, containing
+            name, threads, cpu_percent, ctx_switches_per_s
+    '''
+)
+def thread_top_tool(
+    host: Union[str, None] = None,
+    pid: int = 0,
+    interval: float = 1.0,
+    top_n: int = 20,
+    sort_by: str = "cpu"
+) -> Dict[str, Any]:
+    """定位进程内的热点线程"""
+    cfg = RemoteInfoConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if pid <= 0:
+        raise ValueError("PID必须为正整数" if is_zh else "PID must be a positive integer")
+    if interval <= 0 or interval > 60:
+        raise ValueError("采样间隔必须在0到60秒之间" if is_zh else "Interval must be between 0 and 60 seconds")
+    if sort_by not in THREAD_SORT_KEYS:
+        raise ValueError(
+            f"不支持的排序字段: {sort_by}，可选: {sorted(THREAD_SORT_KEYS)}" if is_zh
+            else f"Unsupported sort key: {sort_by}, supported: {sorted(THREAD_SORT_KEYS)}"
+        )
+
+    host_config = None
+    if host is not None:
+        host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return collect_thread_top(host_config, pid, interval, top_n, sort_by, is_zh)
+
+
+@mcp.tool(
+    name="host_inventory_tool"
+    if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    else "host_inventory_tool",
+    description='''
+    一次性获取主机清单（操作系统、CPU、内存、磁盘、网络、DNS），替代依次调用
+    get_os_info_tool、get_cpu_info_tool、memory_anlyze_tool、get_disk_info_tool、get_network_info_tool、get_dns_info_tool
+    1. 输入值如下：
+        - hosts: 远程主机名称或IP地址，也可以是主机列表（并发采集）；不提供则表示采集本机，
+            列表中的localhost/127.0.0.1表示本机
+        - interval: CPU使用率的采样间隔（秒），默认为0.5
+        - disk_timeout: 单个挂载点的超时时间（秒），默认为2
+    2. 每台主机只执行一次采集脚本（远程只建立一次SSH会话）；系统版本、CPU型号与核数等静态信息按主机缓存，
+        直到boot ID变化（主机重启）才重新采集，其余动态信息每次刷新
+    3. 返回值为主机清单字典（hosts为列表时返回字典列表），包含以下键
+        - host: 主机名称
+        - boot_id: 本次启动的boot ID
+        - static_cached: 静态信息是否来自缓存
+        - hostname / uptime_seconds: 主机名与运行时长（秒）
+        - os: system、release、kernel_version、machine以及/etc/os-release中的name、version、id、version_id、pretty_name
+        - cpu: model、physical_cores、total_cores、max_frequency、min_frequency、current_frequency（MHz）、
+            cpu_usage（每个核心的使用率）、load_avg
+        - memory: total、available、used、free、buff_cache、shared、swap_total、swap_free（MB）与percent
+        - disk: 与get_disk_info_tool相同的挂载点列表（含status与inode用量）
+        - network: interface、ip_address、netmask、mac_address、is_up、addresses
+        - dns: nameservers、search
+       某台主机采集失败时，该主机的结果只包含host与error
+    '''
+    if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Get a host inventory (OS, CPU, memory, disk, network, DNS) in one call, replacing sequential calls to
+    get_os_info_tool, get_cpu_info_tool, memory_anlyze_tool, get_disk_info_tool, get_network_info_tool
+    and get_dns_info_tool.
+    1. Input values are as follows:
+        - hosts: Remote host name or IP address, or a list of hosts collected concurrently. If not provided,
+            the local machine is collected; localhost/127.0.0.1 in a list also means the local machine.
+        - interval: Sampling interval for CPU usage in seconds, default is 0.5.
+        - disk_timeout: Timeout for a single mount point in seconds, default is 2.
+    2. Each host runs one collection script (a single SSH session remotely). Static sections such as the OS
+        release, CPU model and core counts are cached per host until the boot ID changes (host reboot);
+        dynamic sections are refreshed on every call.
+    3. The return value is an inventory dictionary (a list of dictionaries when hosts is a list) containing:
+        - host: Host name
+        - boot_id: Boot ID of the current boot
+        - static_cached: Whether the static sections came from the cache
+        - hostname / uptime_seconds: Host name and uptime (seconds)
+        - os: system, release, kernel_version, machine and name, version, id, version_id, pretty_name
+            from /etc/os-release
+        - cpu: model, physical_cores, total_cores, max_frequency, min_frequency, current_frequency (MHz),
+            cpu_usage (per core usage), load_avg
+        - memory: total, available, used, free, buff_cache, shared, swap_total, swap_free (MB) and percent
+        - disk: Mount point list as returned by get_disk_info_tool (including status and inode usage)
+        - network: interface, ip_address, netmask, mac_address, is_up, addresses
+        - dns: nameservers, search
+       When a host fails, its entry only contains host and error.
+    '''
+)
+def host_inventory_tool(
+    hosts: Union[str, List[str], None] = None,
+    interval: float = 0.5,
+    disk_timeout: float = 2.0
+) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """一次往返获取主机清单"""
+    cfg = RemoteInfoConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if interval <= 0 or interval > 10:
+        raise ValueError("采样间隔必须在0到10秒之间" if is_zh else "Interval must be between 0 and 10 seconds")
+    if disk_timeout <= 0 or disk_timeout > 60:
+        raise ValueError("超时时间必须在0到60秒之间" if is_zh else "Timeout must be between 0 and 60 seconds")
+
+    names = hosts if isinstance(hosts, list) else [hosts]
+    host_configs = [
+        None if name in (None, "localhost", "127.0.0.1")
+        else find_remote_host(name, cfg.public_config.remote_hosts, is_zh)
+        for name in names
+    ]
+    results = collect_inventories(host_configs, interval, disk_timeout, is_zh)
+    if isinstance(hosts, list):
+        return results
+    if "error" in results[0]:
+        raise RuntimeError(results[0]["error"])
+    return results[0]
+
+
+@mcp.tool(
+    name="connectivity_probe_tool"
+    if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    else "connectivity_probe_tool",
+    description='''
+    并发探测多台主机、多个端口的连通性与延迟（TCP建连RTT + 系统ping），一次调用得到可达性矩阵
+    1. 输入值如下：
+        - hosts: 主机名称或IP地址列表，配置文件中的主机名会解析为对应地址；不提供则探测全部已配置的远程主机
+        - ports: 需要探测的TCP端口列表；不提供则使用每台主机配置的SSH端口（未配置的主机为22）
+        - attempts: 每个目标的尝试次数K，默认为3
+        - timeout: 单次尝试的超时时间（秒），默认为2
+        - concurrency: 同时进行的探测数上限，默认为64
+        - deadline: 整体截止时间（秒），默认为30，超时未完成的探测标记为deadline_exceeded
+        - icmp: 是否同时执行ping探测，默认为True
+    2. 返回值为字典，包含以下键
+        - attempts: 尝试次数
+        - elapsed: 总耗时（秒）
+        - matrix: 每台主机一项，包含host、address、reachable、icmp以及tcp（按端口），
+            每个探测结果包含attempts、succeeded、loss_percent、min_ms、avg_ms、max_ms、reachable、error
+    '''
+    if RemoteInfoConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Probe connectivity and latency of several hosts and ports concurrently (TCP connect RTT plus system ping)
+    and return a reachability matrix in one call.
+    1. Input values are as follows:
+        - hosts: List of host names or IP addresses; configured host names are resolved to their addresses.
+            If not provided, all configured remote hosts are probed.
+        - ports: List of TCP ports to probe. If not provided, each host's configured SSH port is used
+            (22 for hosts that are not configured).
+        - attempts: Number of attempts K per target, default is 3.
+        - timeout: Timeout of a single attempt in seconds, default is 2.
+        - concurrency: Maximum number of probes in flight, default is 64.
+        - deadline: Overall deadline in seconds, default is 30; unfinished probes are marked deadline_exceeded.
+        - icmp: Whether to run ping probes as well, default is True.
+    2. The return value is a dictionary containing the following keys:
+        - attempts: Number of attempts
+        - elapsed: Total time (seconds)
+        - matrix: One item per host with host, address, reachable, icmp and tcp (keyed by port); every probe
+            result contains attempts, succeeded, loss_percent, min_ms, avg_ms, max_ms, reachable, error
+    '''
+)
+async def connectivity_probe_tool(
+    hosts: Union[List[str], None] = None,
+    ports: Union[List[int], None] = None,
+    attempts: int = 3,
+    timeout: float = 2.0,
+    concurrency: int = 64,
+    deadline: float = 30.0,
+    icmp: bool = True
+) -> Dict[str, Any]:
+    """并发探测主机连通性"""
+    cfg = RemoteInfoConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    remote_hosts = cfg.public_config.remote_hosts
+    if attempts <= 0 or attempts > 100:
+        raise ValueError("尝试次数必须在1到100之间" if is_zh else "Attempts must be between 1 and 100")
+    if timeout <= 0 or deadline <= 0:
+        raise ValueError("超时时间必须大于0" if is_zh else "Timeouts must be greater than 0")
+    if concurrency <= 0:
+        raise ValueError("并发数必须为正整数" if is_zh else "Concurrency must be a positive integer")
+    for port in ports or []:
+        if port <= 0 or port > 65535:
+            raise ValueError("端口号必须在1到65535之间" if is_zh else "Port number must be between 1 and 65535")
+
+    targets = []
+    for name in (hosts if hosts else [h.name for h in remote_hosts]):
+        host_config = next((h for h in remote_hosts if name == h.name or name == h.host), None)
+        address = host_config.host if host_config else name
+        targets.append((name, address, list(ports) if ports else [host_config.port if host_config else 22]))
+    if not targets:
+        raise ValueError("没有需要探测的主机" if is_zh else "No hosts to probe")
+    return await probe_matrix(targets, attempts, timeout, concurrency, deadline, icmp)
+
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='sse')
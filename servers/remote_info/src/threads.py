@@ -0,0 +1,172 @@
+"""线程维度实现：两次采样 /proc/<pid>/task/*/stat，定位进程内的热点线程"""
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.remote_info.src.base import parse_proc_stat, run_local_script, run_remote_script
+
+# 线程数量与采样次数无关：每次快照只调用一次 cat 与一次 grep，
+# 远程执行时整个采样窗口也只占用一次 SSH 会话
+THREAD_SAMPLE_SCRIPT = """
+pid={pid}
+if [ ! -d /proc/$pid/task ]; then
+    echo "@MISSING"
+    exit 0
+fi
+echo "@HZ $(getconf CLK_TCK 2>/dev/null || echo 100)"
+echo "@NAME $(cat /proc/$pid/comm 2>/dev/null)"
+snap() {{
+    echo "@SNAP $1 $(cut -d' ' -f1 /proc/uptime)"
+    cat /proc/$pid/task/*/stat 2>/dev/null
+    grep -H ctxt_switches /proc/$pid/task/*/status 2>/dev/null
+}}
+snap 1
+sleep {interval}
+snap 2
+"""
+
+SORT_KEYS = {
+    "cpu": lambda t: (t["cpu_percent"], t["ctx_switches_per_s"]),
+    "ctx_switches": lambda t: (t["ctx_switches_per_s"], t["cpu_percent"]),
+}
+
+_POOL_SUFFIX = re.compile(r"[-_#:/ ]?\d+$")
+
+
+def _parse_ctxt_line(line: str) -> Optional[Tuple[int, str, int]]:
+    """解析 grep -H 输出：/proc/<pid>/task/<tid>/status:voluntary_ctxt_switches:\t<n>"""
+    path, _, rest = line.partition(":")
+    key, _, value = rest.partition(":")
+    parts = path.split("/")
+    if len(parts) < 5 or not value.strip():
+        return None
+    try:
+        tid = int(parts[4])
+        count = int(value.strip())
+    except ValueError:
+        return None
+    kind = "nonvoluntary" if key.startswith("nonvoluntary") else "voluntary"
+    return tid, kind, count
+
+
+def parse_thread_samples(output: str) -> Dict[str, Any]:
+    """将采样脚本输出解析为两次快照"""
+    result = {"missing": False, "hz": 100, "name": "", "snapshots": {}}
+    current = None
+    for line in output.splitlines():
+        if not line:
+            continue
+        if line.startswith("@"):
+            tag, _, rest = line.partition(" ")
+            if tag == "@MISSING":
+                result["missing"] = True
+            elif tag == "@HZ":
+                result["hz"] = int(rest.strip() or 100)
+            elif tag == "@NAME":
+                result["name"] = rest.strip()
+            elif tag == "@SNAP":
+                index, _, uptime = rest.partition(" ")
+                current = {"uptime": float(uptime), "threads": {}}
+                result["snapshots"][int(index)] = current
+            continue
+        if current is None:
+            continue
+        if line.startswith("/proc/"):
+            parsed = _parse_ctxt_line(line)
+            if parsed and parsed[0] in current["threads"]:
+                tid, kind, count = parsed
+                current["threads"][tid][kind] = count
+        else:
+            parsed = parse_proc_stat(line)
+            if parsed:
+                tid, stat = parsed
+                stat.update(voluntary=0, nonvoluntary=0)
+                current["threads"][tid] = stat
+    return result
+
+
+def _pool_name(name: str) -> str:
+    """将线程池中的编号线程归并为同一个名字，如 http-nio-8080-exec-12 -> http-nio-8080-exec"""
+    stripped = _POOL_SUFFIX.sub("", name)
+    return stripped or name
+
+
+def compute_thread_rates(samples: Dict[str, Any], top_n: int, sort_by: str) -> Dict[str, Any]:
+    """根据两次快照计算每个线程的CPU占用率与上下文切换速率"""
+    first = samples["snapshots"].get(1, {"uptime": 0.0, "threads": {}})
+    second = samples["snapshots"].get(2, {"uptime": 0.0, "threads": {}})
+    elapsed = max(second["uptime"] - first["uptime"], 1e-6)
+    hz = samples["hz"] or 100
+
+    threads = []
+    for tid, cur in second["threads"].items():
+        prev = first["threads"].get(tid)
+        # 采样窗口内新建的线程，其全部计数都发生在窗口内
+        base = prev or {"utime": 0, "stime": 0, "voluntary": 0, "nonvoluntary": 0}
+        user = max(cur["utime"] - base["utime"], 0) / hz
+        system = max(cur["stime"] - base["stime"], 0) / hz
+        vol = max(cur["voluntary"] - base["voluntary"], 0)
+        nonvol = max(cur["nonvoluntary"] - base["nonvoluntary"], 0)
+        threads.append({
+            "tid": tid,
+            "tid_hex": hex(tid),
+            "name": cur["name"],
+            "state": cur["state"],
+            "processor": cur["processor"],
+            "cpu_percent": round((user + system) / elapsed * 100, 1),
+            "user_percent": round(user / elapsed * 100, 1),
+            "system_percent": round(system / elapsed * 100, 1),
+            "ctx_switches_per_s": round((vol + nonvol) / elapsed, 1),
+            "voluntary_ctx_switches_per_s": round(vol / elapsed, 1),
+            "nonvoluntary_ctx_switches_per_s": round(nonvol / elapsed, 1),
+            "new": prev is None,
+        })
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    for t in threads:
+        group = groups.setdefault(_pool_name(t["name"]), {
+            "name": _pool_name(t["name"]), "threads": 0, "cpu_percent": 0.0, "ctx_switches_per_s": 0.0
+        })
+        group["threads"] += 1
+        group["cpu_percent"] += t["cpu_percent"]
+        group["ctx_switches_per_s"] += t["ctx_switches_per_s"]
+    for group in groups.values():
+        group["cpu_percent"] = round(group["cpu_percent"], 1)
+        group["ctx_switches_per_s"] = round(group["ctx_switches_per_s"], 1)
+
+    key = SORT_KEYS[sort_by]
+    threads.sort(key=key, reverse=True)
+    return {
+        "name": samples["name"],
+        "interval": round(elapsed, 3),
+        "threads_total": len(threads),
+        "exited_threads": len(set(first["threads"]) - set(second["threads"])),
+        "cpu_percent": round(sum(t["cpu_percent"] for t in threads), 1),
+        "threads": threads[:top_n],
+        "thread_groups": sorted(groups.values(), key=key, reverse=True)[:top_n],
+    }
+
+
+def collect_thread_top(
+    host_config: Optional[RemoteConfigModel],
+    pid: int,
+    interval: float,
+    top_n: int,
+    sort_by: str,
+    is_zh: bool
+) -> Dict[str, Any]:
+    """统一入口：本地直接执行采样脚本，远程通过一次SSH会话执行"""
+    script = THREAD_SAMPLE_SCRIPT.format(pid=int(pid), interval=float(interval))
+    timeout = interval + 30
+    if host_config is None:
+        output = run_local_script(script, is_zh, timeout=timeout)
+    else:
+        output = run_remote_script(host_config, script, is_zh, timeout=timeout)
+
+    samples = parse_thread_samples(output)
+    if samples["missing"]:
+        raise ValueError(f"未找到PID为{pid}的进程" if is_zh else f"Process with PID {pid} not found")
+    result = compute_thread_rates(samples, top_n, sort_by)
+    result["pid"] = pid
+    return result
+
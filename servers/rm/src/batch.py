@@ -0,0 +1,65 @@
+"""
+批量删除：每项为 {path}，与 rm -rf 相同，目录递归删除，路径不存在时视为成功；
+在目标机上用解析符号链接后的真实路径再次检查允许删除的目录，防止经由符号链接删除白名单以外的内容。
+各项在有界线程池中并发执行；同一批中同时删除目录及其下的路径时，后者的结果（existed 或报错）取决于执行先后。
+只依赖标准库，远程执行时整个文件通过 SSH 标准输入交给目标机的 python3 运行，结果为最后一行 @RESULT JSON
+"""
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 32
+MAX_ITEMS = 10000
+
+
+def within_allowed(path: str, allowed_prefixes: List[str]) -> bool:
+    """按完整路径分量比较：只允许前缀目录之下的路径，前缀目录本身及 /tmp.bak 这类同名前缀的兄弟路径都不允许"""
+    return any(path.startswith(prefix.rstrip("/") + "/") for prefix in allowed_prefixes)
+
+
+def remove(item: Dict[str, Any], allowed_prefixes: List[str]) -> Dict[str, Any]:
+    path = os.path.abspath(item["path"])
+    # 路径本身为符号链接时删除的是链接，只需解析其所在目录
+    real = os.path.join(os.path.realpath(os.path.dirname(path)), os.path.basename(path))
+    if not within_allowed(real, allowed_prefixes):
+        raise ValueError(f"{real} is outside the allowed prefixes")
+    if not os.path.lexists(real):
+        return {"existed": False}
+    if os.path.isdir(real) and not os.path.islink(real):
+        shutil.rmtree(real)
+    else:
+        os.unlink(real)
+    return {"existed": True}
+
+
+def run_batch(items: List[Dict[str, Any]], workers: int, allowed_prefixes: List[str]) -> Dict[str, Any]:
+    """返回 {"results": [...], "succeeded", "failed", "seconds"}，results 与 items 一一对应"""
+    started = time.monotonic()
+
+    def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return dict(item, ok=True, **(remove(item, allowed_prefixes) or {}))
+        except (OSError, ValueError) as e:
+            detail = e.strerror if isinstance(e, OSError) and e.strerror else str(e)
+            return dict(item, ok=False, error=detail)
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(items)), 1)) as pool:
+        results = list(pool.map(run, items))
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded,
+            "seconds": round(time.monotonic() - started, 3)}
+
+
+def main() -> None:
+    args = json.loads(sys.argv[1])
+    result = run_batch(args["items"], args["workers"], args["allowed_prefixes"])
+    sys.stdout.write("@RESULT " + json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
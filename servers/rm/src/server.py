@@ -12,6 +12,12 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.rm.config_loader import RmConfig
+from servers.rm.src import batch
+from servers.rm.src.base import find_remote_host, run_python
+
+# 仅允许删除这些前缀的路径，白名单
+ALLOWED_PREFIXES = ('/tmp', '/home/user/trash')
+
 mcp = FastMCP("Rm MCP Server", host="0.0.0.0", port=RmConfig().get_config().private_config.port)
 
 
@@ -40,7 +46,6 @@ mcp = FastMCP("Rm MCP Server", host="0.0.0.0", port=RmConfig().get_config().priv
 )
 def rm_collect_tool(host: Union[str, None] = None, path: str = None) -> bool:
     """使用rm命令对文件或文件夹进行删除"""
-    ALLOWED_PREFIXES = ('/tmp', '/home/user/trash')  # 仅允许删除这些前缀的路径，白名单
     if host is None:
         try:
             command = ['rm']
@@ -110,6 +115,89 @@ def rm_collect_tool(host: Union[str, None] = None, path: str = None) -> bool:
             raise ValueError(f"Remote host not found: {host}")
 
 
+def _check_batch(items: List[Any], workers: int, is_zh: bool) -> None:
+    if not items or len(items) > batch.MAX_ITEMS:
+        raise ValueError(f"操作列表不能为空，且最多 {batch.MAX_ITEMS} 项" if is_zh
+                         else f"The operation list must contain 1-{batch.MAX_ITEMS} items")
+    if not 1 <= workers <= batch.MAX_WORKERS:
+        raise ValueError(f"workers 范围为 1~{batch.MAX_WORKERS}" if is_zh else f"workers must be 1-{batch.MAX_WORKERS}")
+
+
+def _execute(host: Union[str, None], items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """本地直接执行；远程把整批操作交给目标机的 python3，只建立一次SSH连接"""
+    cfg = RmConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if host is None:
+        return batch.run_batch(items, workers, list(ALLOWED_PREFIXES))
+    host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_python(host_config, batch.__file__,
+                      {"items": items, "workers": workers, "allowed_prefixes": list(ALLOWED_PREFIXES)}, is_zh,
+                      timeout=600)
+
+
+@mcp.tool(
+    name="rm_batch_tool"
+    if RmConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "rm_batch_tool",
+    description='''
+    批量删除文件或文件夹：与 rm -rf 相同，路径不存在时视为成功；每一项都必须位于允许删除的目录之下
+    （按完整路径分量比较，允许的目录本身不能删除），不在范围内的项直接返回失败，
+    执行前还会用解析符号链接后的真实路径再检查一次；
+    整批操作在本机一次完成，或在远程主机上通过一个SSH连接交给目标机的 python3 执行，各项并发执行并分别返回结果
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则对本机进行操作
+        - paths: 要删除的文件或文件夹路径列表，最多 10000 项
+        - workers: 并发数，范围 1~32，默认8
+    2. 返回值为字典：
+        - results: 与输入顺序一致的结果列表，每项包含输入的字段、ok（是否成功）、existed（删除前是否存在），失败时包含 error
+        - succeeded/failed: 成功与失败的项数
+        - seconds: 执行耗时
+    '''
+    if RmConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Delete files or folders in bulk: like rm -rf, missing paths count as success; every item must lie below an
+    allowed directory (compared by whole path components, the allowed directories themselves cannot be deleted),
+    items outside fail without being touched, and the path with symbolic links resolved is checked again before
+    deletion; the whole batch runs in one local pass, or on a remote host as one python3
+    script over a single SSH connection, items run concurrently and each gets its own result
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the operation is performed on the local machine
+        - paths: Paths of the files or folders to delete, at most 10000 items
+        - workers: Concurrency, 1 to 32, default 8
+    2. The return value is a dictionary:
+        - results: Results in input order, each with the input fields, ok (success), existed (existed before deletion), and error on failure
+        - succeeded/failed: Number of items that succeeded and failed
+        - seconds: Elapsed time
+    '''
+
+)
+def rm_batch_tool(host: Union[str, None] = None, paths: List[str] = None, workers: int = 8) -> Dict[str, Any]:
+    """批量删除文件或文件夹"""
+    is_zh = RmConfig().get_config().public_config.language == LanguageEnum.ZH
+    _check_batch(paths, workers, is_zh)
+    if not all(isinstance(path, str) and path for path in paths):
+        raise ValueError("删除的文件或文件夹路径不能为空" if is_zh else "Paths to delete cannot be empty")
+    # 白名单检查逐项进行，不在范围内的项不会发送执行；目标机上会用真实路径再检查一次
+    results: List[Union[Dict[str, Any], None]] = []
+    items = []
+    for path in paths:
+        abs_path = os.path.abspath(path)
+        if batch.within_allowed(abs_path, list(ALLOWED_PREFIXES)):
+            results.append(None)
+            items.append({"path": path})
+        else:
+            results.append({"path": path, "ok": False, "error": f"路径 {abs_path} 不在允许删除的范围内" if is_zh
+                            else f"Path {abs_path} is outside the allowed range"})
+    executed = _execute(host, items, workers) if items else {"results": [], "seconds": 0.0}
+    done = iter(executed["results"])
+    results = [result if result is not None else next(done) for result in results]
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded,
+            "seconds": executed["seconds"]}
+
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='sse')
@@ -0,0 +1,80 @@
+"""公共基础层：远程主机查找、SSH连接与采集脚本的流式执行"""
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional
+
+import paramiko
+
+from config.public.base_config_loader import RemoteConfigModel
+
+
+def find_remote_host(host_name: str, remote_hosts: List[RemoteConfigModel], is_zh: bool) -> RemoteConfigModel:
+    """查找远程主机配置"""
+    for host in remote_hosts:
+        if host.name == host_name or host.host == host_name:
+            return host
+    raise ValueError(f"未找到远程主机: {host_name}" if is_zh else f"Remote host not found: {host_name}")
+
+
+def open_ssh_client(host_config: RemoteConfigModel, is_zh: bool) -> paramiko.SSHClient:
+    """建立到远程主机的SSH连接"""
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            hostname=host_config.host,
+            port=host_config.port,
+            username=host_config.username,
+            password=host_config.password,
+            timeout=10,
+            banner_timeout=10
+        )
+    except paramiko.AuthenticationException as e:
+        client.close()
+        raise ValueError("SSH认证失败，请检查用户名和密码" if is_zh
+                         else "SSH authentication failed, check username and password") from e
+    except Exception as e:
+        client.close()
+        raise ValueError(f"SSH连接错误: {str(e)}" if is_zh else f"SSH connection error: {str(e)}") from e
+    return client
+
+
+@contextmanager
+def open_script_stream(host_config: Optional[RemoteConfigModel], script: str, is_zh: bool,
+                       timeout: float) -> Iterator[BinaryIO]:
+    """
+    通过 sh -s 执行脚本并返回标准输出的字节流，调用方边读边解析，不需要把完整输出缓存在内存中；
+    远程只建立一次SSH会话，脚本自行把错误信息写到标准输出
+    """
+    if host_config is None:
+        proc = subprocess.Popen(["sh", "-s"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL)
+        proc.stdin.write(script.encode("utf-8"))
+        proc.stdin.close()
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        try:
+            yield proc.stdout
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+        return
+
+    client = open_ssh_client(host_config, is_zh)
+    try:
+        stdin, stdout, _ = client.exec_command("sh -s", timeout=timeout)
+        stdin.write(script)
+        stdin.channel.shutdown_write()
+        yield stdout
+    finally:
+        client.close()
+
+
+def run_script(host_config: Optional[RemoteConfigModel], script: str, is_zh: bool, timeout: float) -> str:
+    """执行输出量很小的脚本并一次性返回全部输出"""
+    with open_script_stream(host_config, script, is_zh, timeout) as stream:
+        return stream.read().decode("utf-8", errors="replace")
@@ -0,0 +1,86 @@
+"""
+sadf -j 流式解析基准测试
+用法：
+    python -m servers.sar.src.bench_sadf                 # 生成一天、1秒间隔的模拟 sadf -j 输出
+    python -m servers.sar.src.bench_sadf /var/log/sa/sa15 # 使用真实的 sa 文件（需要安装 sysstat）
+对比整体 json.loads 与流式解析（均转为列式）的耗时和峰值内存，耗时在未开启 tracemalloc 的单独一次运行中测量
+"""
+import io
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from servers.sar.src.sadf import ColumnarSeries, parse_sadf_stream
+
+ACTIVITY = ["-u", "-P", "ALL", "-r", "-d", "-q", "-w", "-B", "-W", "-I", "SUM", "-n", "DEV,EDEV"]
+
+
+def synthetic_day(samples: int = 86400, cpus: int = 8) -> bytes:
+    """按 sysstat 12 的 JSON 结构生成模拟数据"""
+    records = []
+    for i in range(samples):
+        records.append(json.dumps({
+            "timestamp": {"date": "2025-01-01", "time": f"{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+                          "utc": 0, "interval": 1},
+            "cpu-load": [{"cpu": c, "user": 1.5, "nice": 0.0, "system": 0.5, "iowait": 0.1, "steal": 0.0,
+                          "idle": 97.9} for c in ["all"] + [str(n) for n in range(cpus)]],
+            "memory": {"memfree": 1000, "avail": 2000, "memused": 3000, "memused-percent": 40.0, "buffers": 10,
+                       "cached": 20, "commit": 30, "commit-percent": 5.0, "active": 40, "inactive": 50,
+                       "dirty": 0},
+            "disk": [{"disk-device": d, "tps": 1.0, "rkB": 2.0, "wkB": 3.0, "dkB": 0.0, "areq-sz": 4.0,
+                      "aqu-sz": 0.1, "await": 0.5, "util-percent": 1.0} for d in ("sda", "sdb")],
+            "queue": {"runq-sz": 1, "plist-sz": 300, "ldavg-1": 0.5, "ldavg-5": 0.4, "ldavg-15": 0.3,
+                      "blocked": 0},
+            "process-and-context-switch": {"proc": 1.0, "cswch": 2000.0},
+            "paging": {"pgpgin": 0.0, "pgpgout": 10.0, "fault": 100.0, "majflt": 0.0, "pgfree": 50.0,
+                       "pgscank": 0.0, "pgscand": 0.0, "pgsteal": 0.0, "vmeff-percent": 0.0},
+            "swap-pages": {"pswpin": 0.0, "pswpout": 0.0},
+            "interrupts": [{"intr": "sum", "value": 900.0}],
+            "network": {
+                "net-dev": [{"iface": n, "rxpck": 10.0, "txpck": 10.0, "rxkB": 1.0, "txkB": 1.0, "rxcmp": 0.0,
+                             "txcmp": 0.0, "rxmcst": 0.0, "ifutil-percent": 0.0} for n in ("lo", "eth0")],
+                "net-edev": [{"iface": n, "rxerr": 0.0, "txerr": 0.0, "coll": 0.0, "rxdrop": 0.0, "txdrop": 0.0,
+                              "txcarr": 0.0, "rxfram": 0.0, "rxfifo": 0.0, "txfifo": 0.0} for n in ("lo", "eth0")],
+            },
+        }))
+    head = ('{"sysstat": {"hosts": [{"nodename": "bench", "sysname": "Linux", "release": "6.1.0", '
+            f'"machine": "x86_64", "number-of-cpus": {cpus}, "file-date": "2025-01-01", "timezone": "UTC", '
+            '"statistics": [\n')
+    return (head + ",\n".join(records) + '\n], "restarts": []}]}}\n').encode()
+
+
+def load_whole(data: bytes) -> int:
+    """对照组：整体解析后再转为列式"""
+    columnar = ColumnarSeries()
+    for record in json.loads(data)["sysstat"]["hosts"][0]["statistics"]:
+        columnar.add(record)
+    return len(columnar.timestamps)
+
+
+def measure(name: str, func) -> None:
+    """耗时与峰值内存分两次运行测量：tracemalloc 会显著拖慢分配密集的解析，不能与计时同时开启"""
+    start = time.perf_counter()
+    samples = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} samples={samples:<7} elapsed={elapsed:.2f}s peak={peak / 1024 / 1024:.1f}MB")
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        data = subprocess.run(["sadf", "-j", "-t", sys.argv[1], "--"] + ACTIVITY,
+                              capture_output=True, check=True).stdout
+    else:
+        data = synthetic_day()
+    print(f"sadf -j output: {len(data) / 1024 / 1024:.1f}MB")
+    measure("json.loads", lambda: load_whole(data))
+    measure("streaming", lambda: parse_sadf_stream(io.BytesIO(data), False)["samples"])
+
+
+if __name__ == "__main__":
+    main()
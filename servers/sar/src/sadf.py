@@ -0,0 +1,265 @@
+"""sadf -j 结构化输出的流式解析：逐条解码 statistics 数组中的采样记录，按活动类别输出列式数据"""
+import codecs
+import json
+import re
+import shlex
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.sar.src.base import open_script_stream
+
+# 每次从管道/SSH通道读取的字节数
+CHUNK_SIZE = 64 * 1024
+
+# 不带参数的活动类别；-u/-r 允许附带 ALL
+SIMPLE_OPTIONS = ("-u", "-r", "-d", "-b", "-q", "-w", "-B", "-W", "-S", "-v", "-H", "-y", "-A")
+NET_KEYWORDS = ("DEV", "EDEV", "NFS", "NFSD", "SOCK", "IP", "EIP", "ICMP", "EICMP", "TCP", "ETCP", "UDP",
+                "SOCK6", "IP6", "EIP6", "ICMP6", "EICMP6", "UDP6", "FC", "SOFT", "ALL")
+POWER_KEYWORDS = ("CPU", "FAN", "FREQ", "IN", "TEMP", "USB", "ALL")
+CPU_LIST = re.compile(r"^(ALL|[0-9]+([,-][0-9]+)*)$")
+INT_LIST = re.compile(r"^(SUM|ALL|[0-9]+(,[0-9]+)*)$")
+
+# 列表中用于区分实例（CPU、网卡、磁盘、中断号等）的字段
+INSTANCE_KEYS = ("cpu", "iface", "disk-device", "intr", "name", "dev", "device", "filesystem", "FILESYSTEM",
+                 "usbdev", "number")
+
+LIVE_SCRIPT = """
+export LC_ALL=C
+command -v sadf >/dev/null 2>&1 || {{ echo "@ERROR sadf not found, install sysstat"; exit 0; }}
+dir=$(mktemp -d 2>/dev/null) || {{ dir=/tmp/.sar.$$; mkdir -p "$dir"; }}
+if ! sar -o "$dir/sa" {activity} {interval} {count} >/dev/null 2>"$dir/err"; then
+    echo "@ERROR $(head -n 3 "$dir/err" | tr '\\n' ' ')"
+    rm -rf "$dir"
+    exit 0
+fi
+sadf -j -t "$dir/sa" -- {activity} 2>"$dir/err" || echo "@ERROR $(head -n 3 "$dir/err" | tr '\\n' ' ')"
+rm -rf "$dir"
+exit 0
+"""
+
+FILE_SCRIPT = """
+export LC_ALL=C
+command -v sadf >/dev/null 2>&1 || {{ echo "@ERROR sadf not found, install sysstat"; exit 0; }}
+file={file}
+if [ -n "$file" ] && [ ! -r "$file" ]; then
+    echo "@ERROR $file: not found or not readable"
+    exit 0
+fi
+err=$(mktemp 2>/dev/null) || err=/tmp/.sadf.$$
+sadf -j -t {window} ${{file:+"$file"}} -- {activity} 2>"$err" || echo "@ERROR $(head -n 3 "$err" | tr '\\n' ' ')"
+rm -f "$err"
+exit 0
+"""
+
+
+def parse_activity(device: str, is_zh: bool) -> List[str]:
+    """校验并拆分活动类别参数（如 "-u"、"-n DEV,EDEV"、"-P ALL -q"），只允许 sar 已知的选项"""
+    tokens = device.split()
+    result: List[str] = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+        if token in SIMPLE_OPTIONS:
+            result.append(token)
+            if token in ("-u", "-r") and nxt == "ALL":
+                result.append(nxt)
+                i += 1
+        elif token in ("-n", "-m") and nxt is not None:
+            keywords = NET_KEYWORDS if token == "-n" else POWER_KEYWORDS
+            if not all(k in keywords for k in nxt.split(",")):
+                break
+            result += [token, nxt]
+            i += 1
+        elif token == "-P" and nxt is not None and CPU_LIST.match(nxt):
+            result += [token, nxt]
+            i += 1
+        elif token == "-I":
+            result.append(token)
+            if nxt is not None and INT_LIST.match(nxt):
+                result.append(nxt)
+                i += 1
+        else:
+            break
+        i += 1
+    if not tokens or i < len(tokens):
+        raise ValueError(
+            f"不支持的活动类别: {device}，示例: -u、-r、-d、-q、-w、-B、-W、-I SUM、-P ALL、-n DEV、-n EDEV" if is_zh
+            else f"Unsupported activity: {device}, e.g. -u, -r, -d, -q, -w, -B, -W, -I SUM, -P ALL, -n DEV, -n EDEV"
+        )
+    return result
+
+
+def build_live_script(activity: List[str], interval: int, count: int) -> str:
+    """sar 以二进制格式写入临时文件后由 sadf 转为 JSON，避免解析随版本/语言环境变化的文本列"""
+    return LIVE_SCRIPT.format(activity=" ".join(activity), interval=int(interval), count=int(count))
+
+
+def build_file_script(activity: List[str], file: Optional[str], starttime: Optional[str],
+                      endtime: Optional[str]) -> str:
+    """不指定文件时 sadf 读取当天的日志文件"""
+    window = []
+    if starttime:
+        window += ["-s", starttime]
+    if endtime:
+        window += ["-e", endtime]
+    return FILE_SCRIPT.format(activity=" ".join(activity), file=shlex.quote(file or ""), window=" ".join(window))
+
+
+class ColumnarSeries:
+    """把逐条采样记录转为列式存储：每个 (类别, 实例) 一组列，缺失的采样补 None"""
+
+    def __init__(self) -> None:
+        self.timestamps: List[str] = []
+        self.interval: Optional[int] = None
+        self._series: Dict[Tuple[str, Optional[str]], Dict[str, List[Any]]] = {}
+
+    def add(self, record: Dict[str, Any]) -> None:
+        stamp = record.get("timestamp") or {}
+        self.timestamps.append(f"{stamp.get('date', '')} {stamp.get('time', '')}".strip())
+        if self.interval is None:
+            self.interval = stamp.get("interval")
+        index = len(self.timestamps) - 1
+        for key, value in record.items():
+            if key != "timestamp":
+                self._walk(key, value, index, None)
+
+    def _walk(self, activity: str, value: Any, index: int, instance: Optional[str]) -> None:
+        if isinstance(value, dict):
+            scalars = {k: v for k, v in value.items() if not isinstance(v, (dict, list))}
+            if scalars:
+                self._put(activity, instance, scalars, index)
+            for key, nested in value.items():
+                if isinstance(nested, (dict, list)):
+                    self._walk(key, nested, index, instance)
+        elif isinstance(value, list):
+            for item in value:
+                if not isinstance(item, dict):
+                    continue
+                key = next((k for k in INSTANCE_KEYS if k in item), None)
+                if key is None:
+                    key = next((k for k, v in item.items() if isinstance(v, str)), None)
+                name = str(item[key]) if key is not None else None
+                if instance is not None and name is not None:
+                    name = f"{instance}/{name}"
+                self._walk(activity, {k: v for k, v in item.items() if k != key}, index, name or instance)
+
+    def _put(self, activity: str, instance: Optional[str], values: Dict[str, Any], index: int) -> None:
+        columns = self._series.setdefault((activity, instance), {})
+        for key, value in values.items():
+            column = columns.setdefault(key, [])
+            if len(column) < index:
+                column.extend([None] * (index - len(column)))
+            column.append(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = len(self.timestamps)
+        series = []
+        for (activity, instance), columns in self._series.items():
+            for column in columns.values():
+                if len(column) < total:
+                    column.extend([None] * (total - len(column)))
+            series.append({"activity": activity, "instance": instance, "columns": columns})
+        return {"samples": total, "interval": self.interval, "timestamps": self.timestamps, "series": series}
+
+
+_HEADER_FIELD = re.compile(r'"([\w-]+)"\s*:\s*("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?)')
+
+
+def _parse_header(text: str) -> Dict[str, Any]:
+    """statistics 之前是主机信息（nodename、release、number-of-cpus 等），只取其中的标量字段"""
+    header: Dict[str, Any] = {}
+    for key, value in _HEADER_FIELD.findall(text):
+        header[key] = json.loads(value)
+    return header
+
+
+def _error_detail(text: str) -> List[str]:
+    return [m.strip() for m in re.findall(r"@ERROR (.*)", text)]
+
+
+def iter_sadf_records(stream: BinaryIO, header: Dict[str, Any], errors: List[str],
+                      is_zh: bool) -> Iterator[Dict[str, Any]]:
+    """
+    增量解码 sadf -j 输出：定位到 "statistics" 数组后用 raw_decode 逐个解析采样记录，
+    缓冲区只保留尚未解析完的一条记录，内存占用与文件时长无关；
+    输出中可以依次包含多个文件的 JSON 文档，文档之间的 @ERROR 行记入 errors
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")("replace")
+    json_decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    documents = 0
+
+    def fill() -> None:
+        nonlocal buf, pos, eof
+        chunk = stream.read(CHUNK_SIZE)
+        eof = not chunk
+        buf = buf[pos:] + decoder.decode(chunk or b"", final=eof)
+        pos = 0
+
+    def fail(text: str) -> ValueError:
+        detail = "; ".join(errors + _error_detail(text))
+        if detail:
+            return ValueError(f"sadf 执行失败: {detail}" if is_zh else f"sadf failed: {detail}")
+        return ValueError("sadf 输出不完整或无法解析" if is_zh else "sadf output is truncated or cannot be parsed")
+
+    while True:
+        # 文档之间只有 restarts 等尾部信息与可能的错误提示，数据量很小
+        start = buf.find('"statistics"', pos)
+        bracket = buf.find("[", start) if start >= 0 else -1
+        if bracket < 0:
+            if not eof:
+                fill()
+                continue
+            if documents == 0:
+                raise fail(buf[pos:])
+            errors.extend(_error_detail(buf[pos:]))
+            return
+        errors.extend(_error_detail(buf[pos:start]))
+        if documents == 0:
+            header.update(_parse_header(buf[pos:start]))
+        documents += 1
+        pos = bracket + 1
+
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    raise fail(buf)
+                fill()
+                continue
+            if buf[pos] == "]":
+                pos += 1
+                break
+            try:
+                record, end = json_decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise fail(buf[pos:])
+                fill()
+                continue
+            pos = end
+            yield record
+
+
+def parse_sadf_stream(stream: BinaryIO, is_zh: bool) -> Dict[str, Any]:
+    header: Dict[str, Any] = {}
+    errors: List[str] = []
+    columnar = ColumnarSeries()
+    for record in iter_sadf_records(stream, header, errors, is_zh):
+        columnar.add(record)
+    host = {key: header[key] for key in ("nodename", "sysname", "release", "machine", "number-of-cpus",
+                                         "file-date", "timezone") if key in header}
+    result = dict(host=host, **columnar.to_dict())
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def run_sadf(host_config: Optional[RemoteConfigModel], script: str, timeout: float, is_zh: bool) -> Dict[str, Any]:
+    """本地或远程执行脚本，输出边传输边解析"""
+    with open_script_stream(host_config, script, is_zh, timeout) as stream:
+        return parse_sadf_stream(stream, is_zh)
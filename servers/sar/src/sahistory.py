@@ -0,0 +1,141 @@
+"""sa 历史查询：按主机缓存各 saDD 文件覆盖的时间范围，只对命中的文件在目标机上执行带 -s/-e 窗口的 sadf"""
+import shlex
+import threading
+from datetime import datetime, time as dtime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.sar.src.base import run_script
+from servers.sar.src.sadf import run_sadf
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 列出 sa 文件的大小与修改时间；只对新文件或被覆盖的文件读取第一条记录的时间，
+# 已索引且只是追加写入的文件（如当天的日志）不再调用 sadf，结束时间取修改时间。
+# 被覆盖的判断：文件变小，或修改日期与已索引的首条记录日期不同（一个月后重写的 saDD 可能已超过原来的大小）；
+# 最后一条记录跨过午夜的文件因此每次刷新都会重读一次首条记录，代价只是一次 sadf
+INDEX_SCRIPT = """
+export LC_ALL=C
+known={known}
+set --
+for d in {dirs}; do
+    for f in "$d"/sa[0-9][0-9] "$d"/sa[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]; do
+        [ -f "$f" ] && set -- "$@" "$f"
+    done
+done
+[ $# -gt 0 ] || exit 0
+command -v sadf >/dev/null 2>&1 || {{ echo "@ERROR sadf not found, install sysstat"; exit 0; }}
+stat -L -c '%s %Y %y %n' -- "$@" 2>/dev/null | while read -r size mtime day clock tz path; do
+    echo "@FILE $size $day ${{clock%%.*}} $path"
+    case "$known" in
+        *"|$path:"*)
+            old=${{known#*"|$path:"}}
+            old=${{old%%"|"*}}
+            [ "${{old%%:*}}" -le "$size" ] && [ "${{old#*:}}" = "$day" ] && continue
+            ;;
+    esac
+    for activity in -q -u; do
+        first=$(sadf -d -t "$path" -- $activity 2>/dev/null | awk -F';' 'NR > 1 && $3 ~ /^[0-9]/ {{ print substr($3, 1, 19); exit }}')
+        [ -n "$first" ] && break
+    done
+    echo "@FIRST $first|$path"
+done
+"""
+
+FILE_QUERY = """sadf -j -t -s {start} -e {end} {file} -- {activity} 2>"$err" || echo "@ERROR {name}: $(head -n 3 "$err" | tr '\\n' ' ')"
+"""
+
+# 每台主机的 sa 文件索引：{host: {path: {"size": ..., "first": ..., "last": ...}}}
+_indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+_index_lock = threading.Lock()
+
+
+def parse_index_output(output: str, cached: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """合并索引脚本输出与已有索引，已删除的文件从索引中移除"""
+    index: Dict[str, Dict[str, Any]] = {}
+    firsts: Dict[str, str] = {}
+    for line in output.splitlines():
+        if line.startswith("@FILE "):
+            parts = line.split(" ", 4)
+            if len(parts) == 5 and parts[1].isdigit():
+                index[parts[4]] = {"size": int(parts[1]), "last": f"{parts[2]} {parts[3]}"}
+        elif line.startswith("@FIRST "):
+            first, _, path = line[len("@FIRST "):].partition("|")
+            firsts[path] = first.strip()
+    for path, entry in index.items():
+        entry["first"] = firsts.get(path, cached.get(path, {}).get("first", ""))
+    return {path: entry for path, entry in index.items() if entry["first"]}
+
+
+def refresh_index(host_config: Optional[RemoteConfigModel], sa_dirs: List[str],
+                  is_zh: bool) -> Dict[str, Dict[str, Any]]:
+    """一次往返刷新索引，只有新增或被覆盖（变小或修改日期不在首条记录当天）的文件需要 sadf 读取首条记录"""
+    key = "localhost" if host_config is None else host_config.name
+    with _index_lock:
+        cached = dict(_indexes.get(key, {}))
+    # 每个文件记录为 路径:大小:首条记录日期，供脚本判断文件是否被覆盖
+    known = "|" + "|".join(f"{path}:{entry['size']}:{entry['first'][:10]}" for path, entry in cached.items()) + "|"
+    script = INDEX_SCRIPT.format(known=shlex.quote(known), dirs=" ".join(shlex.quote(d) for d in sa_dirs))
+    output = run_script(host_config, script, is_zh, timeout=120)
+    if "@ERROR" in output:
+        detail = output.split("@ERROR", 1)[1].strip()
+        raise ValueError(f"sadf 执行失败: {detail}" if is_zh else f"sadf failed: {detail}")
+    index = parse_index_output(output, cached)
+    with _index_lock:
+        _indexes[key] = index
+    return index
+
+
+def plan_files(index: Dict[str, Dict[str, Any]], start: datetime, end: datetime,
+               daily_start: Optional[dtime], daily_end: Optional[dtime]) -> List[Tuple[str, dtime, dtime]]:
+    """
+    选出与查询区间有交集的文件，并计算每个文件的 -s/-e 窗口；
+    同一天的 saDD 与 saYYYYMMDD（符号链接）只保留一个
+    """
+    by_first: Dict[str, str] = {}
+    for path in sorted(index):
+        by_first.setdefault(index[path]["first"], path)
+    plan = []
+    for first_text in sorted(by_first):
+        path = by_first[first_text]
+        try:
+            first = datetime.strptime(first_text, TIME_FORMAT)
+            last = datetime.strptime(index[path]["last"], TIME_FORMAT)
+        except ValueError:
+            continue
+        # 每个文件只记录一天，跨过午夜写入的最后一条记录按当天结束处理
+        last = min(last, datetime.combine(first.date(), dtime(23, 59, 59)))
+        if last < start or first > end:
+            continue
+        window_start = max(start, first).time()
+        window_end = min(end, last).time()
+        if daily_start is not None:
+            window_start = max(window_start, daily_start)
+        if daily_end is not None:
+            window_end = min(window_end, daily_end)
+        if window_start <= window_end:
+            plan.append((path, window_start, window_end))
+    return plan
+
+
+def build_query_script(plan: List[Tuple[str, dtime, dtime]], activity: List[str]) -> str:
+    lines = ["export LC_ALL=C", "err=$(mktemp 2>/dev/null) || err=/tmp/.sadf.$$"]
+    for path, start, end in plan:
+        lines.append(FILE_QUERY.format(start=start.strftime("%H:%M:%S"), end=end.strftime("%H:%M:%S"),
+                                       file=shlex.quote(path), name=path.replace('"', ""),
+                                       activity=" ".join(activity)).rstrip("\n"))
+    lines += ['rm -f "$err"', "exit 0"]
+    return "\n".join(lines) + "\n"
+
+
+def query_history(host_config: Optional[RemoteConfigModel], sa_dirs: List[str], activity: List[str],
+                  start: datetime, end: datetime, daily_start: Optional[dtime], daily_end: Optional[dtime],
+                  is_zh: bool) -> Dict[str, Any]:
+    """跨多天查询：各文件的结果按时间顺序合并为一份列式数据，只有窗口内的记录经过网络传输"""
+    plan = plan_files(refresh_index(host_config, sa_dirs, is_zh), start, end, daily_start, daily_end)
+    files = [{"file": path, "start": s.strftime("%H:%M:%S"), "end": e.strftime("%H:%M:%S")} for path, s, e in plan]
+    if not plan:
+        return {"host": {}, "samples": 0, "interval": None, "timestamps": [], "series": [], "files": files}
+    result = run_sadf(host_config, build_query_script(plan, activity), 60 + 30 * len(plan), is_zh)
+    result["files"] = files
+    return result
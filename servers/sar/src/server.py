@@ -1,10 +1,8 @@
 from typing import Union, List, Dict
 import platform
 import os
-import paramiko
 import yaml
 import datetime
-import subprocess
 from typing import Any, Dict
 import psutil
 import tempfile
@@ -12,6 +10,10 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.sar.config_loader import SarConfig
+from servers.sar.src.base import find_remote_host
+from servers.sar.src.downsample import downsample, parse_agg, parse_bucket
+from servers.sar.src.sadf import build_file_script, build_live_script, parse_activity, run_sadf
+from servers.sar.src.sahistory import query_history
 mcp = FastMCP("Sar MCP Server", host="0.0.0.0", port=SarConfig().get_config().private_config.port)
 
 @mcp.tool(
@@ -20,308 +22,87 @@ mcp = FastMCP("Sar MCP Server", host="0.0.0.0", port=SarConfig().get_config().pr
     else
     "sar_collect_tool",
     description='''
-    使用sar命令分析资源使用的周期性规律
+    使用sar命令分析资源使用的周期性规律（数据经 sadf -j 以结构化JSON流式解析）
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则对本机进行分析
-        - device: 分析哪方面的状态（cpu、内存、磁盘...)
-        - interval: 监控的时间间隔
-        - count: 监控次数
-    2. 返回值为包含相应信息的字典列表，每个字典包含以下键
-        - timestamp: 采集指标的时间
-        当`device`设置为-u时,采集的是cpu相关信息:
-            - user: 用户空间程序占用CPU的百分比
-            - nice: 低优先级用户进程占用的CPU百分比
-            - system: 内核空间程序占用CPU的百分比
-            - iowait: CPU等待磁盘I/O操作的时间百分比
-            - steal: 虚拟化环境中，其他虚拟机占用的CPU时间百分比
-            - idle: CPU空闲时间百分比
-        当`device`设置为-r时,采集的是内存相关信息:
-            - kbmemfree:​ 物理空闲内存量（未被使用的内存）
-            - kbavail: 实际可用内存（包括缓存和缓冲区的可回收部分）
-            - kbmemused: 已使用的物理内存（不包括内核缓存和缓冲区）
-            - memused: 已用内存占总物理内存的百分比（百分比）
-            - kbbuffers: 内核缓冲区（Buffer）占用的内存（用于块设备读写缓存） 
-            - kbcached: ​内核缓存（Cache）占用的内存（用于文件系统缓存）
-            - kbcommit: 当前工作负载所需的总内存量（包括已用和预估的）
-            - commit: kbcommit占系统总可用内存（物理内存 + Swap）的百分比（百分比）
-            - kbactive: 活跃内存（最近被访问过的内存，不易被回收）
-            - kbinact: 非活跃内存（较久未访问的内存，可被回收用于新进程）
-            - kbdirty: 等待写入磁盘的脏数据量（单位 KB）
-        当`device`设置为-d时,采集的是磁盘I/O相关信息:
-            - name: 磁盘设备名称
-            - tps: 每秒传输次数（IOPS）
-            - rkB_s: 每秒读取的数据量（单位 KB/s）
-            - wkB_s: 每秒写入的数据量（单位 KB/s）
-            - dkB_s: 每秒丢弃的数据量（单位 KB/s）
-            - areq-sz: 平均每次 I/O 请求的数据大小（单位 KB）
-            - aqu-sz: 平均 I/O 请求队列长度
-            - await: 平均每次 I/O 请求的等待时间（单位 毫秒）
-            - util: 设备带宽利用率（百分比）
+        - device: 活动类别，可组合多个，如 -u（CPU）、-P ALL（每个CPU）、-r（内存）、-d（磁盘）、
+          -n DEV（网卡流量）、-n EDEV（网卡错误）、-q（队列与负载）、-w（进程创建与上下文切换）、
+          -B（分页）、-W（交换）、-I SUM（中断）等
+        - interval: 监控的时间间隔（秒），不提供时读取当天sa日志中已有的数据
+        - count: 监控次数，默认1
+        - bucket: 降采样的时间桶宽度，可选，如 60、30s、5m、1h
+        - agg: 聚合方式，可选，逗号分隔，支持 min、max、mean、p50、p95、p99、last、lttb（保留曲线形状的选点，需指定 bucket，点数与桶数相同），默认 mean
+    2. 返回值为列式数据字典，包含以下键：
+        - host: 主机信息（nodename、release、number-of-cpus 等）
+        - samples: 采样点数
+        - interval: 采样间隔（秒）
+        - timestamps: 每个采样点的时间
+        - series: 序列列表，每项包含：
+            - activity: sadf 的类别名（如 cpu-load、memory、disk、net-dev、net-edev、queue、paging、
+              swap-pages、process-and-context-switch、interrupts）
+            - instance: 实例名（CPU编号、网卡、磁盘设备、中断等），没有实例的类别为 null
+            - columns: 指标名到取值列表的映射，与 timestamps 一一对应，缺失的采样为 null；
+              指标名与 sadf -j 一致，如 cpu-load 的 user/nice/system/iowait/steal/idle，
+              memory 的 memfree/avail/memused/memused-percent/buffers/cached/commit/dirty，
+              disk 的 tps/rkB/wkB/areq-sz/aqu-sz/await/util-percent
+        指定 bucket 或 agg 时在服务端降采样：timestamps 为各桶的起始时间，columns 中每个指标变为
+        {聚合方式: 每个桶的值列表}，lttb 为 {timestamps, values}；另含 bucket、agg、buckets（桶数）
     '''
     if SarConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Using the sar command to analyze the periodic patterns of resource usage
+    Using the sar command to analyze the periodic patterns of resource usage (data is parsed from sadf -j
+    structured JSON as a stream)
     1. Input values are as follows:
         - host: The name or IP address of the remote host; if not provided, the analysis is performed on the local machine
-        - device: The aspect of the system status to be analyzed (CPU, memory, disk, etc.)
-        - interval: The time interval for monitoring
-        - count: The number of monitoring instances
-    2. The return value is a list of dictionaries containing the corresponding information, each dictionary includes the following keys:
-        - timestamp: The time when the metrics were collected.
-        When `device` is set to -u, the following CPU-related information is collected:
-            - user: The percentage of CPU used by user space programs.
-            - nice: The percentage of CPU used by low-priority user processes.
-            - system: The percentage of CPU used by kernel space programs.
-            - iowait: The percentage of time the CPU spends waiting for disk I/O operations.
-            - steal: In a virtualized environment, the percentage of CPU time used by other virtual machines.
-            - idle: The percentage of CPU idle time.
-        When `device` is set to `-r`, the following memory-related information is collected:
-            - `kbmemfree`: Physical free memory (unused memory)
-            - `kbavail`: Actual available memory (including reclaimable parts of cache and buffers)
-            - `kbmemused`: Used physical memory (excluding kernel cache and buffers)
-            - `memused`: Percentage of used memory relative to total physical memory (percentage)
-            - `kbbuffers`: Memory used by kernel buffers (used for block device read/write caching)
-            - `kbcached`: Memory used by kernel cache (used for file system caching)
-            - `kbcommit`: Total memory required for the current workload (including used and estimated)
-            - `commit`: Percentage of `kbcommit` relative to the system's total available memory (physical memory + Swap) (percentage)
-            - `kbactive`: Active memory (recently accessed memory, not easily reclaimable)
-            - `kbinact`: Inactive memory (less recently accessed memory, reclaimable for new processes)
-            - `kbdirty`: Amount of dirty data waiting to be written to disk (unit: KB)
-        When `device` is set to `-d`, the following disk I/O-related information is collected:
-            - `name`: Disk device name
-            - `tps`: Transactions per second (IOPS)
-            - `rkB_s`: Data read per second (unit: KB/s)
-            - `wkB_s`: Data written per second (unit: KB/s)
-            - `dkB_s`: Data discarded per second (unit: KB/s)
-            - `areq-sz`: Average data size per I/O request (unit: KB)
-            - `aqu-sz`: Average I/O request queue length
-            - `await`: Average wait time per I/O request (unit: milliseconds)
-            - `util`: Device bandwidth utilization (percentage)
+        - device: Activity classes, several may be combined, e.g. -u (CPU), -P ALL (per CPU), -r (memory),
+          -d (disk), -n DEV (network traffic), -n EDEV (network errors), -q (queue and load), -w (process
+          creation and context switches), -B (paging), -W (swapping), -I SUM (interrupts)
+        - interval: The monitoring interval in seconds; if not provided, today's existing sa log data is read
+        - count: The number of monitoring instances, default 1
+        - bucket: Downsampling bucket width, optional, e.g. 60, 30s, 5m, 1h
+        - agg: Aggregates, optional, comma separated: min, max, mean, p50, p95, p99, last, lttb (shape-preserving
+          point selection, requires bucket and keeps as many points as there are buckets), default mean
+    2. The return value is a columnar dictionary with the following keys:
+        - host: Host information (nodename, release, number-of-cpus, ...)
+        - samples: Number of samples
+        - interval: Sampling interval in seconds
+        - timestamps: Time of each sample
+        - series: List of series, each containing:
+            - activity: sadf class name (e.g. cpu-load, memory, disk, net-dev, net-edev, queue, paging,
+              swap-pages, process-and-context-switch, interrupts)
+            - instance: Instance name (CPU number, interface, disk device, interrupt, ...), null for classes
+              without instances
+            - columns: Mapping from metric name to a list of values aligned with timestamps, null for missing
+              samples; metric names follow sadf -j, e.g. user/nice/system/iowait/steal/idle for cpu-load,
+              memfree/avail/memused/memused-percent/buffers/cached/commit/dirty for memory,
+              tps/rkB/wkB/areq-sz/aqu-sz/await/util-percent for disk
+        When bucket or agg is given the data is downsampled on the server: timestamps are the bucket start
+        times, each metric in columns becomes {aggregate: list of per-bucket values} and lttb becomes
+        {timestamps, values}; bucket, agg and buckets (number of buckets) are added
     '''
 
 )
-def sar_collect_tool(host: Union[str, None] = None, device: str = '-u', interval: int = None, 
-                        count: int = None) -> List[Dict[str, Any]]:
+def sar_collect_tool(host: Union[str, None] = None, device: str = '-u', interval: int = None,
+                        count: int = None, bucket: Union[str, int, None] = None,
+                        agg: Union[str, List[str], None] = None) -> Dict[str, Any]:
     """使用sar命令分析资源使用的周期性规律"""
-    if host is None:
-        try:
-            command = ['sar']
-            command.append(device)
-            if interval is not None:
-                command.append(str(interval))
-            if count is not None:
-                command.append(str(count))
-            result = subprocess.run(command, capture_output=True, text=True)
-            lines = result.stdout.split('\n')
-            statistics = []
-            if device == '-u':
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) < 9:
-                        # 表头/空行和Avg行跳过
-                        continue
-                    try:
-                        datetime.strptime(parts[0], "%H:%M:%S")
-                        float(parts[3])
-                    except ValueError:
-                        continue
-                    statistics.append({
-                        'timestamp': parts[0] + ' ' + parts[1],
-                        'user': float(parts[3]),
-                        'nice': float(parts[4]),
-                        'system': float(parts[5]),
-                        'iowait': float(parts[6]),
-                        'steal': float(parts[7]), 
-                        'idle': float(parts[8])
-                    })
-            elif device == '-r':
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) < 13:
-                        continue
-                    try:
-                        datetime.strptime(parts[0], "%H:%M:%S")
-                        int(parts[2])
-                    except ValueError:
-                        continue
-                    statistics.append({
-                        'timestamp': parts[0] + ' ' + parts[1],
-                        'kbmemfree': int(parts[2]),
-                        'kbavail': int(parts[3]),
-                        'kbmemused': int(parts[4]),
-                        'memused': float(parts[5]),
-                        'kbbuffers': int(parts[6]),
-                        'kbcached': int(parts[7]), 
-                        'kbcommit': int(parts[8]),
-                        'commit': float(parts[9]),
-                        'kbactive': float(parts[10]),
-                        'kbinact': float(parts[11]),
-                        'kbdirty': float(parts[12])
-                    })
-            elif device == '-d':
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) < 11:
-                        continue
-                    try:
-                        datetime.strptime(parts[0], "%H:%M:%S")
-                        float(parts[3])
-                    except ValueError:
-                        continue
-                    statistics.append({
-                        'timestamp': parts[0] + ' ' + parts[1],
-                        'name': parts[2],
-                        'tps': float(parts[3]),
-                        'rkB_s': float(parts[4]),
-                        'wkB_s': float(parts[5]),
-                        'dkB_s': float(parts[6]),
-                        'areq-sz': float(parts[7]),
-                        'aqu-sz': float(parts[8]),
-                        'await': float(parts[9]),
-                        'util': float(parts[10])
-                    })
-            else:
-                if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                    raise ValueError(f"{command} 命令返回信息无法解析")
-                else:
-                    raise ValueError(f"Command {command} return information cannot be parsed")
-            return statistics
-        except subprocess.CalledProcessError as e:
-            if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                raise RuntimeError(f"执行 {command} 命令失败: {e.stderr}")
-            else:
-                raise RuntimeError(f"Command {command} execution failed: {e.stderr}")
-        except Exception as e:
-            if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                raise RuntimeError(f"执行 {command} 命令发生未知错误: {str(e)}") from e
-            else:
-                raise RuntimeError(f"Command {command} execution encountered an unknown error: {str(e)}") from e
+    cfg = SarConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    activity = parse_activity(device, is_zh)
+    parse_agg(agg, is_zh, parse_bucket(bucket, is_zh))
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    if interval is None:
+        script = build_file_script(activity, None, None, None)
+        timeout = 120
     else:
-        for host_config in SarConfig().get_config().public_config.remote_hosts:
-            if host == host_config.name or host == host_config.host:
-                try:
-                    # 建立SSH连接
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(
-                        hostname=host_config.host,
-                        port=host_config.port,
-                        username=host_config.username,
-                        password=host_config.password
-                    )
-                    command = f'sar {device}'
-                    if interval is not None:
-                        command += f' {interval}'
-                    if count is not None:
-                        command += f' {count}'
-                    stdin, stdout, stderr = ssh.exec_command(command, timeout = 20)
-                    error = stderr.read().decode().strip()
-                    output = stdout.read().decode().strip()
-
-                    if error:
-                        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError(f"命令 {command} 错误：{error}")
-                        else:
-                            raise ValueError(f"Command {command} error: {error}")
-
-                    if not output:
-                        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError("未能获取信息")
-                        else:
-                            raise ValueError("No information obtained")
-                    
-                    lines = output.split('\n')
-                    statistics = []
-                    if device == '-u':
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) < 9:
-                                # 表头/空行和Avg行跳过
-                                continue
-                            try:
-                                datetime.strptime(parts[0], "%H:%M:%S")
-                                float(parts[3])
-                            except ValueError:
-                                continue
-                            statistics.append({
-                                'timestamp': parts[0] + ' ' + parts[1],
-                                'user': float(parts[3]),
-                                'nice': float(parts[4]),
-                                'system': float(parts[5]),
-                                'iowait': float(parts[6]),
-                                'steal': float(parts[7]), 
-                                'idle': float(parts[8])
-                            })
-                    elif device == '-r':
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) < 13:
-                                continue
-                            try:
-                                datetime.strptime(parts[0], "%H:%M:%S")
-                                int(parts[2])
-                            except ValueError:
-                                continue
-                            statistics.append({
-                                'timestamp': parts[0] + ' ' + parts[1],
-                                'kbmemfree': int(parts[2]),
-                                'kbavail': int(parts[3]),
-                                'kbmemused': int(parts[4]),
-                                'memused': float(parts[5]),
-                                'kbbuffers': int(parts[6]),
-                                'kbcached': int(parts[7]), 
-                                'kbcommit': int(parts[8]),
-                                'commit': float(parts[9]),
-                                'kbactive': float(parts[10]),
-                                'kbinact': float(parts[11]),
-                                'kbdirty': float(parts[12])
-                            })
-                    elif device == '-d':
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) < 11:
-                                continue
-                            try:
-                                datetime.strptime(parts[0], "%H:%M:%S")
-                                float(parts[3])
-                            except ValueError:
-                                continue
-                            statistics.append({
-                                'timestamp': parts[0] + ' ' + parts[1],
-                                'name': parts[2],
-                                'tps': float(parts[3]),
-                                'rkB_s': float(parts[4]),
-                                'wkB_s': float(parts[5]),
-                                'dkB_s': float(parts[6]),
-                                'areq-sz': float(parts[7]),
-                                'aqu-sz': float(parts[8]),
-                                'await': float(parts[9]),
-                                'util': float(parts[10])
-                            })
-                    else:
-                        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError(f"{command} 命令返回信息无法解析")
-                        else:
-                            raise ValueError(f"Command {command} return information cannot be parsed")
-                    return statistics
-                except paramiko.AuthenticationException:
-                    raise ValueError("SSH认证失败，请检查用户名和密码")
-                except paramiko.SSHException as e:
-                    raise ValueError(f"SSH连接错误: {str(e)}")
-                except Exception as e:
-                    raise ValueError(f"远程执行 {command} 失败: {str(e)}")
-                finally:
-                    # 确保SSH连接关闭
-                    if ssh is not None:
-                        try:
-                            ssh.close()
-                        except Exception:
-                            pass
-        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"未找到远程主机: {host}")
-        else:
-            raise ValueError(f"Remote host not found: {host}")
+        count = 1 if count is None else count
+        if interval <= 0 or count <= 0:
+            raise ValueError("interval 与 count 必须为正整数" if is_zh else "interval and count must be positive")
+        script = build_live_script(activity, interval, count)
+        timeout = interval * count + 60
+    result = run_sadf(host_config, script, timeout, is_zh)
+    return downsample(result, bucket, agg, is_zh) if bucket or agg else result
 
 @mcp.tool(
     name="sar_historicalinfo_collect_tool"
@@ -329,348 +110,154 @@ def sar_collect_tool(host: Union[str, None] = None, device: str = '-u', interval
     else
     "sar_historicalinfo_collect_tool",
     description='''
-    使用sar命令进行历史状态分析，排查过去某时段的性能问题
+    使用sar命令进行历史状态分析，排查过去某时段的性能问题（sa日志经 sadf -j 流式解析，-s/-e 时间窗口在目标机上过滤）
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则对本机进行分析
-        - device: 分析哪方面的状态（cpu、内存、磁盘...)
-        - file: sar要分析的log文件
-        - starttime: 分析开始的时间点
-        - endtime: 分析结束的时间点
-    2. 返回值为包含相应信息的字典列表，每个字典包含以下键
-        - timestamp: 采集指标的时间
-        当`device`设置为-u时,采集的是cpu相关信息:
-            - user: 用户空间程序占用CPU的百分比
-            - nice: 低优先级用户进程占用的CPU百分比
-            - system: 内核空间程序占用CPU的百分比
-            - iowait: CPU等待磁盘I/O操作的时间百分比
-            - steal: 虚拟化环境中，其他虚拟机占用的CPU时间百分比
-            - idle:CPU空闲时间百分比
-        当`device`设置为-r时,采集的是内存相关信息:
-            - kbmemfree:​ 物理空闲内存量（未被使用的内存）
-            - kbavail: 实际可用内存（包括缓存和缓冲区的可回收部分）
-            - kbmemused: 已使用的物理内存（不包括内核缓存和缓冲区）
-            - memused: 已用内存占总物理内存的百分比（百分比）
-            - kbbuffers: 内核缓冲区（Buffer）占用的内存（用于块设备读写缓存） 
-            - kbcached: ​内核缓存（Cache）占用的内存（用于文件系统缓存）
-            - kbcommit: 当前工作负载所需的总内存量（包括已用和预估的）
-            - commit: kbcommit占系统总可用内存（物理内存 + Swap）的百分比（百分比）
-            - kbactive: 活跃内存（最近被访问过的内存，不易被回收）
-            - kbinact: 非活跃内存（较久未访问的内存，可被回收用于新进程）
-            - kbdirty: 等待写入磁盘的脏数据量（单位 KB）
-        当`device`设置为-d时,采集的是磁盘I/O相关信息:
-            - name: 磁盘设备名称
-            - tps: 每秒传输次数（IOPS）
-            - rkB_s: 每秒读取的数据量（单位 KB/s）
-            - wkB_s: 每秒写入的数据量（单位 KB/s）
-            - dkB_s: 每秒丢弃的数据量（单位 KB/s）
-            - areq-sz: 平均每次 I/O 请求的数据大小（单位 KB）
-            - aqu-sz: 平均 I/O 请求队列长度
-            - await: 平均每次 I/O 请求的等待时间（单位 毫秒）
-            - util: 设备带宽利用率（百分比）
+        - device: 活动类别，与 sar_collect_tool 相同，如 -u、-P ALL、-r、-d、-n DEV、-n EDEV、-q、-w、-B、-W、-I SUM
+        - file: sar要分析的log文件（如 /var/log/sa/sa15），不提供时分析当天的日志
+        - starttime: 分析开始的时间点（HH:MM:SS），可选
+        - endtime: 分析结束的时间点（HH:MM:SS），可选
+        - bucket: 降采样的时间桶宽度，可选，如 60、30s、5m、1h
+        - agg: 聚合方式，可选，逗号分隔，支持 min、max、mean、p50、p95、p99、last、lttb（保留曲线形状的选点，需指定 bucket，点数与桶数相同），默认 mean
+    2. 返回值与 sar_collect_tool 相同的列式数据字典（host、samples、interval、timestamps、series）
+        指定 bucket 或 agg 时在服务端降采样：timestamps 为各桶的起始时间，columns 中每个指标变为
+        {聚合方式: 每个桶的值列表}，lttb 为 {timestamps, values}；另含 bucket、agg、buckets（桶数）
     '''
     if SarConfig().get_config().public_config.language == LanguageEnum.ZH
     else
     '''
-    Using the sar command for historical status analysis to troubleshoot performance issues over a past period:
+    Using the sar command for historical status analysis to troubleshoot performance issues over a past period
+    (the sa log is parsed from sadf -j as a stream and the -s/-e window is applied on the target host):
     1. Input values are as follows:
         - host: The name or IP address of the remote host; if not provided, analysis is performed on the local machine.
-        - device: The aspect of the status to be analyzed (CPU, memory, disk, etc.).
-        - file: The log file that sar is to analyze.
-        - starttime: The starting point of the analysis.
-        - endtime: The endpoint of the analysis.
-    2. The return value is a list of dictionaries containing the corresponding information, each dictionary includes the following keys:
-        - timestamp: The time when the metrics were collected.
-        When `device` is set to -u, the following CPU-related information is collected:
-            - user: The percentage of CPU used by user space programs.
-            - nice: The percentage of CPU used by low-priority user processes.
-            - system: The percentage of CPU used by kernel space programs.
-            - iowait: The percentage of time the CPU spends waiting for disk I/O operations.
-            - steal: In a virtualized environment, the percentage of CPU time used by other virtual machines.
-            - idle: The percentage of CPU idle time.
-        When `device` is set to `-r`, the following memory-related information is collected:
-            - `kbmemfree`: Physical free memory (unused memory)
-            - `kbavail`: Actual available memory (including reclaimable parts of cache and buffers)
-            - `kbmemused`: Used physical memory (excluding kernel cache and buffers)
-            - `memused`: Percentage of used memory relative to total physical memory (percentage)
-            - `kbbuffers`: Memory used by kernel buffers (used for block device read/write caching)
-            - `kbcached`: Memory used by kernel cache (used for file system caching)
-            - `kbcommit`: Total memory required for the current workload (including used and estimated)
-            - `commit`: Percentage of `kbcommit` relative to the system's total available memory (physical memory + Swap) (percentage)
-            - `kbactive`: Active memory (recently accessed memory, not easily reclaimable)
-            - `kbinact`: Inactive memory (less recently accessed memory, reclaimable for new processes)
-            - `kbdirty`: Amount of dirty data waiting to be written to disk (unit: KB)
-        When `device` is set to `-d`, the following disk I/O-related information is collected:
-            - `name`: Disk device name
-            - `tps`: Transactions per second (IOPS)
-            - `rkB_s`: Data read per second (unit: KB/s)
-            - `wkB_s`: Data written per second (unit: KB/s)
-            - `dkB_s`: Data discarded per second (unit: KB/s)
-            - `areq-sz`: Average data size per I/O request (unit: KB)
-            - `aqu-sz`: Average I/O request queue length
-            - `await`: Average wait time per I/O request (unit: milliseconds)
-            - `util`: Device bandwidth utilization (percentage)
+        - device: Activity classes, same as sar_collect_tool, e.g. -u, -P ALL, -r, -d, -n DEV, -n EDEV, -q, -w,
+          -B, -W, -I SUM
+        - file: The log file that sar is to analyze (e.g. /var/log/sa/sa15); today's log if not provided.
+        - starttime: The starting point of the analysis (HH:MM:SS), optional.
+        - endtime: The endpoint of the analysis (HH:MM:SS), optional.
+        - bucket: Downsampling bucket width, optional, e.g. 60, 30s, 5m, 1h
+        - agg: Aggregates, optional, comma separated: min, max, mean, p50, p95, p99, last, lttb (shape-preserving
+          point selection, requires bucket and keeps as many points as there are buckets), default mean
+    2. The return value is the same columnar dictionary as sar_collect_tool (host, samples, interval,
+       timestamps, series)
+        When bucket or agg is given the data is downsampled on the server: timestamps are the bucket start
+        times, each metric in columns becomes {aggregate: list of per-bucket values} and lttb becomes
+        {timestamps, values}; bucket, agg and buckets (number of buckets) are added
     '''
 
 )
-def sar_historicalinfo_collect_tool(host: Union[str, None] = None, device: str = '-u', file: str = None, 
-                        starttime: str = None, endtime: str = None) -> List[Dict[str, Any]]:
+def sar_historicalinfo_collect_tool(host: Union[str, None] = None, device: str = '-u', file: str = None,
+                        starttime: str = None, endtime: str = None, bucket: Union[str, int, None] = None,
+                        agg: Union[str, List[str], None] = None) -> Dict[str, Any]:
     """使用sar命令进行历史状态分析，排查过去某时段的性能问题"""
-    if host is None:
-        try:
-            command = ['sar']
-            command.append(device)
-            command.append('-f')
-            if not os.path.isfile(file):
-                if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                    raise ValueError(f"文件 {file} 不存在")
-                else:
-                    raise ValueError(f"File {file} does not exist")
-            if not os.access(file, os.R_OK):
-                if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                    raise ValueError(f"文件 {file} 不可读")
-                else:
-                    raise ValueError(f"File {file} is not readable")
-            command.append(file)
-            command.append('-s')
-            command.append(starttime)
-            command.append('-e')
-            command.append(endtime)
+    cfg = SarConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    activity = parse_activity(device, is_zh)
+    parse_agg(agg, is_zh, parse_bucket(bucket, is_zh))
+    try:
+        start_dt = datetime.strptime(starttime, "%H:%M:%S").time() if starttime else None
+        end_dt = datetime.strptime(endtime, "%H:%M:%S").time() if endtime else None
+    except ValueError:
+        raise ValueError("时间格式错误，应为HH:MM:SS" if is_zh else "Time format error, should be HH:MM:SS")
+    if start_dt is not None and end_dt is not None and start_dt >= end_dt:
+        raise ValueError("开始时间必须早于结束时间" if is_zh else "Start time must be earlier than end time")
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    if host_config is None and file is not None:
+        if not os.path.isfile(file):
+            raise ValueError(f"文件 {file} 不存在" if is_zh else f"File {file} does not exist")
+        if not os.access(file, os.R_OK):
+            raise ValueError(f"文件 {file} 不可读" if is_zh else f"File {file} is not readable")
+    script = build_file_script(activity, file, starttime, endtime)
+    result = run_sadf(host_config, script, 300, is_zh)
+    return downsample(result, bucket, agg, is_zh) if bucket or agg else result
+
+@mcp.tool(
+    name="sar_history_query_tool"
+    if SarConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "sar_history_query_tool",
+    description='''
+    跨多天查询sa历史数据：根据各 saDD 日志覆盖的时间范围（按主机缓存的索引）选出相关文件，
+    在目标机上对每个文件执行带 -s/-e 时间窗口的 sadf，结果按时间顺序合并，只有窗口内的数据经过网络传输
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则查询本机
+        - device: 活动类别，与 sar_collect_tool 相同，如 -u、-P ALL、-r、-d、-n DEV、-q
+        - start: 查询开始时间，格式 YYYY-MM-DD HH:MM:SS 或 YYYY-MM-DD
+        - end: 查询结束时间，格式同上，不提供时查询到最新数据
+        - daily_start: 每天的开始时刻（HH:MM:SS），可选，如查询最近7天每天02:00到03:00
+        - daily_end: 每天的结束时刻（HH:MM:SS），可选
+        - bucket: 降采样的时间桶宽度，可选，如 60、30s、5m、1h
+        - agg: 聚合方式，可选，逗号分隔，支持 min、max、mean、p50、p95、p99、last、lttb（保留曲线形状的选点，需指定 bucket，点数与桶数相同），默认 mean
+    2. 返回值为与 sar_collect_tool 相同的列式数据字典（host、samples、interval、timestamps、series），另含：
+        - files: 实际查询的文件及各自的时间窗口（file、start、end）
+        - errors: 个别文件读取失败时的错误信息（仅在出错时出现）
+        指定 bucket 或 agg 时在服务端降采样：timestamps 为各桶的起始时间，columns 中每个指标变为
+        {聚合方式: 每个桶的值列表}，lttb 为 {timestamps, values}；另含 bucket、agg、buckets（桶数）
+    '''
+    if SarConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Query sa history across several days: relevant saDD logs are selected from a per-host index of the time
+    range each file covers, sadf runs on the target host with a -s/-e window per file and the results are merged
+    in time order, so only data inside the window crosses the network
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the local machine is queried
+        - device: Activity classes, same as sar_collect_tool, e.g. -u, -P ALL, -r, -d, -n DEV, -q
+        - start: Start of the query, format YYYY-MM-DD HH:MM:SS or YYYY-MM-DD
+        - end: End of the query in the same format; up to the latest data if not provided
+        - daily_start: Start time of day (HH:MM:SS), optional, e.g. 02:00 to 03:00 on each of the last 7 days
+        - daily_end: End time of day (HH:MM:SS), optional
+        - bucket: Downsampling bucket width, optional, e.g. 60, 30s, 5m, 1h
+        - agg: Aggregates, optional, comma separated: min, max, mean, p50, p95, p99, last, lttb (shape-preserving
+          point selection, requires bucket and keeps as many points as there are buckets), default mean
+    2. The return value is the same columnar dictionary as sar_collect_tool (host, samples, interval,
+       timestamps, series), plus:
+        - files: Files actually queried with their time windows (file, start, end)
+        - errors: Error messages for files that could not be read (only present on failure)
+        When bucket or agg is given the data is downsampled on the server: timestamps are the bucket start
+        times, each metric in columns becomes {aggregate: list of per-bucket values} and lttb becomes
+        {timestamps, values}; bucket, agg and buckets (number of buckets) are added
+    '''
+
+)
+def sar_history_query_tool(host: Union[str, None] = None, device: str = '-u', start: str = None,
+                           end: str = None, daily_start: str = None, daily_end: str = None,
+                           bucket: Union[str, int, None] = None,
+                           agg: Union[str, List[str], None] = None) -> Dict[str, Any]:
+    """跨多天查询sa历史数据"""
+    cfg = SarConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    activity = parse_activity(device, is_zh)
+    parse_agg(agg, is_zh, parse_bucket(bucket, is_zh))
+
+    def parse_datetime(value: str, default: datetime) -> datetime:
+        if value is None:
+            return default
+        for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
             try:
-                datetime.strptime(starttime, "%H:%M:%S")
-                datetime.strptime(endtime, "%H:%M:%S")
+                return datetime.strptime(value.strip(), fmt)
             except ValueError:
-                if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                    raise ValueError("时间格式错误，应为HH:MM:SS")
-                else:
-                    raise ValueError("Time format error, should be HH:MM:SS")
-            start_dt = datetime.strptime(starttime, '%H:%M:%S').time()
-            end_dt = datetime.strptime(endtime, '%H:%M:%S').time()
-            if start_dt >= end_dt:
-                if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                    raise ValueError("开始时间必须早于结束时间")
-                else:
-                    raise ValueError("Start time must be earlier than end time")
-            result = subprocess.run(command, capture_output=True, text=True)
-            lines = result.stdout.split('\n')
-            statistics = []
-            if device == '-u':
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) < 9:
-                        # 表头/空行和Avg行跳过
-                        continue
-                    try:
-                        datetime.strptime(parts[0], "%H:%M:%S")
-                        float(parts[3])
-                    except ValueError:
-                        continue
-                    statistics.append({
-                        'timestamp': parts[0] + ' ' + parts[1],
-                        'user': float(parts[3]),
-                        'nice': float(parts[4]),
-                        'system': float(parts[5]),
-                        'iowait': float(parts[6]),
-                        'steal': float(parts[7]), 
-                        'idle': float(parts[8])
-                    })
-            elif device == '-r':
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) < 13:
-                        continue
-                    try:
-                        datetime.strptime(parts[0], "%H:%M:%S")
-                        int(parts[2])
-                    except ValueError:
-                        continue
-                    statistics.append({
-                        'timestamp': parts[0] + ' ' + parts[1],
-                        'kbmemfree': int(parts[2]),
-                        'kbavail': int(parts[3]),
-                        'kbmemused': int(parts[4]),
-                        'memused': float(parts[5]),
-                        'kbbuffers': int(parts[6]),
-                        'kbcached': int(parts[7]), 
-                        'kbcommit': int(parts[8]),
-                        'commit': float(parts[9]),
-                        'kbactive': float(parts[10]),
-                        'kbinact': float(parts[11]),
-                        'kbdirty': float(parts[12])
-                    })
-            elif device == '-d':
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) < 11:
-                        continue
-                    try:
-                        datetime.strptime(parts[0], "%H:%M:%S")
-                        float(parts[3])
-                    except ValueError:
-                        continue
-                    statistics.append({
-                        'timestamp': parts[0] + ' ' + parts[1],
-                        'name': parts[2],
-                        'tps': float(parts[3]),
-                        'rkB_s': float(parts[4]),
-                        'wkB_s': float(parts[5]),
-                        'dkB_s': float(parts[6]),
-                        'areq-sz': float(parts[7]),
-                        'aqu-sz': float(parts[8]),
-                        'await': float(parts[9]),
-                        'util': float(parts[10])
-                    })
-            else:
-                if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                    raise ValueError(f"{command} 命令返回信息无法解析")
-                else:
-                    raise ValueError(f"Command {command} return information cannot be parsed")
-            return statistics
-        except subprocess.CalledProcessError as e:
-            if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                raise RuntimeError(f"执行 {command} 命令失败: {e.stderr}")
-            else:
-                raise RuntimeError(f"Command {command} execution failed: {e.stderr}")
-        except Exception as e:
-            if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                raise RuntimeError(f"执行 {command} 命令发生未知错误: {str(e)}") from e
-            else:
-                raise RuntimeError(f"Command {command} execution encountered an unknown error: {str(e)}") from e
-    else:
-        for host_config in SarConfig().get_config().public_config.remote_hosts:
-            if host == host_config.name or host == host_config.host:
-                try:
-                    # 建立SSH连接
-                    ssh = paramiko.SSHClient()
-                    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                    ssh.connect(
-                        hostname=host_config.host,
-                        port=host_config.port,
-                        username=host_config.username,
-                        password=host_config.password
-                    )
-                    command = f'sar {device} -f {file} -s {starttime} -e {endtime}'
-                    try:
-                        datetime.strptime(starttime, "%H:%M:%S")
-                        datetime.strptime(endtime, "%H:%M:%S")
-                    except ValueError:
-                        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError("时间格式错误，应为HH:MM:SS")
-                        else:
-                            raise ValueError("Time format error, should be HH:MM:SS")
-                    start_dt = datetime.strptime(starttime, '%H:%M:%S').time()
-                    end_dt = datetime.strptime(endtime, '%H:%M:%S').time()
-                    if start_dt >= end_dt:
-                        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError("开始时间必须早于结束时间")
-                        else:
-                            raise ValueError("Start time must be earlier than end time")
-                    stdin, stdout, stderr = ssh.exec_command(command, timeout = 20)
-                    error = stderr.read().decode().strip()
-                    output = stdout.read().decode().strip()
-
-                    if error:
-                        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError(f"命令 {command} 错误：{error}")
-                        else:
-                            raise ValueError(f"Command {command} error: {error}")
+                continue
+        raise ValueError(f"时间格式错误，应为 YYYY-MM-DD HH:MM:SS: {value}" if is_zh
+                         else f"Time format error, should be YYYY-MM-DD HH:MM:SS: {value}")
 
-                    if not output:
-                        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError("未能获取信息")
-                        else:
-                            raise ValueError("No information obtained")
-                    
-                    lines = output.split('\n')
-                    statistics = []
-                    if device == '-u':
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) < 9:
-                                # 表头/空行和Avg行跳过
-                                continue
-                            try:
-                                datetime.strptime(parts[0], "%H:%M:%S")
-                                float(parts[3])
-                            except ValueError:
-                                continue
-                            statistics.append({
-                                'timestamp': parts[0] + ' ' + parts[1],
-                                'user': float(parts[3]),
-                                'nice': float(parts[4]),
-                                'system': float(parts[5]),
-                                'iowait': float(parts[6]),
-                                'steal': float(parts[7]), 
-                                'idle': float(parts[8])
-                            })
-                    elif device == '-r':
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) < 13:
-                                continue
-                            try:
-                                datetime.strptime(parts[0], "%H:%M:%S")
-                                int(parts[2])
-                            except ValueError:
-                                continue
-                            statistics.append({
-                                'timestamp': parts[0] + ' ' + parts[1],
-                                'kbmemfree': int(parts[2]),
-                                'kbavail': int(parts[3]),
-                                'kbmemused': int(parts[4]),
-                                'memused': float(parts[5]),
-                                'kbbuffers': int(parts[6]),
-                                'kbcached': int(parts[7]), 
-                                'kbcommit': int(parts[8]),
-                                'commit': float(parts[9]),
-                                'kbactive': float(parts[10]),
-                                'kbinact': float(parts[11]),
-                                'kbdirty': float(parts[12])
-                            })
-                    elif device == '-d':
-                        for line in lines:
-                            parts = line.split()
-                            if len(parts) < 11:
-                                continue
-                            try:
-                                datetime.strptime(parts[0], "%H:%M:%S")
-                                float(parts[3])
-                            except ValueError:
-                                continue
-                            statistics.append({
-                                'timestamp': parts[0] + ' ' + parts[1],
-                                'name': parts[2],
-                                'tps': float(parts[3]),
-                                'rkB_s': float(parts[4]),
-                                'wkB_s': float(parts[5]),
-                                'dkB_s': float(parts[6]),
-                                'areq-sz': float(parts[7]),
-                                'aqu-sz': float(parts[8]),
-                                'await': float(parts[9]),
-                                'util': float(parts[10])
-                            })
-                    else:
-                        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-                            raise ValueError(f"{command} 命令返回信息无法解析")
-                        else:
-                            raise ValueError(f"Command {command} return information cannot be parsed")
-                    return statistics
-                except paramiko.AuthenticationException:
-                    raise ValueError("SSH认证失败，请检查用户名和密码")
-                except paramiko.SSHException as e:
-                    raise ValueError(f"SSH连接错误: {str(e)}")
-                except Exception as e:
-                    raise ValueError(f"远程执行 {command} 失败: {str(e)}")
-                finally:
-                    # 确保SSH连接关闭
-                    if ssh is not None:
-                        try:
-                            ssh.close()
-                        except Exception:
-                            pass
-        if SarConfig().get_config().public_config.language == LanguageEnum.ZH:
-            raise ValueError(f"未找到远程主机: {host}")
-        else:
-            raise ValueError(f"Remote host not found: {host}")
+    if start is None:
+        raise ValueError("必须提供查询开始时间 start" if is_zh else "start is required")
+    start_dt = parse_datetime(start, datetime.min)
+    end_dt = parse_datetime(end, datetime.max)
+    if start_dt >= end_dt:
+        raise ValueError("开始时间必须早于结束时间" if is_zh else "Start time must be earlier than end time")
+    try:
+        daily_start_t = datetime.strptime(daily_start, "%H:%M:%S").time() if daily_start else None
+        daily_end_t = datetime.strptime(daily_end, "%H:%M:%S").time() if daily_end else None
+    except ValueError:
+        raise ValueError("时间格式错误，应为HH:MM:SS" if is_zh else "Time format error, should be HH:MM:SS")
+    if daily_start_t is not None and daily_end_t is not None and daily_start_t >= daily_end_t:
+        raise ValueError("开始时间必须早于结束时间" if is_zh else "Start time must be earlier than end time")
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    result = query_history(host_config, cfg.private_config.sa_dirs, activity, start_dt, end_dt,
+                           daily_start_t, daily_end_t, is_zh)
+    return downsample(result, bucket, agg, is_zh) if bucket or agg else result
 
 if __name__ == "__main__":
     # Initialize and run the server
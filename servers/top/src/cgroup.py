@@ -0,0 +1,247 @@
+"""cgroup维度实现：按 cgroup v2 层级汇总服务/容器的资源使用"""
+import os
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import paramiko
+
+from config.private.top.config_loader import TopCommandConfig
+from config.public.base_config_loader import LanguageEnum
+from servers.top.src.base import execute_command
+from servers.top.src.pressure import CGROUP_ROOTS, parse_pressure
+
+CGROUP_FILES = ("cpu.stat", "memory.current", "io.stat", "cpu.pressure", "memory.pressure", "io.pressure")
+SORT_KEYS = ("cpu", "memory", "io", "pressure")
+
+# 没有历史快照时，两次采样之间的间隔（秒）
+BASELINE_INTERVAL = 1.0
+# 超过该时长的历史快照视为过期，重新建立基线
+SNAPSHOT_MAX_AGE = 600.0
+
+# 每台主机最近一次快照，用于计算相邻两次轮询之间的速率
+_snapshots: Dict[str, Dict[str, Any]] = {}
+
+# 一次 find 列出所有需要的文件，再由 xargs 批量 grep，避免逐个 cgroup 启动进程
+REMOTE_SCRIPT = """
+root=""
+for r in {roots}; do
+    if [ -f "$r/cgroup.controllers" ]; then root="$r"; break; fi
+done
+if [ -z "$root" ]; then echo "@NOCGROUP2"; exit 0; fi
+echo "@ROOT $root"
+echo "@TS $(cut -d' ' -f1 /proc/uptime)"
+find "$root" -maxdepth {maxdepth} \\( {names} \\) -type f -print0 2>/dev/null | xargs -0 grep -H '' 2>/dev/null
+exit 0
+"""
+
+
+def _is_zh() -> bool:
+    return TopCommandConfig().get_config().public_config.language == LanguageEnum.ZH
+
+
+def _parse_cgroup(files: Dict[str, str]) -> Dict[str, Any]:
+    """将单个 cgroup 的原始文件内容解析为计数器"""
+    stats: Dict[str, Any] = {}
+    for line in files.get("cpu.stat", "").splitlines():
+        key, _, value = line.partition(" ")
+        if key in ("usage_usec", "user_usec", "system_usec", "nr_throttled", "throttled_usec"):
+            stats[key] = int(value)
+    current = files.get("memory.current", "").strip()
+    if current.isdigit():
+        stats["memory_bytes"] = int(current)
+    if "io.stat" in files:
+        io = {"rbytes": 0, "wbytes": 0, "rios": 0, "wios": 0}
+        for line in files["io.stat"].splitlines():
+            for item in line.split()[1:]:
+                key, _, value = item.partition("=")
+                if key in io:
+                    io[key] += int(value)
+        stats["io"] = io
+    pressure = {}
+    for resource in ("cpu", "memory", "io"):
+        content = files.get(f"{resource}.pressure")
+        if content:
+            pressure[resource] = parse_pressure(content)
+    if pressure:
+        stats["pressure"] = pressure
+    return stats
+
+
+def _find_local_root() -> Optional[str]:
+    for root in CGROUP_ROOTS:
+        if os.path.isfile(os.path.join(root, "cgroup.controllers")):
+            return root
+    return None
+
+
+def _read_uptime() -> float:
+    with open("/proc/uptime") as f:
+        return float(f.read().split()[0])
+
+
+def collect_local_snapshot(max_depth: int) -> Dict[str, Any]:
+    """单次遍历本地 cgroup 目录树，读取每个 cgroup 的统计文件"""
+    root = _find_local_root()
+    if root is None:
+        raise RuntimeError("本机未启用 cgroup v2" if _is_zh() else "cgroup v2 is not available on this host")
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    stack = [(root, 0)]
+    while stack:
+        path, depth = stack.pop()
+        files: Dict[str, str] = {}
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < max_depth:
+                            stack.append((entry.path, depth + 1))
+                    elif entry.name in CGROUP_FILES:
+                        try:
+                            with open(entry.path) as f:
+                                files[entry.name] = f.read()
+                        except OSError:
+                            continue
+        except OSError:
+            continue
+        groups[os.path.relpath(path, root)] = _parse_cgroup(files)
+    return {"ts": _read_uptime(), "root": root, "groups": groups}
+
+
+def parse_remote_snapshot(output: str) -> Dict[str, Any]:
+    """解析远程脚本 grep -H 输出（路径:内容）"""
+    root = ""
+    ts = 0.0
+    raw: Dict[str, Dict[str, List[str]]] = {}
+    for line in output.splitlines():
+        if line == "@NOCGROUP2":
+            raise RuntimeError("远程主机未启用 cgroup v2" if _is_zh() else "cgroup v2 is not available on the remote host")
+        if line.startswith("@ROOT "):
+            root = line[6:].strip()
+            continue
+        if line.startswith("@TS "):
+            ts = float(line[4:])
+            continue
+        for name in CGROUP_FILES:
+            marker = f"/{name}:"
+            pos = line.find(marker)
+            if pos < 0:
+                continue
+            directory = line[:pos]
+            content = line[pos + len(marker):]
+            raw.setdefault(directory, {}).setdefault(name, []).append(content)
+            break
+
+    groups = {}
+    for directory, files in raw.items():
+        rel = os.path.relpath(directory, root) if root else directory
+        groups[rel] = _parse_cgroup({name: "\n".join(lines) for name, lines in files.items()})
+    return {"ts": ts, "root": root, "groups": groups}
+
+
+def collect_remote_snapshot(ssh_conn: paramiko.SSHClient, max_depth: int) -> Dict[str, Any]:
+    """通过一次远程命令获取整棵 cgroup 树的统计文件"""
+    script = REMOTE_SCRIPT.format(
+        roots=" ".join(CGROUP_ROOTS),
+        maxdepth=max_depth + 1,
+        names=" -o ".join(f"-name {name}" for name in CGROUP_FILES)
+    )
+    success, output, error = execute_command(ssh_conn, script)
+    if not success:
+        raise RuntimeError(f"cgroup信息采集失败：{error}" if _is_zh() else f"Failed to collect cgroup information: {error}")
+    return parse_remote_snapshot(output)
+
+
+def _rate(cur: Optional[int], prev: Optional[int], elapsed: float) -> Optional[float]:
+    if cur is None:
+        return None
+    return max(cur - (prev or 0), 0) / elapsed
+
+
+def _usec_percent(stats: Dict[str, Any], before: Dict[str, Any], key: str, elapsed: float) -> Optional[float]:
+    """微秒计数器的增量换算为占单个CPU的百分比"""
+    rate = _rate(stats.get(key), before.get(key), elapsed)
+    return round(rate / 1e4, 1) if rate is not None else None
+
+
+def compute_cgroup_rates(prev: Dict[str, Any], cur: Dict[str, Any], top_n: int, sort_by: str) -> Dict[str, Any]:
+    """计算两次快照之间每个 cgroup 的资源速率并取 Top N"""
+    elapsed = max(cur["ts"] - prev["ts"], 1e-6)
+    rows = []
+    for name, stats in cur["groups"].items():
+        if name == ".":
+            continue
+        # 新出现的 cgroup 没有基线，跳过以免把累计值误当作速率
+        before = prev["groups"].get(name)
+        if before is None:
+            continue
+        io = stats.get("io") or {}
+        io_prev = before.get("io") or {}
+        memory = stats.get("memory_bytes")
+        memory_prev = before.get("memory_bytes")
+        pressure = stats.get("pressure", {})
+        pressure_prev = before.get("pressure", {})
+        stall = {}
+        for resource, values in pressure.items():
+            some = values.get("some", {})
+            delta = _rate(some.get("total_us"), pressure_prev.get(resource, {}).get("some", {}).get("total_us"), elapsed)
+            stall[resource] = {
+                "some_avg10": some.get("avg10"),
+                "full_avg10": values.get("full", {}).get("avg10"),
+                "some_stall_percent": round(delta / 1e4, 2) if delta is not None else None,
+            }
+        rows.append({
+            "cgroup": "/" + name,
+            "cpu_percent": _usec_percent(stats, before, "usage_usec", elapsed),
+            "user_percent": _usec_percent(stats, before, "user_usec", elapsed),
+            "system_percent": _usec_percent(stats, before, "system_usec", elapsed),
+            "throttled_percent": _usec_percent(stats, before, "throttled_usec", elapsed),
+            "memory_mb": round(memory / (1024 ** 2), 1) if memory is not None else None,
+            "memory_delta_mb_s": round((memory - memory_prev) / elapsed / (1024 ** 2), 2)
+            if memory is not None and memory_prev is not None else None,
+            "io_read_mb_s": round(_rate(io.get("rbytes"), io_prev.get("rbytes"), elapsed) / (1024 ** 2), 2) if io else None,
+            "io_write_mb_s": round(_rate(io.get("wbytes"), io_prev.get("wbytes"), elapsed) / (1024 ** 2), 2) if io else None,
+            "io_iops": round(_rate(io.get("rios", 0) + io.get("wios", 0),
+                                   io_prev.get("rios", 0) + io_prev.get("wios", 0), elapsed), 1) if io else None,
+            "pressure": stall,
+        })
+
+    def sort_value(row: Dict[str, Any]) -> float:
+        if sort_by == "memory":
+            return row["memory_mb"] or 0
+        if sort_by == "io":
+            return (row["io_read_mb_s"] or 0) + (row["io_write_mb_s"] or 0)
+        if sort_by == "pressure":
+            return max((p["some_stall_percent"] or 0 for p in row["pressure"].values()), default=0)
+        return row["cpu_percent"] or 0
+
+    rows.sort(key=sort_value, reverse=True)
+    return {
+        "root": cur["root"],
+        "interval": round(elapsed, 2),
+        "cgroups_total": len(cur["groups"]),
+        "sort_by": sort_by,
+        "top": rows[:top_n],
+    }
+
+
+def get_cgroup_metrics(is_local: bool, ssh_conn: Union[paramiko.SSHClient, None], cache_key: str,
+                       top_n: int = 5, sort_by: str = "cpu", max_depth: int = 3) -> Dict[str, Any]:
+    """统一入口：采集 cgroup 快照并与上一次快照比较，首次调用时自动建立基线"""
+    if not is_local and not ssh_conn:
+        raise RuntimeError("远程cgroup采集需要SSH连接" if _is_zh() else "Remote cgroup collection requires an SSH connection")
+
+    def snapshot() -> Dict[str, Any]:
+        if is_local:
+            return collect_local_snapshot(max_depth)
+        return collect_remote_snapshot(ssh_conn, max_depth)
+
+    key = f"{cache_key}:{max_depth}"
+    current = snapshot()
+    previous = _snapshots.get(key)
+    if previous is None or not 0 < current["ts"] - previous["ts"] < SNAPSHOT_MAX_AGE:
+        previous = current
+        time.sleep(BASELINE_INTERVAL)
+        current = snapshot()
+    _snapshots[key] = current
+    return {"cgroups": compute_cgroup_rates(previous, current, top_n, sort_by)}
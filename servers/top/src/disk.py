@@ -1,33 +1,38 @@
 """磁盘维度实现：专注于磁盘指标的采集与解析"""
 import psutil
-from typing import Any, Dict, Union, List
+from typing import Any, Dict, Union
 import paramiko
 from base import execute_command
 from config.private.top.config_loader import TopCommandConfig
 from config.public.base_config_loader import LanguageEnum
+from servers.top.src.fsusage import collect_local_usage, collect_remote_usage
 
 
-def collect_local_disk() -> Dict[str, Any]:
+def _format_partition(item: Dict[str, Any]) -> Dict[str, Any]:
+    """将文件系统用量转换为 top 维度的分区格式"""
+    return {
+        "device": item["device"],
+        "mount_point": item["mountpoint"],
+        "fstype": item["fstype"],
+        "status": item["status"],
+        "total_gb": round(item["total"], 1) if item["total"] is not None else None,
+        "used": {
+            "gb": round(item["used"], 1) if item["used"] is not None else None,
+            "percent": item["percent"]
+        },
+        "inodes": {
+            "total": item["inodes_total"],
+            "used": item["inodes_used"],
+            "percent": item["inodes_percent"]
+        }
+    }
+
+
+def collect_local_disk(timeout: float = 2.0) -> Dict[str, Any]:
     """采集本地服务器磁盘指标"""
-    # 获取磁盘分区信息（排除虚拟文件系统）
-    partitions = []
-    for part in psutil.disk_partitions(all=False):
-        if part.fstype:  # 只处理有文件系统的分区
-            try:
-                usage = psutil.disk_usage(part.mountpoint)
-                partitions.append({
-                    "device": part.device,
-                    "mount_point": part.mountpoint,
-                    "fstype": part.fstype,
-                    "total_gb": round(usage.total / (1024 **3), 1),
-                    "used": {
-                        "gb": round(usage.used / (1024** 3), 1),
-                        "percent": round(usage.percent, 1)
-                    }
-                })
-            except PermissionError:
-                continue  # 跳过无权限访问的分区
-    
+    # 并发获取分区用量，失联的网络/FUSE挂载在超时后标记为 unresponsive
+    partitions = [_format_partition(item) for item in collect_local_usage(timeout)]
+
     # 获取磁盘IO信息
     disk_io = psutil.disk_io_counters()
     if disk_io is not None:
@@ -46,32 +51,9 @@ def collect_local_disk() -> Dict[str, Any]:
 
 def collect_remote_disk(ssh_conn: paramiko.SSHClient) -> Dict[str, Any]:
     """采集远程服务器磁盘指标"""
-    # 1. 获取磁盘分区信息
-    success, partitions_output, error = execute_command(
-        ssh_conn, "df -P -B 1 | awk 'NR>1 {print $1, $2, $3, $5, $6}'"
-    )
-    if not success:
-        raise RuntimeError(f"磁盘分区信息采集失败：{error}")
-    
-    partitions = []
-    for line in partitions_output.split('\n'):
-        if not line.strip():
-            continue
-        parts = line.strip().split()
-        if len(parts) != 5:
-            continue
-            
-        device, total, used, used_percent, mount_point = parts
-        partitions.append({
-            "device": device,
-            "mount_point": mount_point,
-            "total_gb": round(int(total) / (1024 **3), 1),
-            "used": {
-                "gb": round(int(used) / (1024** 3), 1),
-                "percent": float(used_percent.strip('%'))
-            }
-        })
-    
+    # 1. 获取磁盘分区信息（单个脚本内对每个挂载点单独超时）
+    partitions = [_format_partition(item) for item in collect_remote_usage(ssh_conn)]
+
     # 2. 获取磁盘IO信息
     success, io_output, error = execute_command(
         ssh_conn, "iostat -k | awk 'NR==4 {print $1, $2, $3, $4}'"
@@ -0,0 +1,201 @@
+"""文件系统用量实现：并发执行 statvfs，每个挂载点独立超时，失联的网络/FUSE挂载不会阻塞整体采集"""
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import paramiko
+
+from config.private.top.config_loader import TopCommandConfig
+from config.public.base_config_loader import LanguageEnum
+from servers.top.src.base import execute_command
+
+# 不统计容量的伪文件系统
+PSEUDO_FSTYPES = (
+    "proc", "sysfs", "devtmpfs", "devpts", "tmpfs", "securityfs", "cgroup", "cgroup2", "pstore", "bpf",
+    "debugfs", "tracefs", "configfs", "fusectl", "mqueue", "hugetlbfs", "autofs", "rpc_pipefs", "binfmt_misc",
+    "nsfs", "ramfs", "efivarfs", "selinuxfs", "overlay", "squashfs", "nfsd",
+)
+
+# 同时执行 statvfs 的线程数
+MAX_WORKERS = 32
+
+# 仍未返回的 statvfs 线程（挂载点 -> 线程），同一挂载点不会重复派发，避免线程堆积
+_stuck: Dict[str, threading.Thread] = {}
+_stuck_lock = threading.Lock()
+
+# 每个挂载点在后台子 shell 中执行 stat -f，结果写入临时文件；主脚本只轮询到截止时间，
+# 卡在 D 状态的子进程不持有 SSH 通道的输出，不会拖住整个脚本
+REMOTE_SCRIPT = """
+dir=$(mktemp -d 2>/dev/null) || {{ dir=/tmp/.fsusage.$$; mkdir -p "$dir"; }}
+runner=""
+if command -v timeout >/dev/null 2>&1; then runner="timeout -s KILL {timeout}"; fi
+i=0
+while read -r dev mp fstype rest; do
+    if [ "{all_mounts}" != "1" ]; then
+        case "$fstype" in {pseudo}) continue ;; esac
+    fi
+    i=$((i + 1))
+    echo "@MOUNT $i $dev $fstype $mp"
+    (
+        out=$($runner stat -f -c '%b %f %a %S %c %d' -- "$(printf '%b' "$mp")" 2>/dev/null)
+        echo "$? $out" > "$dir/$i.tmp" && mv "$dir/$i.tmp" "$dir/$i"
+    ) </dev/null >/dev/null 2>&1 &
+done < /proc/self/mounts
+end=$(($(date +%s) + {deadline}))
+while [ "$(ls "$dir" 2>/dev/null | grep -cv tmp)" -lt "$i" ] && [ "$(date +%s)" -lt "$end" ]; do
+    sleep 0.1
+done
+j=1
+while [ "$j" -le "$i" ]; do
+    if [ -f "$dir/$j" ]; then echo "@RESULT $j $(cat "$dir/$j")"; fi
+    j=$((j + 1))
+done
+rm -rf "$dir"
+exit 0
+"""
+
+
+def _unescape(path: str) -> str:
+    """/proc/mounts 中空格、制表符等以八进制转义"""
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), path)
+
+
+def _usage(device: str, mountpoint: str, fstype: str, status: str,
+           values: Optional[List[int]] = None) -> Dict[str, Any]:
+    """统一输出格式；values 为 (总块数, 空闲块数, 可用块数, 块大小, 总inode, 空闲inode)"""
+    item: Dict[str, Any] = {"device": device, "mountpoint": mountpoint, "fstype": fstype, "status": status}
+    if values is None:
+        item.update(total=None, used=None, free=None, percent=None,
+                    inodes_total=None, inodes_used=None, inodes_free=None, inodes_percent=None)
+        return item
+    blocks, bfree, bavail, bsize, files, ffree = values
+    total = blocks * bsize
+    used = (blocks - bfree) * bsize
+    free = bavail * bsize
+    # 与 df/psutil 一致：使用率以非特权用户可用空间为基准
+    usable = used + free
+    item.update(
+        total=round(total / (1024 ** 3), 2),
+        used=round(used / (1024 ** 3), 2),
+        free=round(free / (1024 ** 3), 2),
+        percent=round(used / usable * 100, 1) if usable else 0.0,
+        inodes_total=files,
+        inodes_used=files - ffree,
+        inodes_free=ffree,
+        inodes_percent=round((files - ffree) / files * 100, 1) if files else None,
+    )
+    return item
+
+
+def list_local_mounts(all_mounts: bool = False) -> List[Dict[str, str]]:
+    """读取 /proc/self/mounts，同一挂载点只保留最后一次挂载"""
+    mounts: Dict[str, Dict[str, str]] = {}
+    with open("/proc/self/mounts") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 3:
+                continue
+            device, mountpoint, fstype = parts[0], _unescape(parts[1]), parts[2]
+            if not all_mounts and fstype in PSEUDO_FSTYPES:
+                continue
+            mounts.pop(mountpoint, None)
+            mounts[mountpoint] = {"device": device, "mountpoint": mountpoint, "fstype": fstype}
+    return list(mounts.values())
+
+
+def _statvfs_worker(mountpoint: str, results: Dict[str, Any]) -> None:
+    try:
+        st = os.statvfs(mountpoint)
+        results[mountpoint] = [st.f_blocks, st.f_bfree, st.f_bavail, st.f_frsize, st.f_files, st.f_ffree]
+    except OSError as e:
+        results[mountpoint] = e
+    finally:
+        with _stuck_lock:
+            if _stuck.get(mountpoint) is threading.current_thread():
+                del _stuck[mountpoint]
+
+
+def collect_local_usage(timeout: float = 2.0, all_mounts: bool = False) -> List[Dict[str, Any]]:
+    """本地分批并发执行 statvfs，每个挂载点最多等待 timeout 秒"""
+    mounts = list_local_mounts(all_mounts)
+    results: Dict[str, Any] = {}
+    for start in range(0, len(mounts), MAX_WORKERS):
+        batch = []
+        for mount in mounts[start:start + MAX_WORKERS]:
+            mountpoint = mount["mountpoint"]
+            with _stuck_lock:
+                if mountpoint in _stuck:
+                    continue
+                # 守护线程：卡死的 statvfs 不会阻止进程退出
+                thread = threading.Thread(target=_statvfs_worker, args=(mountpoint, results), daemon=True)
+                _stuck[mountpoint] = thread
+            thread.start()
+            batch.append(thread)
+        deadline = time.monotonic() + timeout
+        for thread in batch:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+    usage = []
+    for mount in mounts:
+        value = results.get(mount["mountpoint"])
+        if value is None:
+            usage.append(_usage(mount["device"], mount["mountpoint"], mount["fstype"], "unresponsive"))
+        elif isinstance(value, PermissionError):
+            continue
+        elif isinstance(value, OSError):
+            usage.append(_usage(mount["device"], mount["mountpoint"], mount["fstype"], "error"))
+        else:
+            usage.append(_usage(mount["device"], mount["mountpoint"], mount["fstype"], "ok", value))
+    return usage
+
+
+def build_remote_script(timeout: float, all_mounts: bool = False) -> str:
+    return REMOTE_SCRIPT.format(
+        timeout=float(timeout),
+        deadline=int(timeout) + 2,
+        all_mounts="1" if all_mounts else "0",
+        pseudo="|".join(PSEUDO_FSTYPES)
+    )
+
+
+def parse_remote_usage(output: str) -> List[Dict[str, Any]]:
+    """解析 REMOTE_SCRIPT 输出；没有结果的挂载点视为无响应"""
+    mounts: Dict[int, List[str]] = {}
+    results: Dict[int, List[str]] = {}
+    for line in output.splitlines():
+        if line.startswith("@MOUNT "):
+            parts = line.split(" ", 4)
+            if len(parts) == 5:
+                mounts[int(parts[1])] = [parts[2], _unescape(parts[4]), parts[3]]
+        elif line.startswith("@RESULT "):
+            parts = line.split()
+            results[int(parts[1])] = parts[2:]
+
+    usage: Dict[str, Dict[str, Any]] = {}
+    for index, (device, mountpoint, fstype) in mounts.items():
+        result = results.get(index)
+        if result is None or result[0] in ("124", "137"):
+            item = _usage(device, mountpoint, fstype, "unresponsive")
+        elif result[0] != "0" or len(result) != 7:
+            item = _usage(device, mountpoint, fstype, "error")
+        else:
+            item = _usage(device, mountpoint, fstype, "ok", [int(v) for v in result[1:]])
+        usage.pop(mountpoint, None)
+        usage[mountpoint] = item
+    return list(usage.values())
+
+
+
+def collect_remote_usage(ssh_conn: paramiko.SSHClient, timeout: float = 2.0,
+                         all_mounts: bool = False) -> List[Dict[str, Any]]:
+    """远程单个脚本内并发执行 stat -f，每个挂载点应用相同的超时"""
+    success, output, error = execute_command(ssh_conn, build_remote_script(timeout, all_mounts))
+    if not success:
+        raise RuntimeError(
+            f"磁盘分区信息采集失败：{error}"
+            if TopCommandConfig().get_config().public_config.language == LanguageEnum.ZH
+            else f"Failed to collect disk partition information: {error}"
+        )
+    return parse_remote_usage(output)
@@ -0,0 +1,174 @@
+"""压力维度实现：读取 PSI（Pressure Stall Information）并计算相邻两次轮询之间的停顿时间增量"""
+import os
+import shlex
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import paramiko
+
+from config.private.top.config_loader import TopCommandConfig
+from config.public.base_config_loader import LanguageEnum
+from servers.top.src.base import execute_command
+
+PSI_DIR = "/proc/pressure"
+RESOURCES = ("cpu", "memory", "io")
+CGROUP_ROOTS = ("/sys/fs/cgroup", "/sys/fs/cgroup/unified")
+
+# 每台主机上一次读取到的 total 计数与时间戳：{host: (uptime, {source: {resource: parsed}})}
+_previous: Dict[str, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+
+
+def _is_zh() -> bool:
+    return TopCommandConfig().get_config().public_config.language == LanguageEnum.ZH
+
+
+def parse_pressure(content: str) -> Dict[str, Dict[str, float]]:
+    """解析 PSI 文件内容，返回 {"some": {...}, "full": {...}}"""
+    result: Dict[str, Dict[str, float]] = {}
+    for line in content.splitlines():
+        parts = line.split()
+        if not parts or parts[0] not in ("some", "full"):
+            continue
+        values: Dict[str, float] = {}
+        for item in parts[1:]:
+            key, _, value = item.partition("=")
+            if key == "total":
+                values["total_us"] = int(value)
+            elif key in ("avg10", "avg60", "avg300"):
+                values[key] = float(value)
+        result[parts[0]] = values
+    return result
+
+
+def _normalize_cgroup(path: str) -> str:
+    """cgroup 路径统一为以 / 开头、不含 .. 的形式"""
+    parts = [p for p in path.strip().split("/") if p and p != "."]
+    if ".." in parts:
+        raise ValueError(f"非法的cgroup路径: {path}" if _is_zh() else f"Invalid cgroup path: {path}")
+    return "/" + "/".join(parts)
+
+
+def _cgroup_dir(root: str, cgroup: str) -> str:
+    return root if cgroup == "/" else root + cgroup
+
+
+def _read_uptime() -> float:
+    with open("/proc/uptime") as f:
+        return float(f.read().split()[0])
+
+
+def collect_local_pressure(cgroups: List[str]) -> Tuple[float, Dict[str, Dict[str, Any]]]:
+    """读取本机系统级与指定 cgroup 的 PSI 文件"""
+    sources: Dict[str, Dict[str, Any]] = {"system": {}}
+    for resource in RESOURCES:
+        try:
+            with open(os.path.join(PSI_DIR, resource)) as f:
+                sources["system"][resource] = parse_pressure(f.read())
+        except OSError:
+            continue
+    for cgroup in cgroups:
+        for root in CGROUP_ROOTS:
+            base = _cgroup_dir(root, cgroup)
+            if not os.path.isfile(os.path.join(base, "cgroup.procs")):
+                continue
+            sources[cgroup] = {}
+            for resource in RESOURCES:
+                try:
+                    with open(f"{base}/{resource}.pressure") as f:
+                        sources[cgroup][resource] = parse_pressure(f.read())
+                except OSError:
+                    continue
+            break
+    return _read_uptime(), sources
+
+
+def parse_remote_pressure(output: str, cgroups: List[str]) -> Tuple[float, Dict[str, Dict[str, Any]]]:
+    """解析远程 grep -H 输出（路径:内容）"""
+    uptime = 0.0
+    raw: Dict[str, Dict[str, List[str]]] = {}
+    for line in output.splitlines():
+        if line.startswith("@TS "):
+            uptime = float(line[4:])
+            continue
+        path, sep, content = line.partition(":")
+        if not sep:
+            continue
+        if path.startswith(PSI_DIR + "/"):
+            source, resource = "system", path[len(PSI_DIR) + 1:]
+        else:
+            directory, _, filename = path.rpartition("/")
+            resource = filename[:-len(".pressure")] if filename.endswith(".pressure") else ""
+            source = next((cg for cg in cgroups for root in CGROUP_ROOTS if directory == _cgroup_dir(root, cg)), None)
+        if source is None or resource not in RESOURCES:
+            continue
+        raw.setdefault(source, {}).setdefault(resource, []).append(content)
+
+    sources: Dict[str, Dict[str, Any]] = {"system": {}}
+    for source, files in raw.items():
+        sources[source] = {resource: parse_pressure("\n".join(lines)) for resource, lines in files.items()}
+    return uptime, sources
+
+
+def collect_remote_pressure(ssh_conn: paramiko.SSHClient, cgroups: List[str]) -> Tuple[float, Dict[str, Dict[str, Any]]]:
+    """一次远程命令读取系统级与指定 cgroup 的 PSI 文件"""
+    paths = [f"{PSI_DIR}/{r}" for r in RESOURCES]
+    for cgroup in cgroups:
+        paths.extend(shlex.quote(f"{_cgroup_dir(root, cgroup)}/{r}.pressure") for root in CGROUP_ROOTS for r in RESOURCES)
+    command = f"echo \"@TS $(cut -d' ' -f1 /proc/uptime)\"; grep -H '' {' '.join(paths)} 2>/dev/null; true"
+    success, output, error = execute_command(ssh_conn, command)
+    if not success:
+        raise RuntimeError(f"PSI信息采集失败：{error}" if _is_zh() else f"Failed to collect PSI information: {error}")
+    return parse_remote_pressure(output, cgroups)
+
+
+def compute_pressure(uptime: float, sources: Dict[str, Dict[str, Any]],
+                     previous: Optional[Tuple[float, Dict[str, Dict[str, Any]]]]) -> Dict[str, Any]:
+    """组合 avg 指标与自上次采样以来的停顿时间增量"""
+    elapsed = uptime - previous[0] if previous else 0.0
+    prev_sources = previous[1] if previous and elapsed > 0 else {}
+
+    def build(source: str) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for resource, kinds in sources.get(source, {}).items():
+            out[resource] = {}
+            for kind, values in kinds.items():
+                entry = dict(values)
+                prev_total = prev_sources.get(source, {}).get(resource, {}).get(kind, {}).get("total_us")
+                if prev_total is not None and values.get("total_us", 0) >= prev_total:
+                    delta = values["total_us"] - prev_total
+                    entry["stall_delta_us"] = delta
+                    entry["stall_percent"] = round(delta / (elapsed * 1e6) * 100, 2)
+                else:
+                    entry["stall_delta_us"] = None
+                    entry["stall_percent"] = None
+                out[resource][kind] = entry
+        return out
+
+    result: Dict[str, Any] = {
+        "interval": round(elapsed, 2) if prev_sources else None,
+        "system": build("system"),
+    }
+    cgroups = {source: build(source) for source in sources if source != "system"}
+    if cgroups:
+        result["cgroups"] = cgroups
+    return result
+
+
+def get_pressure_metrics(is_local: bool, ssh_conn: Union[paramiko.SSHClient, None], cache_key: str,
+                         cgroups: Optional[List[str]] = None) -> Dict[str, Any]:
+    """统一入口：读取 PSI，开销极低，可在每次轮询时调用"""
+    normalized = [_normalize_cgroup(c) for c in (cgroups or [])]
+    if is_local:
+        uptime, sources = collect_local_pressure(normalized)
+    else:
+        if not ssh_conn:
+            raise RuntimeError("远程PSI采集需要SSH连接" if _is_zh() else "Remote PSI collection requires an SSH connection")
+        uptime, sources = collect_remote_pressure(ssh_conn, normalized)
+    if not sources["system"]:
+        raise RuntimeError(
+            "目标主机不支持PSI（需要4.20及以上内核并启用psi）" if _is_zh()
+            else "PSI is not available on the target host (requires kernel 4.20+ with psi enabled)"
+        )
+
+    result = compute_pressure(uptime, sources, _previous.get(cache_key))
+    _previous[cache_key] = (uptime, sources)
+    return {"pressure": result}
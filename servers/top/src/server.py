@@ -17,9 +17,11 @@ from config.private.top.config_loader import TopCommandConfig
 
 from cpu import get_cpu_metrics
 from servers.top.src.base import create_base_result, get_server_auth
+from servers.top.src.cgroup import SORT_KEYS as CGROUP_SORT_KEYS, get_cgroup_metrics
 from servers.top.src.disk import get_disk_metrics
 from servers.top.src.memory import get_memory_metrics
 from servers.top.src.network import get_network_metrics
+from servers.top.src.pressure import get_pressure_metrics
 from servers.top.src.proc import get_process_metrics
 from servers.top.src.ssh_connection import SSHConnection
 
@@ -121,12 +123,22 @@ def top_collect_tool(host: Union[str, None] = None, k: int = 5) -> List[Dict[str
     参数:
         -host: 服务器IP地址/主机名称，支持单个IP/主机名称字符串或IP/主机名称列表，可为None即本机
             示例: "192.168.1.100" 或 ["192.168.1.100", "192.168.1.101"]
-        -dimensions: 监控维度列表，可选值：cpu、memory、disk、network
+        -dimensions: 监控维度列表，可选值：cpu、memory、disk、network、cgroup、pressure
             默认为 ["cpu", "memory"]
+            cgroup 维度按 cgroup v2 层级（systemd 服务、容器等）汇总 CPU、内存、IO 与 PSI 压力，
+            返回两次采样之间的速率 Top N（首次调用会额外采样1秒建立基线）
+            pressure 维度读取 /proc/pressure/{cpu,memory,io} 的 PSI 指标（some/full 的 avg10/avg60/avg300），
+            并返回自上一次调用以来的停顿时间增量 stall_delta_us 与占比 stall_percent，开销极低，可每次轮询都采集
         -include_processes: 是否返回Top N进程信息
             默认为False
-        -top_n: 当include_processes为True时，返回的进程数量
+        -top_n: 当include_processes为True时，返回的进程数量；同时也是cgroup维度返回的cgroup数量
             默认为5
+        -cgroup_sort_by: cgroup维度的排序字段，可选值：cpu、memory、io、pressure
+            默认为 "cpu"
+        -cgroup_depth: cgroup维度遍历的最大层级深度
+            默认为3
+        -pressure_cgroups: pressure维度额外读取的cgroup路径列表（相对cgroup根目录），如 ["/system.slice/nginx.service"]
+            默认为None，仅返回系统级PSI
     
     返回:
         服务器负载信息列表，每个元素包含：
@@ -144,12 +156,26 @@ def top_collect_tool(host: Union[str, None] = None, k: int = 5) -> List[Dict[str
     Parameters:
         -host:  Server IP address/hostname, supports a single IP/hostname string or IP/hostname list, can be None for localhost.
             Example: "192.168.1.100" or ["192.168.1.100", "192.168.1.101"] or None(localhost)
-        -dimensions: List of monitoring dimensions, optional values: cpu, memory, disk, network
+        -dimensions: List of monitoring dimensions, optional values: cpu, memory, disk, network, cgroup, pressure
             Default: ["cpu", "memory"]
+            The cgroup dimension rolls up CPU, memory, IO and PSI pressure per cgroup v2 group
+            (systemd services, containers, ...) and returns the top N by rate between two samples
+            (the first call takes an extra 1-second sample to build a baseline)
+            The pressure dimension reads PSI from /proc/pressure/{cpu,memory,io} (some/full avg10/avg60/avg300)
+            and returns the stall time since the previous call as stall_delta_us and stall_percent; it is cheap
+            enough to collect on every poll
         -include_processes: Whether to return Top N process information
             Default: False
-        -top_n: Number of processes to return when include_processes is True
+        -top_n: Number of processes to return when include_processes is True; also the number of
+            cgroups returned by the cgroup dimension
             Default: 5
+        -cgroup_sort_by: Sort key of the cgroup dimension, optional values: cpu, memory, io, pressure
+            Default: "cpu"
+        -cgroup_depth: Maximum depth of the cgroup tree walk
+            Default: 3
+        -pressure_cgroups: Extra cgroup paths (relative to the cgroup root) read by the pressure dimension,
+            e.g. ["/system.slice/nginx.service"]
+            Default: None, only system-wide PSI is returned
     
     Returns:
         A list of server load information, where each element contains:
@@ -163,7 +189,10 @@ def top_servers_tool(
     host: Optional[Union[str, List[str]]] = None,
     dimensions: Optional[List[str]] = None,
     include_processes: bool = False,
-    top_n: int = 5
+    top_n: int = 5,
+    cgroup_sort_by: str = "cpu",
+    cgroup_depth: int = 3,
+    pressure_cgroups: Optional[List[str]] = None
 ) -> List[Dict]:
     # 标准化输入参数
     logger.info("into--------------------------")
@@ -174,7 +203,7 @@ def top_servers_tool(
         host_list = [host] if isinstance(host, str) else host
 
     # 标准化监控维度
-    valid_dimensions = {"cpu", "memory", "disk", "network"}
+    valid_dimensions = {"cpu", "memory", "disk", "network", "cgroup", "pressure"}
     dimensions = dimensions or ["cpu", "memory"]
     invalid_dims = [d for d in dimensions if d not in valid_dimensions]
     if invalid_dims:
@@ -183,6 +212,11 @@ def top_servers_tool(
             if TopCommandConfig().get_config().public_config.language == LanguageEnum.ZH else
             ValueError(
                 f"Invalid monitoring dimension: {invalid_dims}, supported dimensions: {sorted(valid_dimensions)}"))
+    if cgroup_sort_by not in CGROUP_SORT_KEYS:
+        raise ValueError(
+            f"无效的cgroup排序字段: {cgroup_sort_by}，支持的字段: {list(CGROUP_SORT_KEYS)}"
+            if TopCommandConfig().get_config().public_config.language == LanguageEnum.ZH else
+            f"Invalid cgroup sort key: {cgroup_sort_by}, supported keys: {list(CGROUP_SORT_KEYS)}")
 
     # 处理每个IP的负载采集
     results = []
@@ -206,6 +240,11 @@ def top_servers_tool(
                         result["metrics"].update(get_disk_metrics(is_local, None))
                     elif dim == "network":
                         result["metrics"].update(get_network_metrics(is_local, None))
+                    elif dim == "cgroup":
+                        result["metrics"].update(
+                            get_cgroup_metrics(is_local, None, ip, top_n, cgroup_sort_by, cgroup_depth))
+                    elif dim == "pressure":
+                        result["metrics"].update(get_pressure_metrics(is_local, None, ip, pressure_cgroups))
 
                 # 采集进程信息（如果需要）
                 if include_processes:
@@ -251,6 +290,11 @@ def top_servers_tool(
                             result["metrics"].update(get_disk_metrics(is_local, ssh_conn))
                         elif dim == "network":
                             result["metrics"].update(get_network_metrics(is_local, ssh_conn))
+                        elif dim == "cgroup":
+                            result["metrics"].update(
+                                get_cgroup_metrics(is_local, ssh_conn, ip, top_n, cgroup_sort_by, cgroup_depth))
+                        elif dim == "pressure":
+                            result["metrics"].update(get_pressure_metrics(is_local, ssh_conn, ip, pressure_cgroups))
 
                     # 采集进程信息（如果需要）
                     if include_processes:
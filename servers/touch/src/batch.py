@@ -0,0 +1,72 @@
+"""
+批量 touch：每项为 {path, atime, mtime, no_create}，文件不存在时创建（no_create 时跳过），
+再设置访问/修改时间；时间均为空时设为当前时间，只给出其一时另一个保持不变，与 touch -a/-m 相同。
+各项在有界线程池中并发执行，同一路径出现多次时最终时间戳取决于执行先后；
+字符串时间在目标机上按其本地时区解析。只依赖标准库，远程执行时整个文件交给目标机的 python3 运行
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List
+
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 32
+MAX_ITEMS = 10000
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _timestamp(value: Any) -> float:
+    """数字为 Unix 时间戳，字符串按目标机本地时区解析，与在目标机上执行 touch -d 一致"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.strptime(value, TIME_FORMAT).timestamp()
+
+
+def touch(item: Dict[str, Any]) -> Dict[str, Any]:
+    path = item["path"]
+    if not os.path.lexists(path):
+        if item.get("no_create"):
+            return {"created": False}
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_NOCTTY | os.O_NONBLOCK, 0o666))
+        created = True
+    else:
+        created = False
+    atime, mtime = item.get("atime"), item.get("mtime")
+    if atime is None and mtime is None:
+        os.utime(path)
+    else:
+        st = os.stat(path)
+        os.utime(path, (st.st_atime if atime is None else _timestamp(atime),
+                        st.st_mtime if mtime is None else _timestamp(mtime)))
+    return {"created": created}
+
+
+def run_batch(items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """返回 {"results": [...], "succeeded", "failed", "seconds"}，results 与 items 一一对应"""
+    started = time.monotonic()
+
+    def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return dict(item, ok=True, **(touch(item) or {}))
+        except (OSError, ValueError) as e:
+            detail = e.strerror if isinstance(e, OSError) and e.strerror else str(e)
+            return dict(item, ok=False, error=detail)
+
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(items)), 1)) as pool:
+        results = list(pool.map(run, items))
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded,
+            "seconds": round(time.monotonic() - started, 3)}
+
+
+def main() -> None:
+    args = json.loads(sys.argv[1])
+    result = run_batch(args["items"], args["workers"])
+    sys.stdout.write("@RESULT " + json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.touch.config_loader import TouchConfig
+from servers.touch.src import batch
+from servers.touch.src.base import find_remote_host, run_python
 mcp = FastMCP("Touch MCP Server", host="0.0.0.0", port=TouchConfig().get_config().private_config.port)
 
 
@@ -206,6 +208,85 @@ def touch_timestamp_files_tool(host: Union[str, None] = None, options: str = Non
             raise ValueError(f"Remote host not found: {host}")
 
 
+def _check_batch(items: List[Any], workers: int, is_zh: bool) -> None:
+    if not items or len(items) > batch.MAX_ITEMS:
+        raise ValueError(f"操作列表不能为空，且最多 {batch.MAX_ITEMS} 项" if is_zh
+                         else f"The operation list must contain 1-{batch.MAX_ITEMS} items")
+    if not 1 <= workers <= batch.MAX_WORKERS:
+        raise ValueError(f"workers 范围为 1~{batch.MAX_WORKERS}" if is_zh else f"workers must be 1-{batch.MAX_WORKERS}")
+
+
+def _execute(host: Union[str, None], items: List[Dict[str, Any]], workers: int) -> Dict[str, Any]:
+    """本地直接执行；远程把整批操作交给目标机的 python3，只建立一次SSH连接"""
+    cfg = TouchConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if host is None:
+        return batch.run_batch(items, workers)
+    host_config = find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return run_python(host_config, batch.__file__, {"items": items, "workers": workers}, is_zh, timeout=600)
+
+
+@mcp.tool(
+    name="touch_batch_tool"
+    if TouchConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "touch_batch_tool",
+    description='''
+    批量 touch：文件不存在时创建，并设置访问/修改时间，用于快速初始化测试文件与模拟时间戳；
+    整批操作在本机一次完成，或在远程主机上通过一个SSH连接交给目标机的 python3 执行，各项并发执行并分别返回结果
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则对本机进行操作
+        - files: 操作列表，每项为文件路径字符串，或 {"path": 文件路径, "atime": 访问时间, "mtime": 修改时间,
+          "no_create": 文件不存在时不创建}；时间为 "YYYY-MM-DD HH:MM:SS"（目标机本地时间）或 Unix 时间戳，
+          都不提供时设为当前时间，只提供其一时另一个保持不变；最多 10000 项
+        - workers: 并发数，范围 1~32，默认8
+    2. 返回值为字典：
+        - results: 与输入顺序一致的结果列表，每项包含输入的字段、ok（是否成功）、created（是否新建），失败时包含 error
+        - succeeded/failed: 成功与失败的项数
+        - seconds: 执行耗时
+    '''
+    if TouchConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Touch files in bulk: create missing files and set access/modification times, to initialize test files and
+    simulate timestamps; the whole batch runs in one local pass, or on a remote host as one python3 script over a
+    single SSH connection, items run concurrently and each gets its own result
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; if not provided, the operation is performed on the local machine
+        - files: Operations, each a file path string or {"path": file path, "atime": access time, "mtime":
+          modification time, "no_create": do not create missing files}; times are "YYYY-MM-DD HH:MM:SS" (local time
+          of the target) or Unix timestamps, both default to now and a single one leaves the other unchanged;
+          at most 10000 items
+        - workers: Concurrency, 1 to 32, default 8
+    2. The return value is a dictionary:
+        - results: Results in input order, each with the input fields, ok (success), created (newly created), and error on failure
+        - succeeded/failed: Number of items that succeeded and failed
+        - seconds: Elapsed time
+    '''
+
+)
+def touch_batch_tool(host: Union[str, None] = None, files: List[Union[str, Dict[str, Any]]] = None, workers: int = 8) -> Dict[str, Any]:
+    """批量创建文件并设置时间戳"""
+    is_zh = TouchConfig().get_config().public_config.language == LanguageEnum.ZH
+    _check_batch(files, workers, is_zh)
+    items = []
+    for item in files:
+        item = {"path": item} if isinstance(item, str) else item
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str) or not item["path"]:
+            raise ValueError("每项须包含 path" if is_zh else "Each item requires path")
+        for key in ("atime", "mtime"):
+            value = item.get(key)
+            if isinstance(value, str):
+                try:
+                    datetime.strptime(value, batch.TIME_FORMAT)
+                except ValueError:
+                    raise ValueError(f"{key} 格式错误: {value}，应为 YYYY-MM-DD HH:MM:SS 或时间戳" if is_zh
+                                     else f"Invalid {key}: {value}, use YYYY-MM-DD HH:MM:SS or a timestamp")
+        items.append({"path": item["path"], "atime": item.get("atime"), "mtime": item.get("mtime"),
+                      "no_create": bool(item.get("no_create"))})
+    return _execute(host, items, workers)
+
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='sse')
@@ -0,0 +1,63 @@
+"""公共基础层：远程主机查找与命令执行"""
+import subprocess
+from typing import List, Optional
+
+import paramiko
+
+from config.public.base_config_loader import RemoteConfigModel
+
+
+def find_remote_host(host_name: str, remote_hosts: List[RemoteConfigModel], is_zh: bool) -> RemoteConfigModel:
+    """查找远程主机配置"""
+    for host in remote_hosts:
+        if host.name == host_name or host.host == host_name:
+            return host
+    raise ValueError(f"未找到远程主机: {host_name}" if is_zh else f"Remote host not found: {host_name}")
+
+
+def open_ssh_client(host_config: RemoteConfigModel, is_zh: bool) -> paramiko.SSHClient:
+    """建立到远程主机的SSH连接"""
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        client.connect(
+            hostname=host_config.host,
+            port=host_config.port,
+            username=host_config.username,
+            password=host_config.password,
+            timeout=10,
+            banner_timeout=10
+        )
+    except paramiko.AuthenticationException as e:
+        client.close()
+        raise ValueError("SSH认证失败，请检查用户名和密码" if is_zh
+                         else "SSH authentication failed, check username and password") from e
+    except Exception as e:
+        client.close()
+        raise ValueError(f"SSH连接错误: {str(e)}" if is_zh else f"SSH connection error: {str(e)}") from e
+    return client
+
+
+def run_command(host_config: Optional[RemoteConfigModel], command: List[str], is_zh: bool, timeout: float) -> str:
+    """在本机或远程主机执行命令并返回标准输出"""
+    if host_config is None:
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise RuntimeError(f"执行 {command} 命令失败: {str(e)}" if is_zh
+                               else f"Command {command} execution failed: {str(e)}") from e
+        if result.returncode != 0:
+            raise RuntimeError(f"执行 {command} 命令失败: {result.stderr.strip()}" if is_zh
+                               else f"Command {command} execution failed: {result.stderr.strip()}")
+        return result.stdout
+    client = open_ssh_client(host_config, is_zh)
+    try:
+        _, stdout, stderr = client.exec_command(" ".join(command), timeout=timeout)
+        output = stdout.read().decode("utf-8", errors="replace")
+        if stdout.channel.recv_exit_status() != 0:
+            error = stderr.read().decode("utf-8", errors="replace").strip()
+            raise ValueError(f"命令 {' '.join(command)} 错误：{error}" if is_zh
+                             else f"Command {' '.join(command)} error: {error}")
+        return output
+    finally:
+        client.close()
@@ -0,0 +1,100 @@
+"""远程主机常驻通道：每台主机保持一个 SSH 会话中的 sh 进程，多次采样复用同一个通道，不再每次采样单独 exec"""
+import socket
+import threading
+import uuid
+from typing import Dict, List
+
+import paramiko
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.vmstat.src.base import open_ssh_client
+
+# 脚本结束标记，之后的输出属于下一次调用
+END_MARK = "@END"
+
+
+class HostChannel:
+    """
+    通过一次 exec 启动 sh，后续每次调用把脚本写入它的标准输入，读取到结束标记为止；
+    同一主机的调用串行执行，通道异常时关闭并在下次调用时重建
+    """
+
+    def __init__(self, host_config: RemoteConfigModel, is_zh: bool) -> None:
+        self.host_config = host_config
+        self.is_zh = is_zh
+        self.lock = threading.Lock()
+        self._client = None
+        self._channel = None
+        self._stdin = None
+        self._stdout = None
+
+    def _open(self) -> None:
+        self._client = open_ssh_client(self.host_config, self.is_zh)
+        self._channel = self._client.get_transport().open_session()
+        self._channel.exec_command("sh")
+        self._stdin = self._channel.makefile_stdin("wb")
+        self._stdout = self._channel.makefile("rb")
+
+    def close(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+        self._client = self._channel = self._stdin = self._stdout = None
+
+    def _execute(self, script: str, timeout: float) -> List[str]:
+        token = uuid.uuid4().hex
+        marker = f"{END_MARK} {token}"
+        # 脚本内的命令不能读取标准输入，否则会吞掉后续写入的脚本
+        self._stdin.write(f"{{\n{script}\n}} </dev/null 2>/dev/null\necho '{marker}'\n".encode("utf-8"))
+        self._stdin.flush()
+        self._channel.settimeout(timeout)
+        lines = []
+        for raw in self._stdout:
+            line = raw.decode("utf-8", errors="replace").rstrip("\n")
+            if line == marker:
+                return lines
+            lines.append(line)
+        raise EOFError("channel closed")
+
+    def _run_once(self, script: str, timeout: float) -> List[str]:
+        if self._channel is None:
+            self._open()
+        return self._execute(script, timeout)
+
+    def _error(self, e: Exception) -> RuntimeError:
+        detail = str(e) or type(e).__name__
+        return RuntimeError(f"远程主机 {self.host_config.name} 通道执行失败: {detail}" if self.is_zh
+                            else f"Channel to {self.host_config.name} failed: {detail}")
+
+    def run(self, script: str, timeout: float) -> List[str]:
+        """执行脚本并返回输出行"""
+        errors = (socket.timeout, EOFError, OSError, paramiko.SSHException)
+        with self.lock:
+            reused = self._channel is not None
+            try:
+                return self._run_once(script, timeout)
+            except errors as e:
+                self.close()
+                if not reused or isinstance(e, socket.timeout):
+                    raise self._error(e) from e
+            # 空闲期间被服务端断开的通道，重建后重试一次
+            try:
+                return self._run_once(script, timeout)
+            except errors as e:
+                self.close()
+                raise self._error(e) from e
+
+
+_channels: Dict[str, HostChannel] = {}
+_channels_lock = threading.Lock()
+
+
+def get_channel(host_config: RemoteConfigModel, is_zh: bool) -> HostChannel:
+    with _channels_lock:
+        channel = _channels.get(host_config.name)
+        if channel is None:
+            channel = HostChannel(host_config, is_zh)
+            _channels[host_config.name] = channel
+        return channel
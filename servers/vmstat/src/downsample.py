@@ -0,0 +1,169 @@
+"""列式时间序列的服务端降采样：按时间桶计算 min/max/mean/分位数/last，或用 LTTB 保留曲线形状"""
+import math
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+AGGREGATES = ("min", "max", "mean", "p50", "p95", "p99", "last", "lttb")
+BUCKET_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+BUCKET_PATTERN = re.compile(r"^(\d+)\s*([smhd]?)$")
+LOCAL_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_bucket(bucket: Union[str, int, None], is_zh: bool) -> Optional[int]:
+    """桶宽度：整数秒，或带单位的字符串，如 30s、5m、1h、1d"""
+    if bucket is None or bucket == "":
+        return None
+    match = BUCKET_PATTERN.match(str(bucket).strip())
+    seconds = int(match.group(1)) * BUCKET_UNITS[match.group(2) or "s"] if match else 0
+    if seconds <= 0:
+        raise ValueError(f"bucket 格式错误: {bucket}，示例: 60、30s、5m、1h" if is_zh
+                         else f"Invalid bucket: {bucket}, e.g. 60, 30s, 5m, 1h")
+    return seconds
+
+
+def parse_agg(agg: Union[str, List[str], None], is_zh: bool, bucket: Optional[int] = None) -> List[str]:
+    """聚合方式列表，默认 mean；lttb 按桶的数量选点，必须同时指定桶宽度"""
+    if not agg:
+        return ["mean"]
+    names = agg.split(",") if isinstance(agg, str) else list(agg)
+    names = [name.strip().lower() for name in names if name.strip()]
+    unknown = [name for name in names if name not in AGGREGATES]
+    if unknown or not names:
+        raise ValueError(f"不支持的聚合方式: {', '.join(unknown)}，可选: {', '.join(AGGREGATES)}" if is_zh
+                         else f"Unsupported aggregate: {', '.join(unknown)}, supported: {', '.join(AGGREGATES)}")
+    if "lttb" in names and bucket is None:
+        raise ValueError("lttb 按桶的数量选点，需要同时指定 bucket" if is_zh
+                         else "lttb selects one point per bucket, bucket is required")
+    return list(dict.fromkeys(names))
+
+
+def _to_epoch(timestamps: Sequence[str]) -> List[Optional[float]]:
+    """
+    换算为本地挂钟时间的秒数（按无时区的时间戳直接相减，不经过 UTC），
+    使小时、天的桶边界与序列中显示的本地时间对齐，例如 1d 的桶从本地 00:00 开始
+    """
+    epochs: List[Optional[float]] = []
+    for stamp in timestamps:
+        try:
+            epochs.append((datetime.fromisoformat(stamp).replace(tzinfo=None) - LOCAL_EPOCH).total_seconds())
+        except ValueError:
+            epochs.append(None)
+    return epochs
+
+
+def _bucket_ranges(epochs: List[Optional[float]], bucket: Optional[int]) -> List[Tuple[int, int, Optional[float]]]:
+    """相邻且落在同一桶内的采样合并为一个下标区间 [start, end)；不指定桶宽时整个窗口为一个桶"""
+    if not epochs:
+        return []
+    if bucket is None:
+        return [(0, len(epochs), epochs[0])]
+    ranges = []
+    start = 0
+    key = None
+    for index, epoch in enumerate(epochs):
+        current = math.floor(epoch / bucket) if epoch is not None else key
+        if index > 0 and current != key:
+            ranges.append((start, index, key * bucket if key is not None else None))
+            start = index
+        key = current
+    ranges.append((start, len(epochs), key * bucket if key is not None else None))
+    return ranges
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """线性插值分位数（与 numpy 默认方式一致）"""
+    pos = (len(ordered) - 1) * q
+    low = math.floor(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def _aggregate(values: List[Any], names: List[str]) -> Dict[str, Optional[float]]:
+    numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    if not numbers:
+        return dict.fromkeys(names)
+    result: Dict[str, Optional[float]] = {}
+    ordered = sorted(numbers) if any(name.startswith("p") for name in names) else None
+    for name in names:
+        if name == "min":
+            result[name] = min(numbers)
+        elif name == "max":
+            result[name] = max(numbers)
+        elif name == "mean":
+            result[name] = round(sum(numbers) / len(numbers), 4)
+        elif name == "last":
+            result[name] = numbers[-1]
+        else:
+            result[name] = round(_percentile(ordered, int(name[1:]) / 100), 4)
+    return result
+
+
+def lttb(xs: List[float], ys: List[float], threshold: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets：选出 threshold 个最能保留曲线形状的点，返回下标"""
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    every = (count - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, count)
+        span = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / span
+        avg_y = sum(ys[avg_start:avg_end]) / span
+        range_start = math.floor(i * every) + 1
+        range_end = math.floor((i + 1) * every) + 1
+        best, best_area = range_start, -1.0
+        for j in range(range_start, range_end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(count - 1)
+    return selected
+
+
+def _lttb_column(epochs: List[Optional[float]], timestamps: List[str], values: List[Any],
+                 threshold: int) -> Dict[str, List[Any]]:
+    points = [i for i, v in enumerate(values)
+              if epochs[i] is not None and isinstance(v, (int, float)) and not isinstance(v, bool)]
+    picked = lttb([epochs[i] for i in points], [values[i] for i in points], threshold)
+    return {"timestamps": [timestamps[points[i]] for i in picked], "values": [values[points[i]] for i in picked]}
+
+
+def downsample(data: Dict[str, Any], bucket: Union[str, int, None], agg: Union[str, List[str], None],
+               is_zh: bool) -> Dict[str, Any]:
+    """
+    对 {"timestamps": [...], "series": [{"columns": {名称: [取值...]}}]} 结构降采样；
+    桶边界只按时间戳计算一次，所有列共用；聚合后每列变为 {聚合方式: [每个桶的值]}，
+    lttb 按桶的数量选点，每列单独返回所选点的 timestamps/values
+    """
+    bucket_seconds = parse_bucket(bucket, is_zh)
+    names = parse_agg(agg, is_zh, bucket_seconds)
+    timestamps = data.get("timestamps", [])
+    epochs = _to_epoch(timestamps)
+    ranges = _bucket_ranges(epochs, bucket_seconds)
+    plain = [name for name in names if name != "lttb"]
+
+    series = []
+    for item in data.get("series", []):
+        columns: Dict[str, Dict[str, Any]] = {}
+        for column, values in item["columns"].items():
+            aggregated: Dict[str, Any] = {name: [] for name in plain}
+            for start, end, _ in ranges:
+                for name, value in _aggregate(values[start:end], plain).items():
+                    aggregated[name].append(value)
+            if "lttb" in names:
+                aggregated["lttb"] = _lttb_column(epochs, timestamps, values, max(len(ranges), 3))
+            columns[column] = aggregated
+        series.append(dict(item, columns=columns))
+
+    bucket_stamps = []
+    for start, _, epoch in ranges:
+        bucket_stamps.append((LOCAL_EPOCH + timedelta(seconds=epoch)).strftime("%Y-%m-%d %H:%M:%S")
+                             if epoch is not None and bucket_seconds is not None else timestamps[start])
+    return dict(data, bucket=bucket_seconds, agg=names, buckets=len(ranges), timestamps=bucket_stamps,
+                series=series)
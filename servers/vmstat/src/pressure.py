@@ -0,0 +1,177 @@
+"""内存压力连续采样：直接读取 /proc/vmstat 与 /proc/stat，计算回收、交换、规整、上下文切换等每秒速率并标记突增"""
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.vmstat.src.channel import get_channel
+
+# 输出指标 -> /proc/vmstat 或 /proc/stat 中的计数器前缀（旧内核按内存区域拆分，如 pgscan_kswapd_normal）
+COUNTERS = {
+    "pgscan_kswapd": "pgscan_kswapd",
+    "pgscan_direct": "pgscan_direct",
+    "pgsteal_kswapd": "pgsteal_kswapd",
+    "pgsteal_direct": "pgsteal_direct",
+    "allocstall": "allocstall",
+    "compact_stall": "compact_stall",
+    "pswpin": "pswpin",
+    "pswpout": "pswpout",
+    "pgmajfault": "pgmajfault",
+    "oom_kill": "oom_kill",
+    "ctxt": "ctxt",
+    "forks": "processes",
+}
+GAUGES = ("procs_running", "procs_blocked")
+KEY_PATTERN = "pgscan|pgsteal|allocstall|compact_stall|pswpin|pswpout|pgmajfault|oom_kill"
+STAT_PATTERN = "ctxt|processes|procs_running|procs_blocked"
+# 突增判定的最小尺度：绝对值（每秒次数或进程数）与相对中位数的比例，取两者中较大者
+SPIKE_MIN_SCALE = 1.0
+SPIKE_MIN_RELATIVE = 0.1
+
+# 单个 awk 进程完成全部采样，每次采样只产生一次 sleep；输出逐次刷新
+SAMPLE_SCRIPT = """
+echo "@START $(date +%s.%N) $(cut -d' ' -f1 /proc/uptime)"
+awk -v n={snapshots} -v iv={interval} 'BEGIN {{
+    for (i = 0; i < n; i++) {{
+        if (i > 0) system("sleep " iv)
+        getline up < "/proc/uptime"; close("/proc/uptime"); split(up, u, " ")
+        printf "@SAMPLE %s\\n", u[1]
+        while ((getline line < "/proc/vmstat") > 0) if (line ~ /^({keys})/) print line
+        close("/proc/vmstat")
+        while ((getline line < "/proc/stat") > 0) if (line ~ /^({stat}) /) print line
+        close("/proc/stat")
+        fflush()
+    }}
+}}'
+"""
+
+
+def _matches(key: str, prefix: str) -> bool:
+    # pgscan_direct_throttle 统计的是节流次数，不是扫描页数
+    return (key == prefix or key.startswith(prefix + "_")) and not key.endswith("_throttle")
+
+
+def parse_samples(lines: List[str]) -> Tuple[Optional[float], List[Tuple[float, Dict[str, int]]]]:
+    """返回 (墙钟时间与 uptime 的差值, [(uptime, 计数器)])"""
+    offset = None
+    samples: List[Tuple[float, Dict[str, int]]] = []
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == "@START" and len(parts) == 3:
+            try:
+                offset = float(parts[1]) - float(parts[2])
+            except ValueError:
+                offset = None
+        elif parts[0] == "@SAMPLE" and len(parts) == 2:
+            samples.append((float(parts[1]), {}))
+        elif samples and len(parts) >= 2 and parts[1].isdigit():
+            samples[-1][1][parts[0]] = int(parts[1])
+    return offset, samples
+
+
+def _totals(counters: Dict[str, int]) -> Dict[str, int]:
+    totals = dict.fromkeys(COUNTERS, 0)
+    for key, value in counters.items():
+        for name, prefix in COUNTERS.items():
+            if _matches(key, prefix):
+                totals[name] += value
+    return totals
+
+
+def find_spikes(values: List[Optional[float]], threshold: float) -> List[int]:
+    """
+    稳健 z 分数：(x - 中位数) / (1.4826 * MAD) 超过阈值视为突增；
+    尺度不低于 SPIKE_MIN_SCALE 与中位数的 SPIKE_MIN_RELATIVE 倍，序列大部分时间恒定（MAD 为 0 或极小，
+    如平时为 0 的回收停顿、基本不变的 procs_running）时，偶尔的小幅波动不会被当作突增
+    """
+    present = sorted(v for v in values if v is not None)
+    if len(present) < 3:
+        return []
+    median = present[len(present) // 2]
+    deviations = sorted(abs(v - median) for v in present)
+    scale = max(deviations[len(deviations) // 2] * 1.4826, SPIKE_MIN_SCALE, abs(median) * SPIKE_MIN_RELATIVE)
+    return [index for index, value in enumerate(values)
+            if value is not None and (value - median) / scale > threshold]
+
+
+def compute_pressure(offset: Optional[float], samples: List[Tuple[float, Dict[str, int]]], interval: float,
+                     spike_threshold: float) -> Dict[str, Any]:
+    """相邻两次快照之间的计数器差值除以 uptime 差值，得到每秒速率"""
+    timestamps: List[str] = []
+    columns: Dict[str, List[Optional[float]]] = {name: [] for name in COUNTERS}
+    columns["reclaim_efficiency"] = []
+    for name in GAUGES:
+        columns[name] = []
+    previous = None
+    for uptime, counters in samples:
+        totals = _totals(counters)
+        if previous is not None:
+            elapsed = uptime - previous[0]
+            if elapsed <= 0:
+                continue
+            for name in COUNTERS:
+                delta = totals[name] - previous[1][name]
+                # 计数器回绕或被重置时该点记为 None
+                columns[name].append(round(delta / elapsed, 2) if delta >= 0 else None)
+            scanned = (totals["pgscan_kswapd"] + totals["pgscan_direct"]
+                       - previous[1]["pgscan_kswapd"] - previous[1]["pgscan_direct"])
+            stolen = (totals["pgsteal_kswapd"] + totals["pgsteal_direct"]
+                      - previous[1]["pgsteal_kswapd"] - previous[1]["pgsteal_direct"])
+            columns["reclaim_efficiency"].append(round(stolen / scanned * 100, 1) if scanned > 0 else None)
+            for name in GAUGES:
+                columns[name].append(counters.get(name))
+            wall = (offset + uptime) if offset is not None else time.time()
+            timestamps.append(datetime.fromtimestamp(wall).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3])
+        previous = (uptime, totals)
+
+    spikes: Dict[str, List[Dict[str, Any]]] = {}
+    for name in list(COUNTERS) + list(GAUGES):
+        indexes = find_spikes(columns[name], spike_threshold)
+        if indexes:
+            spikes[name] = [{"timestamp": timestamps[i], "value": columns[name][i]} for i in indexes]
+    return {
+        "samples": len(timestamps),
+        "interval": interval,
+        "timestamps": timestamps,
+        "series": [{"activity": "memory_pressure", "instance": None, "columns": columns}],
+        "spikes": spikes,
+    }
+
+
+def _read_local(keys: Tuple[str, ...]) -> List[str]:
+    with open("/proc/uptime") as f:
+        lines = [f"@SAMPLE {f.read().split()[0]}"]
+    with open("/proc/vmstat") as f:
+        lines += [line.rstrip("\n") for line in f if line.startswith(keys)]
+    with open("/proc/stat") as f:
+        lines += [line.rstrip("\n") for line in f if line.split(" ", 1)[0] in GAUGES + ("ctxt", "processes")]
+    return lines
+
+
+def sample_local(interval: float, count: int) -> List[str]:
+    """本地按固定节拍读取，读取耗时不会累积成漂移"""
+    keys = tuple(KEY_PATTERN.split("|"))
+    with open("/proc/uptime") as f:
+        lines = [f"@START {time.time()} {f.read().split()[0]}"]
+    start = time.monotonic()
+    for i in range(count + 1):
+        if i > 0:
+            time.sleep(max(start + i * interval - time.monotonic(), 0))
+        lines += _read_local(keys)
+    return lines
+
+
+def collect_pressure(host_config: Optional[RemoteConfigModel], interval: float, count: int,
+                     spike_threshold: float, is_zh: bool) -> Dict[str, Any]:
+    """本地直接读取 procfs；远程在该主机的常驻通道中运行一次采样脚本"""
+    if host_config is None:
+        lines = sample_local(interval, count)
+    else:
+        script = SAMPLE_SCRIPT.format(snapshots=count + 1, interval=interval, keys=KEY_PATTERN, stat=STAT_PATTERN)
+        lines = get_channel(host_config, is_zh).run(script, timeout=interval * (count + 1) + 30)
+    offset, samples = parse_samples(lines)
+    if len(samples) < 2:
+        raise RuntimeError("未能读取 /proc/vmstat 采样数据" if is_zh else "Failed to sample /proc/vmstat")
+    return compute_pressure(offset, samples, interval, spike_threshold)
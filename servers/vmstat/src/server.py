@@ -12,6 +12,11 @@ from datetime import datetime
 from mcp.server import FastMCP
 from config.public.base_config_loader import LanguageEnum
 from config.private.vmstat.config_loader import VmstatConfig
+from servers.vmstat.src.base import find_remote_host
+from servers.vmstat.src.downsample import downsample, parse_agg, parse_bucket
+from servers.vmstat.src.pressure import collect_pressure
+from servers.vmstat.src.slabtrack import track_slab_growth
+from servers.vmstat.src.vmseries import collect_vmstat_series
 mcp = FastMCP("Vmstat MCP Server", host="0.0.0.0", port=VmstatConfig().get_config().private_config.port)
 
 
@@ -24,6 +29,10 @@ mcp = FastMCP("Vmstat MCP Server", host="0.0.0.0", port=VmstatConfig().get_confi
     使用vmstat命令快速诊断系统资源交互瓶颈
     1. 输入值如下：
         - host: 远程主机名称或IP地址，若不提供则表示监控本机系统资源整体状态
+        - interval: 连续采样的时间间隔（秒），可选；不提供时只返回一次采样
+        - count: 连续采样次数，默认1
+        - bucket: 降采样的时间桶宽度，可选，如 60、30s、5m、1h
+        - agg: 聚合方式，可选，逗号分隔，支持 min、max、mean、p50、p95、p99、last、lttb（保留曲线形状的选点，需指定 bucket，点数与桶数相同），默认 mean
     2. 返回值为包含识别性能瓶颈指标的字典列表，每个字典包含以下键
         - r: 运行队列中的进程数
         - b: 等待 I/O 的进程数
@@ -38,6 +47,10 @@ mcp = FastMCP("Vmstat MCP Server", host="0.0.0.0", port=VmstatConfig().get_confi
         - id: CPU 空闲时间
         - wa: CPU 等待 I/O 完成的时间百分比
         - st: 被虚拟机偷走的 CPU 时间百分比
+        指定 interval 时返回列式数据：samples（采样数）、interval、timestamps（采样时间）、
+        series（[{activity: "vmstat", instance: null, columns: {列名: 取值列表}}]，列名与 vmstat 表头一致）；
+        再指定 bucket 或 agg 时在服务端降采样：timestamps 为各桶的起始时间，columns 中每列变为
+        {聚合方式: 每个桶的值列表}，lttb 为 {timestamps, values}；另含 bucket、agg、buckets（桶数）
     '''
     if VmstatConfig().get_config().public_config.language == LanguageEnum.ZH
     else
@@ -45,6 +58,11 @@ mcp = FastMCP("Vmstat MCP Server", host="0.0.0.0", port=VmstatConfig().get_confi
     Using the vmstat Command to Quickly Diagnose System Resource Interaction Bottlenecks
     1. Input values are as follows:
         - host: The name or IP address of the remote host. If not provided, it indicates monitoring the overall status of the local system resources.
+        - interval: Interval in seconds for continuous sampling, optional; a single sample is returned if not provided
+        - count: Number of samples, default 1
+        - bucket: Downsampling bucket width, optional, e.g. 60, 30s, 5m, 1h
+        - agg: Aggregates, optional, comma separated: min, max, mean, p50, p95, p99, last, lttb (shape-preserving
+          point selection, requires bucket and keeps as many points as there are buckets), default mean
     2. The return value is a list of dictionaries containing indicators that identify performance bottlenecks. Each dictionary includes the following keys:
         - r: The number of processes in the run queue.
         - b: The number of processes waiting for I/O.
@@ -59,11 +77,28 @@ mcp = FastMCP("Vmstat MCP Server", host="0.0.0.0", port=VmstatConfig().get_confi
         - id: The CPU idle time.
         - wa: The percentage of CPU time waiting for I/O to complete.
         - st: The percentage of CPU time stolen by virtual machines.
+        When interval is given the result is columnar: samples, interval, timestamps and series
+        ([{activity: "vmstat", instance: null, columns: {column: list of values}}], column names follow the
+        vmstat header); when bucket or agg is also given the data is downsampled on the server: timestamps are
+        the bucket start times, each column becomes {aggregate: list of per-bucket values} and lttb becomes
+        {timestamps, values}; bucket, agg and buckets (number of buckets) are added
     '''
 
 )
-def vmstat_collect_tool(host: Union[str, None] = None, options: str = None) -> Dict[str, Any]:
+def vmstat_collect_tool(host: Union[str, None] = None, options: str = None, interval: int = None,
+                        count: int = None, bucket: Union[str, int, None] = None,
+                        agg: Union[str, List[str], None] = None) -> Dict[str, Any]:
     """使用vmstat命令快速诊断系统资源交互瓶颈"""
+    if interval is not None:
+        cfg = VmstatConfig().get_config()
+        is_zh = cfg.public_config.language == LanguageEnum.ZH
+        count = 1 if count is None else count
+        if interval <= 0 or count <= 0:
+            raise ValueError("interval 与 count 必须为正整数" if is_zh else "interval and count must be positive")
+        parse_agg(agg, is_zh, parse_bucket(bucket, is_zh))
+        host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+        result = collect_vmstat_series(host_config, interval, count, is_zh)
+        return downsample(result, bucket, agg, is_zh) if bucket or agg else result
     if host is None:
         try:
             command = ['vmstat']
@@ -184,6 +219,87 @@ def vmstat_collect_tool(host: Union[str, None] = None, options: str = None) -> D
         else:
             raise ValueError(f"Remote host not found: {host}")
 
+@mcp.tool(
+    name="vmstat_pressure_collect_tool"
+    if VmstatConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "vmstat_pressure_collect_tool",
+    description='''
+    连续采样内存压力相关指标：直接读取 /proc/vmstat 与 /proc/stat，计算每秒速率并标记突增；
+    远程主机复用同一个常驻SSH通道，不会每次采样单独执行命令
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则采集本机
+        - interval: 采样间隔（秒），支持小数，范围 0.1~60，默认1
+        - count: 采样次数，范围 1~3600，默认10
+        - spike_threshold: 突增判定的稳健z分数阈值，默认3.5
+        - bucket: 降采样的时间桶宽度，可选，如 60、30s、5m
+        - agg: 聚合方式，可选，逗号分隔，支持 min、max、mean、p50、p95、p99、last、lttb（需指定 bucket），默认 mean
+    2. 返回值为列式数据字典：
+        - samples: 采样点数
+        - interval: 采样间隔
+        - timestamps: 每个采样点的时间（精确到毫秒）
+        - series: [{activity: "memory_pressure", instance: null, columns: {...}}]，columns 包含每秒速率：
+            - pgscan_kswapd/pgscan_direct: kswapd/直接回收扫描的页数
+            - pgsteal_kswapd/pgsteal_direct: kswapd/直接回收回收的页数
+            - allocstall: 直接回收停顿次数
+            - compact_stall: 内存规整停顿次数
+            - pswpin/pswpout: 换入/换出的页数
+            - pgmajfault: 主缺页次数
+            - oom_kill: OOM kill 次数
+            - ctxt: 上下文切换次数
+            - forks: 新建进程数
+            - reclaim_efficiency: 回收效率（回收页数/扫描页数，百分比），没有扫描时为 null
+            - procs_running/procs_blocked: 可运行/阻塞的进程数（瞬时值）
+        - spikes: 出现突增的指标及对应的 timestamp 与 value
+    '''
+    if VmstatConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Continuously sample memory-pressure indicators by reading /proc/vmstat and /proc/stat directly, derive
+    per-second rates and flag spikes; remote hosts reuse one long-lived SSH channel instead of running a command
+    per sample
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; the local machine if not provided
+        - interval: Sampling interval in seconds, fractions allowed, 0.1 to 60, default 1
+        - count: Number of samples, 1 to 3600, default 10
+        - spike_threshold: Robust z-score threshold for spikes, default 3.5
+        - bucket: Downsampling bucket width, optional, e.g. 60, 30s, 5m
+        - agg: Aggregates, optional, comma separated: min, max, mean, p50, p95, p99, last, lttb (requires bucket),
+          default mean
+    2. The return value is a columnar dictionary:
+        - samples: Number of samples
+        - interval: Sampling interval
+        - timestamps: Time of each sample (millisecond precision)
+        - series: [{activity: "memory_pressure", instance: null, columns: {...}}], columns hold per-second rates:
+            - pgscan_kswapd/pgscan_direct: Pages scanned by kswapd/direct reclaim
+            - pgsteal_kswapd/pgsteal_direct: Pages reclaimed by kswapd/direct reclaim
+            - allocstall: Direct reclaim stalls
+            - compact_stall: Compaction stalls
+            - pswpin/pswpout: Pages swapped in/out
+            - pgmajfault: Major page faults
+            - oom_kill: OOM kills
+            - ctxt: Context switches
+            - forks: Processes created
+            - reclaim_efficiency: Reclaim efficiency (reclaimed/scanned, percent), null when nothing was scanned
+            - procs_running/procs_blocked: Runnable/blocked processes (instantaneous)
+        - spikes: Metrics with spikes and the corresponding timestamp and value
+    '''
+
+)
+def vmstat_pressure_collect_tool(host: Union[str, None] = None, interval: float = 1.0, count: int = 10,
+                                 spike_threshold: float = 3.5, bucket: Union[str, int, None] = None,
+                                 agg: Union[str, List[str], None] = None) -> Dict[str, Any]:
+    """连续采样内存压力相关指标"""
+    cfg = VmstatConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if not 0.1 <= interval <= 60 or not 1 <= count <= 3600:
+        raise ValueError("interval 范围为 0.1~60 秒，count 范围为 1~3600" if is_zh
+                         else "interval must be 0.1-60 seconds and count 1-3600")
+    parse_agg(agg, is_zh, parse_bucket(bucket, is_zh))
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    result = collect_pressure(host_config, interval, count, spike_threshold, is_zh)
+    return downsample(result, bucket, agg, is_zh) if bucket or agg else result
+
 @mcp.tool(
     name="vmstat_slabinfo_collect_tool"
     if VmstatConfig().get_config().public_config.language == LanguageEnum.ZH
@@ -335,6 +451,71 @@ def vmstat_slabinfo_collect_tool(host: Union[str, None] = None) -> List[Dict[str
         else:
             raise ValueError(f"Remote host not found: {host}")
 
+@mcp.tool(
+    name="vmstat_slab_growth_tool"
+    if VmstatConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    "vmstat_slab_growth_tool",
+    description='''
+    跟踪内核 slab 缓存的增长，用于排查内核内存泄漏：直接读取 /proc/slabinfo，需要 root 权限
+    （/proc/slabinfo 不可读时尝试 /sys/kernel/slab，较新内核上其属性文件同样只有 root 可读），按主机保存快照，计算两次快照之间各缓存的字节增量与每秒增长速率，返回增长最多的缓存
+    1. 输入值如下：
+        - host: 远程主机名称或IP地址，若不提供则表示本机
+        - interval: 两次快照的间隔（秒），大于0时在本次调用内连续取两次快照；默认0，即与该主机已保存的快照比较
+        - top_n: 返回增长最多的缓存数量，范围 1~1000，默认20
+        - baseline: interval 为0时的比较基准，previous 为上一次快照，first 为保存的最早快照（每台主机最多保存16个），默认previous
+    2. 返回值为字典：
+        - host: 主机名称
+        - baseline_recorded: 为 true 时表示该主机还没有快照，本次只记录基线，top_growers 为空
+        - snapshots: 该主机已保存的快照数
+        - elapsed: 两次快照间隔的秒数
+        - caches: 缓存数量
+        - total_bytes/total_delta_bytes: 所有 slab 占用的总字节数及其增量
+        - new_caches: 新出现的缓存名称
+        - top_growers: 按字节增量从大到小排列的缓存列表，每项包含 cache、objsize（对象大小）、active_objs（活跃对象数）、
+          num_objs（对象总数）、bytes（slab 占用字节数）、delta_bytes（字节增量）、delta_objs（对象增量）、
+          bytes_per_second（每秒增长字节数）、growth_percent（增长百分比）
+    '''
+    if VmstatConfig().get_config().public_config.language == LanguageEnum.ZH
+    else
+    '''
+    Track kernel slab cache growth to hunt kernel memory leaks: read /proc/slabinfo directly, which requires root
+    (/sys/kernel/slab is tried when it is unreadable, but recent kernels make those attributes root-only as well),
+    keep snapshots per host, compute each cache's byte delta and growth rate between two snapshots,
+    and return the top growers
+    1. Input values are as follows:
+        - host: The name or IP address of the remote host; the local machine if not provided
+        - interval: Seconds between two snapshots; when greater than 0 both snapshots are taken in this call;
+          default 0, compare against the snapshots stored for the host
+        - top_n: Number of top growers to return, 1 to 1000, default 20
+        - baseline: Reference when interval is 0: previous for the last snapshot, first for the oldest stored one
+          (up to 16 per host), default previous
+    2. The return value is a dictionary:
+        - host: Host name
+        - baseline_recorded: true when the host had no snapshot yet; only the baseline was recorded and top_growers is empty
+        - snapshots: Number of snapshots stored for the host
+        - elapsed: Seconds between the two snapshots
+        - caches: Number of caches
+        - total_bytes/total_delta_bytes: Total bytes used by all slabs and its delta
+        - new_caches: Names of caches that appeared
+        - top_growers: Caches sorted by byte delta, each with cache, objsize, active_objs, num_objs,
+          bytes (bytes used by the slabs), delta_bytes, delta_objs, bytes_per_second and growth_percent
+    '''
+
+)
+def vmstat_slab_growth_tool(host: Union[str, None] = None, interval: float = 0, top_n: int = 20,
+                            baseline: str = "previous") -> Dict[str, Any]:
+    """跟踪内核 slab 缓存的增长"""
+    cfg = VmstatConfig().get_config()
+    is_zh = cfg.public_config.language == LanguageEnum.ZH
+    if not 0 <= interval <= 600 or not 1 <= top_n <= 1000:
+        raise ValueError("interval 范围为 0~600 秒，top_n 范围为 1~1000" if is_zh
+                         else "interval must be 0-600 seconds and top_n 1-1000")
+    if baseline not in ("previous", "first"):
+        raise ValueError("baseline 只能是 previous 或 first" if is_zh else "baseline must be previous or first")
+    host_config = None if host is None else find_remote_host(host, cfg.public_config.remote_hosts, is_zh)
+    return track_slab_growth(host_config, interval, top_n, baseline, is_zh)
+
 if __name__ == "__main__":
     # Initialize and run the server
     mcp.run(transport='sse')
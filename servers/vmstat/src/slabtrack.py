@@ -0,0 +1,202 @@
+"""slab 增长跟踪：读取 /proc/slabinfo（需要 root；不可读时尝试 /sys/kernel/slab），按主机保存快照并计算各缓存的增长"""
+import heapq
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.vmstat.src.channel import get_channel
+
+# 每台主机保留的快照数
+MAX_SNAPSHOTS = 16
+SYSFS_SLAB = "/sys/kernel/slab"
+SYSFS_FIELDS = ("objects", "total_objects", "object_size", "slabs", "order")
+
+# slabinfo 需要 root 权限；sysfs 只在属性文件对普通用户可读的内核上可作为替代（较新的内核为 0400，同样需要 root）。
+# SLUB 的 sysfs 目录中合并的缓存以符号链接出现，只统计实际目录
+SNAPSHOT_SCRIPT = """
+snap() {{
+    echo "@SNAP $(cut -d' ' -f1 /proc/uptime)"
+    if [ -r /proc/slabinfo ]; then
+        cat /proc/slabinfo
+    else
+        set --
+        for d in {sysfs}/*; do
+            [ -L "$d" ] || set -- "$@" "$d/objects" "$d/total_objects" "$d/object_size" "$d/slabs" "$d/order"
+        done
+        [ $# -gt 0 ] && grep -H '' "$@" 2>/dev/null
+    fi
+}}
+echo "@PAGESIZE $(getconf PAGESIZE 2>/dev/null || echo 4096)"
+snap
+if [ "{interval}" != "0" ]; then
+    sleep {interval}
+    snap
+fi
+"""
+
+# 快照：(uptime, {缓存名: (活跃对象数, 对象总数, 对象大小, 占用字节数)})
+Snapshot = Tuple[float, Dict[str, Tuple[int, int, int, int]]]
+
+_snapshots: Dict[str, Deque[Snapshot]] = {}
+_snapshots_lock = threading.Lock()
+
+
+def _first_int(value: str) -> int:
+    """sysfs 中 objects/slabs 等文件形如 "1234 N0=1000 N1=234"，只取总数"""
+    head = value.split()[0] if value.split() else "0"
+    return int(head) if head.isdigit() else 0
+
+
+def _from_sysfs(raw: Dict[str, Dict[str, str]], page_size: int) -> Dict[str, Tuple[int, int, int, int]]:
+    caches = {}
+    for name, fields in raw.items():
+        objsize = _first_int(fields.get("object_size", "0"))
+        slabs = _first_int(fields.get("slabs", "0"))
+        order = _first_int(fields.get("order", "0"))
+        caches[name] = (_first_int(fields.get("objects", "0")), _first_int(fields.get("total_objects", "0")),
+                        objsize, slabs * (page_size << order))
+    return caches
+
+
+def parse_snapshots(lines: List[str]) -> List[Snapshot]:
+    """解析 SNAPSHOT_SCRIPT 输出，兼容 slabinfo 与 sysfs 两种来源"""
+    page_size = 4096
+    snapshots: List[Snapshot] = []
+    caches: Dict[str, Tuple[int, int, int, int]] = {}
+    sysfs: Dict[str, Dict[str, str]] = {}
+    uptime = None
+
+    def flush() -> None:
+        if uptime is not None:
+            caches.update(_from_sysfs(sysfs, page_size))
+            snapshots.append((uptime, dict(caches)))
+
+    for line in lines:
+        if line.startswith("@PAGESIZE "):
+            value = line.split()[1] if len(line.split()) > 1 else ""
+            page_size = int(value) if value.isdigit() else 4096
+        elif line.startswith("@SNAP "):
+            flush()
+            uptime = float(line.split()[1])
+            caches, sysfs = {}, {}
+        elif line.startswith(SYSFS_SLAB + "/"):
+            # SLUB 合并缓存的实际目录名形如 :0000064，路径本身含冒号；取值中没有冒号，从右侧切分
+            path, _, value = line.rpartition(":")
+            parts = path.split("/")
+            if len(parts) == 6 and parts[5] in SYSFS_FIELDS:
+                sysfs.setdefault(parts[4], {})[parts[5]] = value
+        else:
+            # name active_objs num_objs objsize objperslab pagesperslab : tunables ... : slabdata active_slabs num_slabs ...
+            parts = line.split()
+            if len(parts) >= 15 and parts[1].isdigit() and parts[13].isdigit() and parts[14].isdigit():
+                caches[parts[0]] = (int(parts[1]), int(parts[2]), int(parts[3]),
+                                    int(parts[14]) * int(parts[5]) * page_size)
+    flush()
+    return snapshots
+
+
+def read_local_snapshot() -> Snapshot:
+    with open("/proc/uptime") as f:
+        uptime = float(f.read().split()[0])
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    lines = [f"@PAGESIZE {page_size}", f"@SNAP {uptime}"]
+    try:
+        with open("/proc/slabinfo") as f:
+            lines += f.read().splitlines()
+    except OSError:
+        # 无权限，或内核未提供 /proc/slabinfo（如 SLOB）
+        try:
+            with os.scandir(SYSFS_SLAB) as entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        continue
+                    for field in SYSFS_FIELDS:
+                        try:
+                            with open(os.path.join(entry.path, field)) as f:
+                                lines.append(f"{entry.path}/{field}:{f.read().strip()}")
+                        except OSError:
+                            continue
+        except OSError:
+            pass
+    return parse_snapshots(lines)[0]
+
+
+def diff_snapshots(before: Snapshot, after: Snapshot, top_n: int) -> Dict[str, Any]:
+    """
+    一次遍历计算所有缓存的字节增量，heapq.nlargest 取增长最多的 top_n（O(n log k)），
+    只对入选的缓存构造输出
+    """
+    elapsed = after[0] - before[0]
+    old, new = before[1], after[1]
+    empty = (0, 0, 0, 0)
+    deltas = {name: value[3] - old.get(name, empty)[3] for name, value in new.items()}
+    for name in old.keys() - new.keys():
+        deltas[name] = -old[name][3]
+    growers = heapq.nlargest(top_n, (item for item in deltas.items() if item[1] > 0), key=lambda item: item[1])
+
+    def fmt(name: str, delta: int) -> Dict[str, Any]:
+        active, total, objsize, size = new.get(name, empty)
+        prev = old.get(name, empty)
+        return {
+            "cache": name,
+            "objsize": objsize or prev[2],
+            "active_objs": active,
+            "num_objs": total,
+            "bytes": size,
+            "delta_bytes": delta,
+            "delta_objs": total - prev[1],
+            "bytes_per_second": round(delta / elapsed, 1) if elapsed > 0 else None,
+            "growth_percent": round(delta / prev[3] * 100, 1) if prev[3] else None,
+        }
+
+    total_before = sum(value[3] for value in old.values())
+    total_after = sum(value[3] for value in new.values())
+    return {
+        "elapsed": round(elapsed, 3),
+        "caches": len(new),
+        "total_bytes": total_after,
+        "total_delta_bytes": total_after - total_before,
+        "new_caches": sorted(new.keys() - old.keys()),
+        "top_growers": [fmt(name, delta) for name, delta in growers],
+    }
+
+
+def track_slab_growth(host_config: Optional[RemoteConfigModel], interval: float, top_n: int, baseline: str,
+                      is_zh: bool) -> Dict[str, Any]:
+    """
+    interval > 0 时在一次调用内取两次快照；否则与该主机保存的上一次（previous）或最早（first）快照比较，
+    第一次调用只记录基线
+    """
+    key = "localhost" if host_config is None else host_config.name
+    if host_config is None:
+        current = [read_local_snapshot()]
+        if interval > 0:
+            time.sleep(interval)
+            current.append(read_local_snapshot())
+    else:
+        script = SNAPSHOT_SCRIPT.format(sysfs=SYSFS_SLAB, interval=interval if interval > 0 else 0)
+        current = parse_snapshots(get_channel(host_config, is_zh).run(script, timeout=interval + 60))
+    if not current or not current[-1][1]:
+        raise RuntimeError(
+            "未能读取 slab 信息：/proc/slabinfo 与 /sys/kernel/slab 的属性文件通常只有 root 可读，请以 root 用户运行或连接远程主机"
+            if is_zh else
+            "Failed to read slab information: /proc/slabinfo and the /sys/kernel/slab attributes are usually readable "
+            "by root only, run as root or connect to the remote host as root")
+
+    with _snapshots_lock:
+        history = _snapshots.setdefault(key, deque(maxlen=MAX_SNAPSHOTS))
+        stored = list(history)
+        history.append(current[-1])
+
+    if len(current) > 1:
+        before = current[0]
+    elif stored:
+        before = stored[0] if baseline == "first" else stored[-1]
+    else:
+        return {"host": key, "baseline_recorded": True, "caches": len(current[-1][1]),
+                "total_bytes": sum(value[3] for value in current[-1][1].values()), "top_growers": []}
+    return dict(host=key, baseline_recorded=False, snapshots=len(stored) + 1,
+                **diff_snapshots(before, current[-1], top_n))
@@ -0,0 +1,42 @@
+"""vmstat 多次采样：按表头名称解析各列（不同 procps 版本的列数不同），输出列式数据"""
+from typing import Any, Dict, List, Optional
+
+from config.public.base_config_loader import RemoteConfigModel
+from servers.vmstat.src.base import run_command
+
+
+def parse_vmstat_series(output: str, interval: int) -> Dict[str, Any]:
+    """解析 vmstat -n -t 输出；第一行是开机以来的平均值，不计入采样"""
+    names: List[str] = []
+    timestamps: List[str] = []
+    columns: Dict[str, List[Any]] = {}
+    rows = 0
+    for line in output.splitlines():
+        parts = line.split()
+        if not parts or parts[0] == "procs":
+            continue
+        if parts[0] == "r":
+            names = parts
+            continue
+        if not names or not parts[0].isdigit() or len(parts) < 3:
+            continue
+        rows += 1
+        if rows == 1:
+            continue
+        values = parts[:-2]
+        timestamps.append(f"{parts[-2]} {parts[-1]}")
+        for name, value in zip(names, values):
+            columns.setdefault(name, []).append(int(value) if value.lstrip("-").isdigit() else value)
+    return {
+        "samples": len(timestamps),
+        "interval": interval,
+        "timestamps": timestamps,
+        "series": [{"activity": "vmstat", "instance": None, "columns": columns}],
+    }
+
+
+def collect_vmstat_series(host_config: Optional[RemoteConfigModel], interval: int, count: int,
+                          is_zh: bool) -> Dict[str, Any]:
+    command = ["vmstat", "-n", "-t", str(int(interval)), str(int(count) + 1)]
+    output = run_command(host_config, command, is_zh, timeout=interval * (count + 1) + 30)
+    return parse_vmstat_series(output, interval)